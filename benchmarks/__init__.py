@@ -0,0 +1,5 @@
+"""
+Render benchmarks of DearCyGui.
+
+Run with python -m benchmarks.run
+"""
@@ -0,0 +1,249 @@
+"""
+Render benchmark suite.
+
+Usage:
+    python -m benchmarks.run [--scenes widgets,table] [--frames 200]
+                             [--output results.json] [--profile]
+                             [--compare previous_results.json]
+
+Every (scene, size) case runs in a separate process, with a
+headless viewport (see Viewport.headless), so that the
+measures do not depend on the display, the vsync or the
+previous cases. The results are printed as JSON, and can be
+compared between releases to track regressions.
+
+For each case are reported:
+- creation: time to create the items and items created per second
+- memory: process memory growth per item created
+- frames: percentiles of the render_frame time and of the
+    rendering part of it (Viewport.metrics)
+- vertices/indices: number of vertices and indices rendered
+    in the last frame
+- profile (with --profile): time spent per item class
+    (Viewport.get_draw_profile)
+- change (with --compare): ratio of the median frame time,
+    creation time and memory per item to the previous results
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+def process_memory():
+    """Resident memory of the process in bytes, None if unavailable"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def percentiles(values):
+    values = np.asarray(values, dtype=np.float64)
+    if len(values) == 0:
+        return None
+    (p50, p90, p99) = np.percentile(values, [50., 90., 99.])
+    return {
+        "mean": float(np.mean(values)),
+        "p50": float(p50),
+        "p90": float(p90),
+        "p99": float(p99),
+        "max": float(np.max(values))
+    }
+
+def run_case(scene, size, frames, warmup_frames, width, height, profile):
+    """Run a single benchmark case in the current process"""
+    import dearcygui as dcg
+    from .scenes import SCENES
+
+    (builder, _) = SCENES[scene]
+    C = dcg.Context()
+    C.viewport.initialize(headless=True, width=width, height=height)
+    window = dcg.Window(C, primary=True)
+    # Render once so that the fixed costs (fonts, etc)
+    # are not accounted to the items.
+    C.viewport.render_frame()
+
+    # Creation time. tracemalloc slows down the allocations,
+    # thus the memory is measured in a separate pass.
+    gc.collect()
+    start = time.perf_counter()
+    num_items = builder(C, window, size)
+    creation_time = time.perf_counter() - start
+
+    # Memory, with a second copy of the scene, deleted afterwards
+    memory_window = dcg.Window(C, show=False)
+    gc.collect()
+    memory_before = process_memory()
+    tracemalloc.start()
+    builder(C, memory_window, size)
+    (python_memory, _) = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    gc.collect()
+    memory_after = process_memory()
+    if memory_before is not None and memory_after is not None:
+        memory = memory_after - memory_before
+    else:
+        # Only accounts python allocations
+        memory = python_memory
+    memory_window.delete_item()
+    gc.collect()
+
+    for _ in range(warmup_frames):
+        C.viewport.render_frame()
+
+    if profile:
+        C.viewport.profile_draws_frames = frames
+        C.viewport.profile_draws = True
+    frame_times = []
+    rendering_times = []
+    for _ in range(frames):
+        start = time.perf_counter()
+        C.viewport.render_frame()
+        frame_times.append(time.perf_counter() - start)
+        rendering_times.append(C.viewport.metrics["delta_rendering"])
+    metrics = C.viewport.metrics
+
+    result = {
+        "scene": scene,
+        "size": size,
+        "items": num_items,
+        "creation": {
+            "time": creation_time,
+            "items_per_second": num_items / creation_time if creation_time > 0 else None
+        },
+        "memory": {
+            "total": memory,
+            "per_item": memory / num_items if num_items > 0 else None
+        },
+        "frames": {
+            "count": frames,
+            "render_frame": percentiles(frame_times),
+            "rendering": percentiles(rendering_times)
+        },
+        "vertices": metrics["rendered_vertices"],
+        "indices": metrics["rendered_indices"]
+    }
+    if profile:
+        draw_profile = C.viewport.get_draw_profile()
+        result["profile"] = {
+            item_type.__name__: {
+                "count": stats["count"],
+                "total": stats["total"] / max(1, draw_profile["frames"]),
+                "self": stats["self"] / max(1, draw_profile["frames"])
+            } for (item_type, stats) in draw_profile["per_class"].items()
+        }
+    return result
+
+def run_isolated(scene, size, args):
+    """Run a benchmark case in a separate process"""
+    command = [sys.executable, "-m", "benchmarks.run",
+               "--case", f"{scene}:{size}",
+               "--frames", str(args.frames),
+               "--warmup-frames", str(args.warmup_frames),
+               "--width", str(args.width),
+               "--height", str(args.height)]
+    if args.profile:
+        command.append("--profile")
+    cwd = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    completed = subprocess.run(command, cwd=cwd, capture_output=True, text=True)
+    if completed.returncode != 0:
+        return {"scene": scene, "size": size,
+                "error": "\n".join(completed.stderr.strip().splitlines()[-1:])}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+def compare(case, previous_results):
+    """Ratios between the case and the same case in previous results"""
+    for previous in previous_results["cases"]:
+        if previous.get("scene") != case["scene"] or \
+           previous.get("size") != case["size"] or \
+           "error" in previous:
+            continue
+        def ratio(new, old):
+            if new is None or old is None or old == 0:
+                return None
+            return new / old
+        return {
+            "render_frame": ratio(case["frames"]["render_frame"]["p50"],
+                                  previous["frames"]["render_frame"]["p50"]),
+            "creation": ratio(case["creation"]["time"],
+                              previous["creation"]["time"]),
+            "memory_per_item": ratio(case["memory"]["per_item"],
+                                     previous["memory"]["per_item"])
+        }
+    return None
+
+def main(argv=None):
+    from .scenes import SCENES
+    parser = argparse.ArgumentParser(description="DearCyGui render benchmarks")
+    parser.add_argument("--scenes", default=",".join(SCENES.keys()),
+                        help="comma separated list of scenes. Available: " + ", ".join(SCENES.keys()))
+    parser.add_argument("--sizes", default=None,
+                        help="comma separated list of sizes, replacing the default sizes of each scene")
+    parser.add_argument("--frames", type=int, default=200,
+                        help="number of measured frames")
+    parser.add_argument("--warmup-frames", type=int, default=20,
+                        help="number of frames rendered before measuring")
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=800)
+    parser.add_argument("--profile", action="store_true",
+                        help="report the time spent per item class")
+    parser.add_argument("--output", default=None,
+                        help="file where to write the JSON results")
+    parser.add_argument("--compare", default=None,
+                        help="JSON results of a previous run to compare to")
+    parser.add_argument("--case", default=None,
+                        help=argparse.SUPPRESS) # scene:size, run in the current process
+    args = parser.parse_args(argv)
+
+    if args.case is not None:
+        (scene, size) = args.case.split(":")
+        result = run_case(scene, int(size), args.frames, args.warmup_frames,
+                          args.width, args.height, args.profile)
+        print(json.dumps(result))
+        return 0
+
+    previous_results = None
+    if args.compare is not None:
+        with open(args.compare) as f:
+            previous_results = json.load(f)
+
+    import dearcygui as dcg
+    results = {
+        "version": getattr(dcg, "__version__", None),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "frames": args.frames,
+        "resolution": [args.width, args.height],
+        "cases": []
+    }
+    for scene in args.scenes.split(","):
+        if scene not in SCENES:
+            parser.error(f"Unknown scene {scene}")
+        (_, sizes) = SCENES[scene]
+        if args.sizes is not None:
+            sizes = [int(size) for size in args.sizes.split(",")]
+        for size in sizes:
+            print(f"{scene} {size}...", file=sys.stderr)
+            case = run_isolated(scene, size, args)
+            if previous_results is not None and "error" not in case:
+                case["change"] = compare(case, previous_results)
+            results["cases"].append(case)
+
+    output = json.dumps(results, indent=2)
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            f.write(output)
+    print(output)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""
+Parameterized scenes used by the benchmarks.
+
+Each scene is a function taking the context, a parent
+window and a size parameter. It builds the items and
+returns the number of items created (cells for tables).
+"""
+
+import dearcygui as dcg
+import numpy as np
+
+def widgets(C, window, n):
+    """n/2 Button and n/2 Text items in a Window"""
+    for i in range(n // 2):
+        dcg.Button(C, label=f"Button {i}", parent=window)
+        dcg.Text(C, value=f"Text {i}", parent=window)
+    return 2 * (n // 2)
+
+def draw_lines(C, window, n):
+    """n DrawLine in a DrawInWindow"""
+    rng = np.random.default_rng(0)
+    points = rng.uniform(0., 1000., size=(n, 4))
+    drawing = dcg.DrawInWindow(C, width=1000, height=1000, parent=window)
+    for i in range(n):
+        dcg.DrawLine(C,
+                     p1=(points[i, 0], points[i, 1]),
+                     p2=(points[i, 2], points[i, 3]),
+                     color=(255, 255, 255, 255),
+                     parent=drawing)
+    return n + 1
+
+def draw_lines_batch(C, window, n):
+    """n lines in a single DrawLines in a DrawInWindow"""
+    rng = np.random.default_rng(0)
+    points = rng.uniform(0., 1000., size=(n, 4))
+    drawing = dcg.DrawInWindow(C, width=1000, height=1000, parent=window)
+    dcg.DrawLines(C,
+                  p1=points[:, :2],
+                  p2=points[:, 2:],
+                  color=(255, 255, 255, 255),
+                  parent=drawing)
+    return 2
+
+def draw_polygons(C, window, n):
+    """n filled pentagons (DrawPolygon) in a DrawInWindow"""
+    rng = np.random.default_rng(0)
+    centers = rng.uniform(0., 1000., size=(n, 2))
+    angles = np.linspace(0., 2. * np.pi, 5, endpoint=False)
+    shape = 10. * np.stack([np.cos(angles), np.sin(angles)], axis=1)
+    drawing = dcg.DrawInWindow(C, width=1000, height=1000, parent=window)
+    for i in range(n):
+        dcg.DrawPolygon(C,
+                        points=(centers[i] + shape).tolist(),
+                        color=(255, 255, 255, 255),
+                        fill=(0, 128, 255, 128),
+                        parent=drawing)
+    return n + 1
+
+def plot_line(C, window, n):
+    """A PlotLine of n points"""
+    X = np.linspace(0., 100., n)
+    Y = np.sin(X) + np.random.default_rng(0).normal(0., 0.1, n)
+    plot = dcg.Plot(C, width=-1, height=-1, parent=window)
+    dcg.PlotLine(C, X=X, Y=Y, label="data", parent=plot)
+    return 2
+
+def table(C, window, n):
+    """A Table of n rows and 20 columns of text cells"""
+    num_cols = 20
+    t = dcg.Table(C, width=-1, height=-1, parent=window)
+    for row in range(n):
+        t.append_row([f"{row}:{col}" for col in range(num_cols)])
+    return n * num_cols
+
+def table_columnar(C, window, n):
+    """A Table of n rows and 20 columns bound to arrays"""
+    num_cols = 20
+    values = np.random.default_rng(0).uniform(0., 1000., size=(n, num_cols))
+    t = dcg.Table(C, width=-1, height=-1, parent=window)
+    t.columns = values
+    t.formats = ["%.2f"] * num_cols
+    t.row_clipping = True
+    return n * num_cols
+
+def nested_layouts(C, window, n):
+    """n nested HorizontalLayout with two buttons at each level"""
+    parent = window
+    for i in range(n):
+        layout = dcg.HorizontalLayout(C, parent=parent)
+        dcg.Button(C, label=f"{i}", parent=layout)
+        dcg.Button(C, label=f"{i}", parent=layout)
+        parent = layout
+    return 3 * n
+
+# name: (builder, default sizes)
+SCENES = {
+    "widgets": (widgets, [100, 1000, 10000]),
+    "draw_lines": (draw_lines, [1000, 10000, 100000]),
+    "draw_lines_batch": (draw_lines_batch, [1000, 10000, 100000, 1000000]),
+    "draw_polygons": (draw_polygons, [1000, 10000, 100000]),
+    "plot_line": (plot_line, [1000, 100000, 1000000, 10000000]),
+    "table": (table, [1000, 10000]),
+    "table_columnar": (table_columnar, [1000, 100000, 1000000]),
+    "nested_layouts": (nested_layouts, [10, 50, 200]),
+}
@@ -56,10 +56,10 @@ public:
     virtual void freeTexture(void* texture) = 0;
     virtual bool updateDynamicTexture(void* texture, unsigned width, unsigned height,
                                    unsigned num_chans, unsigned type, void* data, 
-                                   unsigned src_stride) = 0;
+                                   unsigned src_stride, unsigned x = 0, unsigned y = 0) = 0;
     virtual bool updateStaticTexture(void* texture, unsigned width, unsigned height,
                                    unsigned num_chans, unsigned type, void* data, 
-                                   unsigned src_stride) = 0;
+                                   unsigned src_stride, unsigned x = 0, unsigned y = 0) = 0;
     virtual bool downloadTexture(void* texture,
                          int x,
                          int y,
@@ -73,6 +73,33 @@ public:
     virtual bool backBufferToTexture(void* texture, unsigned width, unsigned height,
                                      unsigned num_chans, unsigned type) = 0;
 
+    // Asynchronous uploads through staging buffers
+    // that stay mapped in CPU memory.
+    // All these calls need the upload context current.
+    virtual void* allocateUploadBuffer(size_t size) = 0;
+    virtual void freeUploadBuffer(void* buffer) = 0;
+    // Waits the GPU is done reading the previous upload
+    // of the buffer, and returns the CPU pointer to write to.
+    virtual void* mapUploadBuffer(void* buffer) = 0;
+    // Whether the GPU is done reading the previous upload
+    virtual bool isUploadBufferReady(void* buffer) = 0;
+    // Queue the copy of the buffer content into the (x, y, width, height)
+    // region of the texture. Does not wait for the copy to complete.
+    virtual bool uploadBufferToTexture(void* buffer, void* texture,
+                                       unsigned x, unsigned y,
+                                       unsigned width, unsigned height,
+                                       unsigned num_chans, unsigned type,
+                                       unsigned src_stride) = 0;
+
+    // Asynchronous readbacks of the back buffer.
+    // The buffers are freed, waited and checked with
+    // freeUploadBuffer, mapUploadBuffer and isUploadBufferReady.
+    virtual void* allocateReadbackBuffer(size_t size) = 0;
+    // Queue the copy of the back buffer (RGBA, uint8, bottom row first)
+    // into the buffer. Does not wait for the copy to complete.
+    virtual bool backBufferToReadbackBuffer(void* buffer, unsigned width,
+                                            unsigned height) = 0;
+
 	// Window state
     float dpiScale = 1.;
     bool isFullScreen = false;
@@ -93,6 +120,15 @@ public:
     bool hasModesChanged = false;
     bool hasVSync = true;
     bool shouldSkipPresenting = false;
+    // Render into an offscreen framebuffer instead of the window.
+    // Must be set before initialize(). No vsync, the window
+    // is never shown and imgui time advances by headlessDeltaTime
+    // every frame.
+    bool isHeadless = false;
+    float headlessDeltaTime = 1.f / 60.f;
+    // False when no display is available. Only
+    // headless viewports can then be initialized.
+    bool hasDisplay = true;
     std::atomic<bool> activityDetected{true};
     std::atomic<bool> needsRefresh{true};
 
@@ -208,35 +244,41 @@ public:
      * Update a dynamic texture with new content.
      * The upload context must be current before calling this function.
      * Uses PBO for efficient updates. PBO is created on first use.
+     * Only the width x height region starting at (x, y) is uploaded,
+     * thus the cost of partial updates scales with the updated area.
      * @param texture void* Cast of GLuint texture ID
-     * @param width Must match texture width
-     * @param height Must match texture height
+     * @param width Width of the updated region (x + width <= texture width)
+     * @param height Height of the updated region (y + height <= texture height)
      * @param num_chans Must match texture channels
      * @param type Must match texture type
      * @param data Pointer to new pixel data
      * @param src_stride Bytes per row in source data
+     * @param x Horizontal offset of the updated region
+     * @param y Vertical offset of the updated region
      * @return bool Success or failure
      */
     virtual bool updateDynamicTexture(void* texture, unsigned width, unsigned height,
                                       unsigned num_chans, unsigned type, void* data, 
-                                      unsigned src_stride) override;
+                                      unsigned src_stride, unsigned x = 0, unsigned y = 0) override;
 
     /**
      * Update a static texture with new content.
      * The upload context must be current before calling this function.
      * Uses PBO for efficient uploads.
      * @param texture void* Cast of GLuint texture ID 
-     * @param width Must match texture width
-     * @param height Must match texture height
+     * @param width Width of the updated region (x + width <= texture width)
+     * @param height Height of the updated region (y + height <= texture height)
      * @param num_chans Must match texture channels
      * @param type Must match texture type
      * @param data Pointer to new pixel data
      * @param src_stride Bytes per row in source data
+     * @param x Horizontal offset of the updated region
+     * @param y Vertical offset of the updated region
      * @return bool Success or failure
      */
     virtual bool updateStaticTexture(void* texture, unsigned width, unsigned height,
                                      unsigned num_chans, unsigned type, void* data, 
-                                     unsigned src_stride) override;
+                                     unsigned src_stride, unsigned x = 0, unsigned y = 0) override;
 
     static SDLViewport* create(render_fun render,
                                on_resize_fun on_resize,
@@ -260,6 +302,84 @@ public:
     virtual bool backBufferToTexture(void* texture, unsigned width, unsigned height,
                                      unsigned num_chans, unsigned type) override;
 
+    /**
+     * Allocate a staging buffer for asynchronous uploads.
+     * The buffer is a persistently mapped PBO when supported,
+     * else host memory that is copied during the upload.
+     * The upload context must be current before calling this function.
+     * @param size Size in bytes
+     * @return void* Opaque buffer handle, or nullptr on failure
+     */
+    virtual void* allocateUploadBuffer(size_t size) override;
+
+    /**
+     * Free a staging buffer.
+     * The upload context must be current before calling this function.
+     */
+    virtual void freeUploadBuffer(void* buffer) override;
+
+    /**
+     * Wait for the GPU to have consumed the previous upload
+     * from the buffer, and return the CPU pointer to its memory.
+     * The pointer remains valid until the buffer is freed.
+     * The upload context must be current before calling this function.
+     */
+    virtual void* mapUploadBuffer(void* buffer) override;
+
+    /**
+     * Check, without waiting, whether the GPU has consumed
+     * the previous upload from the buffer.
+     * The upload context must be current before calling this function.
+     */
+    virtual bool isUploadBufferReady(void* buffer) override;
+
+    /**
+     * Copy the content of a staging buffer into a region of a texture.
+     * The copy is executed asynchronously by the GPU, and the buffer
+     * must not be written to before isUploadBufferReady returns true
+     * (mapUploadBuffer waits for it).
+     * The upload context must be current before calling this function.
+     * @param buffer Staging buffer handle
+     * @param texture void* Cast of GLuint texture ID
+     * @param x, y Offset of the region in the texture
+     * @param width, height Size of the region
+     * @param num_chans Must match texture channels
+     * @param type Must match texture type
+     * @param src_stride Bytes per row in the staging buffer
+     * @return bool Success or failure
+     */
+    virtual bool uploadBufferToTexture(void* buffer, void* texture,
+                                       unsigned x, unsigned y,
+                                       unsigned width, unsigned height,
+                                       unsigned num_chans, unsigned type,
+                                       unsigned src_stride) override;
+
+    /**
+     * Allocate a buffer for asynchronous readbacks of the back buffer.
+     * The buffer is a persistently mapped PBO when supported,
+     * else host memory (the readback is then synchronous).
+     * Use freeUploadBuffer to free it.
+     * The upload context must be current before calling this function.
+     * @param size Size in bytes
+     * @return void* Opaque buffer handle, or nullptr on failure
+     */
+    virtual void* allocateReadbackBuffer(size_t size) override;
+
+    /**
+     * Queue the copy of the content of the back buffer (or of the
+     * headless framebuffer) into a readback buffer, as RGBA uint8
+     * with the bottom row first.
+     * The content is available once isUploadBufferReady returns true
+     * (mapUploadBuffer waits for it).
+     * Must be called after renderFrame and before present.
+     * @param buffer Readback buffer handle
+     * @param width, height Size of the region to read. The buffer
+     *        must hold width * height * 4 bytes.
+     * @return bool Success or failure
+     */
+    virtual bool backBufferToReadbackBuffer(void* buffer, unsigned width,
+                                            unsigned height) override;
+
     void *getSDLWindowHandle() { return (void*)windowHandle; }
 
 private:
@@ -273,10 +393,28 @@ private:
     bool hasSDL3Init = false;
     bool hasResized = false;
 
+    // Headless rendering target
+    GLuint headlessFramebuffer = 0;
+    GLuint headlessColorTexture = 0;
+    int headlessFramebufferWidth = 0;
+    int headlessFramebufferHeight = 0;
+    bool updateHeadlessFramebuffer();
+    void destroyHeadlessFramebuffer();
+
+    bool initializeRendering(const char* glsl_version);
+
     // GL extension support flags
     bool has_texture_storage = false;
     bool has_buffer_storage = false;
 
+    // Staging buffer for asynchronous uploads
+    struct UploadBuffer {
+        GLuint pbo = 0;
+        void* mapped = nullptr; // Persistent mapping of the pbo, or host memory
+        size_t size = 0;
+        GLsync fence = nullptr; // Signaled when the last upload (or readback) has completed
+    };
+
     // Fence management
     struct FenceSync {
         GLsync sync = nullptr;
@@ -315,7 +453,7 @@ private:
     void preparePresentFrame();
     bool updateTexture(void* texture, unsigned width, unsigned height,
                       unsigned num_chans, unsigned type, void* data, 
-                      unsigned src_stride, bool dynamic);
+                      unsigned src_stride, unsigned x, unsigned y, bool dynamic);
 
     /**
      * Wait for all write operations on a texture to complete.
@@ -354,6 +492,7 @@ private:
     // Thread safety
     static SDL_ThreadID sdlMainThreadId;  // Thread that first initialized SDL
     static std::atomic<bool> sdlInitialized;
+    static std::atomic<bool> sdlOffscreenFallback; // No display was available
     static std::mutex sdlInitMutex;
     
     // Event queue for forwarding events
@@ -28,14 +28,25 @@ cdef extern from "backend.h" nogil:
         # Texture methods
         void* allocateTexture(unsigned, unsigned, unsigned, unsigned, unsigned, unsigned)
         void freeTexture(void*)
-        bint updateDynamicTexture(void*, unsigned, unsigned, unsigned, unsigned, void*, unsigned)
-        bint updateStaticTexture(void*, unsigned, unsigned, unsigned, unsigned, void*, unsigned)
+        bint updateDynamicTexture(void*, unsigned, unsigned, unsigned, unsigned, void*, unsigned, unsigned, unsigned)
+        bint updateStaticTexture(void*, unsigned, unsigned, unsigned, unsigned, void*, unsigned, unsigned, unsigned)
 
         bint downloadTexture(void*, int, int,
                              unsigned, unsigned, unsigned, unsigned,
                              void*, unsigned)
         bint backBufferToTexture(void*, unsigned, unsigned, unsigned, unsigned)
 
+        # Asynchronous uploads
+        void* allocateUploadBuffer(size_t)
+        void freeUploadBuffer(void*)
+        void* mapUploadBuffer(void*)
+        bint isUploadBufferReady(void*)
+        bint uploadBufferToTexture(void*, void*, unsigned, unsigned,
+                                   unsigned, unsigned, unsigned, unsigned,
+                                   unsigned)
+        void* allocateReadbackBuffer(size_t)
+        bint backBufferToReadbackBuffer(void*, unsigned, unsigned)
+
         # Texture sync methods
         void beginExternalWrite(unsigned int)
         void endExternalWrite(unsigned int) 
@@ -60,6 +71,9 @@ cdef extern from "backend.h" nogil:
         float[4] clearColor
         bint hasVSync
         bint shouldSkipPresenting
+        bint isHeadless
+        float headlessDeltaTime
+        bint hasDisplay
         atomic[bint] activityDetected
         atomic[bint] needsRefresh
 
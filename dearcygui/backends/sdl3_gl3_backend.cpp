@@ -14,11 +14,13 @@
 #include "imgui_impl_opengl3.h"
 #include <stdio.h>
 
+#include <algorithm>
 #include <functional>
 #include <mutex>
 
 SDL_ThreadID SDLViewport::sdlMainThreadId = 0;
 std::atomic<bool> SDLViewport::sdlInitialized{false};
+std::atomic<bool> SDLViewport::sdlOffscreenFallback{false};
 std::mutex SDLViewport::sdlInitMutex;
 
 bool platformViewport::fastActivityCheck() {
@@ -50,25 +52,37 @@ bool platformViewport::fastActivityCheck() {
 
 // Move prepare_present implementation into class method
 void SDLViewport::preparePresentFrame() {
-    SDL_GetWindowPosition(windowHandle, &positionX, &positionY);
+    if (!isHeadless)
+        SDL_GetWindowPosition(windowHandle, &positionX, &positionY);
 
     // Rendering
     ImGui::Render();
     renderContextLock.lock();
     SDL_GL_MakeCurrent(windowHandle, glContext);
     if (hasResized) {
-        SDL_GetWindowSizeInPixels(windowHandle, &frameWidth, &frameHeight);
-        SDL_GetWindowSize(windowHandle, &windowWidth, &windowHeight);
+        if (isHeadless) {
+            // The requested size is used directly
+            updateHeadlessFramebuffer();
+            windowWidth = frameWidth;
+            windowHeight = frameHeight;
+        } else {
+            SDL_GetWindowSizeInPixels(windowHandle, &frameWidth, &frameHeight);
+            SDL_GetWindowSize(windowHandle, &windowWidth, &windowHeight);
+        }
         hasResized = false;
         resizeCallback(callbackData);
     }
 
-    int current_interval, desired_interval;
-    SDL_GL_GetSwapInterval(&current_interval);
-    desired_interval = hasVSync ? 1 : 0;
-    if (desired_interval != current_interval)
-        SDL_GL_SetSwapInterval(desired_interval);
-    glDrawBuffer(GL_BACK);
+    if (isHeadless) {
+        glBindFramebuffer(GL_FRAMEBUFFER, headlessFramebuffer);
+    } else {
+        int current_interval, desired_interval;
+        SDL_GL_GetSwapInterval(&current_interval);
+        desired_interval = hasVSync ? 1 : 0;
+        if (desired_interval != current_interval)
+            SDL_GL_SetSwapInterval(desired_interval);
+        glDrawBuffer(GL_BACK);
+    }
     glViewport(0, 0, frameWidth, frameHeight);
     glClearColor(clearColor[0], clearColor[1], clearColor[2], clearColor[3]);
     glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT);
@@ -78,12 +92,55 @@ void SDLViewport::preparePresentFrame() {
         std::lock_guard<std::recursive_mutex> lock(textureMutex);
         ImGui_ImplOpenGL3_RenderDrawData(this, ImGui::GetDrawData());
     }
+    if (isHeadless)
+        glBindFramebuffer(GL_FRAMEBUFFER, 0);
     currentFrame++; // should it be mutex protected ?
     cleanupTextures();
     SDL_GL_MakeCurrent(windowHandle, NULL);
     renderContextLock.unlock();
 }
 
+// Must be called with the rendering context current
+bool SDLViewport::updateHeadlessFramebuffer() {
+    if (headlessFramebuffer != 0 &&
+        headlessFramebufferWidth == frameWidth &&
+        headlessFramebufferHeight == frameHeight)
+        return true;
+    destroyHeadlessFramebuffer();
+    glGenTextures(1, &headlessColorTexture);
+    glBindTexture(GL_TEXTURE_2D, headlessColorTexture);
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST);
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_NEAREST);
+    glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA8, frameWidth, frameHeight,
+                 0, GL_RGBA, GL_UNSIGNED_BYTE, nullptr);
+    glBindTexture(GL_TEXTURE_2D, 0);
+    glGenFramebuffers(1, &headlessFramebuffer);
+    glBindFramebuffer(GL_FRAMEBUFFER, headlessFramebuffer);
+    glFramebufferTexture2D(GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0,
+                           GL_TEXTURE_2D, headlessColorTexture, 0);
+    bool success = glCheckFramebufferStatus(GL_FRAMEBUFFER) == GL_FRAMEBUFFER_COMPLETE;
+    glBindFramebuffer(GL_FRAMEBUFFER, 0);
+    if (!success) {
+        destroyHeadlessFramebuffer();
+        return false;
+    }
+    headlessFramebufferWidth = frameWidth;
+    headlessFramebufferHeight = frameHeight;
+    return true;
+}
+
+// Must be called with the rendering context current
+void SDLViewport::destroyHeadlessFramebuffer() {
+    if (headlessFramebuffer != 0)
+        glDeleteFramebuffers(1, &headlessFramebuffer);
+    if (headlessColorTexture != 0)
+        glDeleteTextures(1, &headlessColorTexture);
+    headlessFramebuffer = 0;
+    headlessColorTexture = 0;
+    headlessFramebufferWidth = 0;
+    headlessFramebufferHeight = 0;
+}
+
 
 GLuint SDLViewport::findTextureInCache(unsigned width, unsigned height, unsigned num_chans,
                                       unsigned type, unsigned filter_mode, bool dynamic) {
@@ -267,7 +324,8 @@ void SDLViewport::freeTexture(void* texture) {
 
 bool SDLViewport::updateTexture(void* texture, unsigned width, unsigned height,
                               unsigned num_chans, unsigned type, void* data,
-                              unsigned src_stride, bool dynamic) {
+                              unsigned src_stride, unsigned x, unsigned y,
+                              bool dynamic) {
     auto texture_id = (GLuint)(size_t)texture;
     TextureInfo info;
     bool valid_texture = false;
@@ -288,7 +346,10 @@ bool SDLViewport::updateTexture(void* texture, unsigned width, unsigned height,
     }
 
     // Validate texture parameters haven't changed
-    if(info.width != width || info.height != height || 
+    // and the region is inside the texture
+    if(width == 0 || height == 0 ||
+       x > info.width || width > info.width - x ||
+       y > info.height || height > info.height - y ||
        info.num_chans != num_chans || info.type != type) {
         return false;
     }
@@ -321,6 +382,8 @@ bool SDLViewport::updateTexture(void* texture, unsigned width, unsigned height,
         type_size = 1;
     }
 
+    // The PBO is sized for the whole texture. Partial updates
+    // use its beginning.
     if(info.pbo == 0) {
         glGenBuffers(1, &pboid);
         if (glGetError() != GL_NO_ERROR)
@@ -332,10 +395,10 @@ bool SDLViewport::updateTexture(void* texture, unsigned width, unsigned height,
 
         if (dynamic && has_buffer_storage) {
             GLbitfield flags = GL_MAP_WRITE_BIT | GL_MAP_PERSISTENT_BIT | GL_MAP_COHERENT_BIT;
-            glBufferStorage(GL_PIXEL_UNPACK_BUFFER, width * height * num_chans * type_size, 
+            glBufferStorage(GL_PIXEL_UNPACK_BUFFER, info.width * info.height * num_chans * type_size, 
                           NULL, flags);
         } else {
-            glBufferData(GL_PIXEL_UNPACK_BUFFER, width * height * num_chans * type_size,
+            glBufferData(GL_PIXEL_UNPACK_BUFFER, info.width * info.height * num_chans * type_size,
                         NULL, dynamic ? GL_STREAM_DRAW : GL_STATIC_DRAW);
         }
     } else {
@@ -377,7 +440,7 @@ bool SDLViewport::updateTexture(void* texture, unsigned width, unsigned height,
         waitTextureWritable(it->second);
 
         glBindTexture(GL_TEXTURE_2D, texture_id);
-        glTexSubImage2D(GL_TEXTURE_2D, 0, 0, 0, width, height, gl_format, gl_type, NULL);
+        glTexSubImage2D(GL_TEXTURE_2D, 0, x, y, width, height, gl_format, gl_type, NULL);
         
         markTextureWritten(it->second);
 
@@ -403,16 +466,152 @@ bool SDLViewport::updateTexture(void* texture, unsigned width, unsigned height,
     return false;
 }
 
+void* SDLViewport::allocateUploadBuffer(size_t size) {
+    auto buffer = new UploadBuffer();
+    buffer->size = size;
+    if (has_buffer_storage) {
+        GLbitfield flags = GL_MAP_WRITE_BIT | GL_MAP_PERSISTENT_BIT | GL_MAP_COHERENT_BIT;
+        glGenBuffers(1, &buffer->pbo);
+        glBindBuffer(GL_PIXEL_UNPACK_BUFFER, buffer->pbo);
+        glBufferStorage(GL_PIXEL_UNPACK_BUFFER, size, NULL, flags);
+        buffer->mapped = glMapBufferRange(GL_PIXEL_UNPACK_BUFFER, 0, size, flags);
+        glBindBuffer(GL_PIXEL_UNPACK_BUFFER, 0);
+        if (buffer->mapped != nullptr)
+            return (void*)buffer;
+        glDeleteBuffers(1, &buffer->pbo);
+        buffer->pbo = 0;
+    }
+    // Fallback: host memory, copied by the driver during the upload
+    buffer->mapped = malloc(size);
+    if (buffer->mapped == nullptr) {
+        delete buffer;
+        return nullptr;
+    }
+    return (void*)buffer;
+}
+
+void SDLViewport::freeUploadBuffer(void* upload_buffer) {
+    auto buffer = (UploadBuffer*)upload_buffer;
+    if (buffer == nullptr)
+        return;
+    if (buffer->fence != nullptr)
+        glDeleteSync(buffer->fence);
+    if (buffer->pbo != 0) {
+        glBindBuffer(GL_PIXEL_UNPACK_BUFFER, buffer->pbo);
+        glUnmapBuffer(GL_PIXEL_UNPACK_BUFFER);
+        glBindBuffer(GL_PIXEL_UNPACK_BUFFER, 0);
+        glDeleteBuffers(1, &buffer->pbo);
+    } else {
+        free(buffer->mapped);
+    }
+    delete buffer;
+}
+
+void* SDLViewport::mapUploadBuffer(void* upload_buffer) {
+    auto buffer = (UploadBuffer*)upload_buffer;
+    if (buffer->fence != nullptr) {
+        // Wait the GPU has finished reading the previous upload
+        while (glClientWaitSync(buffer->fence, GL_SYNC_FLUSH_COMMANDS_BIT,
+                                1000000000) == GL_TIMEOUT_EXPIRED) {}
+        glDeleteSync(buffer->fence);
+        buffer->fence = nullptr;
+    }
+    return buffer->mapped;
+}
+
+bool SDLViewport::isUploadBufferReady(void* upload_buffer) {
+    auto buffer = (UploadBuffer*)upload_buffer;
+    if (buffer->fence == nullptr)
+        return true;
+    GLenum status = glClientWaitSync(buffer->fence, GL_SYNC_FLUSH_COMMANDS_BIT, 0);
+    if (status != GL_ALREADY_SIGNALED && status != GL_CONDITION_SATISFIED)
+        return false;
+    glDeleteSync(buffer->fence);
+    buffer->fence = nullptr;
+    return true;
+}
+
+bool SDLViewport::uploadBufferToTexture(void* upload_buffer, void* texture,
+                                        unsigned x, unsigned y,
+                                        unsigned width, unsigned height,
+                                        unsigned num_chans, unsigned type,
+                                        unsigned src_stride) {
+    auto buffer = (UploadBuffer*)upload_buffer;
+    auto texture_id = (GLuint)(size_t)texture;
+    unsigned type_size = (type == 1) ? 1 : 4;
+    unsigned pixel_size = num_chans * type_size;
+
+    if (buffer == nullptr || src_stride % pixel_size != 0 ||
+        src_stride < width * pixel_size ||
+        (size_t)src_stride * height > buffer->size)
+        return false;
+
+    unsigned gl_format = GL_RGBA;
+    switch (num_chans)
+    {
+    case 4:
+        gl_format = GL_RGBA;
+        break;
+    case 3:
+        gl_format = GL_RGB;
+        break;
+    case 2:
+        gl_format = GL_RG;
+        break;
+    case 1:
+    default:
+        gl_format = GL_RED;
+        break;
+    }
+    unsigned gl_type = (type == 1) ? GL_UNSIGNED_BYTE : GL_FLOAT;
+
+    std::lock_guard<std::recursive_mutex> lock(textureMutex);
+    auto it = textureInfoMap.find(texture_id);
+    if (it == textureInfoMap.end() || it->second.deletion_frame >= 0)
+        return false;
+    TextureInfo& info = it->second;
+    if (info.num_chans != num_chans || info.type != type ||
+        x + width > info.width || y + height > info.height)
+        return false;
+
+    // The source is either the pbo, or host memory
+    glBindBuffer(GL_PIXEL_UNPACK_BUFFER, buffer->pbo);
+    const void* source = (buffer->pbo != 0) ? nullptr : buffer->mapped;
+    glPixelStorei(GL_UNPACK_ROW_LENGTH, src_stride / pixel_size);
+
+    waitTextureWritable(info);
+    glBindTexture(GL_TEXTURE_2D, texture_id);
+    glTexSubImage2D(GL_TEXTURE_2D, 0, x, y, width, height, gl_format, gl_type, source);
+    markTextureWritten(info);
+
+    if (buffer->pbo != 0) {
+        if (buffer->fence != nullptr)
+            glDeleteSync(buffer->fence);
+        buffer->fence = glFenceSync(GL_SYNC_GPU_COMMANDS_COMPLETE, 0);
+    }
+
+    // Check if texture is on screen right now
+    if (info.last_use_frame >= currentFrame-1)
+        needsRefresh.store(true);
+
+    glPixelStorei(GL_UNPACK_ROW_LENGTH, 0);
+    glBindBuffer(GL_PIXEL_UNPACK_BUFFER, 0);
+    glBindTexture(GL_TEXTURE_2D, 0);
+    bool success = glGetError() == GL_NO_ERROR;
+    glFlush();
+    return success;
+}
+
 bool SDLViewport::updateDynamicTexture(void* texture, unsigned width, unsigned height,
                                     unsigned num_chans, unsigned type, void* data,
-                                    unsigned src_stride) {
-    return updateTexture(texture, width, height, num_chans, type, data, src_stride, true);
+                                    unsigned src_stride, unsigned x, unsigned y) {
+    return updateTexture(texture, width, height, num_chans, type, data, src_stride, x, y, true);
 }
 
 bool SDLViewport::updateStaticTexture(void* texture, unsigned width, unsigned height,
                                    unsigned num_chans, unsigned type, void* data,
-                                   unsigned src_stride) {
-    return updateTexture(texture, width, height, num_chans, type, data, src_stride, false);
+                                   unsigned src_stride, unsigned x, unsigned y) {
+    return updateTexture(texture, width, height, num_chans, type, data, src_stride, x, y, false);
 }
 
 SDLViewport* SDLViewport::create(render_fun render,
@@ -425,12 +624,20 @@ SDLViewport* SDLViewport::create(render_fun render,
     // Initialize SDL in the first thread that creates a viewport
     if (!sdlInitialized) {
 #ifdef _WIN32
-        if (!SDL_Init(SDL_INIT_VIDEO)) {
+        SDL_InitFlags init_flags = SDL_INIT_VIDEO;
 #else
-        if (!SDL_Init(SDL_INIT_VIDEO | SDL_INIT_GAMEPAD)) {
+        SDL_InitFlags init_flags = SDL_INIT_VIDEO | SDL_INIT_GAMEPAD;
 #endif
-            printf("Error: SDL_Init(): %s\n", SDL_GetError());
-            return nullptr;
+        if (!SDL_Init(init_flags)) {
+            // No display available (build boxes, CI).
+            // Fallback to the offscreen driver, which
+            // is only usable for headless rendering.
+            SDL_SetHint(SDL_HINT_VIDEO_DRIVER, "offscreen");
+            if (!SDL_Init(init_flags)) {
+                printf("Error: SDL_Init(): %s\n", SDL_GetError());
+                return nullptr;
+            }
+            sdlOffscreenFallback = true;
         }
         sdlMainThreadId = SDL_GetCurrentThreadID();
         sdlInitialized = true;
@@ -440,6 +647,7 @@ SDLViewport* SDLViewport::create(render_fun render,
     }
     
     auto viewport = new SDLViewport();
+    viewport->hasDisplay = !sdlOffscreenFallback;
     viewport->renderCallback = render;
     viewport->resizeCallback = on_resize;
     viewport->closeCallback = on_close;
@@ -508,6 +716,7 @@ void SDLViewport::cleanup() {
     }
     textureInfoMap.clear();
     deletedTexturesMemory = 0;
+    destroyHeadlessFramebuffer();
 
     SDL_GL_MakeCurrent(windowHandle, nullptr);
     // Only cleanup if initialization was successful
@@ -557,6 +766,11 @@ void SDLViewport::cleanup() {
 
 bool SDLViewport::initialize() {
     if (!checkPrimaryThread()) return false;
+    if (!hasDisplay && !isHeadless) {
+        // The offscreen driver would give an invisible window
+        fprintf(stderr, "Error: No display available, only headless viewports can be initialized\n");
+        return false;
+    }
     const char* glsl_version = "#version 150";
 
     SDL_WindowFlags creation_flags = 0;
@@ -605,6 +819,16 @@ bool SDLViewport::initialize() {
     SDL_GL_MakeCurrent(windowHandle, NULL);
     SDL_GL_MakeCurrent(uploadWindowHandle, NULL);
     uploadContextLock.unlock();
+    if (isHeadless) {
+        // Deterministic output: no dependency on
+        // the display scale, the window is never shown,
+        // and rendering targets our own framebuffer.
+        dpiScale = 1.f;
+        hasVSync = false;
+        windowWidth = frameWidth;
+        windowHeight = frameHeight;
+        return initializeRendering(glsl_version);
+    }
     //glfwSetWindowPos(sdlViewport->handle, viewport.xpos, viewport.ypos); // SDL_SetWindowPosition
     dpiScale = SDL_GetWindowDisplayScale(windowHandle);
     float logical_to_pixel_factor = SDL_GetWindowPixelDensity(windowHandle);
@@ -662,6 +886,10 @@ bool SDLViewport::initialize() {
         glfwSetWindowIcon(sdlViewport->handle, images.size(), images.data());
     */
 
+    return initializeRendering(glsl_version);
+}
+
+bool SDLViewport::initializeRendering(const char* glsl_version) {
     // A single thread can use a context at a time
     renderContextLock.lock();
 
@@ -685,6 +913,18 @@ bool SDLViewport::initialize() {
         return false;
     }
 
+    if (isHeadless && !updateHeadlessFramebuffer()) {
+        ImGui_ImplOpenGL3_Shutdown();
+        hasOpenGL3Init = false;
+        ImGui_ImplSDL3_Shutdown();
+        hasSDL3Init = false;
+        SDL_GL_MakeCurrent(windowHandle, NULL);
+        renderContextLock.unlock();
+        SDL_GL_DestroyContext(glContext);
+        SDL_DestroyWindow(windowHandle);
+        return false;
+    }
+
     SDL_GL_MakeCurrent(windowHandle, NULL);
     renderContextLock.unlock();
 
@@ -693,7 +933,29 @@ bool SDLViewport::initialize() {
 
 void SDLViewport::processEvents(int timeout_ms) {
     if (!checkPrimaryThread()) return;
-    
+
+    if (isHeadless) {
+        // No window to update, and no wait
+        // in order to have a deterministic pacing.
+        if (sizeChangeRequested) {
+            frameWidth = std::clamp<int>(frameWidth, minWidth, maxWidth);
+            frameHeight = std::clamp<int>(frameHeight, minHeight, maxHeight);
+            hasResized = true;
+            needsRefresh.store(true);
+            sizeChangeRequested = false;
+        }
+        positionChangeRequested = false;
+        windowPropertyChangeRequested = false;
+        titleChangeRequested = false;
+        shouldMinimize = false;
+        shouldMaximize = false;
+        shouldRestore = false;
+        shouldShow = false;
+        shouldHide = false;
+        shouldFullscreen = false;
+        timeout_ms = 0;
+    }
+
     if (positionChangeRequested)
     {
         SDL_SetWindowPosition(windowHandle, positionX, positionY);
@@ -912,6 +1174,13 @@ bool SDLViewport::renderFrame(bool can_skip_presenting) {
     
     renderContextLock.unlock();
     ImGui_ImplSDL3_NewFrame();
+    if (isHeadless) {
+        // Fixed frame size and time step
+        ImGuiIO& io = ImGui::GetIO();
+        io.DisplaySize = ImVec2((float)frameWidth, (float)frameHeight);
+        io.DisplayFramebufferScale = ImVec2(1.f, 1.f);
+        io.DeltaTime = headlessDeltaTime;
+    }
     ImGui::NewFrame();
 
     bool does_needs_refresh = needsRefresh.load();
@@ -965,6 +1234,15 @@ bool SDLViewport::renderFrame(bool can_skip_presenting) {
 void SDLViewport::present() {
     renderContextLock.lock();
     SDL_GL_MakeCurrent(windowHandle, glContext);
+    if (isHeadless) {
+        // Nothing to display. Wait for the rendering to
+        // complete, as swapping would, so that frame times
+        // include the GPU work.
+        glFinish();
+        SDL_GL_MakeCurrent(windowHandle, NULL);
+        renderContextLock.unlock();
+        return;
+    }
     SDL_GL_SwapWindow(windowHandle);
     dpiScale = SDL_GetWindowDisplayScale(windowHandle);
     if (dpiScale == 0.f)
@@ -1283,7 +1561,7 @@ bool SDLViewport::backBufferToTexture(void* texture, unsigned width, unsigned he
     if (glCheckFramebufferStatus(GL_DRAW_FRAMEBUFFER) == GL_FRAMEBUFFER_COMPLETE)
     {
         // Default framebuffer is 0, used as READ source
-        glBindFramebuffer(GL_READ_FRAMEBUFFER, 0);
+        glBindFramebuffer(GL_READ_FRAMEBUFFER, isHeadless ? headlessFramebuffer : 0);
         glBlitFramebuffer(0, 0, width, height, 0, 0, width, height,
                           GL_COLOR_BUFFER_BIT, GL_LINEAR);
         success = true;
@@ -1298,6 +1576,67 @@ bool SDLViewport::backBufferToTexture(void* texture, unsigned width, unsigned he
     return success;
 }
 
+void* SDLViewport::allocateReadbackBuffer(size_t size) {
+    auto buffer = new UploadBuffer();
+    buffer->size = size;
+    if (has_buffer_storage) {
+        GLbitfield flags = GL_MAP_READ_BIT | GL_MAP_PERSISTENT_BIT | GL_MAP_COHERENT_BIT;
+        glGenBuffers(1, &buffer->pbo);
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, buffer->pbo);
+        glBufferStorage(GL_PIXEL_PACK_BUFFER, size, NULL, flags);
+        buffer->mapped = glMapBufferRange(GL_PIXEL_PACK_BUFFER, 0, size, flags);
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0);
+        if (buffer->mapped != nullptr)
+            return (void*)buffer;
+        glDeleteBuffers(1, &buffer->pbo);
+        buffer->pbo = 0;
+    }
+    // Fallback: host memory, filled synchronously
+    buffer->mapped = malloc(size);
+    if (buffer->mapped == nullptr) {
+        delete buffer;
+        return nullptr;
+    }
+    return (void*)buffer;
+}
+
+bool SDLViewport::backBufferToReadbackBuffer(void* readback_buffer,
+                                             unsigned width, unsigned height) {
+    auto buffer = (UploadBuffer*)readback_buffer;
+    if (buffer == nullptr || (size_t)width * height * 4 > buffer->size)
+        return false;
+
+    renderContextLock.lock();
+    SDL_GL_MakeCurrent(windowHandle, glContext);
+
+    // Wait a previous readback in the buffer has completed
+    if (buffer->fence != nullptr) {
+        while (glClientWaitSync(buffer->fence, GL_SYNC_FLUSH_COMMANDS_BIT,
+                                1000000000) == GL_TIMEOUT_EXPIRED) {}
+        glDeleteSync(buffer->fence);
+        buffer->fence = nullptr;
+    }
+
+    glBindFramebuffer(GL_READ_FRAMEBUFFER, isHeadless ? headlessFramebuffer : 0);
+    glPixelStorei(GL_PACK_ALIGNMENT, 1);
+    if (buffer->pbo != 0) {
+        // The GPU writes into the PBO asynchronously
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, buffer->pbo);
+        glReadPixels(0, 0, width, height, GL_RGBA, GL_UNSIGNED_BYTE, NULL);
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0);
+        buffer->fence = glFenceSync(GL_SYNC_GPU_COMMANDS_COMPLETE, 0);
+    } else {
+        glReadPixels(0, 0, width, height, GL_RGBA, GL_UNSIGNED_BYTE, buffer->mapped);
+    }
+    glBindFramebuffer(GL_READ_FRAMEBUFFER, 0);
+    bool success = glGetError() == GL_NO_ERROR;
+    glFlush();
+
+    SDL_GL_MakeCurrent(windowHandle, NULL);
+    renderContextLock.unlock();
+    return success;
+}
+
 bool SDLViewport::downloadTexture(void* texture,
                                   int x,
                                   int y,
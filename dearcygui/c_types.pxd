@@ -399,6 +399,7 @@ cdef extern from * nogil:
         size_t capacity()
         void clear()
         void reserve(size_t) except +
+        void resize(size_t) except +
         T* data()
         T& back()
         T& front()
@@ -1,7 +1,8 @@
 from libcpp cimport bool
 from libcpp.atomic cimport atomic
+from libcpp.unordered_map cimport unordered_map
 from cpython.ref cimport PyObject, Py_INCREF, Py_DECREF
-from libc.stdint cimport uint32_t, int32_t, int64_t
+from libc.stdint cimport uint32_t, int32_t, int64_t, uintptr_t
 cimport numpy as cnp
 from .c_types cimport *
 from .types cimport *
@@ -70,6 +71,31 @@ cdef inline void append_obj_vector(DCGVector[PyObject *] &items, item_list):
         Py_INCREF(item)
         items.push_back(<PyObject*>item)
 
+# Compact record of a callback queued during a frame
+# when the context batches callbacks.
+cdef struct callback_event:
+    PyObject *callback # Callback
+    PyObject *parent # baseItem
+    PyObject *target # baseItem
+    PyObject *obj_arg # baseItem, or converted python value
+    int32_t kind # callback_event_kind
+    int32_t[4] int_args
+    double[6] double_args
+    int64_t[3] long_args
+    int64_t enqueue_ns # 0 if the callback is not profiled
+    int32_t queue_depth
+    int32_t coalesced # number of events merged into this one
+
+# Timings of a profiled callback
+cdef struct callback_timing:
+    PyObject *callback # Callback
+    PyObject *source_type # type of the source item
+    int64_t enqueue_ns
+    int64_t start_ns
+    int64_t end_ns
+    int32_t queue_depth # callbacks waiting, including this one, when queued
+    int32_t coalesced
+
 cdef class Context:
     ### Read-only public variables ###
     cdef DCGMutex mutex
@@ -92,6 +118,24 @@ cdef class Context:
     ### private variables ###
     cdef object _threadlocal_data
     cdef bint _started
+    cdef bint _batch_callbacks
+    cdef bint _coalesce_callbacks
+    cdef bint _batching # True while a frame is collecting events
+    cdef int32_t _batch_generation
+    cdef DCGMutex _batch_mutex
+    cdef DCGVector[callback_event] _pending_events
+    cdef unordered_map[uintptr_t, int32_t] _batch_pins # pinned PyObject* -> last generation used
+    cdef object _last_batch
+    cdef bint _profile_callbacks
+    cdef atomic[int32_t] _callback_backlog # profiled callbacks queued and not finished
+    cdef int32_t _max_callback_backlog
+    cdef DCGMutex _timings_mutex
+    cdef DCGVector[callback_timing] _timings # ring buffer
+    cdef int32_t _timings_next
+    cdef int64_t _timings_overwritten
+    # Incremented when a theme element or the children
+    # of a theme list change. Used to recompile themes.
+    cdef atomic[int64_t] _theme_generation
     ### public methods ###
     cdef void queue_callback_noarg(self, Callback, baseItem, baseItem) noexcept nogil
     cdef void queue_callback_arg1obj(self, Callback, baseItem, baseItem, baseItem) noexcept nogil
@@ -112,6 +156,8 @@ cdef class Context:
     cpdef void pop_next_parent(self)
     cpdef object fetch_parent_queue_back(self)
     cpdef object fetch_parent_queue_front(self)
+    cdef void start_callback_batch(self) noexcept nogil
+    cdef void flush_callback_batch(self)
     # Helpers to write custom handlers without locking the gil
     # No validation is performed on the arguments.
     # button, key and key_chord are imgui values that should
@@ -130,6 +176,14 @@ cdef class Context:
     cdef int32_t c_get_keymod_mask(self) noexcept nogil
     cdef bint c_is_key_pressed(self, int32_t key, bint repeat) noexcept nogil
     cdef bint c_is_key_released(self, int32_t key) noexcept nogil
+    ### private methods ###
+    cdef void _pin_for_batch(self, PyObject *) noexcept nogil
+    cdef bint _append_event(self, callback_event &) noexcept nogil
+    cdef void _release_batch_pins(self, bint)
+    cdef void _submit_callback(self, Callback, baseItem, baseItem, object)
+    cdef int32_t _enter_callback_backlog(self) noexcept nogil
+    cdef void _leave_callback_backlog(self) noexcept nogil
+    cdef void _record_callback_timing(self, object, object, int64_t, int64_t, int64_t, int32_t, int32_t)
 
 """
 Main item types
@@ -184,6 +238,10 @@ cdef class baseItem:
     cdef int32_t _external_lock
     cdef object __weakref__
     cdef object _user_data
+    # Culling of the drawing children. Only used
+    # by the items exposing culling and culling_margin
+    cdef bint _culling_children
+    cdef float _culling_margin
     ### public methods ###
     cdef void lock_parent_and_item_mutex(self, unique_lock[DCGMutex]&, unique_lock[DCGMutex]&)
     cdef void lock_and_previous_siblings(self) noexcept nogil
@@ -253,6 +311,23 @@ cdef struct itemState:
 
 cdef void update_current_mouse_states(itemState&) noexcept nogil
 
+cdef struct draw_record:
+    int64_t uuid
+    int64_t parent # sequence number of the parent record. -1 if None
+    int64_t start_ns
+    int64_t end_ns
+    int32_t type_index # index in Viewport._draw_profile_types
+
+cdef struct capture_slot:
+    void* buffer # readback buffer
+    size_t size
+    int32_t width
+    int32_t height
+    int32_t state # 0: free, 1: readback pending, 2: held by the arrays of a CapturedFrame
+    int64_t frame
+    int64_t timestamp_ns
+    int64_t id # unique per buffer allocation
+
 
 cdef class Viewport(baseItem):
     ### Public read-only variables
@@ -309,8 +384,25 @@ cdef class Viewport(baseItem):
     cdef ThemeCategories _current_theme_activation_condition_category
     cdef float _scale
     cdef double _target_refresh_time
+    cdef bint _profile_draws
+    cdef int32_t _profile_draws_frames # Number of frames kept
+    cdef DCGVector[draw_record] _draw_records # ring buffer
+    cdef int64_t _draw_records_next # sequence number of the next record
+    cdef DCGVector[int64_t] _draw_records_stack # sequence numbers of the draws in progress
+    cdef DCGVector[int64_t] _draw_frame_starts # ring buffer of the first record of the frames
+    cdef int64_t _draw_frames_recorded
+    cdef DCGVector[PyObject*] _draw_profile_types # reference held
+    cdef unordered_map[uintptr_t, int32_t] _draw_profile_type_indices
+    cdef DCGMutex _capture_mutex # protects the fields below
+    cdef int32_t _capture_frames # size of the capture ring. 0 if disabled
+    cdef DCGVector[capture_slot] _capture_slots
+    cdef int64_t _capture_next_id
+    cdef int64_t _capture_dropped
+    cdef DCGMutex _end_frame_fonts_mutex # protects the field below
+    cdef DCGVector[PyObject*] _end_frame_fonts # type baseFont. No reference held
     ### public methods ###
     cdef void coordinate_to_screen(self, float *dst_p, double[2] src_p) noexcept nogil
+    cdef void coordinates_to_screen(self, float *dst_p, const double *src_p, int32_t n) noexcept nogil
     cdef void screen_to_coordinate(self, double *dst_p, float[2] src_p) noexcept nogil
     cdef void push_pending_theme_actions(self, ThemeEnablers, ThemeCategories) noexcept nogil
     cdef void push_pending_theme_actions_on_subset(self, int32_t, int32_t) noexcept nogil
@@ -319,6 +411,10 @@ cdef class Viewport(baseItem):
     cdef void force_present(self) noexcept nogil
     cdef Vec2 get_size(self) noexcept nogil
     cdef void *get_platform_window(self) noexcept nogil
+    cdef void profile_draw_begin(self, baseItem) noexcept nogil
+    cdef void profile_draw_end(self) noexcept nogil
+    cdef void register_end_frame_font(self, baseFont)
+    cdef void unregister_end_frame_font(self, baseFont)
     ### private methods ###
     cdef void __check_initialized(self)
     cdef void __check_not_initialized(self)
@@ -326,6 +422,9 @@ cdef class Viewport(baseItem):
     cdef void __on_close(self)
     cdef void __on_drop(self, int32_t, const char*)
     cdef void __render(self) noexcept nogil
+    cdef void __reset_draw_profile(self)
+    cdef void __capture_frame(self) noexcept nogil
+    cdef void __free_capture_slots(self, bint all_slots) noexcept nogil
 
 
 cdef class Callback:
@@ -334,6 +433,25 @@ cdef class Callback:
 
 # Rendering children
 
+cdef inline void draw_child(baseItem child, void* drawlist) noexcept nogil:
+    """
+    Draws a child item, accounting its time in the draw
+    profile when enabled. drawlist (imgui.ImDrawList*)
+    is only used by drawing items.
+    """
+    cdef bint profile = child.context.viewport._profile_draws
+    if profile:
+        child.context.viewport.profile_draw_begin(child)
+    if child.element_child_category == child_type.cat_drawing or \
+       child.element_child_category == child_type.cat_viewport_drawlist:
+        (<drawingItem>child).draw(drawlist)
+    elif child.element_child_category == child_type.cat_plot_element:
+        (<plotElement>child).draw()
+    else:
+        (<uiItem>child).draw()
+    if profile:
+        child.context.viewport.profile_draw_end()
+
 cdef inline void draw_drawing_children(baseItem item,
                                        void* drawlist) noexcept nogil:
     if item.last_drawings_child is None:
@@ -342,9 +460,12 @@ cdef inline void draw_drawing_children(baseItem item,
     while (<baseItem>child).prev_sibling is not None:
         child = <PyObject *>(<baseItem>child).prev_sibling
     while (<baseItem>child) is not None:
-        (<drawingItem>child).draw(drawlist) # drawlist is imgui.ImDrawList*
+        draw_child(<baseItem>child, drawlist)
         child = <PyObject *>(<baseItem>child).next_sibling
 
+cdef void draw_drawing_children_culled(baseItem item,
+                                      void* drawlist) noexcept nogil
+
 cdef inline void draw_menubar_children(baseItem item) noexcept nogil:
     if item.last_menubar_child is None:
         return
@@ -352,7 +473,7 @@ cdef inline void draw_menubar_children(baseItem item) noexcept nogil:
     while (<baseItem>child).prev_sibling is not None:
         child = <PyObject *>(<baseItem>child).prev_sibling
     while (<baseItem>child) is not None:
-        (<uiItem>child).draw()
+        draw_child(<baseItem>child, NULL)
         child = <PyObject *>(<baseItem>child).next_sibling
 
 cdef inline void draw_plot_element_children(baseItem item) noexcept nogil:
@@ -362,7 +483,7 @@ cdef inline void draw_plot_element_children(baseItem item) noexcept nogil:
     while (<baseItem>child).prev_sibling is not None:
         child = <PyObject *>(<baseItem>child).prev_sibling
     while (<baseItem>child) is not None:
-        (<plotElement>child).draw()
+        draw_child(<baseItem>child, NULL)
         child = <PyObject *>(<baseItem>child).next_sibling
 
 cdef inline void draw_tab_children(baseItem item) noexcept nogil:
@@ -372,7 +493,7 @@ cdef inline void draw_tab_children(baseItem item) noexcept nogil:
     while (<baseItem>child).prev_sibling is not None:
         child = <PyObject *>(<baseItem>child).prev_sibling
     while (<baseItem>child) is not None:
-        (<uiItem>child).draw()
+        draw_child(<baseItem>child, NULL)
         child = <PyObject *>(<baseItem>child).next_sibling
 
 cdef inline void draw_viewport_drawlist_children(baseItem item) noexcept nogil:
@@ -382,7 +503,7 @@ cdef inline void draw_viewport_drawlist_children(baseItem item) noexcept nogil:
     while (<baseItem>child).prev_sibling is not None:
         child = <PyObject *>(<baseItem>child).prev_sibling
     while (<baseItem>child) is not None:
-        (<drawingItem>child).draw(NULL)
+        draw_child(<baseItem>child, NULL)
         child = <PyObject *>(<baseItem>child).next_sibling
 
 cdef inline void draw_ui_children(baseItem item) noexcept nogil:
@@ -392,7 +513,7 @@ cdef inline void draw_ui_children(baseItem item) noexcept nogil:
     while (<baseItem>child).prev_sibling is not None:
         child = <PyObject *>(<baseItem>child).prev_sibling
     while (<baseItem>child) is not None:
-        (<uiItem>child).draw()
+        draw_child(<baseItem>child, NULL)
         child = <PyObject *>(<baseItem>child).next_sibling
 
 cdef inline void draw_window_children(baseItem item) noexcept nogil:
@@ -402,7 +523,7 @@ cdef inline void draw_window_children(baseItem item) noexcept nogil:
     while (<baseItem>child).prev_sibling is not None:
         child = <PyObject *>(<baseItem>child).prev_sibling
     while (<baseItem>child) is not None:
-        (<uiItem>child).draw()
+        draw_child(<baseItem>child, NULL)
         child = <PyObject *>(<baseItem>child).next_sibling
 
 
@@ -412,8 +533,20 @@ Drawing Items
 
 cdef class drawingItem(baseItem):
     cdef bint _show
+    # Culling. _bounds: xmin, ymin, xmax, ymax in coordinate space.
+    # Extra extent around them, converted to pixels at draw time:
+    # _bounds_radius: sizes scaled by size_multiplier,
+    # _bounds_padding: sizes in (unscaled) pixels,
+    # _bounds_thickness: half thickness, with the sign convention of thickness
+    cdef bint _bounds_valid
+    cdef bint _has_bounds
+    cdef double[4] _bounds
+    cdef float _bounds_radius
+    cdef float _bounds_padding
+    cdef float _bounds_thickness
     #cdef void _copy(self, object)
     cdef void draw(self, void *) noexcept nogil # imgui.ImDrawList*
+    cdef bint compute_bounds(self) noexcept nogil
     pass
 
 
@@ -696,7 +829,20 @@ cdef class Texture(baseItem):
     cdef int32_t _filtering_mode
     cdef bint _readonly
     cdef bint _no_realloc
+    cdef void* _back_texture # target of asynchronous uploads
+    cdef DCGVector[void*] _upload_buffers # ring of staging buffers
+    cdef DCGVector[int32_t] _upload_buffers_in_use
+    cdef int32_t _next_upload_buffer
+    # Format of the upload resources
+    cdef int32_t _upload_width
+    cdef int32_t _upload_height
+    cdef int32_t _upload_num_chans
+    cdef unsigned _upload_buffer_type
+    cdef float[2] _uv_offset # region of allocated_texture displayed (AtlasTexture)
+    cdef float[2] _uv_scale
     cdef void set_content(self, cnp.ndarray content)
+    cdef void set_regions(self, list regions)
+    cdef void _free_upload_resources(self) noexcept nogil
     cdef void c_gl_begin_read(self) noexcept nogil
     cdef void c_gl_end_read(self) noexcept nogil
     cdef void c_gl_begin_write(self) noexcept nogil
@@ -705,6 +851,7 @@ cdef class Texture(baseItem):
 cdef class baseFont(baseItem):
     cdef void push(self) noexcept nogil
     cdef void pop(self) noexcept nogil
+    cdef void end_frame(self) noexcept nogil
 
 """
 Theme base class:
@@ -720,7 +867,9 @@ In that case the caller handles the pops
 
 cdef class baseTheme(baseItem):
     cdef bint _enabled
+    cdef bint _is_conditional # push depends on the rendering state
     cdef DCGVector[int32_t] _last_push_size
+    cdef void _mark_changed(self) noexcept nogil
     cdef void push(self) noexcept nogil
     cdef void push_to_list(self, DCGVector[theme_action]&) noexcept nogil
     cdef void pop(self) noexcept nogil
@@ -19,9 +19,10 @@ import traceback
 
 cimport cython
 cimport cython.view
-from cython.operator cimport dereference
+from cython.operator cimport dereference, preincrement
 from libc.string cimport memset, memcpy
 from libcpp.string cimport string
+from cpython.object cimport PyObject_GenericSetAttr
 
 # This file is the only one that is linked to the C++ code
 # Thus it is the only one allowed to make calls to it
@@ -222,6 +223,251 @@ cdef void internal_drop_callback(void *object, int type, const char *data) noexc
 cdef void internal_render_callback(void *object) noexcept nogil:
     (<Viewport>object).__render()
 
+cdef enum:
+    # Number of callback timings kept by the context
+    CALLBACK_TIMINGS_SIZE = 8192
+
+cdef enum callback_event_kind:
+    ev_noarg
+    ev_arg1obj
+    ev_arg1key
+    ev_arg1button
+    ev_arg1float
+    ev_arg1value
+    ev_arg1key1float
+    ev_arg1button1float
+    ev_arg2float
+    ev_arg2double
+    ev_arg1button2float
+    ev_arg4int
+    ev_arg3long1int
+    ev_argdoubletriplet
+    ev_arg1int1stringvector
+
+cdef inline void init_callback_event(callback_event &event,
+                                     int32_t kind,
+                                     Callback callback,
+                                     baseItem parent_item,
+                                     baseItem target_item) noexcept nogil:
+    event.callback = <PyObject*>callback
+    event.parent = <PyObject*>parent_item
+    event.target = <PyObject*>target_item
+    event.obj_arg = NULL
+    event.kind = kind
+    event.enqueue_ns = 0
+    event.queue_depth = 0
+    event.coalesced = 0
+
+cdef inline bint can_coalesce_events(callback_event &prev,
+                                     callback_event &event) noexcept nogil:
+    """
+    Whether event can replace prev. Only events whose
+    arguments are absolute values (positions, drag deltas,
+    durations, sizes) are merged, such that keeping the
+    latest one doesn't lose information.
+    """
+    if prev.kind != event.kind or \
+       prev.callback != event.callback or \
+       prev.parent != event.parent or \
+       prev.target != event.target:
+        return False
+    if event.kind == callback_event_kind.ev_arg2float or \
+       event.kind == callback_event_kind.ev_arg2double or \
+       event.kind == callback_event_kind.ev_arg4int:
+        return True
+    if event.kind == callback_event_kind.ev_arg1key1float or \
+       event.kind == callback_event_kind.ev_arg1button1float or \
+       event.kind == callback_event_kind.ev_arg1button2float:
+        # Same key/button
+        return prev.int_args[0] == event.int_args[0]
+    return False
+
+cdef object callback_event_args(callback_event &event):
+    """
+    Build the call_info argument of a recorded callback
+    """
+    cdef int32_t kind = event.kind
+    if kind == callback_event_kind.ev_noarg:
+        return None
+    if kind == callback_event_kind.ev_arg1obj or \
+       kind == callback_event_kind.ev_arg1value or \
+       kind == callback_event_kind.ev_arg1int1stringvector:
+        return <object>event.obj_arg
+    if kind == callback_event_kind.ev_arg1key:
+        return Key(event.int_args[0])
+    if kind == callback_event_kind.ev_arg1button:
+        return <MouseButton>event.int_args[0]
+    if kind == callback_event_kind.ev_arg1float:
+        return event.double_args[0]
+    if kind == callback_event_kind.ev_arg1key1float:
+        return (Key(event.int_args[0]), event.double_args[0])
+    if kind == callback_event_kind.ev_arg1button1float:
+        return (<MouseButton>event.int_args[0], event.double_args[0])
+    if kind == callback_event_kind.ev_arg2float or \
+       kind == callback_event_kind.ev_arg2double:
+        return (event.double_args[0], event.double_args[1])
+    if kind == callback_event_kind.ev_arg1button2float:
+        return (<MouseButton>event.int_args[0], event.double_args[0], event.double_args[1])
+    if kind == callback_event_kind.ev_arg4int:
+        return (event.int_args[0], event.int_args[1], event.int_args[2], event.int_args[3])
+    if kind == callback_event_kind.ev_arg3long1int:
+        return (event.long_args[0], event.long_args[1], event.long_args[2], event.int_args[0])
+    if kind == callback_event_kind.ev_argdoubletriplet:
+        return ((event.double_args[0], event.double_args[1], event.double_args[2]),
+                (event.double_args[3], event.double_args[4], event.double_args[5]))
+    return None
+
+cdef class _CallbackBatch:
+    """
+    Callbacks recorded during one or several frames,
+    run in order as a single job of the context queue.
+
+    The batch holds a reference on all the objects
+    referenced by its events.
+    """
+    cdef Context context
+    cdef DCGMutex mutex
+    cdef bint started
+    cdef DCGVector[callback_event] events
+
+    def __dealloc__(self):
+        self.release_events()
+
+    cdef bint merge(self, DCGVector[callback_event] &events, bint coalesce):
+        """
+        Append events to the batch. Ownership of the converted
+        arguments (obj_arg of ev_arg1value and ev_arg1int1stringvector)
+        is transferred to the batch. Other references are taken.
+
+        Returns False if the batch already started running,
+        in which case nothing is done.
+        """
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        if self.started:
+            return False
+        cdef int32_t i, n
+        for i in range(<int>events.size()):
+            n = <int>self.events.size()
+            if coalesce and n > 0 and can_coalesce_events(self.events[n-1], events[i]):
+                # Same objects, the references are already held
+                events[i].coalesced += self.events[n-1].coalesced + 1
+                if self.events[n-1].enqueue_ns != 0:
+                    self.context._leave_callback_backlog()
+                self.events[n-1] = events[i]
+                continue
+            Py_INCREF(<object>events[i].callback)
+            Py_INCREF(<object>events[i].parent)
+            Py_INCREF(<object>events[i].target)
+            if events[i].kind == callback_event_kind.ev_arg1obj:
+                Py_INCREF(<object>events[i].obj_arg)
+            self.events.push_back(events[i])
+        return True
+
+    cdef void release_events(self):
+        cdef int32_t i
+        for i in range(<int>self.events.size()):
+            if not(self.started) and self.events[i].enqueue_ns != 0:
+                # Never run
+                self.context._leave_callback_backlog()
+            Py_DECREF(<object>self.events[i].callback)
+            Py_DECREF(<object>self.events[i].parent)
+            Py_DECREF(<object>self.events[i].target)
+            if self.events[i].obj_arg != NULL:
+                Py_DECREF(<object>self.events[i].obj_arg)
+        self.events.clear()
+
+    def __call__(self):
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        self.started = True
+        m.unlock()
+        # No merge can occur anymore
+        cdef int32_t i
+        cdef int64_t start_ns
+        for i in range(<int>self.events.size()):
+            start_ns = ctime.monotonic_ns()
+            try:
+                (<object>self.events[i].callback)(<object>self.events[i].parent,
+                                                  <object>self.events[i].target,
+                                                  callback_event_args(self.events[i]))
+            except Exception as e:
+                print(traceback.format_exc())
+            if self.events[i].enqueue_ns != 0:
+                self.context._record_callback_timing(<object>self.events[i].callback,
+                                                     type(<object>self.events[i].parent),
+                                                     self.events[i].enqueue_ns,
+                                                     start_ns,
+                                                     ctime.monotonic_ns(),
+                                                     self.events[i].queue_depth,
+                                                     self.events[i].coalesced)
+                self.context._leave_callback_backlog()
+        self.release_events()
+
+
+cdef class _TimedCallback:
+    """
+    Callback submitted to the context queue when
+    profile_callbacks is set, in order to record
+    its timings.
+    """
+    cdef Context context
+    cdef Callback callback
+    cdef object parent_item
+    cdef object target_item
+    cdef object call_info
+    cdef int64_t enqueue_ns
+    cdef int32_t queue_depth
+    cdef bint done
+
+    def __dealloc__(self):
+        if not(self.done) and self.context is not None:
+            # Never run
+            self.context._leave_callback_backlog()
+
+    def __call__(self):
+        cdef int64_t start_ns = ctime.monotonic_ns()
+        try:
+            self.callback(self.parent_item, self.target_item, self.call_info)
+        finally:
+            self.done = True
+            self.context._record_callback_timing(self.callback,
+                                                 type(self.parent_item),
+                                                 self.enqueue_ns,
+                                                 start_ns,
+                                                 ctime.monotonic_ns(),
+                                                 self.queue_depth,
+                                                 0)
+            self.context._leave_callback_backlog()
+
+
+cdef object summarize_callback_timings(cnp.ndarray indices,
+                                       cnp.ndarray latencies,
+                                       cnp.ndarray durations,
+                                       cnp.ndarray depths,
+                                       cnp.ndarray coalesced):
+    """
+    Statistics of a subset of the recorded callback timings
+    """
+    latencies = latencies[indices]
+    durations = durations[indices]
+    (latency_p50, latency_p90, latency_p99) = np.percentile(latencies, [50., 90., 99.])
+    (duration_p50, duration_p90, duration_p99) = np.percentile(durations, [50., 90., 99.])
+    return {
+        "count": len(indices),
+        "latency_p50": float(latency_p50),
+        "latency_p90": float(latency_p90),
+        "latency_p99": float(latency_p99),
+        "latency_max": float(np.max(latencies)),
+        "duration_p50": float(duration_p50),
+        "duration_p90": float(duration_p90),
+        "duration_p99": float(duration_p99),
+        "duration_max": float(np.max(durations)),
+        "duration_total": float(np.sum(durations)),
+        "max_queue_depth": int(np.max(depths[indices])),
+        "coalesced": int(np.sum(coalesced[indices]))
+    }
+
 # Placeholder global where the last created Context is stored.
 C : Context = None
 
@@ -261,6 +507,14 @@ cdef class Context:
         Signature: func(item)
         Note: May not be called if item is garbage collected without holding context reference.
 
+    batch_callbacks : bool
+        Whether the callbacks issued during a frame are submitted to the queue
+        as a single job at the end of the frame. Defaults to False.
+
+    coalesce_callbacks : bool
+        Whether consecutive motion-like callbacks of the same item and callback
+        are merged into the latest one when batching. Defaults to False.
+
     viewport : Viewport
         Root item from where rendering starts. Read-only attribute.
 
@@ -282,7 +536,9 @@ cdef class Context:
                  queue=None, 
                  item_creation_callback=None,
                  item_unused_configure_args_callback=None,
-                 item_deletion_callback=None):
+                 item_deletion_callback=None,
+                 bint batch_callbacks=False,
+                 bint coalesce_callbacks=False):
         """Initialize the Context.
 
         Parameters
@@ -303,6 +559,12 @@ cdef class Context:
             Function called during item deletion.
             Signature: func(item)
             Note: May not be called if item is garbage collected without context reference.
+
+        batch_callbacks : bool, optional
+            Submit the callbacks of a frame as a single job. See the batch_callbacks attribute.
+
+        coalesce_callbacks : bool, optional
+            Merge consecutive motion-like callbacks. See the coalesce_callbacks attribute.
         
         Raises
         ------
@@ -320,6 +582,8 @@ cdef class Context:
         self._item_creation_callback = item_creation_callback
         self._item_unused_configure_args_callback = item_unused_configure_args_callback
         self._item_deletion_callback = item_deletion_callback
+        self._batch_callbacks = batch_callbacks
+        self._coalesce_callbacks = coalesce_callbacks
         C = self
 
     def __cinit__(self):
@@ -327,6 +591,7 @@ cdef class Context:
         Cython-specific initializer for Context.
         """
         self.next_uuid.store(21)
+        self._theme_generation.store(0)
         self._started = True
         self._threadlocal_data = threading.local()
         self.viewport = Viewport(self)
@@ -340,6 +605,11 @@ cdef class Context:
         Deallocate resources for Context.
         """
         self._started = True
+        cdef int32_t i
+        for i in range(<int>self._timings.size()):
+            Py_DECREF(<object>self._timings[i].callback)
+            Py_DECREF(<object>self._timings[i].source_type)
+        self._timings.clear()
         if self.imnodes_context != NULL:
             imnodes.DestroyContext(<imnodes.ImNodesContext*>self.imnodes_context)
         if self.implot_context != NULL:
@@ -398,6 +668,65 @@ cdef class Context:
             self._queue.shutdown(wait=True)
         self._queue = queue
 
+    @property
+    def batch_callbacks(self) -> bool:
+        """
+        Writable attribute: Whether the callbacks issued during
+        a frame are collected and submitted to the queue as a
+        single job at the end of the frame.
+
+        By default every callback is submitted to the queue
+        as soon as it is issued, which requires the rendering
+        thread to take the gil and allocate a Future for each
+        of them. When batch_callbacks is set, the rendering
+        thread only appends a compact record of the callback
+        in a buffer, and the gil is taken once at the end of
+        the frame to submit all of them.
+
+        The callbacks are run in the order they were issued,
+        sequentially, in a single job of the queue. Note that
+        they are thus submitted at the end of the frame rather
+        than during it, and that with an Executor with several
+        workers, callbacks of the same frame do not run in parallel.
+        """
+        return self._batch_callbacks
+
+    @batch_callbacks.setter
+    def batch_callbacks(self, bint value):
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self._batch_mutex)
+        self._batch_callbacks = value
+        m.unlock()
+        if not(value):
+            self._release_batch_pins(True)
+
+    @property
+    def coalesce_callbacks(self) -> bool:
+        """
+        Writable attribute: When batch_callbacks is set, merge
+        consecutive callbacks issued for the same callback,
+        source and target items into the latest one.
+
+        Only callbacks whose arguments are absolute values
+        are merged: mouse positions (MouseMoveHandler,
+        MouseInRect, DraggingHandler, DraggedHandler), drag
+        deltas (MouseDragHandler), hold durations (MouseDownHandler,
+        KeyDownHandler) and viewport resizes. Clicks, key presses
+        and value changes are never merged.
+
+        Merging also occurs with the callbacks of the previous
+        frames if their job has not started yet. This prevents
+        a slow callback from building an ever growing backlog
+        of outdated motion events.
+        """
+        return self._coalesce_callbacks
+
+    @coalesce_callbacks.setter
+    def coalesce_callbacks(self, bint value):
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self._batch_mutex)
+        self._coalesce_callbacks = value
+
     @property
     def rendering_context(self) -> BackendRenderingContext:
         """
@@ -462,9 +791,14 @@ cdef class Context:
         """
         if callback is None:
             return
+        cdef callback_event event
+        if self._batching:
+            init_callback_event(event, callback_event_kind.ev_noarg, callback, parent_item, target_item)
+            if self._append_event(event):
+                return
         with gil:
             try:
-                self._queue.submit(callback, parent_item, target_item, None)
+                self._submit_callback(callback, parent_item, target_item, None)
             except Exception as e:
                 print(traceback.format_exc())
 
@@ -484,9 +818,15 @@ cdef class Context:
         """
         if callback is None:
             return
+        cdef callback_event event
+        if self._batching:
+            init_callback_event(event, callback_event_kind.ev_arg1obj, callback, parent_item, target_item)
+            event.obj_arg = <PyObject*>arg1
+            if self._append_event(event):
+                return
         with gil:
             try:
-                self._queue.submit(callback, parent_item, target_item, arg1)
+                self._submit_callback(callback, parent_item, target_item, arg1)
             except Exception as e:
                 print(traceback.format_exc())
 
@@ -506,9 +846,15 @@ cdef class Context:
         """
         if callback is None:
             return
+        cdef callback_event event
+        if self._batching:
+            init_callback_event(event, callback_event_kind.ev_arg1key, callback, parent_item, target_item)
+            event.int_args[0] = arg1
+            if self._append_event(event):
+                return
         with gil:
             try:
-                self._queue.submit(callback, parent_item, target_item, Key(arg1))
+                self._submit_callback(callback, parent_item, target_item, Key(arg1))
             except Exception as e:
                 print(traceback.format_exc())
 
@@ -528,9 +874,15 @@ cdef class Context:
         """
         if callback is None:
             return
+        cdef callback_event event
+        if self._batching:
+            init_callback_event(event, callback_event_kind.ev_arg1button, callback, parent_item, target_item)
+            event.int_args[0] = arg1
+            if self._append_event(event):
+                return
         with gil:
             try:
-                self._queue.submit(callback, parent_item, target_item, <MouseButton>arg1)
+                self._submit_callback(callback, parent_item, target_item, <MouseButton>arg1)
             except Exception as e:
                 print(traceback.format_exc())
 
@@ -551,9 +903,15 @@ cdef class Context:
         """
         if callback is None:
             return
+        cdef callback_event event
+        if self._batching:
+            init_callback_event(event, callback_event_kind.ev_arg1float, callback, parent_item, target_item)
+            event.double_args[0] = arg1
+            if self._append_event(event):
+                return
         with gil:
             try:
-                self._queue.submit(callback, parent_item, target_item, arg1)
+                self._submit_callback(callback, parent_item, target_item, arg1)
             except Exception as e:
                 print(traceback.format_exc())
 
@@ -573,9 +931,22 @@ cdef class Context:
         """
         if callback is None:
             return
+        cdef callback_event event
+        cdef bint batched = False
         with gil:
             try:
-                self._queue.submit(callback, parent_item, target_item, arg1.value)
+                value = arg1.value
+                if self._batching:
+                    # The value must be read now, but we
+                    # still save the submission
+                    init_callback_event(event, callback_event_kind.ev_arg1value, callback, parent_item, target_item)
+                    Py_INCREF(value)
+                    event.obj_arg = <PyObject*>value
+                    batched = self._append_event(event)
+                    if not(batched):
+                        Py_DECREF(value)
+                if not(batched):
+                    self._submit_callback(callback, parent_item, target_item, value)
             except Exception as e:
                 print(traceback.format_exc())
 
@@ -598,9 +969,16 @@ cdef class Context:
         """
         if callback is None:
             return
+        cdef callback_event event
+        if self._batching:
+            init_callback_event(event, callback_event_kind.ev_arg1key1float, callback, parent_item, target_item)
+            event.int_args[0] = arg1
+            event.double_args[0] = arg2
+            if self._append_event(event):
+                return
         with gil:
             try:
-                self._queue.submit(callback, parent_item, target_item, (Key(arg1), arg2))
+                self._submit_callback(callback, parent_item, target_item, (Key(arg1), arg2))
             except Exception as e:
                 print(traceback.format_exc())
 
@@ -622,9 +1000,16 @@ cdef class Context:
         """
         if callback is None:
             return
+        cdef callback_event event
+        if self._batching:
+            init_callback_event(event, callback_event_kind.ev_arg1button1float, callback, parent_item, target_item)
+            event.int_args[0] = arg1
+            event.double_args[0] = arg2
+            if self._append_event(event):
+                return
         with gil:
             try:
-                self._queue.submit(callback, parent_item, target_item, (<MouseButton>(arg1), arg2))
+                self._submit_callback(callback, parent_item, target_item, (<MouseButton>(arg1), arg2))
             except Exception as e:
                 print(traceback.format_exc())
 
@@ -646,9 +1031,16 @@ cdef class Context:
         """
         if callback is None:
             return
+        cdef callback_event event
+        if self._batching:
+            init_callback_event(event, callback_event_kind.ev_arg2float, callback, parent_item, target_item)
+            event.double_args[0] = arg1
+            event.double_args[1] = arg2
+            if self._append_event(event):
+                return
         with gil:
             try:
-                self._queue.submit(callback, parent_item, target_item, (arg1, arg2))
+                self._submit_callback(callback, parent_item, target_item, (arg1, arg2))
             except Exception as e:
                 print(traceback.format_exc())
 
@@ -670,9 +1062,16 @@ cdef class Context:
         """
         if callback is None:
             return
+        cdef callback_event event
+        if self._batching:
+            init_callback_event(event, callback_event_kind.ev_arg2double, callback, parent_item, target_item)
+            event.double_args[0] = arg1
+            event.double_args[1] = arg2
+            if self._append_event(event):
+                return
         with gil:
             try:
-                self._queue.submit(callback, parent_item, target_item, (arg1, arg2))
+                self._submit_callback(callback, parent_item, target_item, (arg1, arg2))
             except Exception as e:
                 print(traceback.format_exc())
 
@@ -696,9 +1095,17 @@ cdef class Context:
         """
         if callback is None:
             return
+        cdef callback_event event
+        if self._batching:
+            init_callback_event(event, callback_event_kind.ev_arg1button2float, callback, parent_item, target_item)
+            event.int_args[0] = arg1
+            event.double_args[0] = arg2
+            event.double_args[1] = arg3
+            if self._append_event(event):
+                return
         with gil:
             try:
-                self._queue.submit(callback, parent_item, target_item, (<MouseButton>(arg1), arg2, arg3))
+                self._submit_callback(callback, parent_item, target_item, (<MouseButton>(arg1), arg2, arg3))
             except Exception as e:
                 print(traceback.format_exc())
 
@@ -724,9 +1131,18 @@ cdef class Context:
         """
         if callback is None:
             return
+        cdef callback_event event
+        if self._batching:
+            init_callback_event(event, callback_event_kind.ev_arg4int, callback, parent_item, target_item)
+            event.int_args[0] = arg1
+            event.int_args[1] = arg2
+            event.int_args[2] = arg3
+            event.int_args[3] = arg4
+            if self._append_event(event):
+                return
         with gil:
             try:
-                self._queue.submit(callback, parent_item, target_item, (arg1, arg2, arg3, arg4))
+                self._submit_callback(callback, parent_item, target_item, (arg1, arg2, arg3, arg4))
             except Exception as e:
                 print(traceback.format_exc())
 
@@ -752,9 +1168,18 @@ cdef class Context:
         """
         if callback is None:
             return
+        cdef callback_event event
+        if self._batching:
+            init_callback_event(event, callback_event_kind.ev_arg3long1int, callback, parent_item, target_item)
+            event.long_args[0] = arg1
+            event.long_args[1] = arg2
+            event.long_args[2] = arg3
+            event.int_args[0] = arg4
+            if self._append_event(event):
+                return
         with gil:
             try:
-                self._queue.submit(callback, parent_item, target_item, (arg1, arg2, arg3, arg4))
+                self._submit_callback(callback, parent_item, target_item, (arg1, arg2, arg3, arg4))
             except Exception as e:
                 print(traceback.format_exc())
 
@@ -786,10 +1211,21 @@ cdef class Context:
         """
         if callback is None:
             return
+        cdef callback_event event
+        if self._batching:
+            init_callback_event(event, callback_event_kind.ev_argdoubletriplet, callback, parent_item, target_item)
+            event.double_args[0] = arg1_1
+            event.double_args[1] = arg1_2
+            event.double_args[2] = arg1_3
+            event.double_args[3] = arg2_1
+            event.double_args[4] = arg2_2
+            event.double_args[5] = arg2_3
+            if self._append_event(event):
+                return
         with gil:
             try:
-                self._queue.submit(callback, parent_item, target_item,
-                                  ((arg1_1, arg1_2, arg1_3), (arg2_1, arg2_2, arg2_3)))
+                self._submit_callback(callback, parent_item, target_item,
+                                      ((arg1_1, arg1_2, arg1_3), (arg2_1, arg2_2, arg2_3)))
             except Exception as e:
                 print(traceback.format_exc())
 
@@ -813,12 +1249,23 @@ cdef class Context:
         if callback is None:
             return
         cdef int i
+        cdef callback_event event
+        cdef bint batched = False
         with gil:
             try:
                 element_list = []
                 for i in range(<int>arg2.size()):
                     element_list.append(string_to_str(arg2[i]))
-                self._queue.submit(callback, parent_item, target_item, (arg1, element_list))
+                call_info = (arg1, element_list)
+                if self._batching:
+                    init_callback_event(event, callback_event_kind.ev_arg1int1stringvector, callback, parent_item, target_item)
+                    Py_INCREF(call_info)
+                    event.obj_arg = <PyObject*>call_info
+                    batched = self._append_event(event)
+                    if not(batched):
+                        Py_DECREF(call_info)
+                if not(batched):
+                    self._submit_callback(callback, parent_item, target_item, call_info)
             except Exception as e:
                 print(traceback.format_exc())
 
@@ -878,6 +1325,302 @@ cdef class Context:
             return None
         return parent_queue[0]
 
+    cdef void start_callback_batch(self) noexcept nogil:
+        """
+        Start collecting the callbacks queued in a
+        compact form, rather than submitting them one by one.
+        Does nothing if batch_callbacks is not set.
+
+        Called by the viewport at the start of render_frame.
+        """
+        cdef unique_lock[DCGMutex] m = unique_lock[DCGMutex](self._batch_mutex)
+        self._batching = self._batch_callbacks
+
+    cdef void flush_callback_batch(self):
+        """
+        Submit the callbacks collected since start_callback_batch
+        to the queue as a single job, and stop collecting.
+
+        If the previous job has not started yet, the callbacks
+        are appended to it instead.
+
+        Called by the viewport at the end of render_frame.
+        """
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self._batch_mutex)
+        self._batching = False
+        cdef _CallbackBatch batch
+        if not(self._pending_events.empty()):
+            batch = <_CallbackBatch>self._last_batch
+            if batch is None or \
+               not(batch.merge(self._pending_events, self._coalesce_callbacks)):
+                batch = _CallbackBatch.__new__(_CallbackBatch)
+                batch.context = self
+                batch.merge(self._pending_events, False)
+                self._last_batch = batch
+                try:
+                    self._queue.submit(batch)
+                except Exception as e:
+                    print(traceback.format_exc())
+            self._pending_events.clear()
+        m.unlock()
+        # Release the objects that did not issue
+        # any callback during this frame.
+        self._release_batch_pins(not(self._batch_callbacks) or not(self._started))
+        lock_gil_friendly(m, self._batch_mutex)
+        self._batch_generation += 1
+
+    cdef void _pin_for_batch(self, PyObject *obj) noexcept nogil:
+        """
+        Ensure obj stays alive until the end of the next flush.
+
+        The reference is kept across frames in order to not
+        need the gil when the same items issue callbacks every
+        frame. It is released when obj doesn't issue any callback
+        during a frame.
+
+        Must be called with _batch_mutex held.
+        """
+        if self._batch_pins.find(<uintptr_t>obj) == self._batch_pins.end():
+            # Holding _batch_mutex while waiting for the gil is
+            # fine as it is locked with lock_gil_friendly when
+            # the gil is held.
+            with gil:
+                Py_INCREF(<object>obj)
+        self._batch_pins[<uintptr_t>obj] = self._batch_generation
+
+    cdef bint _append_event(self, callback_event &event) noexcept nogil:
+        """
+        Record event in the current batch.
+        Returns False if no batch is being collected.
+        """
+        cdef unique_lock[DCGMutex] m = unique_lock[DCGMutex](self._batch_mutex)
+        if not(self._batching):
+            return False
+        self._pin_for_batch(event.callback)
+        self._pin_for_batch(event.parent)
+        self._pin_for_batch(event.target)
+        if event.kind == callback_event_kind.ev_arg1obj:
+            self._pin_for_batch(event.obj_arg)
+        if self._profile_callbacks:
+            event.enqueue_ns = ctime.monotonic_ns()
+            event.queue_depth = self._enter_callback_backlog()
+        cdef int32_t n = <int32_t>self._pending_events.size()
+        if self._coalesce_callbacks and n > 0 and \
+           can_coalesce_events(self._pending_events[n-1], event):
+            event.coalesced += self._pending_events[n-1].coalesced + 1
+            if self._pending_events[n-1].enqueue_ns != 0:
+                self._leave_callback_backlog()
+            self._pending_events[n-1] = event
+            return True
+        self._pending_events.push_back(event)
+        return True
+
+    cdef void _submit_callback(self,
+                               Callback callback,
+                               baseItem parent_item,
+                               baseItem target_item,
+                               object call_info):
+        """
+        Submit a callback to the queue, with timings
+        if profile_callbacks is set.
+
+        Must be called with the gil held.
+        """
+        if not(self._profile_callbacks):
+            self._queue.submit(callback, parent_item, target_item, call_info)
+            return
+        cdef _TimedCallback timed = _TimedCallback.__new__(_TimedCallback)
+        timed.context = self
+        timed.callback = callback
+        timed.parent_item = parent_item
+        timed.target_item = target_item
+        timed.call_info = call_info
+        timed.enqueue_ns = ctime.monotonic_ns()
+        timed.queue_depth = self._enter_callback_backlog()
+        self._queue.submit(timed)
+
+    cdef int32_t _enter_callback_backlog(self) noexcept nogil:
+        """
+        Count a profiled callback as queued.
+        Returns the resulting number of queued callbacks.
+        """
+        cdef int32_t depth = self._callback_backlog.fetch_add(1) + 1
+        if depth > self._max_callback_backlog:
+            self._max_callback_backlog = depth
+        return depth
+
+    cdef void _leave_callback_backlog(self) noexcept nogil:
+        self._callback_backlog.fetch_sub(1)
+
+    cdef void _record_callback_timing(self,
+                                      object callback,
+                                      object source_type,
+                                      int64_t enqueue_ns,
+                                      int64_t start_ns,
+                                      int64_t end_ns,
+                                      int32_t queue_depth,
+                                      int32_t coalesced):
+        """
+        Store the timings of a profiled callback
+        in the ring buffer.
+        """
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self._timings_mutex)
+        cdef callback_timing timing
+        cdef callback_timing *slot
+        if self._timings.size() < CALLBACK_TIMINGS_SIZE:
+            self._timings.push_back(timing)
+            slot = &self._timings[self._timings.size() - 1]
+        else:
+            slot = &self._timings[self._timings_next]
+            Py_DECREF(<object>slot.callback)
+            Py_DECREF(<object>slot.source_type)
+            self._timings_overwritten += 1
+        Py_INCREF(callback)
+        Py_INCREF(source_type)
+        slot.callback = <PyObject*>callback
+        slot.source_type = <PyObject*>source_type
+        slot.enqueue_ns = enqueue_ns
+        slot.start_ns = start_ns
+        slot.end_ns = end_ns
+        slot.queue_depth = queue_depth
+        slot.coalesced = coalesced
+        self._timings_next = (self._timings_next + 1) % CALLBACK_TIMINGS_SIZE
+
+    @property
+    def profile_callbacks(self) -> bool:
+        """
+        Writable attribute: Whether to record the timings
+        of the callbacks submitted to the queue.
+
+        For each callback the time it was queued, the time
+        it started running, the time it ended and the number
+        of callbacks waiting in the queue are recorded in a
+        ring buffer of the last 8192 callbacks.
+
+        Statistics are retrieved with get_callback_stats().
+        When disabled, the overhead is a single test
+        per callback.
+        """
+        return self._profile_callbacks
+
+    @profile_callbacks.setter
+    def profile_callbacks(self, bint value):
+        self._profile_callbacks = value
+
+    def get_callback_stats(self):
+        """
+        Return statistics on the recorded callback timings
+        (see profile_callbacks).
+
+        Times are in seconds. The latency is the time between
+        the callback being queued and the callback starting.
+        The duration is the time the callback took to run.
+
+        Returns a dictionary with:
+        - queue_depth: the number of profiled callbacks
+            currently queued or running.
+        - max_queue_depth: the maximum queue_depth reached
+            since the last reset_callback_stats().
+        - overwritten: the number of records dropped from
+            the ring buffer to make room for new ones.
+        - coalesced: the number of callbacks dropped by
+            coalesce_callbacks.
+        - total: statistics on all recorded callbacks.
+        - per_callback: statistics for each Callback.
+        - per_source_type: statistics for each class of
+            item issuing callbacks (handler classes, etc).
+        The statistics contain the count, the 50th, 90th, 99th
+        percentiles and maximum of the latency and duration,
+        the total duration, the maximum queue depth and the
+        number of coalesced callbacks.
+        """
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self._timings_mutex)
+        cdef int32_t num_timings = <int32_t>self._timings.size()
+        cdef list callbacks = []
+        cdef list source_types = []
+        cdef cnp.ndarray[cnp.float64_t, ndim=1] latencies = np.empty(num_timings, dtype=np.float64)
+        cdef cnp.ndarray[cnp.float64_t, ndim=1] durations = np.empty(num_timings, dtype=np.float64)
+        cdef cnp.ndarray[cnp.int32_t, ndim=1] depths = np.empty(num_timings, dtype=np.int32)
+        cdef cnp.ndarray[cnp.int32_t, ndim=1] coalesced = np.empty(num_timings, dtype=np.int32)
+        cdef int32_t i
+        for i in range(num_timings):
+            callbacks.append(<object>self._timings[i].callback)
+            source_types.append(<object>self._timings[i].source_type)
+            latencies[i] = 1e-9 * <double>(self._timings[i].start_ns - self._timings[i].enqueue_ns)
+            durations[i] = 1e-9 * <double>(self._timings[i].end_ns - self._timings[i].start_ns)
+            depths[i] = self._timings[i].queue_depth
+            coalesced[i] = self._timings[i].coalesced
+        result = {
+            "queue_depth": self._callback_backlog.load(),
+            "max_queue_depth": self._max_callback_backlog,
+            "overwritten": self._timings_overwritten,
+            "coalesced": int(np.sum(coalesced)),
+            "total": None,
+            "per_callback": {},
+            "per_source_type": {}
+        }
+        m.unlock()
+        if num_timings == 0:
+            return result
+        result["total"] = summarize_callback_timings(np.arange(num_timings),
+                                                     latencies, durations,
+                                                     depths, coalesced)
+        cdef dict groups
+        for (key, keys) in (("per_callback", callbacks),
+                            ("per_source_type", source_types)):
+            groups = {}
+            for i in range(num_timings):
+                groups.setdefault(keys[i], []).append(i)
+            result[key] = {
+                k: summarize_callback_timings(np.asarray(v, dtype=np.intp),
+                                              latencies, durations,
+                                              depths, coalesced)
+                for (k, v) in groups.items()
+            }
+        return result
+
+    def reset_callback_stats(self):
+        """
+        Clear the recorded callback timings
+        and the maximum queue depth.
+        """
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self._timings_mutex)
+        cdef int32_t i
+        for i in range(<int>self._timings.size()):
+            Py_DECREF(<object>self._timings[i].callback)
+            Py_DECREF(<object>self._timings[i].source_type)
+        self._timings.clear()
+        self._timings_next = 0
+        self._timings_overwritten = 0
+        self._max_callback_backlog = self._callback_backlog.load()
+
+    cdef void _release_batch_pins(self, bint release_all):
+        """
+        Release the references taken by _pin_for_batch on
+        the objects unused during the current generation,
+        or on all of them if release_all is set.
+        """
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self._batch_mutex)
+        cdef DCGVector[uintptr_t] released
+        cdef unordered_map[uintptr_t, int32_t].iterator it = self._batch_pins.begin()
+        while it != self._batch_pins.end():
+            if release_all or dereference(it).second != self._batch_generation:
+                released.push_back(dereference(it).first)
+            preincrement(it)
+        cdef int32_t i
+        for i in range(<int>released.size()):
+            self._batch_pins.erase(released[i])
+        m.unlock()
+        # Decref outside the lock as it might
+        # trigger item deletion
+        for i in range(<int>released.size()):
+            Py_DECREF(<object><PyObject*>released[i])
+
     cdef bint c_is_key_down(self, int32_t key) noexcept nogil:
         return imgui.IsKeyDown(<imgui.ImGuiKey>key)
 
@@ -1371,6 +2114,7 @@ cdef class baseItem:
         self.can_have_drawing_child = False
         self.can_have_sibling = False
         self.element_child_category = -1
+        self._culling_margin = 8.
 
     def configure(self, **kwargs):
         # Automatic attachment
@@ -2204,6 +2948,8 @@ cdef class baseItem:
                 target_parent.last_window_child = <Window>self
                 attached = True
         assert(attached) # because we checked before compatibility
+        if self.element_child_category == child_type.cat_theme:
+            self.context._theme_generation.fetch_add(1)
         if not(self.parent._check_rendered()): # TODO: could be optimized. Also not totally correct (attaching to a menu for instance)
             self.set_hidden_and_propagate_to_children_no_handlers()
 
@@ -2268,6 +3014,8 @@ cdef class baseItem:
         self.prev_sibling = prev_sibling
         self.next_sibling = target_before
         target_before.prev_sibling = self
+        if self.element_child_category == child_type.cat_theme:
+            self.context._theme_generation.fetch_add(1)
         if not(self.parent._check_rendered()):
             self.set_hidden_and_propagate_to_children_no_handlers()
 
@@ -2285,6 +3033,9 @@ cdef class baseItem:
         if self.parent is None:
             return # nothing to do
 
+        if self.element_child_category == child_type.cat_theme:
+            self.context._theme_generation.fetch_add(1)
+
         # Remove this item from the list of siblings
         if self.prev_sibling is not None:
             lock_gil_friendly(sibling_m, self.prev_sibling.mutex)
@@ -2740,6 +3491,133 @@ class wrap_this_and_parents_mutex:
         return False # Do not catch exceptions
 
 
+cdef class _CapturedFrameMemory:
+    """
+    Base object of the arrays of a CapturedFrame.
+
+    Owns the capture slot: the buffer is given back to
+    the viewport only when this object, and thus every
+    array pointing to the buffer, is released.
+    """
+    cdef Viewport _viewport
+    cdef void* _buffer
+    cdef int32_t _index
+    cdef int64_t _id
+
+    def __dealloc__(self):
+        if self._viewport is None:
+            return
+        cdef Viewport viewport = self._viewport
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, viewport._capture_mutex)
+        if self._index < <int32_t>viewport._capture_slots.size() and \
+           viewport._capture_slots[self._index].id == self._id:
+            viewport._capture_slots[self._index].state = 0
+            return
+        # The ring was resized in between. We own the buffer.
+        with nogil:
+            (<platformViewport*>viewport._platform).makeUploadContextCurrent()
+            (<platformViewport*>viewport._platform).freeUploadBuffer(self._buffer)
+            (<platformViewport*>viewport._platform).releaseUploadContext()
+
+
+cdef class CapturedFrame:
+    """
+    Frame captured by the viewport (see Viewport.capture_frames).
+
+    array is a read-only numpy view (height, width, 4)
+    of the RGBA uint8 content of the frame, mapped to
+    the readback buffer. The buffer is given back to the
+    viewport once the frame is released (release(), or
+    the CapturedFrame is not referenced anymore) and no
+    array of the frame is referenced anymore.
+    Copy the array to keep the content without
+    holding the buffer.
+    """
+    cdef int64_t _frame
+    cdef int64_t _timestamp_ns
+    cdef object _array
+    cdef bint _released
+
+    cdef void _release(self):
+        self._released = True
+        # The buffer is recycled when the arrays
+        # are not referenced anymore
+        self._array = None
+
+    @property
+    def array(self):
+        """
+        Read-only numpy array (height, width, 4) of
+        the RGBA content of the frame.
+        Cannot be retrieved after release().
+        """
+        if self._released:
+            raise ValueError("The frame was released")
+        return self._array
+
+    @property
+    def frame(self):
+        """
+        Index of the frame (see viewport.metrics["frame_count"])
+        """
+        return self._frame
+
+    @property
+    def timestamp(self):
+        """
+        Time at which the frame was captured, in seconds.
+        Same clock as time.monotonic().
+        """
+        return 1e-9 * self._timestamp_ns
+
+    def release(self):
+        """
+        Give back the buffer to the viewport, for the
+        capture of the next frames.
+        The buffer is recycled only once the arrays
+        obtained from the frame are not referenced anymore.
+        """
+        self._release()
+
+    def __enter__(self):
+        return self.array
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._release()
+        return False
+
+
+cdef enum:
+    # Number of draw records kept by the viewport when profiling
+    DRAW_PROFILE_CAPACITY = 262144
+
+cdef extern from * nogil:
+    """
+    void PlotToPixelsBulk(float* dst, const double* src, int32_t n, bool fit)
+    {
+        // Same as calling PlotToPixels(x, y, -1, -1) on every point,
+        // but the current axes are retrieved only once.
+        ImPlotPlot& plot = *ImPlot::GetCurrentPlot();
+        ImPlotAxis& x_axis = plot.Axes[plot.CurrentX];
+        ImPlotAxis& y_axis = plot.Axes[plot.CurrentY];
+        int32_t i;
+        if (fit) {
+            for (i = 0; i < n; i++) {
+                ImPlot::FitPointX(src[2*i]);
+                ImPlot::FitPointY(src[2*i+1]);
+            }
+        }
+        if (!plot.SetupLocked)
+            ImPlot::SetupLock();
+        for (i = 0; i < n; i++) {
+            dst[2*i] = x_axis.PlotToPixels(src[2*i]);
+            dst[2*i+1] = y_axis.PlotToPixels(src[2*i+1]);
+        }
+    }
+    """
+    void PlotToPixelsBulk(float*, const double*, int32_t, bint)
+
 @cython.final
 @cython.no_gc_clear
 cdef class Viewport(baseItem):
@@ -2776,9 +3654,11 @@ cdef class Viewport(baseItem):
     - maximized: Boolean indicating if the viewport is maximized.
     - wait_for_input: Boolean indicating if rendering should wait for input.
     - shown: Boolean indicating if the viewport window has been created by the OS.
+    - headless: Boolean indicating if rendering occurs offscreen, without window.
     - resize_callback: Callback to be issued when the viewport is resized.
     - close_callback: Callback to be issued when the viewport is closed.
     - metrics: Rendering related metrics relative to the last frame.
+    - profile_draws: Boolean indicating if the draw time of each item is recorded.
     """
     def __cinit__(self, context):
         self.resize_callback = None
@@ -2794,6 +3674,10 @@ cdef class Viewport(baseItem):
         self.frame_count = 0
         self.wait_for_input = False
         self._target_refresh_time = 0.
+        self._profile_draws_frames = 60
+        self._capture_frames = 0
+        self._capture_next_id = 0
+        self._capture_dropped = 0
         self.state.cur.rendered = True # For compatibility with RenderHandlers
         self.p_state = &self.state
         self._cursor = imgui.ImGuiMouseCursor_Arrow
@@ -2819,8 +3703,10 @@ cdef class Viewport(baseItem):
             # Maybe just a warning ? Not sure how to solve this issue.
             #if not (<platformViewport*>self._platform).checkPrimaryThread():
             #    raise RuntimeError("Viewport deallocated from a different thread than the one it was created in")
+            self.__free_capture_slots(True)
             (<platformViewport*>self._platform).cleanup()
             self._platform = NULL
+        self.__reset_draw_profile()
 
     def initialize(self, **kwargs):
         """
@@ -2837,6 +3723,10 @@ cdef class Viewport(baseItem):
         To change the font and have scale managements, look
         at the documentation of the FontTexture class, as well
         as AutoFont.
+
+        Passing headless=True renders into an offscreen
+        framebuffer, without showing any window (see the
+        headless attribute).
         """
         cdef unique_lock[DCGMutex] m
         cdef unique_lock[DCGMutex] m2
@@ -2849,6 +3739,9 @@ cdef class Viewport(baseItem):
         if self._initialized:
             raise RuntimeError("Viewport already initialized")
         ensure_correct_im_context(self.context)
+        if not((<platformViewport*>self._platform).hasDisplay) and \
+           not((<platformViewport*>self._platform).isHeadless):
+            raise RuntimeError("No display is available: only headless viewports can be initialized")
         if not (<platformViewport*>self._platform).initialize():
             raise RuntimeError("Failed to initialize the viewport")
         imgui.StyleColorsDark()
@@ -3002,6 +3895,55 @@ cdef class Viewport(baseItem):
         lock_gil_friendly(m, self.mutex)
         (<platformViewport*>self._platform).hasVSync = value
 
+    @property
+    def headless(self) -> bool:
+        """
+        Whether the viewport renders into an offscreen
+        framebuffer instead of an OS window.
+
+        Must be set before, or passed to, initialize().
+        In headless mode the window is never shown,
+        there is no vsync, the dpi is fixed to 1,
+        render_frame never waits for input events, and the
+        time seen by the items advances by headless_frame_time
+        at every frame. This gives reproducible frames
+        and frame times for benchmarks and pixel
+        comparisons (retrieve_framebuffer).
+
+        When no display is available, the context falls back
+        automatically to an offscreen driver, in which case
+        only headless viewports can be initialized: initialize()
+        raises a RuntimeError for the others.
+        """
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        return (<platformViewport*>self._platform).isHeadless
+
+    @headless.setter
+    def headless(self, bint value):
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        self.__check_not_initialized()
+        (<platformViewport*>self._platform).isHeadless = value
+
+    @property
+    def headless_frame_time(self) -> float:
+        """
+        Time step, in seconds, between two frames
+        of a headless viewport. Defaults to 1/60.
+        """
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        return (<platformViewport*>self._platform).headlessDeltaTime
+
+    @headless_frame_time.setter
+    def headless_frame_time(self, float value):
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        if value <= 0.:
+            raise ValueError("headless_frame_time must be positive")
+        (<platformViewport*>self._platform).headlessDeltaTime = value
+
     @property
     def dpi(self) -> float:
         """
@@ -3404,6 +4346,10 @@ cdef class Viewport(baseItem):
 
         frame_count corresponds to the frame number to which
         the data refers to.
+
+        callback_backlog is the number of callbacks queued
+        and not finished. It is only tracked when
+        context.profile_callbacks is set.
         """
         return {
             "last_time_before_event_handling" : self.last_t_before_event_handling,
@@ -3419,6 +4365,7 @@ cdef class Viewport(baseItem):
             "rendered_windows": imgui.GetIO().MetricsRenderWindows,
             "active_windows": imgui.GetIO().MetricsActiveWindows,
             "frame_count" : self.frame_count-1,
+            "callback_backlog": self.context._callback_backlog.load(),
         }
 
     @property
@@ -3444,6 +4391,286 @@ cdef class Viewport(baseItem):
         lock_gil_friendly(m, self.mutex)
         return self._frame_buffer
 
+    @property
+    def capture_frames(self):
+        """
+        Writable attribute: Number of frames that can be
+        captured in advance. 0 (default) disables capture.
+
+        When set, the content of every presented frame is
+        read back asynchronously into a ring of buffers
+        of that size. Unlike retrieve_framebuffer, no
+        allocation occurs, and neither rendering nor
+        presenting waits for the readback.
+        Completed frames are retrieved with
+        get_captured_frame() or captured_frames().
+
+        A frame is dropped (see capture_dropped) when all
+        the buffers are either waiting for the GPU or held
+        by CapturedFrame objects (or their arrays) not
+        released yet.
+        """
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self._capture_mutex)
+        return self._capture_frames
+
+    @capture_frames.setter
+    def capture_frames(self, int32_t value):
+        if value < 0:
+            raise ValueError("Invalid number of frames")
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self._capture_mutex)
+        self._capture_frames = value
+        # The slots are (re)allocated during rendering
+        with nogil:
+            self.__free_capture_slots(True)
+
+    @property
+    def capture_dropped(self):
+        """
+        Number of frames that could not be captured
+        because no buffer was available.
+        """
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self._capture_mutex)
+        return self._capture_dropped
+
+    def get_captured_frame(self, bint block=False, timeout=None):
+        """
+        Retrieve the oldest captured frame not retrieved yet.
+
+        block: if True, waits for the readback of the
+            frame to complete, if one is pending.
+        timeout: maximum time to wait in seconds (None for no limit)
+
+        Returns a CapturedFrame, or None if no
+        captured frame is available. Frames are returned
+        in the order they were rendered.
+        """
+        cdef unique_lock[DCGMutex] m
+        cdef double deadline = 0.
+        if timeout is not None:
+            deadline = python_time.monotonic() + timeout
+        cdef int32_t i, index
+        cdef bint ready
+        cdef capture_slot slot
+        cdef _CapturedFrameMemory memory
+        cdef CapturedFrame frame
+        cdef cnp.npy_intp[3] dims
+        while True:
+            lock_gil_friendly(m, self._capture_mutex)
+            index = -1
+            for i in range(<int>self._capture_slots.size()):
+                if self._capture_slots[i].state != 1:
+                    continue
+                if index < 0 or self._capture_slots[i].frame < self._capture_slots[index].frame:
+                    index = i
+            if index < 0:
+                return None
+            with nogil:
+                (<platformViewport*>self._platform).makeUploadContextCurrent()
+                ready = (<platformViewport*>self._platform).isUploadBufferReady(self._capture_slots[index].buffer)
+                (<platformViewport*>self._platform).releaseUploadContext()
+            if ready:
+                break
+            m.unlock()
+            if not(block) or \
+               (timeout is not None and python_time.monotonic() >= deadline):
+                return None
+            python_time.sleep(0.0005)
+        self._capture_slots[index].state = 2
+        slot = self._capture_slots[index]
+        m.unlock()
+        memory = _CapturedFrameMemory.__new__(_CapturedFrameMemory)
+        memory._viewport = self
+        memory._buffer = slot.buffer
+        memory._index = index
+        memory._id = slot.id
+        frame = CapturedFrame.__new__(CapturedFrame)
+        frame._frame = slot.frame
+        frame._timestamp_ns = slot.timestamp_ns
+        dims[0] = slot.height
+        dims[1] = slot.width
+        dims[2] = 4
+        array = cnp.PyArray_SimpleNewFromData(3, dims, cnp.NPY_UINT8, slot.buffer)
+        cnp.set_array_base(array, memory)
+        array.setflags(write=False)
+        # The readback starts from the bottom row
+        frame._array = array[::-1]
+        return frame
+
+    def captured_frames(self):
+        """
+        Iterate over the captured frames available,
+        without waiting (see get_captured_frame).
+        """
+        while True:
+            frame = self.get_captured_frame()
+            if frame is None:
+                return
+            yield frame
+
+    @property
+    def profile_draws(self):
+        """
+        Writable attribute: Whether to record the time
+        spent rendering each item.
+
+        When enabled, the start and end of the draw of
+        every item are recorded during rendering, without
+        taking the gil, into a preallocated buffer.
+        The data of the last profile_draws_frames frames is
+        retrieved with get_draw_profile().
+
+        When disabled, the cost is a single test per item.
+        Enabling profiling clears the previous records.
+        """
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._profile_draws
+
+    @profile_draws.setter
+    def profile_draws(self, bint value):
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        if value and not(self._profile_draws):
+            self.__reset_draw_profile()
+            self._draw_records.resize(DRAW_PROFILE_CAPACITY)
+            self._draw_frame_starts.resize(self._profile_draws_frames)
+        self._profile_draws = value
+
+    @property
+    def profile_draws_frames(self):
+        """
+        Writable attribute: Number of frames for which
+        the draw times are kept (see profile_draws).
+
+        Records older than the last 262144 draws are
+        dropped regardless of this number.
+        Changing it clears the previous records.
+        """
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._profile_draws_frames
+
+    @profile_draws_frames.setter
+    def profile_draws_frames(self, int32_t value):
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        if value <= 0:
+            raise ValueError("profile_draws_frames must be positive")
+        self.__reset_draw_profile()
+        self._profile_draws_frames = value
+        if self._profile_draws:
+            self._draw_frame_starts.resize(value)
+
+    def get_draw_profile(self, int32_t frames=-1):
+        """
+        Return the draw times recorded for the last
+        frames (see profile_draws).
+
+        Args:
+            frames: Number of frames to aggregate.
+                By default all the frames kept.
+
+        Returns a dictionary with:
+        - frames: the number of frames aggregated
+        - tree: the list of the root nodes of the flame
+            tree (the viewport). Each node is a dictionary
+            with the item uuid, its class (type), the number
+            of draws (count), the total time spent in these
+            draws (total) and the time not spent drawing its
+            children (self), in seconds, and the list of the
+            nodes of its children (children), sorted by
+            decreasing total time.
+            Nodes of the same item at the same location
+            of the tree are merged across frames.
+        - per_class: a dictionary of the count, total
+            and self times for each item class.
+
+        The root nodes have a total time that corresponds
+        to the rendering part of delta_rendering in metrics.
+        """
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        cdef int64_t last = self._draw_records_next
+        cdef int64_t capacity = <int64_t>self._draw_records.size()
+        cdef int64_t num_frames = min(self._draw_frames_recorded,
+                                      <int64_t>self._profile_draws_frames)
+        if frames >= 0:
+            num_frames = min(num_frames, <int64_t>frames)
+        cdef int64_t first = last
+        cdef int64_t frame_start
+        cdef int32_t num_kept_frames = 0
+        cdef int64_t k
+        # Skip the frames whose records have been overwritten
+        for k in range(self._draw_frames_recorded - num_frames,
+                       self._draw_frames_recorded):
+            frame_start = self._draw_frame_starts[k % self._profile_draws_frames]
+            if frame_start < last - capacity:
+                continue
+            if num_kept_frames == 0:
+                first = frame_start
+            num_kept_frames += 1
+        cdef list types = [<object>self._draw_profile_types[i] \
+                           for i in range(<int>self._draw_profile_types.size())]
+        cdef list records = []
+        cdef draw_record *record
+        for k in range(first, last):
+            record = &self._draw_records[k % capacity]
+            records.append((record.uuid, record.parent,
+                            1e-9 * <double>(record.end_ns - record.start_ns),
+                            types[record.type_index]))
+        m.unlock()
+
+        cdef dict roots = {}
+        cdef dict nodes = {}
+        cdef dict per_class = {}
+        cdef dict siblings
+        for k in range(first, last):
+            (uuid, parent, duration, item_type) = records[k - first]
+            parent_node = nodes.get(parent, None)
+            siblings = roots if parent_node is None else parent_node["children"]
+            node = siblings.get(uuid, None)
+            if node is None:
+                node = {
+                    "uuid": uuid,
+                    "type": item_type,
+                    "count": 0,
+                    "total": 0.,
+                    "self": 0.,
+                    "children": {}
+                }
+                siblings[uuid] = node
+            node["count"] += 1
+            node["total"] += duration
+            node["self"] += duration
+            nodes[k] = node
+            class_stats = per_class.get(item_type, None)
+            if class_stats is None:
+                class_stats = {"count": 0, "total": 0., "self": 0.}
+                per_class[item_type] = class_stats
+            class_stats["count"] += 1
+            class_stats["total"] += duration
+            class_stats["self"] += duration
+            if parent_node is not None:
+                parent_node["self"] -= duration
+                per_class[parent_node["type"]]["self"] -= duration
+
+        def sorted_nodes(dict nodes_dict):
+            cdef list result = sorted(nodes_dict.values(),
+                                      key=lambda n: n["total"],
+                                      reverse=True)
+            for node in result:
+                node["children"] = sorted_nodes(node["children"])
+            return result
+
+        return {
+            "frames": num_kept_frames,
+            "tree": sorted_nodes(roots),
+            "per_class": per_class
+        }
+
 
     def configure(self, **kwargs):
         for (key, value) in kwargs.items():
@@ -3526,15 +4753,27 @@ cdef class Viewport(baseItem):
                                      (<platformViewport*>self._platform).frameHeight)
         self.window_pos = make_Vec2(0., 0.)
         self.window_cursor = make_Vec2(0., 0.)
+        if self._profile_draws:
+            self._draw_frame_starts[self._draw_frames_recorded % self._profile_draws_frames] = \
+                self._draw_records_next
+            self._draw_frames_recorded += 1
+            self.profile_draw_begin(self)
         imgui.PushID(self.uuid)
         draw_menubar_children(self)
         draw_window_children(self)
         draw_viewport_drawlist_children(self)
         imgui.PopID()
+        if self._profile_draws:
+            self.profile_draw_end()
         if self._theme is not None:
             self._theme.pop()
         if self._font is not None:
             self._font.pop()
+        # The draw lists of the windows are complete
+        cdef unique_lock[DCGMutex] fonts_m = unique_lock[DCGMutex](self._end_frame_fonts_mutex)
+        for i in range(<int>self._end_frame_fonts.size()):
+            (<baseFont>self._end_frame_fonts[i]).end_frame()
+        fonts_m.unlock()
         self.run_handlers()
         self.last_t_after_rendering = ctime.monotonic_ns()
         if self.redraw_needed:
@@ -3582,7 +4821,30 @@ cdef class Viewport(baseItem):
             dst_p[0] = <float>p[0]
             dst_p[1] = <float>p[1]
 
-    cdef void screen_to_coordinate(self, double *dst_p, float[2] src_p) noexcept nogil:
+    cdef void coordinates_to_screen(self, float *dst_p, const double *src_p, int32_t n) noexcept nogil:
+        """
+        Bulk version of coordinate_to_screen for n points.
+
+        src_p and dst_p are arrays of n interleaved (x, y) pairs.
+        The transform is retrieved once for all the points,
+        which matters inside plots where it depends on
+        the axes (linear, log, time, etc).
+        """
+        # assumes imgui + viewport mutex are held
+        cdef int32_t i
+        cdef double scale_x, scale_y, shift_x, shift_y
+        if self.in_plot:
+            PlotToPixelsBulk(dst_p, src_p, n, self.plot_fit)
+            return
+        scale_x = self.scales[0]
+        scale_y = self.scales[1]
+        shift_x = self.shifts[0]
+        shift_y = self.shifts[1]
+        for i in range(n):
+            dst_p[2*i] = <float>(src_p[2*i] * scale_x + shift_x)
+            dst_p[2*i+1] = <float>(src_p[2*i+1] * scale_y + shift_y)
+
+    cdef void screen_to_coordinate(self, double *dst_p, float[2] src_p) noexcept nogil:
         """
         Used during rendering as helper to convert pixel coordinates to drawing coordinates
         """
@@ -3829,60 +5091,69 @@ cdef class Viewport(baseItem):
             style_p.AnnotationPadding = imgui.ImVec2(cround(gs*2), cround(gs*2))
             style_p.PlotDefaultSize = imgui.ImVec2(cround(gs*400), cround(gs*300))
             style_p.PlotMinSize = imgui.ImVec2(cround(gs*200), cround(gs*150))
-        with nogil:
-            backend_m.lock()
-            self_m.unlock()
-            # Process input events.
-            # Doesn't need imgui mutex.
-            # if wait_for_input is set, can take a long time
-            current_time_s = self.last_t_before_event_handling * 1e-9
-            target_timeout_ms = (self._target_refresh_time - current_time_s) * 1000.
-            target_timeout_ms = max(0., ceil(target_timeout_ms))
-            (<platformViewport*>self._platform).processEvents(<int>target_timeout_ms)
-            if self.wait_for_input:
-                self._target_refresh_time = current_time_s + 5.
-            else:
-                self._target_refresh_time = 0
-            backend_m.unlock() # important to respect lock order
-            # Core rendering - uses imgui and viewport
-            imgui_m.lock()
-            self_m.lock()
-            backend_m.lock()
-            #self.last_t_before_rendering = ctime.monotonic_ns()
+        try:
+            with nogil:
+                self.context.start_callback_batch()
+                backend_m.lock()
+                self_m.unlock()
+                # Process input events.
+                # Doesn't need imgui mutex.
+                # if wait_for_input is set, can take a long time
+                current_time_s = self.last_t_before_event_handling * 1e-9
+                target_timeout_ms = (self._target_refresh_time - current_time_s) * 1000.
+                target_timeout_ms = max(0., ceil(target_timeout_ms))
+                (<platformViewport*>self._platform).processEvents(<int>target_timeout_ms)
+                if self.wait_for_input:
+                    self._target_refresh_time = current_time_s + 5.
+                else:
+                    self._target_refresh_time = 0
+                backend_m.unlock() # important to respect lock order
+                # Core rendering - uses imgui and viewport
+                imgui_m.lock()
+                self_m.lock()
+                backend_m.lock()
+                #self.last_t_before_rendering = ctime.monotonic_ns()
             
-            #imgui.GetMainViewport().DpiScale = self.viewport.dpi
-            #imgui.GetIO().FontGlobalScale = self.viewport.dpi
-            should_present = \
-                (<platformViewport*>self._platform).renderFrame(can_skip_presenting)
-            #self.last_t_after_rendering = ctime.monotonic_ns()
-            backend_m.unlock()
-            self_m.unlock()
-            imgui_m.unlock()
-            # Present doesn't use imgui but can take time (vsync)
-            backend_m.lock()
-            if should_present:
-                if self._retrieve_framebuffer:
-                    with gil:
-                        try:
-                            while True:
-                                framebuffer = Texture(self.context)
-                                framebuffer.allocate(width=(<platformViewport*>self._platform).frameWidth,
-                                                     height=(<platformViewport*>self._platform).frameHeight,
-                                                     num_chans=4,
-                                                     uint8=True)
-                                if not (<platformViewport*>self._platform).backBufferToTexture(framebuffer.allocated_texture,
-                                                                                               framebuffer.width,
-                                                                                               framebuffer.height,
-                                                                                               framebuffer.num_chans,
-                                                                                               framebuffer._buffer_type):
+                #imgui.GetMainViewport().DpiScale = self.viewport.dpi
+                #imgui.GetIO().FontGlobalScale = self.viewport.dpi
+                should_present = \
+                    (<platformViewport*>self._platform).renderFrame(can_skip_presenting)
+                #self.last_t_after_rendering = ctime.monotonic_ns()
+                backend_m.unlock()
+                self_m.unlock()
+                imgui_m.unlock()
+                # Present doesn't use imgui but can take time (vsync)
+                backend_m.lock()
+                if should_present:
+                    if self._retrieve_framebuffer:
+                        with gil:
+                            try:
+                                while True:
+                                    framebuffer = Texture(self.context)
+                                    framebuffer.allocate(width=(<platformViewport*>self._platform).frameWidth,
+                                                         height=(<platformViewport*>self._platform).frameHeight,
+                                                         num_chans=4,
+                                                         uint8=True)
+                                    if not (<platformViewport*>self._platform).backBufferToTexture(framebuffer.allocated_texture,
+                                                                                                   framebuffer.width,
+                                                                                                   framebuffer.height,
+                                                                                                   framebuffer.num_chans,
+                                                                                                   framebuffer._buffer_type):
+                                        break
+                                    self._frame_buffer = framebuffer
                                     break
-                                self._frame_buffer = framebuffer
-                                break
-                        except Exception as e:
-                            print(f"Failed to retrieve framebuffer: {e}")
-                (<platformViewport*>self._platform).present()
-            backend_m.unlock()
-        if not(should_present) and (<platformViewport*>self._platform).hasVSync:
+                            except Exception as e:
+                                print(f"Failed to retrieve framebuffer: {e}")
+                    if self._capture_frames > 0:
+                        self.__capture_frame()
+                    (<platformViewport*>self._platform).present()
+                backend_m.unlock()
+        finally:
+            # Submit the callbacks issued during the frame.
+            # Also stops collecting them if the frame failed.
+            self.context.flush_callback_batch()
+        if not(should_present) and (<platformViewport*>self._platform).hasVSync and \
+           not((<platformViewport*>self._platform).isHeadless):
             # cap 'cpu' framerate when not presenting
             python_time.sleep(0.005)
         lock_gil_friendly(self_m, self.mutex)
@@ -3945,6 +5216,161 @@ cdef class Viewport(baseItem):
     cdef void *get_platform_window(self) noexcept nogil:
         return (<SDLViewport*>self._platform).getSDLWindowHandle()
 
+    cdef void profile_draw_begin(self, baseItem item) noexcept nogil:
+        """
+        Record the start of the draw of an item.
+        Must be called during rendering, when
+        profile_draws is set.
+        """
+        cdef uintptr_t item_type = <uintptr_t>(<PyObject*>item).ob_type
+        cdef int32_t type_index
+        cdef unordered_map[uintptr_t, int32_t].iterator it = \
+            self._draw_profile_type_indices.find(item_type)
+        if it == self._draw_profile_type_indices.end():
+            # First time this class is seen.
+            # Hold a reference as records outlive the items
+            with gil:
+                Py_INCREF(<object><PyObject*>item_type)
+            type_index = <int32_t>self._draw_profile_types.size()
+            self._draw_profile_types.push_back(<PyObject*>item_type)
+            self._draw_profile_type_indices[item_type] = type_index
+        else:
+            type_index = dereference(it).second
+        cdef int64_t seq = self._draw_records_next
+        cdef draw_record *record = &self._draw_records[seq % self._draw_records.size()]
+        record.uuid = item.uuid
+        record.parent = -1 if self._draw_records_stack.empty() else \
+                        self._draw_records_stack.back()
+        record.type_index = type_index
+        record.end_ns = 0
+        self._draw_records_stack.push_back(seq)
+        self._draw_records_next = seq + 1
+        record.start_ns = ctime.monotonic_ns()
+
+    cdef void profile_draw_end(self) noexcept nogil:
+        """
+        Record the end of the draw started by the
+        last profile_draw_begin call.
+        """
+        cdef int64_t end_ns = ctime.monotonic_ns()
+        if self._draw_records_stack.empty():
+            return
+        cdef int64_t seq = self._draw_records_stack.back()
+        self._draw_records_stack.pop_back()
+        cdef int64_t capacity = <int64_t>self._draw_records.size()
+        if seq < self._draw_records_next - capacity:
+            # Overwritten
+            return
+        self._draw_records[seq % capacity].end_ns = end_ns
+
+    cdef void register_end_frame_font(self, baseFont font):
+        """
+        Call font.end_frame() at the end of the rendering of
+        every frame. No reference is held: the font must
+        unregister itself before being deallocated.
+        """
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self._end_frame_fonts_mutex)
+        self._end_frame_fonts.push_back(<PyObject*>font)
+
+    cdef void unregister_end_frame_font(self, baseFont font):
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self._end_frame_fonts_mutex)
+        cdef DCGVector[PyObject*] kept
+        cdef int32_t i
+        for i in range(<int>self._end_frame_fonts.size()):
+            if self._end_frame_fonts[i] != <PyObject*>font:
+                kept.push_back(self._end_frame_fonts[i])
+        self._end_frame_fonts = kept
+
+    cdef void __free_capture_slots(self, bint all_slots) noexcept nogil:
+        """
+        Free the capture buffers not in use.
+        Slots whose arrays are still referenced are removed
+        from the ring, and freed when the arrays are released.
+        The capture mutex must be held.
+        """
+        cdef int32_t i
+        cdef DCGVector[capture_slot] kept
+        (<platformViewport*>self._platform).makeUploadContextCurrent()
+        for i in range(<int>self._capture_slots.size()):
+            if self._capture_slots[i].state == 2:
+                continue
+            if all_slots or self._capture_slots[i].state == 0:
+                (<platformViewport*>self._platform).freeUploadBuffer(self._capture_slots[i].buffer)
+            else:
+                kept.push_back(self._capture_slots[i])
+        (<platformViewport*>self._platform).releaseUploadContext()
+        self._capture_slots = kept
+
+    cdef void __capture_frame(self) noexcept nogil:
+        """
+        Queue the readback of the frame being presented
+        into a free slot of the capture ring.
+        """
+        cdef unique_lock[DCGMutex] m = unique_lock[DCGMutex](self._capture_mutex)
+        if self._capture_frames <= 0:
+            return
+        cdef int32_t width = (<platformViewport*>self._platform).frameWidth
+        cdef int32_t height = (<platformViewport*>self._platform).frameHeight
+        if width <= 0 or height <= 0:
+            return
+        cdef size_t size = <size_t>width * <size_t>height * 4
+        cdef capture_slot slot
+        cdef int32_t i, index = -1
+        for i in range(<int>self._capture_slots.size()):
+            if self._capture_slots[i].state != 0:
+                continue
+            index = i
+            if self._capture_slots[i].size >= size:
+                break
+        if index < 0 and <int32_t>self._capture_slots.size() < self._capture_frames:
+            slot.buffer = NULL
+            slot.size = 0
+            slot.state = 0
+            self._capture_slots.push_back(slot)
+            index = self._capture_slots.size() - 1
+        if index < 0:
+            self._capture_dropped += 1
+            return
+        if self._capture_slots[index].size < size:
+            # The frame is larger than the buffer
+            (<platformViewport*>self._platform).makeUploadContextCurrent()
+            if self._capture_slots[index].buffer != NULL:
+                (<platformViewport*>self._platform).freeUploadBuffer(self._capture_slots[index].buffer)
+            self._capture_slots[index].buffer = \
+                (<platformViewport*>self._platform).allocateReadbackBuffer(size)
+            (<platformViewport*>self._platform).releaseUploadContext()
+            self._capture_slots[index].size = size if self._capture_slots[index].buffer != NULL else 0
+            self._capture_slots[index].id = self._capture_next_id
+            self._capture_next_id += 1
+            if self._capture_slots[index].buffer == NULL:
+                self._capture_dropped += 1
+                return
+        if not((<platformViewport*>self._platform).backBufferToReadbackBuffer(
+                self._capture_slots[index].buffer, width, height)):
+            self._capture_dropped += 1
+            return
+        self._capture_slots[index].width = width
+        self._capture_slots[index].height = height
+        self._capture_slots[index].frame = self.frame_count
+        self._capture_slots[index].timestamp_ns = ctime.monotonic_ns()
+        self._capture_slots[index].state = 1
+
+    cdef void __reset_draw_profile(self):
+        """
+        Clear the draw records and release
+        the references to the item classes.
+        """
+        cdef int32_t i
+        for i in range(<int>self._draw_profile_types.size()):
+            Py_DECREF(<object>self._draw_profile_types[i])
+        self._draw_profile_types.clear()
+        self._draw_profile_type_indices.clear()
+        self._draw_records_stack.clear()
+        self._draw_records_next = 0
+        self._draw_frames_recorded = 0
+
 # Callbacks
 
 
@@ -4119,10 +5545,140 @@ cdef class drawingItem(baseItem):
         baseItem._copy(self, target_base)
     '''
 
+    def __setattr__(self, name, value):
+        PyObject_GenericSetAttr(self, name, value)
+        # Any attribute change may move the item
+        self._bounds_valid = False
+
     cdef void draw(self, void* l) noexcept nogil:
         cdef unique_lock[DCGMutex] m = unique_lock[DCGMutex](self.mutex)
         return
 
+    cdef bint compute_bounds(self) noexcept nogil:
+        """
+        Fills _bounds (and _bounds_radius, _bounds_padding,
+        _bounds_thickness) with the extent of the item.
+        Returns False if the item cannot be bounded,
+        in which case it is never culled.
+        Called with the item mutex held.
+        """
+        return False
+
+
+def _get_culling(baseItem self):
+    """
+    Writable attribute: skip the children outside
+    the visible region.
+
+    When set, the bounds of the children in coordinate
+    space are cached (and invalidated whenever one of
+    their attributes is set), and the children whose
+    bounds do not intersect the clip region are not
+    drawn. Children without known bounds (texts,
+    values, lists, etc) are always drawn.
+    In plots, culling is disabled during the frames
+    where the plot fits its content.
+    This is worth it for large numbers of children of
+    which only a part is visible at a time.
+    Default is False.
+    """
+    cdef unique_lock[DCGMutex] m
+    lock_gil_friendly(m, self.mutex)
+    return self._culling_children
+
+def _set_culling(baseItem self, bint value):
+    cdef unique_lock[DCGMutex] m
+    lock_gil_friendly(m, self.mutex)
+    self._culling_children = value
+
+def _get_culling_margin(baseItem self):
+    """
+    Writable attribute: margin in pixels added around
+    the clip region when culling.
+
+    Covers the antialiasing and the approximations of
+    the bounds (non-linear axes, etc).
+    Default is 8.
+    """
+    cdef unique_lock[DCGMutex] m
+    lock_gil_friendly(m, self.mutex)
+    return self._culling_margin
+
+def _set_culling_margin(baseItem self, float value):
+    cdef unique_lock[DCGMutex] m
+    lock_gil_friendly(m, self.mutex)
+    if value < 0:
+        raise ValueError("culling_margin must be positive")
+    self._culling_margin = value
+
+# Shared by the items that can cull their drawing children
+_culling_property = property(_get_culling, _set_culling,
+                             doc=_get_culling.__doc__)
+_culling_margin_property = property(_get_culling_margin, _set_culling_margin,
+                                    doc=_get_culling_margin.__doc__)
+
+cdef void draw_drawing_children_culled(baseItem item,
+                                      void* drawlist) noexcept nogil:
+    """
+    Same as draw_drawing_children, but skips the
+    children whose cached bounds do not intersect
+    the current clip region (extended by the
+    culling margin of the item).
+    """
+    if item.last_drawings_child is None:
+        return
+    cdef float margin = item._culling_margin
+    cdef imgui.ImVec2 clip_min = (<imgui.ImDrawList*>drawlist).GetClipRectMin()
+    cdef imgui.ImVec2 clip_max = (<imgui.ImDrawList*>drawlist).GetClipRectMax()
+    cdef float[2] corner
+    cdef double[2] c1
+    cdef double[2] c2
+    corner[0] = clip_min.x - margin
+    corner[1] = clip_min.y - margin
+    item.context.viewport.screen_to_coordinate(c1, corner)
+    corner[0] = clip_max.x + margin
+    corner[1] = clip_max.y + margin
+    item.context.viewport.screen_to_coordinate(c2, corner)
+    # The transform may flip the axes
+    cdef double xmin = min(c1[0], c2[0])
+    cdef double xmax = max(c1[0], c2[0])
+    cdef double ymin = min(c1[1], c2[1])
+    cdef double ymax = max(c1[1], c2[1])
+    # Coordinate extent of a pixel on each axis, to convert
+    # the radial extents, which are in pixels once scaled.
+    cdef double pixel_x = (xmax - xmin) / max(1., clip_max.x - clip_min.x + 2. * margin)
+    cdef double pixel_y = (ymax - ymin) / max(1., clip_max.y - clip_min.y + 2. * margin)
+    cdef double extent, thickness
+
+    cdef PyObject *child = <PyObject*> item.last_drawings_child
+    while (<baseItem>child).prev_sibling is not None:
+        child = <PyObject *>(<baseItem>child).prev_sibling
+    while (<baseItem>child) is not None:
+        if not((<drawingItem>child)._bounds_valid):
+            (<drawingItem>child).mutex.lock()
+            (<drawingItem>child)._bounds_radius = 0.
+            (<drawingItem>child)._bounds_padding = 0.
+            (<drawingItem>child)._bounds_thickness = 0.
+            (<drawingItem>child)._has_bounds = (<drawingItem>child).compute_bounds()
+            (<drawingItem>child)._bounds_valid = True
+            (<drawingItem>child).mutex.unlock()
+        if (<drawingItem>child)._has_bounds:
+            # Same scaling as the draw() of the items
+            thickness = (<drawingItem>child)._bounds_thickness * item.context.viewport.thickness_multiplier
+            if thickness > 0:
+                thickness *= item.context.viewport.size_multiplier
+            extent = (<drawingItem>child)._bounds_radius * item.context.viewport.size_multiplier + \
+                     (<drawingItem>child)._bounds_padding * item.context.viewport.global_scale + \
+                     abs(thickness)
+            if (<drawingItem>child)._bounds[0] - extent * pixel_x > xmax or \
+               (<drawingItem>child)._bounds[2] + extent * pixel_x < xmin or \
+               (<drawingItem>child)._bounds[1] - extent * pixel_y > ymax or \
+               (<drawingItem>child)._bounds[3] + extent * pixel_y < ymin:
+                child = <PyObject *>(<baseItem>child).next_sibling
+                continue
+        draw_child(<baseItem>child, drawlist)
+        child = <PyObject *>(<baseItem>child).next_sibling
+
 
 """
 InvisibleDrawButton: main difference with InvisibleButton
@@ -6912,6 +8468,211 @@ cdef class AxisTag(baseItem):
 Textures
 """
 
+cdef enum:
+    # Number of staging buffers used for the asynchronous uploads of a texture
+    TEXTURE_UPLOAD_BUFFERS = 3
+    # Flags of Texture._upload_buffers_in_use
+    UPLOAD_BUFFER_PENDING = 1 # upload not submitted or cancelled yet
+    UPLOAD_BUFFER_MAPPED = 2 # an array pointing to the buffer is alive
+
+cdef cnp.ndarray convert_texture_content(cnp.ndarray content, bint to_uint8):
+    """
+    Convert content to the type of an existing texture
+    allocation, with the normalization set_value assumes:
+    float data in [0, 1] corresponds to uint8 data in [0, 255].
+    """
+    if to_uint8:
+        if content.dtype == np.uint8:
+            return content
+        if content.dtype.kind == 'f':
+            content = np.rint(np.asarray(content, dtype=np.float32) * np.float32(255.))
+        return np.clip(content, 0, 255).astype(np.uint8)
+    if content.dtype == np.float32:
+        return content
+    if content.dtype == np.uint8:
+        return np.asarray(content, dtype=np.float32) / np.float32(255.)
+    return np.asarray(content, dtype=np.float32)
+
+cdef class _TextureUploadMemory:
+    """
+    Base object of the array of a TextureUpload.
+
+    The staging buffer is not reused, nor freed,
+    until the array (and thus this object) is released.
+    """
+    cdef Texture _texture
+    cdef int32_t _index
+
+    def __dealloc__(self):
+        if self._texture is None:
+            return
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self._texture.mutex)
+        if self._index < <int32_t>self._texture._upload_buffers_in_use.size():
+            self._texture._upload_buffers_in_use[self._index] &= ~UPLOAD_BUFFER_MAPPED
+
+cdef class TextureUpload:
+    """
+    Handle of an asynchronous upload of a Texture content.
+
+    Obtained with Texture.begin_upload() or
+    Texture.set_value_async().
+
+    The content to upload is written into array, which
+    is mapped directly to the memory the GPU reads from.
+    submit() then queues the upload and returns without
+    waiting for the GPU. The items displaying the
+    texture show the new content starting from the next
+    rendered frame.
+
+    Can be used as a context manager, in which case
+    submit() is called on exit (or cancel() if an
+    exception occured).
+    """
+    cdef Texture _texture
+    cdef void* _buffer
+    cdef int32_t _index
+    cdef cnp.ndarray _array
+    cdef bint _submitted
+    cdef bint _released
+
+    def __dealloc__(self):
+        self._release()
+
+    cdef void _release(self):
+        if self._released or self._texture is None:
+            return
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self._texture.mutex)
+        self._released = True
+        if self._index < <int32_t>self._texture._upload_buffers_in_use.size():
+            self._texture._upload_buffers_in_use[self._index] &= ~UPLOAD_BUFFER_PENDING
+        # The buffer stays reserved while the
+        # user still references the array
+        self._array = None
+
+    @property
+    def array(self):
+        """
+        Writable numpy array of shape (height, width, num_chans)
+        mapped to the staging memory of the upload.
+
+        It must not be written to after submit(). The staging
+        memory is not reused while the array is referenced.
+        None after submit() or cancel().
+        """
+        return self._array
+
+    @property
+    def texture(self):
+        """
+        Texture targetted by the upload
+        """
+        return self._texture
+
+    def submit(self):
+        """
+        Queue the upload of the content of array to the texture.
+
+        Returns without waiting for the GPU to have processed
+        the upload (see done and wait()).
+        """
+        if self._submitted or self._released:
+            raise ValueError("The upload was already submitted or cancelled")
+        cdef Texture texture = self._texture
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, texture.mutex)
+        cdef void* target
+        cdef bint success
+        cdef unsigned type_size = 1 if texture._buffer_type == 1 else 4
+        with nogil:
+            m.unlock()
+            (<platformViewport*>texture.context.viewport._platform).makeUploadContextCurrent()
+            m.lock()
+            # When reallocations are allowed, the upload targets
+            # a second texture, which is then swapped with the
+            # displayed one. Thus the frame being rendered is
+            # not affected.
+            target = texture._back_texture if texture._back_texture != NULL \
+                     else texture.allocated_texture
+            # The texture may have been reallocated since begin_upload
+            success = target != NULL and \
+                texture._upload_width == texture.width and \
+                texture._upload_height == texture.height and \
+                texture._upload_num_chans == texture.num_chans and \
+                texture._upload_buffer_type == texture._buffer_type and \
+                (<platformViewport*>texture.context.viewport._platform).uploadBufferToTexture(
+                    self._buffer,
+                    target,
+                    0, 0,
+                    texture.width,
+                    texture.height,
+                    texture.num_chans,
+                    texture._buffer_type,
+                    texture.width * texture.num_chans * type_size)
+            (<platformViewport*>texture.context.viewport._platform).releaseUploadContext()
+            if success and texture._back_texture != NULL:
+                texture._back_texture = texture.allocated_texture
+                texture.allocated_texture = target
+        m.unlock()
+        self._submitted = True
+        self._release()
+        if not(success):
+            raise ValueError("Failed to upload the texture content")
+
+    def cancel(self):
+        """
+        Release the staging memory without uploading.
+        """
+        if self._submitted:
+            raise ValueError("The upload was already submitted")
+        self._release()
+
+    @property
+    def done(self):
+        """
+        Whether the GPU has finished processing the upload.
+        """
+        if not(self._submitted):
+            return False
+        cdef Texture texture = self._texture
+        cdef bint ready
+        with nogil:
+            (<platformViewport*>texture.context.viewport._platform).makeUploadContextCurrent()
+            ready = (<platformViewport*>texture.context.viewport._platform).isUploadBufferReady(self._buffer)
+            (<platformViewport*>texture.context.viewport._platform).releaseUploadContext()
+        return ready
+
+    def wait(self, timeout=None):
+        """
+        Wait for the GPU to have finished processing the upload.
+
+        timeout: maximum time to wait in seconds (None for no limit)
+
+        Returns done.
+        """
+        if not(self._submitted):
+            raise ValueError("The upload must be submitted before waiting")
+        cdef double deadline = 0.
+        if timeout is not None:
+            deadline = python_time.monotonic() + timeout
+        while not(self.done):
+            if timeout is not None and python_time.monotonic() >= deadline:
+                return False
+            python_time.sleep(0.0005)
+        return True
+
+    def __enter__(self):
+        return self.array
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self.cancel()
+        else:
+            self.submit()
+        return False
+
+
 cdef class Texture(baseItem):
     """
     Represents a texture that can be used in the UI.
@@ -6934,6 +8695,14 @@ cdef class Texture(baseItem):
         self.num_chans = 0
         self._buffer_type = 0
         self._filtering_mode = 0
+        self._back_texture = NULL
+        self._next_upload_buffer = 0
+        self._upload_width = 0
+        self._upload_height = 0
+        self._upload_num_chans = 0
+        self._upload_buffer_type = 0
+        self._uv_offset = [0., 0.]
+        self._uv_scale = [1., 1.]
 
     def __dealloc__(self):
         cdef unique_lock[DCGMutex] imgui_m
@@ -6948,8 +8717,27 @@ cdef class Texture(baseItem):
            and self.context.viewport is not None:
             (<platformViewport*>self.context.viewport._platform).makeUploadContextCurrent()
             (<platformViewport*>self.context.viewport._platform).freeTexture(self.allocated_texture)
+            self._free_upload_resources()
             (<platformViewport*>self.context.viewport._platform).releaseUploadContext()
 
+    cdef void _free_upload_resources(self) noexcept nogil:
+        """
+        Free the resources of the asynchronous uploads.
+        The upload context must be current.
+        """
+        cdef int32_t i
+        if self._back_texture != NULL:
+            (<platformViewport*>self.context.viewport._platform).freeTexture(self._back_texture)
+            self._back_texture = NULL
+        for i in range(<int>self._upload_buffers.size()):
+            (<platformViewport*>self.context.viewport._platform).freeUploadBuffer(self._upload_buffers[i])
+        self._upload_buffers.clear()
+        self._upload_buffers_in_use.clear()
+        self._upload_width = 0
+        self._upload_height = 0
+        self._upload_num_chans = 0
+        self._upload_buffer_type = 0
+
     def configure(self, *args, **kwargs):
         # set parameters before set_content
         baseItem.configure(self, **kwargs)
@@ -7054,9 +8842,22 @@ cdef class Texture(baseItem):
             raise ValueError("Invalid texture format. Float32 or uint8 must be set")
 
         cdef bint success
+        cdef bint busy = False
+        cdef int32_t i
         with nogil:
             (<platformViewport*>self.context.viewport._platform).makeUploadContextCurrent()
             self.mutex.lock()
+            # The resources of the asynchronous uploads
+            # are for the previous allocation
+            if self._back_texture != NULL:
+                (<platformViewport*>self.context.viewport._platform).freeTexture(self._back_texture)
+                self._back_texture = NULL
+            for i in range(<int>self._upload_buffers_in_use.size()):
+                if self._upload_buffers_in_use[i]:
+                    busy = True
+            if not(busy):
+                # Else freed by the next begin_upload
+                self._free_upload_resources()
             self.allocated_texture = \
                 (<platformViewport*>self.context.viewport._platform).allocateTexture(width,
                                                                     height,
@@ -7071,12 +8872,13 @@ cdef class Texture(baseItem):
                 self.height = height
                 self.num_chans = num_chans
                 self._buffer_type = buffer_type
+                self._no_realloc = no_realloc
             self.mutex.unlock()
         if not(success):
             raise MemoryError("Failed to allocate target texture")
 
 
-    def set_value(self, value):
+    def set_value(self, value, x0=None, y0=None):
         """
         Pass an array as texture data.
         The currently native formats are:
@@ -7101,8 +8903,127 @@ cdef class Texture(baseItem):
         need to bind it again to the objects it is
         bound. The objects will automatically take
         the updated texture.
+
+        If x0 or y0 is passed, only the region of the
+        texture starting at (x0, y0) (column, row) and of
+        the size of value is updated. The texture must
+        have been allocated before, the region must
+        fit in the texture, and the number of channels
+        must match. Only the region is transferred to
+        the GPU, thus the cost scales with its area.
+        See also set_value_regions.
+        """
+        if x0 is None and y0 is None:
+            self.set_content(np.asarray(value))
+        else:
+            self.set_regions([(0 if x0 is None else x0,
+                               0 if y0 is None else y0,
+                               value)])
+
+    def set_value_regions(self, regions):
         """
-        self.set_content(np.asarray(value))
+        Update several regions of the texture at once.
+
+        regions: iterable of (x0, y0, value) tuples, where
+            value is an array of shape (height, width, num_chans)
+            to write at column x0 and row y0 of the texture.
+
+        Equivalent to calling set_value(value, x0=x0, y0=y0)
+        for each region, but all the regions are uploaded
+        in a single pass. Regions are written in order,
+        thus later regions overwrite earlier ones where
+        they overlap.
+        """
+        self.set_regions([(x0, y0, value) for (x0, y0, value) in regions])
+
+    cdef void set_regions(self, list regions):
+        cdef unique_lock[DCGMutex] m
+        cdef unique_lock[DCGMutex] m2
+        lock_gil_friendly(m, self._write_mutex)
+        lock_gil_friendly(m2, self.mutex)
+        if self._readonly:
+            raise ValueError("Target texture is read-only")
+        if self.allocated_texture == NULL:
+            raise ValueError("The texture must be allocated before updating regions")
+        cdef type dtype = np.uint8 if self._buffer_type == 1 else np.float32
+        cdef int32_t type_size = 1 if self._buffer_type == 1 else 4
+        # Keep references to the converted arrays during the upload
+        cdef list contents = []
+        cdef DCGVector[void*] datas
+        cdef DCGVector[int32_t] params # x0, y0, width, height, stride
+        cdef cnp.ndarray content
+        cdef int32_t x0, y0, width, height, num_chans, ndim
+        for (x, y, value) in regions:
+            x0 = x
+            y0 = y
+            content = np.asarray(value)
+            ndim = cnp.PyArray_NDIM(content)
+            if ndim > 3 or ndim == 0:
+                raise ValueError("Invalid number of texture dimensions")
+            height = cnp.PyArray_DIM(content, 0)
+            width = cnp.PyArray_DIM(content, 1) if ndim >= 2 else 1
+            num_chans = cnp.PyArray_DIM(content, 2) if ndim >= 3 else 1
+            if width * height == 0:
+                continue
+            if num_chans != self.num_chans:
+                raise ValueError(f"Region has {num_chans} channels, but the texture has {self.num_chans}")
+            if x0 < 0 or y0 < 0 or x0 + width > self.width or y0 + height > self.height:
+                raise ValueError(f"Region of size {width}x{height} at ({x0}, {y0}) "
+                                 f"does not fit in the texture of size {self.width}x{self.height}")
+            if content.dtype != dtype:
+                # float32 data is expected normalized, as in set_value
+                content = convert_texture_content(content, self._buffer_type == 1)
+            # rows must be contiguous
+            if ndim >= 2 and cnp.PyArray_STRIDE(content, 1) != num_chans * type_size:
+                content = np.ascontiguousarray(content)
+            contents.append(content)
+            datas.push_back(cnp.PyArray_DATA(content))
+            params.push_back(x0)
+            params.push_back(y0)
+            params.push_back(width)
+            params.push_back(height)
+            params.push_back(cnp.PyArray_STRIDE(content, 0))
+
+        cdef bint success = True
+        cdef int32_t i
+        with nogil:
+            m2.unlock()
+            (<platformViewport*>self.context.viewport._platform).makeUploadContextCurrent()
+            m2.lock()
+            # The texture might have been freed while the lock was released
+            success = self.allocated_texture != NULL
+            for i in range(<int>datas.size()):
+                if not(success):
+                    break
+                if self._dynamic:
+                    success = \
+                        (<platformViewport*>self.context.viewport._platform).updateDynamicTexture(
+                                                     self.allocated_texture,
+                                                     params[5*i+2],
+                                                     params[5*i+3],
+                                                     self.num_chans,
+                                                     self._buffer_type,
+                                                     datas[i],
+                                                     params[5*i+4],
+                                                     params[5*i],
+                                                     params[5*i+1])
+                else:
+                    success = \
+                        (<platformViewport*>self.context.viewport._platform).updateStaticTexture(
+                                                     self.allocated_texture,
+                                                     params[5*i+2],
+                                                     params[5*i+3],
+                                                     self.num_chans,
+                                                     self._buffer_type,
+                                                     datas[i],
+                                                     params[5*i+4],
+                                                     params[5*i],
+                                                     params[5*i+1])
+            (<platformViewport*>self.context.viewport._platform).releaseUploadContext()
+            m.unlock()
+            m2.unlock() # Release before we get gil again
+        if not(success):
+            raise MemoryError("Failed to upload the texture regions")
 
     cdef void set_content(self, cnp.ndarray content): # TODO: deadlock when held by external lock
         # The write mutex is to ensure order of processing of set_content
@@ -7161,6 +9082,9 @@ cdef class Texture(baseItem):
                 (<platformViewport*>self.context.viewport._platform).makeUploadContextCurrent()
                 (<platformViewport*>self.context.viewport._platform).freeTexture(self.allocated_texture)
                 self.allocated_texture = NULL
+                if self._back_texture != NULL:
+                    (<platformViewport*>self.context.viewport._platform).freeTexture(self._back_texture)
+                    self._back_texture = NULL
                 self.context.imgui_mutex.unlock()
             else:
                 m2.unlock()
@@ -7199,7 +9123,8 @@ cdef class Texture(baseItem):
                                                      num_chans,
                                                      buffer_type,
                                                      cnp.PyArray_DATA(content),
-                                                     stride)
+                                                     stride,
+                                                     0, 0)
                 else:
                     success = (<platformViewport*>self.context.viewport._platform).updateStaticTexture(
                                                     self.allocated_texture,
@@ -7208,13 +9133,165 @@ cdef class Texture(baseItem):
                                                     num_chans,
                                                     buffer_type,
                                                     cnp.PyArray_DATA(content),
-                                                    stride)
+                                                    stride,
+                                                    0, 0)
             (<platformViewport*>self.context.viewport._platform).releaseUploadContext()
             m.unlock()
             m2.unlock() # Release before we get gil again
         if not(success):
             raise MemoryError("Failed to upload target texture")
 
+    def begin_upload(self):
+        """
+        Start an asynchronous upload of the texture content.
+
+        Returns a TextureUpload, whose array attribute is a
+        writable numpy array of shape (height, width, num_chans)
+        mapped directly to the memory the GPU will read from.
+        Write the new content into it, and call submit().
+        No intermediate copy occurs, and neither the rendering
+        nor the caller wait for the transfer to the GPU.
+
+        The texture must have been allocated before
+        (allocate() or set_value()), and the upload has
+        the same size and format as the allocation.
+
+        A ring of a few staging buffers is used, such that
+        several uploads can be in flight. begin_upload only waits
+        if the GPU hasn't finished processing the upload
+        that used the same staging buffer.
+
+        If the texture can be reallocated (no_realloc not set
+        in allocate()), the content is uploaded to a second
+        texture, swapped with the displayed one on submit(),
+        such that the frame being rendered is not affected.
+        texture_id changes in that case.
+        """
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        if self._readonly:
+            raise ValueError("Target texture is read-only")
+        if self.allocated_texture == NULL:
+            raise ValueError("The texture must be allocated before asynchronous uploads")
+        cdef size_t type_size = 1 if self._buffer_type == 1 else 4
+        cdef size_t size = <size_t>self.width * <size_t>self.height * \
+                           <size_t>self.num_chans * type_size
+        cdef int32_t i, index = -1
+        cdef bint busy = False
+        cdef bint success = True
+        cdef void *data = NULL
+        with nogil:
+            m.unlock()
+            (<platformViewport*>self.context.viewport._platform).makeUploadContextCurrent()
+            m.lock()
+            if self._upload_width != self.width or \
+               self._upload_height != self.height or \
+               self._upload_num_chans != self.num_chans or \
+               self._upload_buffer_type != self._buffer_type:
+                # The allocation has changed since the last uploads
+                for i in range(<int>self._upload_buffers_in_use.size()):
+                    if self._upload_buffers_in_use[i]:
+                        busy = True
+                if not(busy):
+                    self._free_upload_resources()
+                    self._upload_width = self.width
+                    self._upload_height = self.height
+                    self._upload_num_chans = self.num_chans
+                    self._upload_buffer_type = self._buffer_type
+            if not(busy) and self._upload_buffers.empty():
+                for i in range(TEXTURE_UPLOAD_BUFFERS):
+                    data = (<platformViewport*>self.context.viewport._platform).allocateUploadBuffer(size)
+                    if data == NULL:
+                        success = False
+                        break
+                    self._upload_buffers.push_back(data)
+                    self._upload_buffers_in_use.push_back(0)
+            if not(busy) and success and not(self._no_realloc) and self._back_texture == NULL:
+                self._back_texture = \
+                    (<platformViewport*>self.context.viewport._platform).allocateTexture(self.width,
+                                                                    self.height,
+                                                                    self.num_chans,
+                                                                    1, # dynamic
+                                                                    self._buffer_type,
+                                                                    self._filtering_mode)
+                success = self._back_texture != NULL
+            if not(busy) and success:
+                # Next staging buffer not used by a pending upload
+                for i in range(<int>self._upload_buffers.size()):
+                    if not(self._upload_buffers_in_use[self._next_upload_buffer]):
+                        index = self._next_upload_buffer
+                    self._next_upload_buffer = (self._next_upload_buffer + 1) % <int>self._upload_buffers.size()
+                    if index >= 0:
+                        break
+            if index >= 0:
+                # Waits if the GPU still reads the previous upload
+                data = (<platformViewport*>self.context.viewport._platform).mapUploadBuffer(self._upload_buffers[index])
+                self._upload_buffers_in_use[index] = UPLOAD_BUFFER_PENDING | UPLOAD_BUFFER_MAPPED
+            if not(success):
+                # Arrays of previous uploads may still point to the buffers
+                for i in range(<int>self._upload_buffers_in_use.size()):
+                    if self._upload_buffers_in_use[i]:
+                        busy = True
+                if not(busy):
+                    self._free_upload_resources()
+            (<platformViewport*>self.context.viewport._platform).releaseUploadContext()
+        if not(success):
+            raise MemoryError("Failed to allocate the upload buffers")
+        if busy:
+            raise ValueError("The texture was reallocated while uploads are pending, "
+                             "or while arrays of previous uploads are referenced")
+        if index < 0:
+            raise ValueError("Too many uploads pending. Submit or cancel previous uploads")
+        cdef TextureUpload upload = TextureUpload.__new__(TextureUpload)
+        upload._texture = self
+        upload._buffer = self._upload_buffers[index]
+        upload._index = index
+        cdef cnp.npy_intp[3] dims
+        dims[0] = self.height
+        dims[1] = self.width
+        dims[2] = self.num_chans
+        upload._array = cnp.PyArray_SimpleNewFromData(3, dims,
+                                                      cnp.NPY_UINT8 if self._buffer_type == 1 else cnp.NPY_FLOAT32,
+                                                      data)
+        # The memory remains valid as long as the array is referenced
+        cdef _TextureUploadMemory memory = _TextureUploadMemory.__new__(_TextureUploadMemory)
+        memory._texture = self
+        memory._index = index
+        cnp.set_array_base(upload._array, memory)
+        return upload
+
+    def set_value_async(self, value):
+        """
+        Same as set_value, but without waiting for the
+        upload to the GPU (see begin_upload).
+
+        The value must have the same size and number of
+        channels as the current texture allocation. It is
+        converted to the texture format if needed (float
+        data is normalized between 0 and 1, as in set_value).
+
+        The data can be discarded right after the call.
+
+        Returns a TextureUpload, whose done attribute
+        and wait() method indicate when the GPU
+        has processed the upload.
+        """
+        cdef TextureUpload upload = self.begin_upload()
+        array = upload.array
+        content = np.asarray(value)
+        try:
+            if content.size != array.size or \
+               content.ndim == 0 or content.ndim > 3 or \
+               content.shape[0] != array.shape[0]:
+                raise ValueError("The value must have the size of the texture")
+            content = convert_texture_content(content, array.dtype == np.uint8)
+            np.copyto(array, content.reshape(array.shape))
+        except:
+            upload.cancel()
+            raise
+        upload.submit()
+        return upload
+
     def read(self, int32_t x0=0, int32_t y0=0, int32_t crop_width=0, int32_t crop_height=0):
         """
         Read the texture content. The texture must be
@@ -7349,6 +9426,620 @@ cdef class Texture(baseItem):
         self.c_gl_end_write()
 
 
+cdef class AtlasTexture(Texture):
+    """
+    Region of a page of a TextureAtlas.
+
+    Created with TextureAtlas.add(). Can be used anywhere
+    a Texture is accepted: the items displaying it
+    restrict their texture coordinates to the region.
+    Images sharing the same page are rendered with
+    the same texture, which enables to batch them
+    in the same draw call.
+
+    width, height and num_chans refer to the region.
+    The content can be updated with set_value, in
+    which case the region might be moved if the
+    size changes. The region is released with
+    TextureAtlas.remove().
+    """
+    cdef TextureAtlas _atlas
+    cdef Texture _page
+    cdef int32_t _x
+    cdef int32_t _y
+
+    def __cinit__(self):
+        self._readonly = True
+        self._x = 0
+        self._y = 0
+
+    def __dealloc__(self):
+        # The page is owned by the atlas
+        self.allocated_texture = NULL
+
+    @property
+    def atlas(self):
+        """
+        TextureAtlas the region belongs to.
+        None if the region was removed from the atlas.
+        """
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._atlas
+
+    @property
+    def page(self):
+        """
+        Texture of the atlas page containing the region
+        """
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._page
+
+    @property
+    def rect(self):
+        """
+        (x, y, width, height) of the region in the page, in pixels
+        """
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        return (self._x, self._y, self.width, self.height)
+
+    @property
+    def uv(self):
+        """
+        Texture coordinates (u_min, v_min, u_max, v_max)
+        of the region in the page.
+        """
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        return (self._uv_offset[0], self._uv_offset[1],
+                self._uv_offset[0] + self._uv_scale[0],
+                self._uv_offset[1] + self._uv_scale[1])
+
+    def set_value(self, value, x0=None, y0=None):
+        """
+        Replace the content of the region.
+
+        If x0 or y0 is passed, only the part of the
+        region starting at (x0, y0) is updated.
+        Else if value doesn't have the size of the region,
+        the region is moved to a place of the new size.
+        """
+        if self._atlas is None:
+            raise ValueError("The texture was removed from its atlas")
+        self._atlas.update(self, value, x0, y0)
+
+    def allocate(self, **kwargs):
+        raise ValueError("Atlas textures cannot be allocated. Use TextureAtlas.add")
+
+    def read(self, int32_t x0=0, int32_t y0=0, int32_t crop_width=0, int32_t crop_height=0):
+        """
+        Read the content of the region.
+        See Texture.read.
+        """
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        if self._page is None:
+            raise ValueError("The texture was removed from its atlas")
+        cdef int32_t crop_width_ = crop_width if crop_width > 0 else self.width
+        cdef int32_t crop_height_ = crop_height if crop_height > 0 else self.height
+        if x0 < 0 or y0 < 0 or x0 + crop_width_ > self.width or y0 + crop_height_ > self.height:
+            raise ValueError("Invalid crop coordinates")
+        page = self._page
+        x0 += self._x
+        y0 += self._y
+        m.unlock()
+        return page.read(x0, y0, crop_width_, crop_height_)
+
+
+cdef class TextureAtlas(baseItem):
+    """
+    Packs many small images into a few large textures (pages).
+
+    Each image added with add() gets an AtlasTexture,
+    usable anywhere a Texture is accepted (Image, ImageButton,
+    DrawImage, etc), with the texture coordinates
+    restricted automatically to its region.
+
+    Displaying many images (icons, thumbnails) from
+    separate Texture objects breaks the rendering into one
+    draw call per image. Images of the same page are
+    rendered in a single draw call instead.
+
+    Images are packed in rows (shelves) of similar heights.
+    remove() releases the region of an image, and repack()
+    compacts the remaining images, which is done automatically
+    when the atlas is full or too fragmented.
+
+    Attributes:
+    - page_width, page_height: size of the pages
+    - num_chans: number of channels of the pages (1, 2, 3, 4)
+    - uint8: whether the pages use uint8 rather than float32 data
+    - padding: pixels replicated around each image, to prevent
+        bilinear filtering to sample neighbouring images.
+    - max_pages: maximum number of pages (0 for no limit)
+    - nearest_neighbor_upsampling: filtering of the pages
+    The above can only be set before the first add().
+    """
+    cdef int32_t _page_width
+    cdef int32_t _page_height
+    cdef int32_t _num_chans
+    cdef bint _uint8
+    cdef int32_t _padding
+    cdef int32_t _max_pages
+    cdef bint _nearest_neighbor
+    cdef list _pages # Texture
+    cdef list _shelves # per page: list of [y, height, x_end]
+    cdef list _next_shelf_y # per page
+    cdef list _textures # AtlasTexture
+    cdef int64_t _removed_area
+
+    def __cinit__(self):
+        self.can_have_sibling = False
+        self._page_width = 2048
+        self._page_height = 2048
+        self._num_chans = 4
+        self._uint8 = True
+        self._padding = 1
+        self._max_pages = 0
+        self._nearest_neighbor = False
+        self._pages = []
+        self._shelves = []
+        self._next_shelf_y = []
+        self._textures = []
+        self._removed_area = 0
+
+    cdef void _check_not_started(self):
+        if len(self._pages) > 0:
+            raise ValueError("The atlas parameters cannot be changed after images were added")
+
+    @property
+    def page_width(self):
+        """Width of the pages in pixels (2048 by default)"""
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._page_width
+    @page_width.setter
+    def page_width(self, int32_t value):
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._check_not_started()
+        if value <= 0:
+            raise ValueError("Invalid page width")
+        self._page_width = value
+
+    @property
+    def page_height(self):
+        """Height of the pages in pixels (2048 by default)"""
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._page_height
+    @page_height.setter
+    def page_height(self, int32_t value):
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._check_not_started()
+        if value <= 0:
+            raise ValueError("Invalid page height")
+        self._page_height = value
+
+    @property
+    def num_chans(self):
+        """Number of channels of the pages (4 by default)"""
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._num_chans
+    @num_chans.setter
+    def num_chans(self, int32_t value):
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._check_not_started()
+        if value < 1 or value > 4:
+            raise ValueError("Invalid number of channels")
+        self._num_chans = value
+
+    @property
+    def uint8(self):
+        """
+        Whether the pages store uint8 data (default).
+        If False, float32 data is stored.
+        """
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._uint8
+    @uint8.setter
+    def uint8(self, bint value):
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._check_not_started()
+        self._uint8 = value
+
+    @property
+    def padding(self):
+        """
+        Number of pixels around each image in which
+        its border is replicated (1 by default).
+        Prevents bilinear filtering from blending
+        neighbouring images.
+        """
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._padding
+    @padding.setter
+    def padding(self, int32_t value):
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._check_not_started()
+        if value < 0:
+            raise ValueError("Invalid padding")
+        self._padding = value
+
+    @property
+    def max_pages(self):
+        """
+        Maximum number of pages (0, the default, for no limit).
+        add() raises a MemoryError when the images
+        do not fit.
+        """
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._max_pages
+    @max_pages.setter
+    def max_pages(self, int32_t value):
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        if value < 0:
+            raise ValueError("Invalid number of pages")
+        self._max_pages = value
+
+    @property
+    def nearest_neighbor_upsampling(self):
+        """
+        Whether the pages use nearest neighbor interpolation
+        instead of bilinear interpolation when upscaling.
+        """
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._nearest_neighbor
+    @nearest_neighbor_upsampling.setter
+    def nearest_neighbor_upsampling(self, bint value):
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._check_not_started()
+        self._nearest_neighbor = value
+
+    @property
+    def pages(self):
+        """List of the Texture of each page (read-only)"""
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        return list(self._pages)
+
+    @property
+    def textures(self):
+        """List of the AtlasTexture in the atlas (read-only)"""
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        return list(self._textures)
+
+    @property
+    def occupancy(self):
+        """
+        Fraction of the pages area used by the images
+        (padding included).
+        """
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        if len(self._pages) == 0:
+            return 0.
+        cdef int64_t used = 0
+        cdef AtlasTexture texture
+        for texture in self._textures:
+            used += (texture.width + 2 * self._padding) * (texture.height + 2 * self._padding)
+        return used / float(len(self._pages) * self._page_width * self._page_height)
+
+    cdef cnp.ndarray _prepare_image(self, value):
+        """Convert to the page format and add the padding"""
+        cdef cnp.ndarray image = np.asarray(value)
+        if image.ndim == 2:
+            image = image[:, :, np.newaxis]
+        if image.ndim != 3:
+            raise ValueError("Invalid number of image dimensions")
+        if image.shape[2] != self._num_chans:
+            raise ValueError(f"Image has {image.shape[2]} channels, but the atlas has {self._num_chans}")
+        if image.shape[0] == 0 or image.shape[1] == 0:
+            raise ValueError("Cannot add an empty image")
+        if image.shape[1] + 2 * self._padding > self._page_width or \
+           image.shape[0] + 2 * self._padding > self._page_height:
+            raise ValueError("Image is larger than the atlas pages")
+        image = convert_texture_content(image, self._uint8)
+        if self._padding > 0:
+            image = np.pad(image,
+                           ((self._padding, self._padding),
+                            (self._padding, self._padding),
+                            (0, 0)),
+                           mode="edge")
+        return np.ascontiguousarray(image)
+
+    cdef tuple _find_space(self, int32_t width, int32_t height):
+        """
+        Find a place for a (padded) image of the given size.
+        Returns (page index, x, y), or None if no space is left
+        in the current pages.
+        """
+        cdef int32_t i
+        cdef list shelf
+        cdef list best_shelf
+        cdef int32_t best_page = -1
+        for i in range(len(self._pages)):
+            best_shelf = None
+            # Pick the shelf of the closest height not wasting too much space
+            for shelf in self._shelves[i]:
+                if shelf[1] < height or shelf[1] > 2 * height or \
+                   shelf[2] + width > self._page_width:
+                    continue
+                if best_shelf is None or shelf[1] < best_shelf[1]:
+                    best_shelf = shelf
+            if best_shelf is not None:
+                x = best_shelf[2]
+                best_shelf[2] += width
+                return (i, x, best_shelf[0])
+            if self._next_shelf_y[i] + height <= self._page_height:
+                y = self._next_shelf_y[i]
+                self._shelves[i].append([y, height, width])
+                self._next_shelf_y[i] = y + height
+                return (i, 0, y)
+        return None
+
+    cdef void _add_page(self):
+        cdef Texture page = Texture(self.context)
+        page._filtering_mode = 1 if self._nearest_neighbor else 0
+        page.allocate(width=self._page_width,
+                      height=self._page_height,
+                      num_chans=self._num_chans,
+                      uint8=self._uint8,
+                      float32=not(self._uint8),
+                      no_realloc=True)
+        # Uninitialized memory may contain anything
+        page.set_value(np.zeros((self._page_height, self._page_width, self._num_chans),
+                                dtype=np.uint8 if self._uint8 else np.float32),
+                       x0=0, y0=0)
+        self._pages.append(page)
+        self._shelves.append([])
+        self._next_shelf_y.append(0)
+
+    cdef void _place(self, AtlasTexture texture, cnp.ndarray padded):
+        """Find a place for the padded image, upload it and point the texture to it"""
+        cdef int32_t padded_width = padded.shape[1]
+        cdef int32_t padded_height = padded.shape[0]
+        cdef int64_t total_area = len(self._pages) * self._page_width * self._page_height
+        location = self._find_space(padded_width, padded_height)
+        if location is None and self._removed_area > 0 and \
+           ((self._max_pages > 0 and len(self._pages) >= self._max_pages) or \
+            4 * self._removed_area >= total_area):
+            # Reclaim the space of the removed images
+            try:
+                self._repack()
+                location = self._find_space(padded_width, padded_height)
+            except MemoryError:
+                # The layout was restored. Try with a new page.
+                pass
+        if location is None:
+            if self._max_pages > 0 and len(self._pages) >= self._max_pages:
+                raise MemoryError("The texture atlas is full")
+            self._add_page()
+            location = self._find_space(padded_width, padded_height)
+        (page_index, x, y) = location
+        cdef Texture page = self._pages[page_index]
+        page.set_value(padded, x0=x, y0=y)
+        self._assign(texture, page, x + self._padding, y + self._padding,
+                     padded_width - 2 * self._padding,
+                     padded_height - 2 * self._padding)
+
+    cdef void _assign(self, AtlasTexture texture, Texture page,
+                      int32_t x, int32_t y, int32_t width, int32_t height):
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, texture.mutex)
+        texture._atlas = self
+        texture._page = page
+        texture._x = x
+        texture._y = y
+        texture.width = width
+        texture.height = height
+        texture.num_chans = self._num_chans
+        texture._buffer_type = 1 if self._uint8 else 0
+        texture._filtering_mode = page._filtering_mode
+        texture._uv_offset[0] = <float>x / <float>self._page_width
+        texture._uv_offset[1] = <float>y / <float>self._page_height
+        texture._uv_scale[0] = <float>width / <float>self._page_width
+        texture._uv_scale[1] = <float>height / <float>self._page_height
+        texture.allocated_texture = page.allocated_texture
+
+    cdef void _release(self, AtlasTexture texture):
+        self._removed_area += (texture.width + 2 * self._padding) * \
+                              (texture.height + 2 * self._padding)
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, texture.mutex)
+        texture.allocated_texture = NULL
+
+    def add(self, value):
+        """
+        Add an image to the atlas.
+
+        value: array of shape (height, width, num_chans),
+            or (height, width) for single channel atlases.
+            The data is converted to the atlas format if
+            needed (float32 data must be normalized between
+            0 and 1).
+
+        Returns an AtlasTexture pointing to the region
+        of the image.
+        """
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        cdef cnp.ndarray padded = self._prepare_image(value)
+        cdef AtlasTexture texture = AtlasTexture(self.context)
+        self._place(texture, padded)
+        self._textures.append(texture)
+        return texture
+
+    def update(self, AtlasTexture texture not None, value, x0=None, y0=None):
+        """
+        Replace the content of an image of the atlas.
+
+        If x0 or y0 is passed, only the part of the image
+        starting at column x0 and row y0 is updated.
+        Else if the size of the image changes, it is moved
+        to a new region (the AtlasTexture remains valid).
+
+        Same as texture.set_value(value, x0, y0).
+        """
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        if texture._atlas is not self:
+            raise ValueError("The texture does not belong to this atlas")
+        cdef cnp.ndarray image
+        if x0 is not None or y0 is not None:
+            image = convert_texture_content(np.asarray(value), self._uint8)
+            if image.ndim == 2:
+                image = image[:, :, np.newaxis]
+            x0 = 0 if x0 is None else x0
+            y0 = 0 if y0 is None else y0
+            if image.ndim != 3 or x0 < 0 or y0 < 0 or \
+               x0 + image.shape[1] > texture.width or \
+               y0 + image.shape[0] > texture.height:
+                raise ValueError("The region does not fit in the texture")
+            texture._page.set_value(image, x0=texture._x + x0, y0=texture._y + y0)
+            return
+        cdef cnp.ndarray padded = self._prepare_image(value)
+        if padded.shape[0] == texture.height + 2 * self._padding and \
+           padded.shape[1] == texture.width + 2 * self._padding:
+            texture._page.set_value(padded,
+                                    x0=texture._x - self._padding,
+                                    y0=texture._y - self._padding)
+            return
+        self._textures.remove(texture)
+        self._release(texture)
+        try:
+            self._place(texture, padded)
+        finally:
+            self._textures.append(texture)
+
+    def remove(self, AtlasTexture texture not None):
+        """
+        Remove (evict) an image from the atlas.
+
+        The texture is not displayed anymore by the items
+        using it, and its region can be reused by the next
+        images (see repack).
+        """
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        if texture._atlas is not self:
+            raise ValueError("The texture does not belong to this atlas")
+        self._textures.remove(texture)
+        self._release(texture)
+        cdef unique_lock[DCGMutex] m2
+        lock_gil_friendly(m2, texture.mutex)
+        texture._atlas = None
+        texture._page = None
+
+    def clear(self):
+        """
+        Remove all the images and release the pages.
+        """
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        cdef AtlasTexture texture
+        cdef unique_lock[DCGMutex] m2
+        for texture in self._textures:
+            lock_gil_friendly(m2, texture.mutex)
+            texture.allocated_texture = NULL
+            texture._atlas = None
+            texture._page = None
+            m2.unlock()
+        self._textures = []
+        self._pages = []
+        self._shelves = []
+        self._next_shelf_y = []
+        self._removed_area = 0
+
+    def repack(self):
+        """
+        Compact the images to reclaim the space
+        of removed images, and release the pages
+        that are not needed anymore.
+
+        Done automatically when an image does not fit
+        and the pages are fragmented. The images are
+        moved on the GPU side: the AtlasTexture
+        remain valid.
+        """
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._repack()
+
+    cdef void _repack(self):
+        cdef AtlasTexture texture
+        cdef list contents = []
+        # Read back the images (with their padding)
+        for texture in self._textures:
+            contents.append(texture._page.read(texture._x - self._padding,
+                                               texture._y - self._padding,
+                                               texture.width + 2 * self._padding,
+                                               texture.height + 2 * self._padding))
+        cdef list old_pages = self._pages
+        cdef list old_shelves = self._shelves
+        cdef list old_next_shelf_y = self._next_shelf_y
+        cdef int64_t old_removed_area = self._removed_area
+        cdef list old_locations = [(texture._page, texture._x, texture._y)
+                                   for texture in self._textures]
+        self._pages = []
+        self._shelves = []
+        self._next_shelf_y = []
+        self._removed_area = 0
+        # Reuse the previous pages, rather than allocating new ones
+        cdef Texture page
+        for page in old_pages:
+            self._pages.append(page)
+            self._shelves.append([])
+            self._next_shelf_y.append(0)
+        # Tallest first gives denser shelves
+        cdef list order = sorted(range(len(contents)),
+                                 key=lambda i: -contents[i].shape[0])
+        cdef int32_t num_used_pages = 0
+        for i in order:
+            texture = self._textures[i]
+            location = self._find_space(contents[i].shape[1], contents[i].shape[0])
+            if location is None:
+                # Shelf packing in height order does not guarantee
+                # the images fit again. Restore the previous layout,
+                # including the images already moved, before failing.
+                self._pages = old_pages
+                self._shelves = old_shelves
+                self._next_shelf_y = old_next_shelf_y
+                self._removed_area = old_removed_area
+                for j in range(len(contents)):
+                    texture = self._textures[j]
+                    (page, x, y) = old_locations[j]
+                    page.set_value(contents[j],
+                                   x0=x - self._padding,
+                                   y0=y - self._padding)
+                    self._assign(texture, page, x, y,
+                                 texture.width, texture.height)
+                raise MemoryError("Failed to repack the texture atlas")
+            (page_index, x, y) = location
+            num_used_pages = max(num_used_pages, page_index + 1)
+            page = self._pages[page_index]
+            page.set_value(contents[i], x0=x, y0=y)
+            self._assign(texture, page, x + self._padding, y + self._padding,
+                         texture.width, texture.height)
+        del self._pages[num_used_pages:]
+        del self._shelves[num_used_pages:]
+        del self._next_shelf_y[num_used_pages:]
+
+
 cdef class baseFont(baseItem):
     def __cinit__(self, context, *args, **kwargs):
         self.can_have_sibling = False
@@ -7359,6 +10050,14 @@ cdef class baseFont(baseItem):
     cdef void pop(self) noexcept nogil:
         return
 
+    cdef void end_frame(self) noexcept nogil:
+        """
+        Called at the end of the rendering of every frame,
+        once all the draw lists are complete, for the fonts
+        registered with viewport.register_end_frame_font.
+        """
+        return
+
 
 cdef class baseTheme(baseItem):
     """
@@ -7371,9 +10070,11 @@ cdef class baseTheme(baseItem):
         self.element_child_category = child_type.cat_theme
         self.can_have_sibling = True
         self._enabled = True
+        self._is_conditional = False
     def configure(self, **kwargs):
         self._enabled = kwargs.pop("enabled", self._enabled)
         self._enabled = kwargs.pop("show", self._enabled)
+        self._mark_changed()
         baseItem.configure(self, **kwargs)
     @property
     def enabled(self):
@@ -7385,6 +10086,14 @@ cdef class baseTheme(baseItem):
         cdef unique_lock[DCGMutex] m
         lock_gil_friendly(m, self.mutex)
         self._enabled = value
+        self._mark_changed()
+    cdef void _mark_changed(self) noexcept nogil:
+        """
+        Signal the theme values changed, such that
+        the theme lists compiled with them are updated.
+        """
+        if self.context is not None:
+            self.context._theme_generation.fetch_add(1)
     # should be always defined by subclass
     cdef void push(self) noexcept nogil:
         return
@@ -2,13 +2,14 @@ from .core cimport drawingItem, Texture, baseFont, SharedValue
 from .c_types cimport double2, float2, DCGVector, DCGString
 
 from libc.stdint cimport uint32_t, int32_t
+cimport numpy as cnp
 
 cdef class ViewportDrawList(drawingItem):
     cdef bint _front
     cdef void draw(self, void*) noexcept nogil
 
 cdef class DrawingList(drawingItem):
-    pass
+    cdef void draw(self, void*) noexcept nogil
 
 cdef class DrawingClip(drawingItem):
     cdef double[2] _pmin
@@ -37,6 +38,7 @@ cdef class DrawArc(drawingItem):
     cdef float _thickness
     cdef uint32_t _color # imgui.ImU32
     cdef uint32_t _fill # imgui.ImU32
+    cdef bint compute_bounds(self) noexcept nogil
 
 cdef class DrawArrow(drawingItem):
     cdef double[2] _start
@@ -48,6 +50,7 @@ cdef class DrawArrow(drawingItem):
     cdef float _size
     cdef void draw(self, void*) noexcept nogil
     cdef void __compute_tip(self)
+    cdef bint compute_bounds(self) noexcept nogil
 
 cdef class DrawBezierCubic(drawingItem):
     cdef double[2] _p1
@@ -58,6 +61,7 @@ cdef class DrawBezierCubic(drawingItem):
     cdef float _thickness
     cdef int32_t _segments
     cdef void draw(self, void*) noexcept nogil
+    cdef bint compute_bounds(self) noexcept nogil
 
 cdef class DrawBezierQuadratic(drawingItem):
     cdef double[2] _p1
@@ -67,6 +71,7 @@ cdef class DrawBezierQuadratic(drawingItem):
     cdef float _thickness
     cdef int32_t _segments
     cdef void draw(self, void*) noexcept nogil
+    cdef bint compute_bounds(self) noexcept nogil
 
 cdef class DrawCircle(drawingItem):
     cdef double[2] _center
@@ -76,6 +81,7 @@ cdef class DrawCircle(drawingItem):
     cdef float _thickness
     cdef int32_t _segments
     cdef void draw(self, void*) noexcept nogil
+    cdef bint compute_bounds(self) noexcept nogil
 
 cdef class DrawEllipse(drawingItem):
     cdef double[2] _pmin
@@ -87,6 +93,7 @@ cdef class DrawEllipse(drawingItem):
     cdef DCGVector[double2] _points
     cdef void __fill_points(self)
     cdef void draw(self, void*) noexcept nogil
+    cdef bint compute_bounds(self) noexcept nogil
 
 cdef class DrawImage(drawingItem):
     cdef double[2] _p1
@@ -107,6 +114,7 @@ cdef class DrawImage(drawingItem):
     cdef void update_center(self) noexcept nogil
     cdef void update_extremities(self) noexcept nogil
     cdef void draw(self, void*) noexcept nogil
+    cdef bint compute_bounds(self) noexcept nogil
 
 cdef class DrawLine(drawingItem):
     cdef double[2] _p1
@@ -119,6 +127,7 @@ cdef class DrawLine(drawingItem):
     cdef void update_center(self) noexcept nogil
     cdef void update_extremities(self) noexcept nogil
     cdef void draw(self, void*) noexcept nogil
+    cdef bint compute_bounds(self) noexcept nogil
 
 cdef class DrawPolyline(drawingItem):
     cdef uint32_t _color # imgui.ImU32
@@ -126,15 +135,19 @@ cdef class DrawPolyline(drawingItem):
     cdef bint _closed
     cdef DCGVector[double2] _points
     cdef void draw(self, void*) noexcept nogil
+    cdef bint compute_bounds(self) noexcept nogil
 
 cdef class DrawPolygon(drawingItem):
     cdef uint32_t _color # imgui.ImU32
     cdef uint32_t _fill # imgui.ImU32
     cdef float _thickness
     cdef DCGVector[double2] _points
-    cdef int[:,:] _triangulation_indices
-    cdef void __triangulate(self)
+    cdef DCGVector[uint32_t] _triangulation_indices
+    cdef bint _triangulated
+    cdef bint _convex
+    cdef void __triangulate(self) noexcept nogil
     cdef void draw(self, void*) noexcept nogil
+    cdef bint compute_bounds(self) noexcept nogil
 
 cdef class DrawQuad(drawingItem):
     cdef double[2] _p1
@@ -145,6 +158,7 @@ cdef class DrawQuad(drawingItem):
     cdef uint32_t _fill # imgui.ImU32
     cdef float _thickness
     cdef void draw(self, void*) noexcept nogil
+    cdef bint compute_bounds(self) noexcept nogil
 
 cdef class DrawRect(drawingItem):
     cdef double[2] _pmin
@@ -159,6 +173,7 @@ cdef class DrawRect(drawingItem):
     cdef float _thickness
     cdef bint _multicolor
     cdef void draw(self, void*) noexcept nogil
+    cdef bint compute_bounds(self) noexcept nogil
 
 cdef class DrawRegularPolygon(drawingItem):
     cdef double[2] _center
@@ -171,6 +186,7 @@ cdef class DrawRegularPolygon(drawingItem):
     cdef DCGVector[float2] _points
     cdef bint _dirty
     cdef void draw(self, void*) noexcept nogil
+    cdef bint compute_bounds(self) noexcept nogil
 
 cdef class DrawStar(drawingItem):
     cdef double[2] _center
@@ -185,6 +201,7 @@ cdef class DrawStar(drawingItem):
     cdef DCGVector[float2] _inner_points
     cdef bint _dirty
     cdef void draw(self, void*) noexcept nogil
+    cdef bint compute_bounds(self) noexcept nogil
 
 cdef class DrawText(drawingItem):
     cdef double[2] _pos
@@ -202,6 +219,7 @@ cdef class DrawTriangle(drawingItem):
     cdef uint32_t _fill # imgui.ImU32
     cdef float _thickness
     cdef void draw(self, void*) noexcept nogil
+    cdef bint compute_bounds(self) noexcept nogil
 
 cdef class DrawValue(drawingItem):
     cdef char[256] buffer
@@ -212,4 +230,41 @@ cdef class DrawValue(drawingItem):
     cdef float _size
     cdef baseFont _font
     cdef SharedValue _value
-    cdef void draw(self, void*) noexcept nogil
\ No newline at end of file
+    cdef void draw(self, void*) noexcept nogil
+cdef class drawingBatchItem(drawingItem):
+    cdef uint32_t _color # imgui.ImU32
+    cdef uint32_t _fill # imgui.ImU32
+    cdef cnp.ndarray _colors
+    cdef cnp.ndarray _fills
+    cdef float _thickness
+    cdef bint _culling
+    cdef DCGVector[float2] _screen_points
+    cdef float2* transform_points(self, cnp.ndarray, int32_t, int32_t) noexcept nogil
+    cdef float screen_thickness(self) noexcept nogil
+
+cdef class DrawLines(drawingBatchItem):
+    cdef cnp.ndarray _p1
+    cdef cnp.ndarray _p2
+    cdef bint compute_bounds(self) noexcept nogil
+    cdef void draw(self, void*) noexcept nogil
+
+cdef class DrawCircles(drawingBatchItem):
+    cdef cnp.ndarray _centers
+    cdef double _radius
+    cdef cnp.ndarray _radii
+    cdef int32_t _segments
+    cdef bint compute_bounds(self) noexcept nogil
+    cdef void draw(self, void*) noexcept nogil
+
+cdef class DrawRects(drawingBatchItem):
+    cdef cnp.ndarray _pmin
+    cdef cnp.ndarray _pmax
+    cdef bint compute_bounds(self) noexcept nogil
+    cdef void draw(self, void*) noexcept nogil
+
+cdef class DrawTriangles(drawingBatchItem):
+    cdef cnp.ndarray _p1
+    cdef cnp.ndarray _p2
+    cdef cnp.ndarray _p3
+    cdef bint compute_bounds(self) noexcept nogil
+    cdef void draw(self, void*) noexcept nogil
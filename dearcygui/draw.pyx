@@ -16,7 +16,8 @@
 
 from dearcygui.wrapper cimport imgui
 from .core cimport baseItem, drawingItem, \
-    lock_gil_friendly, draw_drawing_children, read_point, read_coord
+    lock_gil_friendly, draw_drawing_children, draw_drawing_children_culled, \
+    read_point, read_coord
 from .widget cimport SharedBool, SharedInt, SharedFloat, SharedDouble, \
     SharedColor, SharedInt4, SharedFloat4, SharedDouble4, SharedStr
 from .imgui_types cimport \
@@ -24,15 +25,46 @@ from .imgui_types cimport \
 from .c_types cimport *
 from .types cimport child_type, Coord
 
-from libcpp.algorithm cimport swap
+from libcpp.algorithm cimport swap, reverse
 from libcpp.cmath cimport atan, atan2, sin, cos, sqrt, trunc, floor, round as cround
 from libc.math cimport M_PI, INFINITY
 from libc.stdint cimport uint32_t, int32_t
 from libcpp cimport bool
 from libcpp.vector cimport vector
 
-import scipy
-import scipy.spatial
+from .core import _culling_property, _culling_margin_property
+import numpy as np
+cimport numpy as cnp
+cnp.import_array()
+
+# Bounds of drawing items, used for culling.
+# Radial sizes follow the convention of the items:
+# positive ones are scaled by size_multiplier, negative
+# ones are in screen space. They are converted to each
+# axis when culling.
+
+cdef inline void bounds_reset(drawingItem item) noexcept nogil:
+    item._bounds[0] = INFINITY
+    item._bounds[1] = INFINITY
+    item._bounds[2] = -INFINITY
+    item._bounds[3] = -INFINITY
+
+cdef inline void bounds_add(drawingItem item, const double* p) noexcept nogil:
+    item._bounds[0] = min(item._bounds[0], p[0])
+    item._bounds[1] = min(item._bounds[1], p[1])
+    item._bounds[2] = max(item._bounds[2], p[0])
+    item._bounds[3] = max(item._bounds[3], p[1])
+
+cdef inline void bounds_extend(drawingItem item, double size) noexcept nogil:
+    if size >= 0:
+        item._bounds_radius += <float>size
+    else:
+        item._bounds_padding += <float>(-size)
+
+cdef inline void bounds_extend_thickness(drawingItem item, float thickness) noexcept nogil:
+    # scaled at draw time like the thickness
+    item._bounds_thickness = 0.5 * thickness
+
 
 cdef inline bint is_counter_clockwise(imgui.ImVec2 p1,
                                       imgui.ImVec2 p2,
@@ -105,12 +137,18 @@ cdef class DrawingList(drawingItem):
     def __cinit__(self):
         self.can_have_drawing_child = True
 
+    culling = _culling_property
+    culling_margin = _culling_margin_property
+
     cdef void draw(self,
                    void* drawlist) noexcept nogil:
         cdef unique_lock[DCGMutex] m = unique_lock[DCGMutex](self.mutex)
         if not(self._show):
             return
-        draw_drawing_children(self, drawlist)
+        if self._culling_children:
+            draw_drawing_children_culled(self, drawlist)
+        else:
+            draw_drawing_children(self, drawlist)
 
 
 cdef class DrawingClip(drawingItem):
@@ -288,6 +326,9 @@ cdef class DrawingScale(drawingItem):
         self._no_parent_scale = False
         self.can_have_drawing_child = True
 
+    culling = _culling_property
+    culling_margin = _culling_margin_property
+
     @property
     def scales(self):
         """
@@ -414,7 +455,10 @@ cdef class DrawingScale(drawingItem):
             self.context.viewport.size_multiplier = self.context.viewport.size_multiplier * self._scales[0]
 
         # draw children
-        draw_drawing_children(self, drawlist)
+        if self._culling_children:
+            draw_drawing_children_culled(self, drawlist)
+        else:
+            draw_drawing_children(self, drawlist)
 
         # restore states
         #self.context.viewport.global_scale = global_scale
@@ -619,6 +663,17 @@ cdef class DrawArc(drawingItem):
         self._rotation = value
 
 
+    cdef bint compute_bounds(self) noexcept nogil:
+        if self._radius[0] == 0 and self._radius[1] == 0:
+            return False
+        bounds_reset(self)
+        bounds_add(self, self._center)
+        # The radii are scaled by size_multiplier whatever
+        # their sign. The arc is rotated: use the largest one.
+        self._bounds_radius = max(abs(self._radius[0]), abs(self._radius[1]))
+        bounds_extend_thickness(self, self._thickness)
+        return True
+
     cdef void draw(self, void* drawlist) noexcept nogil:
         cdef unique_lock[DCGMutex] m = unique_lock[DCGMutex](self.mutex)
         if not(self._show):
@@ -769,6 +824,15 @@ cdef class DrawArrow(drawingItem):
         self._corner2 = [x1 + 0.5 * self._size * cos((M_PI / 2.0) - angle),
                         y1 - 0.5 * self._size * sin((M_PI / 2.0) - angle)]
 
+    cdef bint compute_bounds(self) noexcept nogil:
+        bounds_reset(self)
+        bounds_add(self, self._start)
+        bounds_add(self, self._end)
+        bounds_add(self, self._corner1)
+        bounds_add(self, self._corner2)
+        bounds_extend_thickness(self, self._thickness)
+        return True
+
     cdef void draw(self,
                    void* drawlist) noexcept nogil:
         cdef unique_lock[DCGMutex] m = unique_lock[DCGMutex](self.mutex)
@@ -892,6 +956,16 @@ cdef class DrawBezierCubic(drawingItem):
         lock_gil_friendly(m, self.mutex)
         self._segments = value
 
+    cdef bint compute_bounds(self) noexcept nogil:
+        # The curve is inside the hull of its control points
+        bounds_reset(self)
+        bounds_add(self, self._p1)
+        bounds_add(self, self._p2)
+        bounds_add(self, self._p3)
+        bounds_add(self, self._p4)
+        bounds_extend_thickness(self, self._thickness)
+        return True
+
     cdef void draw(self,
                    void* drawlist) noexcept nogil:
         cdef unique_lock[DCGMutex] m = unique_lock[DCGMutex](self.mutex)
@@ -1001,6 +1075,14 @@ cdef class DrawBezierQuadratic(drawingItem):
         lock_gil_friendly(m, self.mutex)
         self._segments = value
 
+    cdef bint compute_bounds(self) noexcept nogil:
+        bounds_reset(self)
+        bounds_add(self, self._p1)
+        bounds_add(self, self._p2)
+        bounds_add(self, self._p3)
+        bounds_extend_thickness(self, self._thickness)
+        return True
+
     cdef void draw(self,
                    void* drawlist) noexcept nogil:
         cdef unique_lock[DCGMutex] m = unique_lock[DCGMutex](self.mutex)
@@ -1111,6 +1193,13 @@ cdef class DrawCircle(drawingItem):
         lock_gil_friendly(m, self.mutex)
         self._segments = value
 
+    cdef bint compute_bounds(self) noexcept nogil:
+        bounds_reset(self)
+        bounds_add(self, self._center)
+        bounds_extend(self, self._radius)
+        bounds_extend_thickness(self, self._thickness)
+        return True
+
     cdef void draw(self,
                    void* drawlist) noexcept nogil:
         cdef unique_lock[DCGMutex] m = unique_lock[DCGMutex](self.mutex)
@@ -1284,6 +1373,13 @@ cdef class DrawEllipse(drawingItem):
             self._points.push_back(p)
         self._points.push_back(self._points[0])
 
+    cdef bint compute_bounds(self) noexcept nogil:
+        bounds_reset(self)
+        bounds_add(self, self._pmin)
+        bounds_add(self, self._pmax)
+        bounds_extend_thickness(self, self._thickness)
+        return True
+
     cdef void draw(self,
                    void* drawlist) noexcept nogil:
         cdef unique_lock[DCGMutex] m = unique_lock[DCGMutex](self.mutex)
@@ -1297,12 +1393,10 @@ cdef class DrawEllipse(drawingItem):
         thickness = abs(thickness)
 
         cdef vector[imgui.ImVec2] transformed_points
-        transformed_points.reserve(self._points.size())
-        cdef int32_t i
-        cdef float[2] p
-        for i in range(<int>self._points.size()):
-            self.context.viewport.coordinate_to_screen(p, self._points[i].p)
-            transformed_points.push_back(imgui.ImVec2(p[0], p[1]))
+        transformed_points.resize(self._points.size())
+        self.context.viewport.coordinates_to_screen(<float*>transformed_points.data(),
+                                                    <double*>self._points.data(),
+                                                    <int32_t>self._points.size())
         # TODO imgui requires clockwise order for correct AA
         # Reverse order if needed
         if self._fill & imgui.IM_COL32_A_MASK != 0:
@@ -1705,6 +1799,17 @@ cdef class DrawImage(drawingItem):
                 x - self._center[0]
                 )
 
+    cdef bint compute_bounds(self) noexcept nogil:
+        if self._width < 0 or self._height < 0:
+            # size in pixels
+            return False
+        bounds_reset(self)
+        bounds_add(self, self._p1)
+        bounds_add(self, self._p2)
+        bounds_add(self, self._p3)
+        bounds_add(self, self._p4)
+        return True
+
     cdef void draw(self,
                    void* drawlist) noexcept nogil:
         cdef unique_lock[DCGMutex] m = unique_lock[DCGMutex](self.mutex)
@@ -1769,10 +1874,17 @@ cdef class DrawImage(drawingItem):
         ip2 = imgui.ImVec2(p2[0], p2[1])
         ip3 = imgui.ImVec2(p3[0], p3[1])
         ip4 = imgui.ImVec2(p4[0], p4[1])
-        cdef imgui.ImVec2 iuv1 = imgui.ImVec2(self._uv1[0], self._uv1[1])
-        cdef imgui.ImVec2 iuv2 = imgui.ImVec2(self._uv2[0], self._uv2[1])
-        cdef imgui.ImVec2 iuv3 = imgui.ImVec2(self._uv3[0], self._uv3[1])
-        cdef imgui.ImVec2 iuv4 = imgui.ImVec2(self._uv4[0], self._uv4[1])
+        # Restrict to the region of the texture (AtlasTexture)
+        cdef float[2] uv_offset = self._texture._uv_offset
+        cdef float[2] uv_scale = self._texture._uv_scale
+        cdef imgui.ImVec2 iuv1 = imgui.ImVec2(uv_offset[0] + uv_scale[0] * self._uv1[0],
+                                              uv_offset[1] + uv_scale[1] * self._uv1[1])
+        cdef imgui.ImVec2 iuv2 = imgui.ImVec2(uv_offset[0] + uv_scale[0] * self._uv2[0],
+                                              uv_offset[1] + uv_scale[1] * self._uv2[1])
+        cdef imgui.ImVec2 iuv3 = imgui.ImVec2(uv_offset[0] + uv_scale[0] * self._uv3[0],
+                                              uv_offset[1] + uv_scale[1] * self._uv3[1])
+        cdef imgui.ImVec2 iuv4 = imgui.ImVec2(uv_offset[0] + uv_scale[0] * self._uv4[0],
+                                              uv_offset[1] + uv_scale[1] * self._uv4[1])
 
         # TODO: should be ensure clockwise order for ImageQuad ?
 
@@ -1957,6 +2069,18 @@ cdef class DrawLine(drawingItem):
         lock_gil_friendly(m, self.mutex)
         self._thickness = value
 
+    cdef bint compute_bounds(self) noexcept nogil:
+        bounds_reset(self)
+        if self._length >= 0:
+            bounds_add(self, self._p1)
+            bounds_add(self, self._p2)
+        else:
+            # length in pixels around the center
+            bounds_add(self, self._center)
+            bounds_extend(self, 0.5 * self._length)
+        bounds_extend_thickness(self, self._thickness)
+        return True
+
     cdef void draw(self,
                    void* drawlist) noexcept nogil:
         cdef unique_lock[DCGMutex] m = unique_lock[DCGMutex](self.mutex)
@@ -2085,6 +2209,16 @@ cdef class DrawPolyline(drawingItem):
         lock_gil_friendly(m, self.mutex)
         self._thickness = value
 
+    cdef bint compute_bounds(self) noexcept nogil:
+        if self._points.empty():
+            return False
+        bounds_reset(self)
+        cdef int32_t i
+        for i in range(<int32_t>self._points.size()):
+            bounds_add(self, self._points[i].p)
+        bounds_extend_thickness(self, self._thickness)
+        return True
+
     cdef void draw(self,
                    void* drawlist) noexcept nogil:
         cdef unique_lock[DCGMutex] m = unique_lock[DCGMutex](self.mutex)
@@ -2097,36 +2231,177 @@ cdef class DrawPolyline(drawingItem):
             thickness *= self.context.viewport.size_multiplier
         thickness = abs(thickness)
 
-        cdef float[2] p
-        cdef imgui.ImVec2 ip1
-        cdef imgui.ImVec2 ip1_
-        cdef imgui.ImVec2 ip2
-        self.context.viewport.coordinate_to_screen(p, self._points[0].p)
-        ip1 = imgui.ImVec2(p[0], p[1])
-        ip1_ = ip1
+        cdef int32_t num_points = <int32_t>self._points.size()
+        cdef vector[imgui.ImVec2] ipoints
+        ipoints.resize(num_points)
+        self.context.viewport.coordinates_to_screen(<float*>ipoints.data(),
+                                                    <double*>self._points.data(),
+                                                    num_points)
         # imgui has artifacts for PolyLine when thickness is small.
         # in that case use AddLine
         # For big thickness, use AddPolyline
         cdef int32_t i
-        cdef vector[imgui.ImVec2] ipoints
         if thickness < 2.:
-            for i in range(1, <int>self._points.size()):
-                self.context.viewport.coordinate_to_screen(p, self._points[i].p)
-                ip2 = imgui.ImVec2(p[0], p[1])
-                (<imgui.ImDrawList*>drawlist).AddLine(ip1, ip2, <imgui.ImU32>self._color, thickness)
-                ip1 = ip2
-            if self._closed and self._points.size() > 2:
-                (<imgui.ImDrawList*>drawlist).AddLine(ip1_, ip2, <imgui.ImU32>self._color, thickness)
+            for i in range(1, num_points):
+                (<imgui.ImDrawList*>drawlist).AddLine(ipoints[i-1], ipoints[i], <imgui.ImU32>self._color, thickness)
+            if self._closed and num_points > 2:
+                (<imgui.ImDrawList*>drawlist).AddLine(ipoints[0], ipoints[num_points-1], <imgui.ImU32>self._color, thickness)
         else:
-            ipoints.reserve(self._points.size())
-            ipoints.push_back(ip1_)
-            for i in range(1, <int>self._points.size()):
-                self.context.viewport.coordinate_to_screen(p, self._points[i].p)
-                ip2 = imgui.ImVec2(p[0], p[1])
-                ipoints.push_back(ip2)
-            if self._closed:
-                ipoints.push_back(ip1_)
-            (<imgui.ImDrawList*>drawlist).AddPolyline(ipoints.data(), <int>ipoints.size(), <imgui.ImU32>self._color, self._closed, thickness)
+            # AddPolyline closes the path itself
+            (<imgui.ImDrawList*>drawlist).AddPolyline(ipoints.data(), num_points, <imgui.ImU32>self._color, self._closed, thickness)
+
+
+# Polygon triangulation
+
+cdef inline double polygon_signed_area(const double2* points, int32_t n) noexcept nogil:
+    cdef double area = 0.
+    cdef int32_t i, j
+    for i in range(n):
+        j = i + 1 if i + 1 < n else 0
+        area += points[i].p[0] * points[j].p[1] - points[j].p[0] * points[i].p[1]
+    return 0.5 * area
+
+cdef inline double turn(const double* a, const double* b, const double* c) noexcept nogil:
+    return (b[0] - a[0]) * (c[1] - b[1]) - (b[1] - a[1]) * (c[0] - b[0])
+
+cdef bint polygon_is_convex(const double2* points, int32_t n) noexcept nogil:
+    """
+    Whether the polygon is convex and simple.
+    All the turns must go in the same direction,
+    and the polygon must not wind more than once,
+    which is checked by the number of changes of
+    the direction along x.
+    """
+    if n < 3:
+        return False
+    cdef int32_t i
+    cdef double cross, dx
+    cdef int32_t sign = 0
+    cdef int32_t dx_sign = 0
+    cdef int32_t first_dx_sign = 0
+    cdef int32_t dx_changes = 0
+    for i in range(n):
+        cross = turn(points[i].p, points[(i+1) % n].p, points[(i+2) % n].p)
+        if cross != 0.:
+            if sign == 0:
+                sign = 1 if cross > 0. else -1
+            elif (cross > 0.) != (sign > 0):
+                return False
+        dx = points[(i+1) % n].p[0] - points[i].p[0]
+        if dx != 0.:
+            if dx_sign == 0:
+                first_dx_sign = 1 if dx > 0. else -1
+            elif (dx > 0.) != (dx_sign > 0):
+                dx_changes += 1
+            dx_sign = 1 if dx > 0. else -1
+    if dx_sign != 0 and dx_sign != first_dx_sign:
+        dx_changes += 1
+    return sign != 0 and dx_changes <= 2
+
+cdef inline bint point_in_triangle(const double* p,
+                                   const double* a,
+                                   const double* b,
+                                   const double* c,
+                                   double orientation) noexcept nogil:
+    # Points on the edges count as inside
+    return orientation * turn(a, b, p) >= 0. and \
+           orientation * turn(b, c, p) >= 0. and \
+           orientation * turn(c, a, p) >= 0.
+
+cdef void triangulate_polygon(const double2* points,
+                              int32_t n,
+                              DCGVector[uint32_t]* indices) noexcept nogil:
+    """
+    Ear clipping triangulation of a simple polygon
+    of any orientation. Appends the vertex indices
+    of the triangles to indices (three per triangle).
+
+    Self-intersecting polygons do not have ears
+    everywhere: in that case vertices are clipped
+    anyway to guarantee termination.
+    """
+    indices.clear()
+    if n < 3:
+        return
+    cdef double orientation = 1. if polygon_signed_area(points, n) >= 0. else -1.
+    cdef DCGVector[int32_t] remaining
+    remaining.resize(n)
+    cdef int32_t i, j, k
+    for i in range(n):
+        remaining[i] = i
+    cdef int32_t count = n
+    cdef int32_t attempts = 0
+    cdef int32_t prev, cur, nxt
+    cdef bint is_ear
+    i = 0
+    while count > 3:
+        prev = remaining[(i + count - 1) % count]
+        cur = remaining[i]
+        nxt = remaining[(i + 1) % count]
+        is_ear = orientation * turn(points[prev].p, points[cur].p, points[nxt].p) > 0.
+        if is_ear:
+            for j in range(count):
+                k = remaining[j]
+                if k == prev or k == cur or k == nxt:
+                    continue
+                if point_in_triangle(points[k].p,
+                                     points[prev].p,
+                                     points[cur].p,
+                                     points[nxt].p,
+                                     orientation):
+                    is_ear = False
+                    break
+        # No ear left: the polygon is not simple (or degenerate)
+        if not(is_ear) and attempts < count:
+            i = (i + 1) % count
+            attempts += 1
+            continue
+        indices.push_back(<uint32_t>prev)
+        indices.push_back(<uint32_t>cur)
+        indices.push_back(<uint32_t>nxt)
+        for j in range(i, count - 1):
+            remaining[j] = remaining[j + 1]
+        count -= 1
+        attempts = 0
+        # re-examine the previous vertex, which became convex
+        i = (i + count - 1) % count
+    indices.push_back(<uint32_t>remaining[0])
+    indices.push_back(<uint32_t>remaining[1])
+    indices.push_back(<uint32_t>remaining[2])
+
+cdef bint is_axis_scaling(const double2* previous,
+                          const double2* points,
+                          int32_t n) noexcept nogil:
+    """
+    Whether points is previous with a translation
+    and a (non-zero) scaling applied on each axis.
+    Such transforms keep a triangulation valid.
+    """
+    if n < 3:
+        return False
+    cdef int32_t axis, i, ref
+    cdef double scale, shift, extent, expected, tolerance
+    for axis in range(2):
+        # Point the furthest away from the first one
+        ref = 0
+        extent = 0.
+        for i in range(1, n):
+            if abs(previous[i].p[axis] - previous[0].p[axis]) > extent:
+                extent = abs(previous[i].p[axis] - previous[0].p[axis])
+                ref = i
+        if extent == 0.:
+            return False
+        scale = (points[ref].p[axis] - points[0].p[axis]) / \
+                (previous[ref].p[axis] - previous[0].p[axis])
+        if scale == 0.:
+            return False
+        shift = points[0].p[axis] - scale * previous[0].p[axis]
+        tolerance = 1e-9 * abs(scale) * extent
+        for i in range(n):
+            expected = scale * previous[i].p[axis] + shift
+            if abs(points[i].p[axis] - expected) > tolerance:
+                return False
+    return True
 
 
 cdef class DrawPolygon(drawingItem):
@@ -2135,7 +2410,8 @@ cdef class DrawPolygon(drawingItem):
 
     The polygon is defined by a sequence of points that form its vertices.
     Can be filled and/or outlined. Non-convex polygons are automatically
-    triangulated for proper filling.
+    triangulated for proper filling. The triangulation is kept
+    when the points are only translated or scaled.
 
     Attributes:
         points (list): List of (x,y) coordinates defining the vertices 
@@ -2171,11 +2447,21 @@ cdef class DrawPolygon(drawingItem):
         lock_gil_friendly(m, self.mutex)
         cdef double2 p
         cdef int32_t i
-        self._points.clear()
+        cdef DCGVector[double2] points
         for i in range(len(value)):
             read_coord(p.p, value[i])
-            self._points.push_back(p)
-        self.__triangulate()
+            points.push_back(p)
+        # Animated shapes often only move or zoom: in that
+        # case the triangulation remains valid.
+        if not(self._triangulated) or \
+           points.size() != self._points.size() or \
+           not(is_axis_scaling(self._points.data(),
+                               points.data(),
+                               <int32_t>points.size())):
+            self._triangulated = False
+        self._points.clear()
+        for i in range(<int>points.size()):
+            self._points.push_back(points[i])
     @property
     def color(self):
         """
@@ -2231,17 +2517,25 @@ cdef class DrawPolygon(drawingItem):
 
     # ImGui Polygon fill requires clockwise order and convex polygon.
     # We want to be more lenient -> triangulate
-    cdef void __triangulate(self):
-        if self._fill & imgui.IM_COL32_A_MASK != 0:
-            return
-        # TODO: optimize with arrays
-        points = []
+    cdef void __triangulate(self) noexcept nogil:
+        cdef int32_t n = <int32_t>self._points.size()
+        self._convex = polygon_is_convex(self._points.data(), n)
+        if self._convex:
+            # Filled directly as a convex polygon
+            self._triangulation_indices.clear()
+        else:
+            triangulate_polygon(self._points.data(), n, &self._triangulation_indices)
+        self._triangulated = True
+
+    cdef bint compute_bounds(self) noexcept nogil:
+        if self._points.empty():
+            return False
+        bounds_reset(self)
         cdef int32_t i
-        for i in range(<int>self._points.size()):
-            # For now perform only in 2D
-            points.append([self._points[i].p[0], self._points[i].p[1]])
-        # order is counter clock-wise
-        self._triangulation_indices = scipy.spatial.Delaunay(points).simplices
+        for i in range(<int32_t>self._points.size()):
+            bounds_add(self, self._points[i].p)
+        bounds_extend_thickness(self, self._thickness)
+        return True
 
     cdef void draw(self,
                    void* drawlist) noexcept nogil:
@@ -2255,38 +2549,53 @@ cdef class DrawPolygon(drawingItem):
             thickness *= self.context.viewport.size_multiplier
         thickness = abs(thickness)
 
-        cdef float[2] p
-        cdef imgui.ImVec2 ip
         cdef vector[imgui.ImVec2] ipoints
         cdef int32_t i
         cdef bint ccw
-        ipoints.reserve(self._points.size())
-        for i in range(<int>self._points.size()):
-            self.context.viewport.coordinate_to_screen(p, self._points[i].p)
-            ip = imgui.ImVec2(p[0], p[1])
-            ipoints.push_back(ip)
-
+        ipoints.resize(self._points.size())
+        self.context.viewport.coordinates_to_screen(<float*>ipoints.data(),
+                                                    <double*>self._points.data(),
+                                                    <int32_t>self._points.size())
+
+        cdef int32_t n = <int32_t>self._points.size()
+        cdef const uint32_t* indices
+        cdef float area
         # Draw interior
-        if self._fill & imgui.IM_COL32_A_MASK != 0 and self._triangulation_indices.shape[0] > 0:
+        if self._fill & imgui.IM_COL32_A_MASK != 0 and n >= 3:
+            # The triangulation is done in coordinate space,
+            # and is thus not affected by the transform.
+            if not(self._triangulated):
+                self.__triangulate()
             # imgui requires clockwise order + convexity for correct AA
-            # The triangulation always returns counter-clockwise
-            # but the matrix can change the order.
-            # The order should be the same for all triangles, except in plot with log
-            # scale.
-            for i in range(self._triangulation_indices.shape[0]):
-                ccw = is_counter_clockwise(ipoints[self._triangulation_indices[i, 0]],
-                                           ipoints[self._triangulation_indices[i, 1]],
-                                           ipoints[self._triangulation_indices[i, 2]])
-                if ccw:
-                    (<imgui.ImDrawList*>drawlist).AddTriangleFilled(ipoints[self._triangulation_indices[i, 0]],
-                                                      ipoints[self._triangulation_indices[i, 2]],
-                                                      ipoints[self._triangulation_indices[i, 1]],
-                                                      self._fill)
-                else:
-                    (<imgui.ImDrawList*>drawlist).AddTriangleFilled(ipoints[self._triangulation_indices[i, 0]],
-                                                      ipoints[self._triangulation_indices[i, 1]],
-                                                      ipoints[self._triangulation_indices[i, 2]],
-                                                      self._fill)
+            # The transform can change the order.
+            if self._convex:
+                area = 0.
+                for i in range(n):
+                    area += ipoints[i].x * ipoints[(i+1) % n].y - ipoints[(i+1) % n].x * ipoints[i].y
+                # Same convention as for the triangles below
+                if area > 0:
+                    reverse(ipoints.begin(), ipoints.end())
+                (<imgui.ImDrawList*>drawlist).AddConvexPolyFilled(ipoints.data(), n, self._fill)
+                if area > 0:
+                    reverse(ipoints.begin(), ipoints.end())
+            else:
+                indices = self._triangulation_indices.data()
+                # The order should be the same for all triangles,
+                # except in plot with log scale.
+                for i in range(<int32_t>self._triangulation_indices.size() // 3):
+                    ccw = is_counter_clockwise(ipoints[indices[3*i]],
+                                               ipoints[indices[3*i+1]],
+                                               ipoints[indices[3*i+2]])
+                    if ccw:
+                        (<imgui.ImDrawList*>drawlist).AddTriangleFilled(ipoints[indices[3*i]],
+                                                          ipoints[indices[3*i+2]],
+                                                          ipoints[indices[3*i+1]],
+                                                          self._fill)
+                    else:
+                        (<imgui.ImDrawList*>drawlist).AddTriangleFilled(ipoints[indices[3*i]],
+                                                          ipoints[indices[3*i+1]],
+                                                          ipoints[indices[3*i+2]],
+                                                          self._fill)
 
         # Draw closed boundary
         # imgui requires clockwise order + convexity for correct AA of AddPolyline
@@ -2435,6 +2744,15 @@ cdef class DrawQuad(drawingItem):
         lock_gil_friendly(m, self.mutex)
         self._thickness = value
 
+    cdef bint compute_bounds(self) noexcept nogil:
+        bounds_reset(self)
+        bounds_add(self, self._p1)
+        bounds_add(self, self._p2)
+        bounds_add(self, self._p3)
+        bounds_add(self, self._p4)
+        bounds_extend_thickness(self, self._thickness)
+        return True
+
     cdef void draw(self,
                    void* drawlist) noexcept nogil:
         cdef unique_lock[DCGMutex] m = unique_lock[DCGMutex](self.mutex)
@@ -2700,6 +3018,13 @@ cdef class DrawRect(drawingItem):
         lock_gil_friendly(m, self.mutex)
         self._rounding = value
 
+    cdef bint compute_bounds(self) noexcept nogil:
+        bounds_reset(self)
+        bounds_add(self, self._pmin)
+        bounds_add(self, self._pmax)
+        bounds_extend_thickness(self, self._thickness)
+        return True
+
     cdef void draw(self,
                    void* drawlist) noexcept nogil:
         cdef unique_lock[DCGMutex] m = unique_lock[DCGMutex](self.mutex)
@@ -2909,6 +3234,13 @@ cdef class DrawRegularPolygon(drawingItem):
         lock_gil_friendly(m, self.mutex)
         self._thickness = value
 
+    cdef bint compute_bounds(self) noexcept nogil:
+        bounds_reset(self)
+        bounds_add(self, self._center)
+        bounds_extend(self, self._radius)
+        bounds_extend_thickness(self, self._thickness)
+        return True
+
     cdef void draw(self,
                    void* drawlist) noexcept nogil:
         cdef unique_lock[DCGMutex] m = unique_lock[DCGMutex](self.mutex)
@@ -3141,6 +3473,17 @@ cdef class DrawStar(drawingItem):
         lock_gil_friendly(m, self.mutex)
         self._thickness = value
 
+    cdef bint compute_bounds(self) noexcept nogil:
+        bounds_reset(self)
+        bounds_add(self, self._center)
+        # inner_radius uses the same space as radius
+        if self._radius >= 0:
+            bounds_extend(self, max(self._radius, abs(self._inner_radius)))
+        else:
+            bounds_extend(self, min(self._radius, -abs(self._inner_radius)))
+        bounds_extend_thickness(self, self._thickness)
+        return True
+
     cdef void draw(self,
                    void* drawlist) noexcept nogil:
         cdef unique_lock[DCGMutex] m = unique_lock[DCGMutex](self.mutex)
@@ -3493,6 +3836,14 @@ cdef class DrawTriangle(drawingItem):
         lock_gil_friendly(m, self.mutex)
         self._thickness = value
 
+    cdef bint compute_bounds(self) noexcept nogil:
+        bounds_reset(self)
+        bounds_add(self, self._p1)
+        bounds_add(self, self._p2)
+        bounds_add(self, self._p3)
+        bounds_extend_thickness(self, self._thickness)
+        return True
+
     cdef void draw(self,
                    void* drawlist) noexcept nogil:
         cdef unique_lock[DCGMutex] m = unique_lock[DCGMutex](self.mutex)
@@ -3768,4 +4119,736 @@ cdef class DrawValue(drawingItem):
             (<imgui.ImDrawList*>drawlist).AddText(NULL, size, ip, <imgui.ImU32>self._color, self.buffer)
 
         if self._font is not None:
-            self._font.pop()
\ No newline at end of file
+            self._font.pop()
+
+"""
+Batch items: many primitives of the same kind
+stored in arrays and drawn by a single item.
+"""
+
+cdef cnp.ndarray read_points_array(value):
+    """
+    Converts value into a C-contiguous (N, 2) float64 array.
+    No copy is made if value is already in this format.
+    """
+    if value is None:
+        return np.zeros((0, 2), dtype=np.float64)
+    cdef cnp.ndarray array = np.ascontiguousarray(value, dtype=np.float64)
+    if array.size == 0:
+        return np.zeros((0, 2), dtype=np.float64)
+    if array.ndim != 2 or array.shape[1] != 2:
+        raise ValueError("Points must be an array of shape (N, 2)")
+    return array
+
+cdef cnp.ndarray read_values_array(value):
+    """
+    Converts value into a C-contiguous 1D float64 array,
+    or None if value is None.
+    """
+    if value is None:
+        return None
+    return np.ascontiguousarray(value, dtype=np.float64).reshape([-1])
+
+cdef cnp.ndarray read_colors_array(value):
+    """
+    Converts value into a C-contiguous 1D uint32 array
+    of packed colors (as returned by color_as_int),
+    or None if value is None.
+
+    Accepts packed colors (N,) or colors
+    components (N, 3) or (N, 4), either as
+    integers in [0, 255] or as normalized floats.
+    """
+    if value is None:
+        return None
+    cdef cnp.ndarray array = np.asarray(value)
+    if array.ndim == 1 and array.dtype.kind in 'iu':
+        return np.ascontiguousarray(array, dtype=np.uint32)
+    if array.ndim != 2 or array.shape[1] not in (3, 4):
+        raise TypeError("Colors must be an array of packed colors (N,) or of components (N, 3) or (N, 4)")
+    if array.dtype.kind == 'f':
+        array = np.rint(np.clip(array, 0., 1.) * 255.)
+    elif array.dtype.kind in 'iu':
+        if array.size > 0 and (array.min() < 0 or array.max() > 255):
+            raise ValueError("Color value component outside bounds (0...255)")
+    else:
+        raise TypeError("Unsupported dtype for colors")
+    array = array.astype(np.uint32)
+    cdef cnp.ndarray packed = array[:, 0] | (array[:, 1] << 8) | (array[:, 2] << 16)
+    if array.shape[1] == 4:
+        packed |= array[:, 3] << 24
+    else:
+        packed |= np.uint32(255) << 24
+    return np.ascontiguousarray(packed, dtype=np.uint32)
+
+cdef inline int32_t array_length(cnp.ndarray array) noexcept nogil:
+    if array is None:
+        return 0
+    return <int32_t>cnp.PyArray_DIM(array, 0)
+
+cdef inline void bounds_add_array(drawingItem item, cnp.ndarray points) noexcept nogil:
+    cdef const double* data = <const double*>cnp.PyArray_DATA(points)
+    cdef int32_t i
+    for i in range(array_length(points)):
+        bounds_add(item, &data[2*i])
+
+cdef inline bint is_outside(imgui.ImVec2 clip_min,
+                            imgui.ImVec2 clip_max,
+                            float xmin, float ymin,
+                            float xmax, float ymax) noexcept nogil:
+    return xmax < clip_min.x or xmin > clip_max.x or \
+           ymax < clip_min.y or ymin > clip_max.y
+
+
+cdef class drawingBatchItem(drawingItem):
+    """
+    Base class for items drawing many primitives
+    of the same kind in a single item.
+
+    The geometry is given as numpy arrays, which are
+    kept without copy when they are C-contiguous float64
+    arrays. Thus modifying such an array in place is
+    reflected on the next frame. In that case, the bounds
+    used by the culling of the parent are not updated
+    automatically: set the attribute again to refresh them.
+
+    Colors can be given for all the primitives (color, fill),
+    or per primitive (colors, fills). When an array of colors
+    is shorter than the number of primitives, the single
+    color is used for the remaining ones.
+    """
+    def __cinit__(self):
+        self._color = 4294967295 # 0xffffffff
+        self._fill = 0
+        self._thickness = 1.
+        self._culling = True
+
+    @property
+    def color(self):
+        """
+        Color of the outlines of all the primitives.
+
+        Returns:
+            list: RGBA values in [0,1] range
+        """
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        cdef float[4] color
+        unparse_color(color, self._color)
+        return list(color)
+    @color.setter
+    def color(self, value):
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._color = parse_color(value)
+
+    @property
+    def colors(self):
+        """
+        Per primitive outline colors, or None.
+
+        Can be set with an array of packed colors (N,)
+        or of color components (N, 3) or (N, 4).
+
+        Returns:
+            array: packed colors (uint32)
+        """
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._colors
+    @colors.setter
+    def colors(self, value):
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._colors = read_colors_array(value)
+
+    @property
+    def fill(self):
+        """
+        Fill color of the primitives without an entry
+        in fills. Ignored by DrawLines.
+
+        Returns:
+            list: RGBA values in [0,1] range
+        """
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        cdef float[4] fill
+        unparse_color(fill, self._fill)
+        return list(fill)
+    @fill.setter
+    def fill(self, value):
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._fill = parse_color(value)
+
+    @property
+    def fills(self):
+        """
+        Per primitive fill colors, or None.
+
+        Can be set with an array of packed colors (N,)
+        or of color components (N, 3) or (N, 4).
+
+        Returns:
+            array: packed colors (uint32)
+        """
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._fills
+    @fills.setter
+    def fills(self, value):
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._fills = read_colors_array(value)
+
+    @property
+    def thickness(self):
+        """
+        Line thickness of the outlines.
+
+        Returns:
+            float: Thickness value
+        """
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._thickness
+    @thickness.setter
+    def thickness(self, float value):
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._thickness = value
+
+    @property
+    def culling(self):
+        """
+        Whether to skip the primitives outside
+        the clip region.
+
+        The test is done in screen space after
+        the coordinate transform, and thus saves
+        the cost of generating the vertices of the
+        invisible primitives. Default is True.
+        """
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._culling
+    @culling.setter
+    def culling(self, bint value):
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._culling = value
+
+    cdef float2* transform_points(self, cnp.ndarray points, int32_t slot, int32_t n) noexcept nogil:
+        """
+        Converts the first n points of the array
+        into screen space, in the slot-th block
+        of n points of the internal buffer.
+        The buffer must have been resized beforehand.
+        """
+        cdef float2* dst = self._screen_points.data() + slot * n
+        self.context.viewport.coordinates_to_screen(<float*>dst,
+                                                    <const double*>cnp.PyArray_DATA(points),
+                                                    n)
+        return dst
+
+    cdef float screen_thickness(self) noexcept nogil:
+        cdef float thickness = self._thickness
+        thickness *= self.context.viewport.thickness_multiplier
+        if thickness > 0:
+            thickness *= self.context.viewport.size_multiplier
+        return abs(thickness)
+
+
+cdef class DrawLines(drawingBatchItem):
+    """
+    Draws many line segments in coordinate space.
+
+    Segment i goes from p1[i] to p2[i]. All segments share
+    the same thickness.
+
+    Attributes:
+        p1 (array): (N, 2) array of the first points
+        p2 (array): (N, 2) array of the second points
+        color (list): RGBA color of all the lines
+        colors (array): per line color
+        thickness (float): Line thickness
+    """
+    def __cinit__(self):
+        self._p1 = read_points_array(None)
+        self._p2 = read_points_array(None)
+
+    @property
+    def p1(self):
+        """
+        First points of the segments, as a (N, 2) array.
+        """
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._p1
+    @p1.setter
+    def p1(self, value):
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._p1 = read_points_array(value)
+
+    @property
+    def p2(self):
+        """
+        Second points of the segments, as a (N, 2) array.
+        """
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._p2
+    @p2.setter
+    def p2(self, value):
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._p2 = read_points_array(value)
+
+    cdef bint compute_bounds(self) noexcept nogil:
+        if array_length(self._p1) == 0 or array_length(self._p2) == 0:
+            return False
+        bounds_reset(self)
+        bounds_add_array(self, self._p1)
+        bounds_add_array(self, self._p2)
+        bounds_extend_thickness(self, self._thickness)
+        return True
+
+    cdef void draw(self,
+                   void* drawlist) noexcept nogil:
+        cdef unique_lock[DCGMutex] m = unique_lock[DCGMutex](self.mutex)
+        if not(self._show):
+            return
+        cdef int32_t n = min(array_length(self._p1), array_length(self._p2))
+        if n == 0:
+            return
+
+        cdef float thickness = self.screen_thickness()
+        self._screen_points.resize(2 * n)
+        cdef imgui.ImVec2* p1 = <imgui.ImVec2*>self.transform_points(self._p1, 0, n)
+        cdef imgui.ImVec2* p2 = <imgui.ImVec2*>self.transform_points(self._p2, 1, n)
+
+        cdef imgui.ImVec2 clip_min = (<imgui.ImDrawList*>drawlist).GetClipRectMin()
+        cdef imgui.ImVec2 clip_max = (<imgui.ImDrawList*>drawlist).GetClipRectMax()
+        clip_min.x -= thickness + 1.
+        clip_min.y -= thickness + 1.
+        clip_max.x += thickness + 1.
+        clip_max.y += thickness + 1.
+
+        cdef int32_t num_colors = array_length(self._colors)
+        cdef const uint32_t* colors = NULL
+        if num_colors > 0:
+            colors = <const uint32_t*>cnp.PyArray_DATA(self._colors)
+        cdef uint32_t color
+        cdef int32_t i
+        for i in range(n):
+            if self._culling and \
+               is_outside(clip_min, clip_max,
+                          min(p1[i].x, p2[i].x), min(p1[i].y, p2[i].y),
+                          max(p1[i].x, p2[i].x), max(p1[i].y, p2[i].y)):
+                continue
+            color = colors[i] if i < num_colors else self._color
+            if color & imgui.IM_COL32_A_MASK == 0:
+                continue
+            (<imgui.ImDrawList*>drawlist).AddLine(p1[i], p2[i], <imgui.ImU32>color, thickness)
+
+
+cdef class DrawCircles(drawingBatchItem):
+    """
+    Draws many circles (or markers) in coordinate space.
+
+    Similarly to DrawCircle, a positive radius is in
+    coordinate space, while a negative radius is in
+    pixels, which is convenient for markers.
+
+    Attributes:
+        centers (array): (N, 2) array of the circle centers
+        radius (float): Radius of all the circles
+        radii (array): per circle radius
+        color (list): RGBA color of all the outlines
+        colors (array): per circle outline color
+        fill (list): RGBA fill color of all the circles
+        fills (array): per circle fill color
+        thickness (float): Outline thickness
+        segments (int): Number of segments per circle (0 for automatic)
+    """
+    def __cinit__(self):
+        self._centers = read_points_array(None)
+        self._radius = 1.
+        self._segments = 0
+
+    @property
+    def centers(self):
+        """
+        Centers of the circles, as a (N, 2) array.
+        """
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._centers
+    @centers.setter
+    def centers(self, value):
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._centers = read_points_array(value)
+
+    @property
+    def radius(self):
+        """
+        Radius of the circles without an entry in radii.
+
+        Negative values are in pixels.
+        """
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._radius
+    @radius.setter
+    def radius(self, double value):
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._radius = value
+
+    @property
+    def radii(self):
+        """
+        Per circle radius, or None.
+
+        Negative values are in pixels.
+        """
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._radii
+    @radii.setter
+    def radii(self, value):
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._radii = read_values_array(value)
+
+    @property
+    def segments(self):
+        """
+        Number of segments used to draw each circle.
+
+        0 lets imgui pick it depending on the radius.
+        """
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._segments
+    @segments.setter
+    def segments(self, int32_t value):
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._segments = value
+
+    cdef bint compute_bounds(self) noexcept nogil:
+        cdef int32_t n = array_length(self._centers)
+        if n == 0:
+            return False
+        bounds_reset(self)
+        bounds_add_array(self, self._centers)
+        # largest radius in coordinate space and in pixels
+        cdef double max_radius = max(self._radius, 0.)
+        cdef double max_pixels = max(-self._radius, 0.)
+        cdef int32_t num_radii = array_length(self._radii)
+        cdef const double* radii = NULL
+        cdef int32_t i
+        if num_radii > 0:
+            radii = <const double*>cnp.PyArray_DATA(self._radii)
+            for i in range(min(n, num_radii)):
+                max_radius = max(max_radius, radii[i])
+                max_pixels = max(max_pixels, -radii[i])
+        bounds_extend(self, max_radius)
+        bounds_extend(self, -max_pixels)
+        bounds_extend_thickness(self, self._thickness)
+        return True
+
+    cdef void draw(self,
+                   void* drawlist) noexcept nogil:
+        cdef unique_lock[DCGMutex] m = unique_lock[DCGMutex](self.mutex)
+        if not(self._show):
+            return
+        cdef int32_t n = array_length(self._centers)
+        if n == 0:
+            return
+
+        cdef float thickness = self.screen_thickness()
+        self._screen_points.resize(n)
+        cdef imgui.ImVec2* centers = <imgui.ImVec2*>self.transform_points(self._centers, 0, n)
+
+        cdef imgui.ImVec2 clip_min = (<imgui.ImDrawList*>drawlist).GetClipRectMin()
+        cdef imgui.ImVec2 clip_max = (<imgui.ImDrawList*>drawlist).GetClipRectMax()
+        cdef float size_multiplier = self.context.viewport.size_multiplier
+        cdef float global_scale = self.context.viewport.global_scale
+
+        cdef int32_t num_radii = array_length(self._radii)
+        cdef int32_t num_colors = array_length(self._colors)
+        cdef int32_t num_fills = array_length(self._fills)
+        cdef const double* radii = NULL
+        cdef const uint32_t* colors = NULL
+        cdef const uint32_t* fills = NULL
+        if num_radii > 0:
+            radii = <const double*>cnp.PyArray_DATA(self._radii)
+        if num_colors > 0:
+            colors = <const uint32_t*>cnp.PyArray_DATA(self._colors)
+        if num_fills > 0:
+            fills = <const uint32_t*>cnp.PyArray_DATA(self._fills)
+
+        cdef float radius, extent
+        cdef uint32_t color, fill
+        cdef int32_t i
+        for i in range(n):
+            radius = radii[i] if i < num_radii else self._radius
+            if radius > 0:
+                radius *= size_multiplier
+            else:
+                radius = -radius * global_scale
+            if self._culling:
+                extent = radius + thickness + 1.
+                if is_outside(clip_min, clip_max,
+                              centers[i].x - extent, centers[i].y - extent,
+                              centers[i].x + extent, centers[i].y + extent):
+                    continue
+            fill = fills[i] if i < num_fills else self._fill
+            color = colors[i] if i < num_colors else self._color
+            if fill & imgui.IM_COL32_A_MASK != 0:
+                (<imgui.ImDrawList*>drawlist).AddCircleFilled(centers[i], radius, <imgui.ImU32>fill, self._segments)
+            if color & imgui.IM_COL32_A_MASK != 0:
+                (<imgui.ImDrawList*>drawlist).AddCircle(centers[i], radius, <imgui.ImU32>color, self._segments, thickness)
+
+
+cdef class DrawRects(drawingBatchItem):
+    """
+    Draws many axis-aligned rectangles in coordinate space.
+
+    Rectangle i spans from pmin[i] to pmax[i].
+
+    Attributes:
+        pmin (array): (N, 2) array of the first corners
+        pmax (array): (N, 2) array of the opposite corners
+        color (list): RGBA color of all the outlines
+        colors (array): per rectangle outline color
+        fill (list): RGBA fill color of all the rectangles
+        fills (array): per rectangle fill color
+        thickness (float): Outline thickness
+    """
+    def __cinit__(self):
+        self._pmin = read_points_array(None)
+        self._pmax = read_points_array(None)
+
+    @property
+    def pmin(self):
+        """
+        First corners of the rectangles, as a (N, 2) array.
+        """
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._pmin
+    @pmin.setter
+    def pmin(self, value):
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._pmin = read_points_array(value)
+
+    @property
+    def pmax(self):
+        """
+        Opposite corners of the rectangles, as a (N, 2) array.
+        """
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._pmax
+    @pmax.setter
+    def pmax(self, value):
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._pmax = read_points_array(value)
+
+    cdef bint compute_bounds(self) noexcept nogil:
+        if array_length(self._pmin) == 0 or array_length(self._pmax) == 0:
+            return False
+        bounds_reset(self)
+        bounds_add_array(self, self._pmin)
+        bounds_add_array(self, self._pmax)
+        bounds_extend_thickness(self, self._thickness)
+        return True
+
+    cdef void draw(self,
+                   void* drawlist) noexcept nogil:
+        cdef unique_lock[DCGMutex] m = unique_lock[DCGMutex](self.mutex)
+        if not(self._show):
+            return
+        cdef int32_t n = min(array_length(self._pmin), array_length(self._pmax))
+        if n == 0:
+            return
+
+        cdef float thickness = self.screen_thickness()
+        self._screen_points.resize(2 * n)
+        cdef imgui.ImVec2* p1 = <imgui.ImVec2*>self.transform_points(self._pmin, 0, n)
+        cdef imgui.ImVec2* p2 = <imgui.ImVec2*>self.transform_points(self._pmax, 1, n)
+
+        cdef imgui.ImVec2 clip_min = (<imgui.ImDrawList*>drawlist).GetClipRectMin()
+        cdef imgui.ImVec2 clip_max = (<imgui.ImDrawList*>drawlist).GetClipRectMax()
+        clip_min.x -= thickness + 1.
+        clip_min.y -= thickness + 1.
+        clip_max.x += thickness + 1.
+        clip_max.y += thickness + 1.
+
+        cdef int32_t num_colors = array_length(self._colors)
+        cdef int32_t num_fills = array_length(self._fills)
+        cdef const uint32_t* colors = NULL
+        cdef const uint32_t* fills = NULL
+        if num_colors > 0:
+            colors = <const uint32_t*>cnp.PyArray_DATA(self._colors)
+        if num_fills > 0:
+            fills = <const uint32_t*>cnp.PyArray_DATA(self._fills)
+
+        cdef imgui.ImVec2 rect_min, rect_max
+        cdef uint32_t color, fill
+        cdef int32_t i
+        for i in range(n):
+            # The transform may flip the axes
+            rect_min = imgui.ImVec2(min(p1[i].x, p2[i].x), min(p1[i].y, p2[i].y))
+            rect_max = imgui.ImVec2(max(p1[i].x, p2[i].x), max(p1[i].y, p2[i].y))
+            if self._culling and \
+               is_outside(clip_min, clip_max,
+                          rect_min.x, rect_min.y,
+                          rect_max.x, rect_max.y):
+                continue
+            fill = fills[i] if i < num_fills else self._fill
+            color = colors[i] if i < num_colors else self._color
+            if fill & imgui.IM_COL32_A_MASK != 0:
+                (<imgui.ImDrawList*>drawlist).AddRectFilled(rect_min, rect_max, <imgui.ImU32>fill, 0., 0)
+            if color & imgui.IM_COL32_A_MASK != 0:
+                (<imgui.ImDrawList*>drawlist).AddRect(rect_min, rect_max, <imgui.ImU32>color, 0., 0, thickness)
+
+
+cdef class DrawTriangles(drawingBatchItem):
+    """
+    Draws many triangles in coordinate space.
+
+    Triangle i has the vertices p1[i], p2[i] and p3[i].
+
+    Attributes:
+        p1 (array): (N, 2) array of the first vertices
+        p2 (array): (N, 2) array of the second vertices
+        p3 (array): (N, 2) array of the third vertices
+        color (list): RGBA color of all the outlines
+        colors (array): per triangle outline color
+        fill (list): RGBA fill color of all the triangles
+        fills (array): per triangle fill color
+        thickness (float): Outline thickness
+    """
+    def __cinit__(self):
+        self._p1 = read_points_array(None)
+        self._p2 = read_points_array(None)
+        self._p3 = read_points_array(None)
+
+    @property
+    def p1(self):
+        """
+        First vertices of the triangles, as a (N, 2) array.
+        """
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._p1
+    @p1.setter
+    def p1(self, value):
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._p1 = read_points_array(value)
+
+    @property
+    def p2(self):
+        """
+        Second vertices of the triangles, as a (N, 2) array.
+        """
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._p2
+    @p2.setter
+    def p2(self, value):
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._p2 = read_points_array(value)
+
+    @property
+    def p3(self):
+        """
+        Third vertices of the triangles, as a (N, 2) array.
+        """
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._p3
+    @p3.setter
+    def p3(self, value):
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._p3 = read_points_array(value)
+
+    cdef bint compute_bounds(self) noexcept nogil:
+        if array_length(self._p1) == 0 or \
+           array_length(self._p2) == 0 or \
+           array_length(self._p3) == 0:
+            return False
+        bounds_reset(self)
+        bounds_add_array(self, self._p1)
+        bounds_add_array(self, self._p2)
+        bounds_add_array(self, self._p3)
+        bounds_extend_thickness(self, self._thickness)
+        return True
+
+    cdef void draw(self,
+                   void* drawlist) noexcept nogil:
+        cdef unique_lock[DCGMutex] m = unique_lock[DCGMutex](self.mutex)
+        if not(self._show):
+            return
+        cdef int32_t n = min(array_length(self._p1),
+                             min(array_length(self._p2), array_length(self._p3)))
+        if n == 0:
+            return
+
+        cdef float thickness = self.screen_thickness()
+        self._screen_points.resize(3 * n)
+        cdef imgui.ImVec2* p1 = <imgui.ImVec2*>self.transform_points(self._p1, 0, n)
+        cdef imgui.ImVec2* p2 = <imgui.ImVec2*>self.transform_points(self._p2, 1, n)
+        cdef imgui.ImVec2* p3 = <imgui.ImVec2*>self.transform_points(self._p3, 2, n)
+
+        cdef imgui.ImVec2 clip_min = (<imgui.ImDrawList*>drawlist).GetClipRectMin()
+        cdef imgui.ImVec2 clip_max = (<imgui.ImDrawList*>drawlist).GetClipRectMax()
+        clip_min.x -= thickness + 1.
+        clip_min.y -= thickness + 1.
+        clip_max.x += thickness + 1.
+        clip_max.y += thickness + 1.
+
+        cdef int32_t num_colors = array_length(self._colors)
+        cdef int32_t num_fills = array_length(self._fills)
+        cdef const uint32_t* colors = NULL
+        cdef const uint32_t* fills = NULL
+        if num_colors > 0:
+            colors = <const uint32_t*>cnp.PyArray_DATA(self._colors)
+        if num_fills > 0:
+            fills = <const uint32_t*>cnp.PyArray_DATA(self._fills)
+
+        cdef uint32_t color, fill
+        cdef int32_t i
+        for i in range(n):
+            if self._culling and \
+               is_outside(clip_min, clip_max,
+                          min(p1[i].x, min(p2[i].x, p3[i].x)),
+                          min(p1[i].y, min(p2[i].y, p3[i].y)),
+                          max(p1[i].x, max(p2[i].x, p3[i].x)),
+                          max(p1[i].y, max(p2[i].y, p3[i].y))):
+                continue
+            fill = fills[i] if i < num_fills else self._fill
+            color = colors[i] if i < num_colors else self._color
+            # imgui requires clockwise order + convex for correct AA
+            if is_counter_clockwise(p1[i], p2[i], p3[i]):
+                if fill & imgui.IM_COL32_A_MASK != 0:
+                    (<imgui.ImDrawList*>drawlist).AddTriangleFilled(p1[i], p3[i], p2[i], <imgui.ImU32>fill)
+                if color & imgui.IM_COL32_A_MASK != 0:
+                    (<imgui.ImDrawList*>drawlist).AddTriangle(p1[i], p3[i], p2[i], <imgui.ImU32>color, thickness)
+            else:
+                if fill & imgui.IM_COL32_A_MASK != 0:
+                    (<imgui.ImDrawList*>drawlist).AddTriangleFilled(p1[i], p2[i], p3[i], <imgui.ImU32>fill)
+                if color & imgui.IM_COL32_A_MASK != 0:
+                    (<imgui.ImDrawList*>drawlist).AddTriangle(p1[i], p2[i], p3[i], <imgui.ImU32>color, thickness)
@@ -1,9 +1,11 @@
-from libc.stdint cimport int32_t
+from libc.stdint cimport int32_t, uint32_t
 from libcpp.deque cimport deque
+from libcpp.unordered_map cimport unordered_map
+from libcpp.unordered_set cimport unordered_set
 from cpython.ref cimport PyObject
 from .c_types cimport DCGVector
 from .types cimport *
-from .core cimport baseItem, baseFont, Texture
+from .core cimport baseItem, baseFont, Texture, Callback
 
 cdef class Font(baseFont):
     cdef void* _font # imgui.ImFont*
@@ -35,6 +37,47 @@ cdef class AutoFont(FontMultiScales):
     cpdef void _create_font_at_scale(self, float scale, bint no_fail)
     cdef void _add_new_font_to_list(self, Font font)
 
+cdef class DynamicFont(baseFont):
+    cdef void* _atlas # imgui.ImFontAtlas*
+    cdef void* _font # imgui.ImFont*
+    cdef Texture _texture
+    cdef str _path
+    cdef bytes _data # content of the font file
+    cdef object _face # freetype.Face
+    cdef int32_t _pixel_size
+    cdef int32_t _load_flags
+    cdef int32_t _render_mode
+    cdef bint _color
+    cdef bint _dpi_scaling
+    cdef float _scale
+    cdef DCGVector[float] _scales_backup
+    cdef int32_t _texture_width
+    cdef int32_t _texture_height
+    cdef int32_t _page_x
+    cdef int32_t _page_y
+    cdef int32_t _page_width
+    cdef int32_t _page_height
+    cdef int32_t _cell_size
+    cdef int32_t _cells_per_row
+    cdef int32_t _origin_y
+    cdef float _placeholder_advance
+    cdef float _marker_v # V coordinate identifying the placeholders
+    cdef unordered_map[uint32_t, int32_t] _glyph_index # codepoint -> index in the glyphs
+    cdef unordered_map[uint32_t, int32_t] _glyph_cell # loaded codepoint -> cell (-1: no bitmap)
+    cdef DCGVector[uint32_t] _cell_codepoint # cell -> codepoint
+    cdef DCGVector[int32_t] _cell_last_used # cell -> last frame it was rendered
+    cdef unordered_set[uint32_t] _requested # missing codepoints rendered
+    cdef int32_t _last_push_frame
+    cdef bint _loading
+    cdef Callback _load_callback
+    cdef object _executor # ThreadPoolExecutor
+    cdef void _set_placeholder(self, uint32_t) noexcept nogil
+    cdef void _evict_cell(self, int32_t) noexcept nogil
+    cdef void _scan_frame(self) noexcept nogil
+    cdef void push(self) noexcept nogil
+    cdef void pop(self) noexcept nogil
+    cdef void end_frame(self) noexcept nogil
+
 cdef class FontTexture(baseItem):
     """
     Packs one or several fonts into
@@ -58,11 +101,18 @@ cdef class GlyphSet:
                          float dx,
                          float advance)
 
+cdef class GlyphCache:
+    cdef str _directory
+    cdef dict _file_hashes # (path, mtime, size) -> hash of the content
+
 cdef class FontRenderer:
+    cdef str _path
+    cdef bytes _data # content of the font file
     cdef object _face
     cpdef GlyphSet render_glyph_set(self,
                                     target_pixel_height=?,
                                     target_size=?,
                                     str hinter=?,
                                     restrict_to=?,
-                                    allow_color=?)
\ No newline at end of file
+                                    allow_color=?,
+                                    cache=?)
\ No newline at end of file
@@ -14,9 +14,12 @@
 #cython: auto_pickle=False
 #distutils: language=c++
 
-from libc.math cimport logf
+from libc.math cimport ceilf, logf
+from libc.string cimport memcpy
 from libcpp cimport bool
 from libcpp.deque cimport deque
+from libcpp.unordered_map cimport unordered_map
+from libcpp.unordered_set cimport unordered_set
 from libcpp.vector cimport vector
 
 cimport cython
@@ -28,7 +31,7 @@ from .core cimport baseFont, baseItem, Texture, Callback, \
 from .c_types cimport *
 from .types cimport *
 
-from libc.stdint cimport uintptr_t
+from libc.stdint cimport uintptr_t, int64_t, uint32_t
 import ctypes
 from concurrent.futures import ThreadPoolExecutor
 
@@ -63,7 +66,10 @@ What is up to you to provide:
 
 import freetype
 import freetype.raw
+import hashlib
 import os
+import sys
+import tempfile
 import numpy as np
 
 def get_system_fonts():
@@ -949,6 +955,177 @@ cdef class GlyphSet:
         return new_glyphset
 
 
+# File format: int64 header (magic, version, height, origin_y,
+# number of glyphs), int64 (key, rows, cols, channels, offset)
+# per glyph, float32 (dy, dx, advance) per glyph, then the pixels.
+_GLYPH_CACHE_MAGIC = 0x4443474753594C47
+_GLYPH_CACHE_VERSION = 2
+
+cdef class GlyphCache:
+    """
+    Persistent cache of the glyphs rendered by FontRenderer.
+
+    Rendering a GlyphSet is slow, as every glyph is rasterized.
+    The rendered GlyphSets are thus stored in a cache directory,
+    indexed by the content of the font file, the size, the hinter
+    and the set of characters, such that next launches, or
+    a new dpi scale already seen, reuse the glyphs without
+    rasterizing.
+
+    The files are memory mapped when loaded: the glyph images are
+    only read from the disk when used, and are copied on write.
+
+    Args:
+        directory: where to store the cache files. Defaults
+            to the dearcygui/glyphs subdirectory of the user
+            cache directory.
+    """
+    def __init__(self, directory=None):
+        if directory is None:
+            if os.name == "nt":
+                root = os.environ.get("LOCALAPPDATA", os.path.expanduser("~"))
+            elif sys.platform == "darwin":
+                root = os.path.join(os.path.expanduser("~"), "Library", "Caches")
+            else:
+                root = os.environ.get("XDG_CACHE_HOME",
+                                      os.path.join(os.path.expanduser("~"), ".cache"))
+            directory = os.path.join(root, "dearcygui", "glyphs")
+        self._directory = str(directory)
+        self._file_hashes = {}
+
+    @property
+    def directory(self):
+        """Directory containing the cache files"""
+        return self._directory
+
+    def key(self, str path, int32_t size, str hinter, restrict_to, bint allow_color) -> str:
+        """
+        Returns the cache key of the glyphs of the font file
+        rendered with these parameters.
+        """
+        cdef object stat = os.stat(path)
+        file_key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+        file_hash = self._file_hashes.get(file_key, None)
+        if file_hash is None:
+            with open(path, 'rb') as fp:
+                file_hash = hashlib.sha1(fp.read()).hexdigest()
+            self._file_hashes[file_key] = file_hash
+        if restrict_to is None:
+            codepoints = "all"
+        else:
+            codepoints = hashlib.sha1(
+                np.array(sorted(set(restrict_to)), dtype=np.int64).tobytes()
+            ).hexdigest()
+        key = f"{file_hash}-{size}-{hinter}-{int(allow_color)}-{codepoints}"
+        return hashlib.sha1(key.encode()).hexdigest()
+
+    def load(self, str key):
+        """
+        Returns the GlyphSet stored for the key,
+        or None if it is not in the cache.
+        """
+        path = os.path.join(self._directory, key + ".glyphs")
+        if not(os.path.exists(path)):
+            return None
+        cdef GlyphSet glyph_set
+        cdef int64_t num_glyphs, i, offset, rows, cols, channels
+        try:
+            data = np.memmap(path, dtype=np.uint8, mode='c')
+            header = data[:64].view(np.int64)
+            if header[0] != _GLYPH_CACHE_MAGIC or header[1] != _GLYPH_CACHE_VERSION:
+                return None
+            num_glyphs = header[4]
+            offset = 64
+            layout = data[offset:offset+num_glyphs*5*8].view(np.int64).reshape(num_glyphs, 5)
+            offset += num_glyphs*5*8
+            positioning = data[offset:offset+num_glyphs*3*4].view(np.float32).reshape(num_glyphs, 3)
+            offset += (num_glyphs*3*4 + 7) & ~7
+            pixels = data[offset:]
+            glyph_set = GlyphSet(int(header[2]), int(header[3]))
+            for i in range(num_glyphs):
+                (key_i, rows, cols, channels, offset) = layout[i].tolist()
+                glyph_set.images[key_i] = \
+                    pixels[offset:offset+rows*cols*channels].reshape(rows, cols, channels)
+                glyph_set.positioning[key_i] = tuple(positioning[i].tolist())
+        except (OSError, ValueError):
+            # Corrupted or truncated file
+            return None
+        return glyph_set
+
+    def store(self, str key, GlyphSet glyph_set) -> None:
+        """
+        Stores the GlyphSet in the cache.
+        Failures to write (read-only directory, etc) are ignored.
+        """
+        keys = sorted(glyph_set.images.keys())
+        cdef int64_t num_glyphs = len(keys)
+        header = np.zeros(8, dtype=np.int64)
+        header[:5] = (_GLYPH_CACHE_MAGIC, _GLYPH_CACHE_VERSION,
+                      glyph_set.height, glyph_set.origin_y, num_glyphs)
+        layout = np.zeros((num_glyphs, 5), dtype=np.int64)
+        positioning = np.zeros((num_glyphs, 3), dtype=np.float32)
+        images = []
+        cdef int64_t offset = 0
+        for (i, unicode_key) in enumerate(keys):
+            image = np.ascontiguousarray(glyph_set.images[unicode_key], dtype=np.uint8)
+            if image.ndim == 2:
+                image = image[:, :, np.newaxis]
+            layout[i] = (unicode_key, image.shape[0], image.shape[1], image.shape[2], offset)
+            positioning[i] = glyph_set.positioning[unicode_key]
+            images.append(image)
+            offset += image.size
+        padding = (-(num_glyphs*3*4)) & 7
+        fd = -1
+        temp_path = None
+        try:
+            os.makedirs(self._directory, exist_ok=True)
+            (fd, temp_path) = tempfile.mkstemp(dir=self._directory, suffix=".tmp")
+            with os.fdopen(fd, 'wb') as fp:
+                fd = -1
+                fp.write(header.tobytes())
+                fp.write(layout.tobytes())
+                fp.write(positioning.tobytes())
+                fp.write(bytes(padding))
+                for image in images:
+                    fp.write(image.tobytes())
+            # Atomic, in case another process writes the same entry
+            os.replace(temp_path, os.path.join(self._directory, key + ".glyphs"))
+        except OSError:
+            if fd >= 0:
+                os.close(fd)
+            if temp_path is not None and os.path.exists(temp_path):
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+
+    def clear(self) -> None:
+        """Removes all the cache files"""
+        if not(os.path.isdir(self._directory)):
+            return
+        for filename in os.listdir(self._directory):
+            if filename.endswith(".glyphs"):
+                try:
+                    os.remove(os.path.join(self._directory, filename))
+                except OSError:
+                    pass
+
+cdef GlyphCache _default_glyph_cache = None
+
+cdef GlyphCache get_glyph_cache(cache):
+    """Returns the GlyphCache to use for the cache argument of render_glyph_set"""
+    global _default_glyph_cache
+    if cache is None or cache is False:
+        return None
+    if cache is True:
+        if _default_glyph_cache is None:
+            _default_glyph_cache = GlyphCache()
+        return _default_glyph_cache
+    if not(isinstance(cache, GlyphCache)):
+        raise TypeError("cache must be a GlyphCache, True or None")
+    return <GlyphCache>cache
+
+
 cdef inline int32_t get_freetype_load_flags(str hinter, bint allow_color):
     """Prepare FreeType loading flags"""
 
@@ -1006,6 +1183,371 @@ cdef inline int32_t get_freetype_load_flags(str hinter, bint allow_color):
         
     return load_flags
 
+cdef inline int32_t get_freetype_render_mode(str hinter):
+    """Rendering mode matching the hinter"""
+    if hinter == "monochrome":
+        return freetype.FT_RENDER_MODES["FT_RENDER_MODE_MONO"]
+    elif hinter == "light":
+        return freetype.FT_RENDER_MODES["FT_RENDER_MODE_LIGHT"]
+    return freetype.FT_RENDER_MODES["FT_RENDER_MODE_NORMAL"]
+
+cdef extern from * nogil:
+    """
+    #include <ft2build.h>
+    #include FT_FREETYPE_H
+    #include <cmath>
+    #include <cstring>
+    #include <functional>
+    #include <system_error>
+    #include <thread>
+    #include <utility>
+    #include <vector>
+
+    struct RasterizedGlyph {
+        uint32_t codepoint;
+        int32_t rows;
+        int32_t cols;
+        int32_t channels;
+        int32_t top;
+        int32_t left;
+        float advance;
+        int64_t offset; // in the pixels of the job
+    };
+
+    struct GlyphRasterJob {
+        // inputs
+        const unsigned char *font_data = nullptr;
+        size_t font_data_size = 0;
+        int32_t pixel_size = 0;
+        int32_t load_flags = 0;
+        int32_t render_mode = 0;
+        bool all_codepoints = true;
+        std::vector<uint32_t> codepoints;
+        // outputs
+        int32_t error = 0;
+        std::vector<RasterizedGlyph> glyphs;
+        std::vector<unsigned char> pixels; // packed glyph bitmaps
+        std::vector<uint32_t> skipped; // glyphs that failed to render
+    };
+
+    static void font_rasterize_glyph(GlyphRasterJob &job, FT_Face face,
+                                     FT_ULong codepoint, FT_UInt glyph_index)
+    {
+        // The bundled FreeType is built without libpng
+        // (color bitmap glyphs). The glyphs it fails to
+        // render are recorded for the freetype-py fallback.
+        if (FT_Load_Glyph(face, glyph_index, job.load_flags)) {
+            job.skipped.push_back((uint32_t)codepoint);
+            return;
+        }
+        FT_GlyphSlot slot = face->glyph;
+        if (FT_Render_Glyph(slot, (FT_Render_Mode)job.render_mode)) {
+            job.skipped.push_back((uint32_t)codepoint);
+            return;
+        }
+        const FT_Bitmap &bitmap = slot->bitmap;
+        RasterizedGlyph glyph;
+        glyph.codepoint = (uint32_t)codepoint;
+        // lsb/rsb deltas are pre-applied, as the advance is rounded
+        glyph.advance = (float)std::nearbyint(
+            (double)(slot->lsb_delta - slot->rsb_delta + slot->metrics.horiAdvance) / 64.);
+        glyph.top = slot->bitmap_top;
+        glyph.left = slot->bitmap_left;
+        glyph.offset = (int64_t)job.pixels.size();
+        int32_t rows = (int32_t)bitmap.rows;
+        int32_t cols = (int32_t)bitmap.width;
+        int32_t pitch = bitmap.pitch;
+        if (rows == 0 || cols == 0) {
+            // empty glyph (space for instance)
+            glyph.rows = 1;
+            glyph.cols = 1;
+            glyph.channels = 1;
+            glyph.top = 0;
+            glyph.left = 0;
+            job.pixels.push_back(0);
+            job.glyphs.push_back(glyph);
+            return;
+        }
+        glyph.rows = rows;
+        glyph.cols = cols;
+        unsigned char *dst;
+        if (bitmap.pixel_mode == FT_PIXEL_MODE_MONO) {
+            glyph.channels = 1;
+            job.pixels.resize(job.pixels.size() + (size_t)rows * cols);
+            dst = job.pixels.data() + glyph.offset;
+            for (int32_t i = 0; i < rows; i++)
+                for (int32_t j = 0; j < cols; j++)
+                    dst[i * cols + j] = (bitmap.buffer[i * pitch + (j >> 3)] & (1 << (7 - (j & 7)))) ? 255 : 0;
+        } else if (bitmap.pixel_mode == FT_PIXEL_MODE_GRAY) {
+            glyph.channels = 1;
+            job.pixels.resize(job.pixels.size() + (size_t)rows * cols);
+            dst = job.pixels.data() + glyph.offset;
+            for (int32_t i = 0; i < rows; i++)
+                std::memcpy(dst + i * cols, bitmap.buffer + i * pitch, cols);
+        } else if (bitmap.pixel_mode == FT_PIXEL_MODE_BGRA) {
+            glyph.channels = 4;
+            job.pixels.resize(job.pixels.size() + (size_t)rows * cols * 4);
+            dst = job.pixels.data() + glyph.offset;
+            for (int32_t i = 0; i < rows; i++) {
+                for (int32_t j = 0; j < cols; j++) {
+                    const unsigned char *src = bitmap.buffer + i * pitch + j * 4;
+                    unsigned char *pixel = dst + (i * cols + j) * 4;
+                    pixel[0] = src[2];
+                    pixel[1] = src[1];
+                    pixel[2] = src[0];
+                    pixel[3] = src[3];
+                }
+            }
+        } else {
+            // unsupported bitmap mode
+            job.skipped.push_back((uint32_t)codepoint);
+            return;
+        }
+        job.glyphs.push_back(glyph);
+    }
+
+    static void font_rasterize_job(GlyphRasterJob &job)
+    {
+        // FreeType objects cannot be shared between threads:
+        // each job has its own library and face.
+        FT_Library library;
+        FT_Face face;
+        job.error = FT_Init_FreeType(&library);
+        if (job.error)
+            return;
+        job.error = FT_New_Memory_Face(library, job.font_data,
+                                       (FT_Long)job.font_data_size, 0, &face);
+        if (job.error) {
+            FT_Done_FreeType(library);
+            return;
+        }
+        job.error = FT_Set_Pixel_Sizes(face, 0, job.pixel_size);
+        if (!job.error) {
+            FT_UInt glyph_index;
+            if (job.all_codepoints) {
+                FT_ULong codepoint = FT_Get_First_Char(face, &glyph_index);
+                while (glyph_index != 0) {
+                    font_rasterize_glyph(job, face, codepoint, glyph_index);
+                    codepoint = FT_Get_Next_Char(face, codepoint, &glyph_index);
+                }
+            } else {
+                for (uint32_t codepoint : job.codepoints) {
+                    glyph_index = FT_Get_Char_Index(face, codepoint);
+                    if (glyph_index != 0)
+                        font_rasterize_glyph(job, face, codepoint, glyph_index);
+                }
+            }
+        }
+        FT_Done_Face(face);
+        FT_Done_FreeType(library);
+    }
+
+    // Vertical metrics (in pixels) and character map of a font
+    static int32_t font_face_info(const unsigned char *font_data, size_t font_data_size,
+                                  int32_t pixel_size, float *ascender, float *descender,
+                                  std::vector<uint32_t> &codepoints)
+    {
+        FT_Library library;
+        FT_Face face;
+        int32_t error = FT_Init_FreeType(&library);
+        if (error)
+            return error;
+        error = FT_New_Memory_Face(library, font_data, (FT_Long)font_data_size, 0, &face);
+        if (error) {
+            FT_Done_FreeType(library);
+            return error;
+        }
+        error = FT_Set_Pixel_Sizes(face, 0, pixel_size);
+        if (!error) {
+            *ascender = (float)face->size->metrics.ascender / 64.f;
+            *descender = (float)face->size->metrics.descender / 64.f;
+            FT_UInt glyph_index;
+            FT_ULong codepoint = FT_Get_First_Char(face, &glyph_index);
+            while (glyph_index != 0) {
+                codepoints.push_back((uint32_t)codepoint);
+                codepoint = FT_Get_Next_Char(face, codepoint, &glyph_index);
+            }
+        }
+        FT_Done_Face(face);
+        FT_Done_FreeType(library);
+        return error;
+    }
+
+    // Runs the jobs in parallel, one thread per job
+    static void font_rasterize_jobs(std::vector<GlyphRasterJob> &jobs)
+    {
+        std::vector<std::thread> threads;
+        size_t first_inline = jobs.size();
+        for (size_t i = 1; i < jobs.size(); i++) {
+            try {
+                threads.emplace_back(font_rasterize_job, std::ref(jobs[i]));
+            } catch (const std::system_error &) {
+                first_inline = i;
+                break;
+            }
+        }
+        if (!jobs.empty())
+            font_rasterize_job(jobs[0]);
+        for (size_t i = first_inline; i < jobs.size(); i++)
+            font_rasterize_job(jobs[i]);
+        for (auto &thread : threads)
+            thread.join();
+    }
+    """
+    cdef cppclass RasterizedGlyph:
+        uint32_t codepoint
+        int32_t rows
+        int32_t cols
+        int32_t channels
+        int32_t top
+        int32_t left
+        float advance
+        int64_t offset
+    cdef cppclass GlyphRasterJob:
+        const unsigned char *font_data
+        size_t font_data_size
+        int32_t pixel_size
+        int32_t load_flags
+        int32_t render_mode
+        bint all_codepoints
+        vector[uint32_t] codepoints
+        int32_t error
+        vector[RasterizedGlyph] glyphs
+        vector[unsigned char] pixels
+        vector[uint32_t] skipped
+    void font_rasterize_jobs(vector[GlyphRasterJob]&)
+    int32_t font_face_info(const unsigned char*, size_t, int32_t, float*, float*, vector[uint32_t]&)
+
+
+cdef object bitmap_to_image(bitmap):
+    """
+    Copy of a freetype-py bitmap, as a (rows, cols, channels)
+    uint8 array, or None if the pixel mode is not supported.
+    """
+    cdef int32_t rows = bitmap.rows
+    cdef int32_t cols = bitmap.width
+    cdef int32_t pitch = bitmap.pitch
+    cdef int32_t pixel_mode = bitmap.pixel_mode
+    cdef int32_t channels
+    if pixel_mode == freetype.FT_PIXEL_MODE_MONO or \
+       pixel_mode == freetype.FT_PIXEL_MODE_GRAY:
+        channels = 1
+    elif pixel_mode == freetype.FT_PIXEL_MODE_BGRA:
+        channels = 4
+    else:
+        return None
+    image = np.empty((rows, cols, channels), dtype=np.uint8)
+    cdef unsigned char[:,:,::1] image_view = image
+    cdef uintptr_t buffer_ptr = <uintptr_t>ctypes.addressof(bitmap._FT_Bitmap.buffer.contents)
+    cdef const unsigned char* buffer_view = <unsigned char*>buffer_ptr
+    cdef bint is_mono = pixel_mode == freetype.FT_PIXEL_MODE_MONO
+    cdef int32_t i, j, idx
+    with nogil:
+        if is_mono:
+            for i in range(rows):
+                for j in range(cols):
+                    image_view[i, j, 0] = 255 if (buffer_view[i * pitch + (j >> 3)] & (1 << (7 - (j & 7)))) else 0
+        elif channels == 1:
+            for i in range(rows):
+                for j in range(cols):
+                    image_view[i, j, 0] = buffer_view[i * pitch + j]
+        else:
+            # BGRA to RGBA
+            for i in range(rows):
+                for j in range(cols):
+                    idx = i * pitch + j * 4
+                    image_view[i, j, 0] = buffer_view[idx + 2]
+                    image_view[i, j, 1] = buffer_view[idx + 1]
+                    image_view[i, j, 2] = buffer_view[idx]
+                    image_view[i, j, 3] = buffer_view[idx + 3]
+    return image
+
+cdef list rasterize_glyphs_python(face,
+                                  int32_t pixel_size,
+                                  int32_t load_flags,
+                                  int32_t render_mode,
+                                  codepoints):
+    """
+    Rasterize glyphs with freetype-py, for the fonts and
+    glyphs the bundled FreeType does not support (WOFF,
+    WOFF2, PNG color glyphs), as it is built without zlib,
+    brotli and libpng.
+
+    codepoints: the characters to render, or None for all.
+    Returns a list of (codepoint, image, top, left, advance).
+    """
+    face.set_pixel_sizes(0, pixel_size)
+    cdef list indices
+    if codepoints is None:
+        indices = list(face.get_chars())
+    else:
+        indices = [(c, face.get_char_index(c)) for c in codepoints]
+    cdef list glyphs = []
+    for (codepoint, glyph_index) in indices:
+        if glyph_index == 0:
+            continue
+        try:
+            face.load_glyph(glyph_index, flags=load_flags)
+            slot = face.glyph
+            slot.render(render_mode)
+        except freetype.FT_Exception:
+            continue
+        # lsb/rsb deltas are pre-applied, as the advance is rounded
+        advance = round((slot._FT_GlyphSlot.contents.lsb_delta -
+                         slot._FT_GlyphSlot.contents.rsb_delta +
+                         slot.metrics.horiAdvance) / 64.)
+        if slot.bitmap.rows == 0 or slot.bitmap.width == 0:
+            # empty glyph (space for instance)
+            glyphs.append((codepoint, np.zeros((1, 1, 1), dtype=np.uint8), 0, 0, advance))
+            continue
+        image = bitmap_to_image(slot.bitmap)
+        if image is None:
+            continue
+        glyphs.append((codepoint, image, slot.bitmap_top, slot.bitmap_left, advance))
+    return glyphs
+
+cdef list glyphs_from_job(GlyphRasterJob& job, face):
+    """
+    Glyphs rendered by a job of font_rasterize_jobs, as a list
+    of (codepoint, image, top, left, advance). The images are
+    views of a single packed buffer.
+
+    face is the freetype-py face of the font, used
+    to render the glyphs the job could not.
+    """
+    if job.error != 0:
+        # For instance a WOFF font
+        try:
+            return rasterize_glyphs_python(face, job.pixel_size,
+                                           job.load_flags, job.render_mode,
+                                           None if job.all_codepoints else list(job.codepoints))
+        except freetype.FT_Exception:
+            raise ValueError(f"FreeType error {job.error}")
+    cdef int64_t num_pixels = <int64_t>job.pixels.size()
+    pixels = np.empty(num_pixels, dtype=np.uint8)
+    cdef unsigned char[::1] pixels_view = pixels
+    if num_pixels > 0:
+        memcpy(&pixels_view[0], job.pixels.data(), num_pixels)
+    cdef list glyphs = []
+    cdef int32_t i
+    cdef int64_t offset, size
+    for i in range(<int32_t>job.glyphs.size()):
+        offset = job.glyphs[i].offset
+        size = <int64_t>job.glyphs[i].rows * job.glyphs[i].cols * job.glyphs[i].channels
+        image = pixels[offset:offset+size].reshape(job.glyphs[i].rows,
+                                                   job.glyphs[i].cols,
+                                                   job.glyphs[i].channels)
+        glyphs.append((job.glyphs[i].codepoint, image,
+                       job.glyphs[i].top, job.glyphs[i].left,
+                       job.glyphs[i].advance))
+    if not(job.skipped.empty()):
+        # For instance color emojis
+        glyphs += rasterize_glyphs_python(face, job.pixel_size,
+                                          job.load_flags, job.render_mode,
+                                          list(job.skipped))
+    return glyphs
+
+
 cdef class FontRenderer:
     """
     A class that manages font loading,
@@ -1013,6 +1555,9 @@ cdef class FontRenderer:
     def __init__(self, path):
         if not os.path.exists(path):
             raise ValueError(f"Font file {path} not found")
+        self._path = str(path)
+        with open(path, 'rb') as fp:
+            self._data = fp.read()
         self._face = freetype.Face(path)
         if self._face is None:
             raise ValueError("Failed to open the font")
@@ -1135,21 +1680,45 @@ cdef class FontRenderer:
 
     def _copy_bitmap_to_image(self, bitmap, image, x_offset, y_offset):
         """Copy bitmap data to the image array"""
-        for y in range(bitmap.rows):
-            for x in range(bitmap.width):
-                if bitmap.pixel_mode == freetype.FT_PIXEL_MODE_GRAY:
-                    image[y + y_offset, int(x + x_offset), 3] = bitmap.buffer[y * bitmap.pitch + x]
-                elif bitmap.pixel_mode == freetype.FT_PIXEL_MODE_BGRA:
-                    image[y + y_offset, int(x + x_offset), :] = bitmap.buffer[
-                        y * bitmap.pitch + x * 4:(y + 1) * bitmap.pitch + x * 4
-                    ]
+        cdef int32_t rows = bitmap.rows
+        cdef int32_t cols = bitmap.width
+        cdef int32_t pitch = bitmap.pitch
+        cdef bint is_gray = bitmap.pixel_mode == freetype.FT_PIXEL_MODE_GRAY
+        if rows == 0 or cols == 0:
+            return
+        if not(is_gray) and bitmap.pixel_mode != freetype.FT_PIXEL_MODE_BGRA:
+            return
+        cdef unsigned char[:,:,::1] image_view = image
+        cdef uintptr_t buffer_ptr = <uintptr_t>ctypes.addressof(bitmap._FT_Bitmap.buffer.contents)
+        cdef const unsigned char* buffer_view = <unsigned char*>buffer_ptr
+        cdef int32_t x0 = int(x_offset)
+        cdef int32_t y0 = int(y_offset)
+        cdef int32_t i, j, idx
+        # Clip to the image
+        cdef int32_t i_end = min(rows, <int32_t>image_view.shape[0] - y0)
+        cdef int32_t j_end = min(cols, <int32_t>image_view.shape[1] - x0)
+        with nogil:
+            if is_gray:
+                for i in range(max(0, -y0), i_end):
+                    for j in range(max(0, -x0), j_end):
+                        image_view[y0 + i, x0 + j, 3] = buffer_view[i * pitch + j]
+            else:
+                # BGRA to RGBA
+                for i in range(max(0, -y0), i_end):
+                    for j in range(max(0, -x0), j_end):
+                        idx = i * pitch + j * 4
+                        image_view[y0 + i, x0 + j, 0] = buffer_view[idx + 2]
+                        image_view[y0 + i, x0 + j, 1] = buffer_view[idx + 1]
+                        image_view[y0 + i, x0 + j, 2] = buffer_view[idx]
+                        image_view[y0 + i, x0 + j, 3] = buffer_view[idx + 3]
 
     cpdef GlyphSet render_glyph_set(self,
                                     target_pixel_height=None,
                                     target_size=0,
                                     str hinter="light",
                                     restrict_to=None,
-                                    allow_color=True):
+                                    allow_color=True,
+                                    cache=True):
         """
         Render the glyphs of the font at the target scale,
         in order to them load them in a Font object.
@@ -1183,6 +1752,10 @@ cdef class FontRenderer:
             available.
         allow_color: If the font contains colored glyphs, this enables
             to render them in color.
+        cache: GlyphCache where to look for the glyphs before
+            rendering them, and where to store them after. True
+            uses a GlyphCache in the user cache directory, and
+            None disables the cache.
 
         Outputs:
         --------
@@ -1195,130 +1768,762 @@ cdef class FontRenderer:
             assert(False)# TODO
             #req = freetype.raw.FT_Size_Re
             #freetype.raw.FT_Request_Size(face, req)
+        return render_glyph_sets([self],
+                                 target_size=target_size,
+                                 hinter=hinter,
+                                 restrict_to=[restrict_to],
+                                 allow_color=allow_color,
+                                 cache=cache)[0]
+
+
+cdef GlyphSet glyph_set_from_glyphs(list glyphs):
+    """Build a GlyphSet from a list of (codepoint, image, top, left, advance)"""
+    # Track max dimensions of the glyphs
+    cdef int32_t max_bitmap_top = 0
+    cdef int32_t max_bitmap_bot = 0
+    for (_, image, top, _, _) in glyphs:
+        max_bitmap_top = max(max_bitmap_top, top)
+        max_bitmap_bot = max(max_bitmap_bot, image.shape[0] - top)
+
+    # Calculate final dimensions
+    cdef int32_t height = max_bitmap_top + max_bitmap_bot + 1
+    cdef int32_t target_origin_y = max_bitmap_top
+    cdef GlyphSet glyph_set = GlyphSet(height, target_origin_y)
+    for (codepoint, image, top, left, advance) in glyphs:
+        # Convert to top-down coordinate system
+        glyph_set.add_glyph(codepoint, image, target_origin_y - top, left, advance)
+    return glyph_set
+
+def render_glyph_sets(list renderers,
+                      target_size=0,
+                      str hinter="light",
+                      restrict_to=None,
+                      allow_color=True,
+                      cache=True) -> list:
+    """
+    Render the glyphs of several fonts at the target scale.
+
+    Equivalent to calling render_glyph_set on each FontRenderer,
+    but the fonts are rasterized in parallel threads, without
+    holding the GIL.
+
+    Inputs:
+    -------
+    renderers: list of FontRenderer.
+    restrict_to: None, a set of ints used for all the fonts,
+        or a list with a set of ints (or None) per font.
+    target_size, hinter, allow_color, cache: see
+        FontRenderer.render_glyph_set
+
+    Outputs:
+    --------
+    List of GlyphSet, one for each renderer.
+    """
+    cdef int32_t num_fonts = len(renderers)
+    cdef bint per_font = isinstance(restrict_to, (list, tuple)) and \
+        len(restrict_to) == num_fonts and \
+        all([r is None or hasattr(r, "__iter__") for r in restrict_to])
+    cdef int32_t load_flags = get_freetype_load_flags(hinter, allow_color)
+    cdef int32_t render_mode = get_freetype_render_mode(hinter)
+    cdef int32_t pixel_size = int(round(target_size))
+
+    # Retrieve the fonts already in the cache
+    cdef GlyphCache glyph_cache = get_glyph_cache(cache)
+    cdef list glyph_sets = [None] * num_fonts
+    cdef list cache_keys = [None] * num_fonts
+    cdef list restricts = [None] * num_fonts
+    cdef list missing = []
+    cdef FontRenderer renderer
+    cdef int32_t i, j
+    for i in range(num_fonts):
+        renderer = renderers[i]
+        restricts[i] = restrict_to[i] if per_font else restrict_to
+        if glyph_cache is not None:
+            cache_keys[i] = glyph_cache.key(renderer._path, pixel_size,
+                                            hinter, restricts[i], allow_color)
+            glyph_sets[i] = glyph_cache.load(cache_keys[i])
+            if glyph_sets[i] is not None:
+                continue
+        missing.append(i)
+
+    if len(missing) == 0:
+        return glyph_sets
+
+    # Rasterize the others
+    cdef vector[GlyphRasterJob] jobs
+    jobs.resize(len(missing))
+    for j in range(<int32_t>len(missing)):
+        i = missing[j]
+        renderer = renderers[i]
+        jobs[j].font_data = <const unsigned char*><const char*>renderer._data
+        jobs[j].font_data_size = len(renderer._data)
+        jobs[j].pixel_size = pixel_size
+        jobs[j].load_flags = load_flags
+        jobs[j].render_mode = render_mode
+        jobs[j].all_codepoints = restricts[i] is None
+        if restricts[i] is not None:
+            for codepoint in sorted(set(restricts[i])):
+                jobs[j].codepoints.push_back(<uint32_t>codepoint)
+
+    with nogil:
+        font_rasterize_jobs(jobs)
+
+    for j in range(<int32_t>len(missing)):
+        i = missing[j]
+        renderer = renderers[i]
+        try:
+            glyphs = glyphs_from_job(jobs[j], renderer._face)
+        except ValueError as e:
+            raise ValueError(f"Failed to render the glyphs of {renderer._path} ({e})")
+        glyph_sets[i] = glyph_set_from_glyphs(glyphs)
+        if glyph_cache is not None:
+            glyph_cache.store(cache_keys[i], glyph_sets[i])
+    return glyph_sets
+
+cdef extern from * nogil:
+    """
+    #include "imgui.h"
+    #include "imgui_internal.h"
+    #include <cstdint>
+    #include <vector>
+
+    // Glyphs of a DynamicFont found in the draw lists of the frame
+    struct DynamicFontScan {
+        ImTextureID texture_id = ImTextureID(); // texture of the font
+        float marker_v = 0.f; // V of the placeholder glyphs
+        float page_u0 = 0.f;
+        float page_v0 = 0.f;
+        float page_u1 = 0.f;
+        float page_v1 = 0.f;
+        float cell_du = 1.f;
+        float cell_dv = 1.f;
+        int32_t cells_per_row = 0;
+        std::vector<uint32_t> requested; // codepoints of the placeholders rendered
+        std::vector<int32_t> used_cells; // cells of the page rendered
+    };
+
+    static void dynamic_font_scan_draw_list(DynamicFontScan &scan, const ImDrawList *draw_list)
+    {
+        if (draw_list == nullptr)
+            return;
+        const ImDrawVert *vertices = draw_list->VtxBuffer.Data;
+        const ImDrawIdx *indices = draw_list->IdxBuffer.Data;
+        // The vertices of a glyph quad give the same results
+        uint32_t last_codepoint = UINT32_MAX;
+        int32_t last_cell = -1;
+        for (const ImDrawCmd &cmd : draw_list->CmdBuffer) {
+            // Only the commands using the texture of the font
+            // (images or other fonts may use the same uvs)
+            if (cmd.UserCallback != nullptr || cmd.GetTexID() != scan.texture_id)
+                continue;
+            for (unsigned int i = cmd.IdxOffset; i < cmd.IdxOffset + cmd.ElemCount; i++) {
+                const ImDrawVert &vertex = vertices[cmd.VtxOffset + indices[i]];
+                float u = vertex.uv.x;
+                float v = vertex.uv.y;
+                if (v == scan.marker_v) {
+                    // placeholder glyph: u is -(codepoint+1)
+                    if (u > -1.f)
+                        continue;
+                    uint32_t codepoint = (uint32_t)(-u) - 1;
+                    if (codepoint != last_codepoint)
+                        scan.requested.push_back(codepoint);
+                    last_codepoint = codepoint;
+                } else if (u >= scan.page_u0 && u < scan.page_u1 &&
+                           v >= scan.page_v0 && v < scan.page_v1) {
+                    int32_t col = (int32_t)((u - scan.page_u0) / scan.cell_du);
+                    int32_t row = (int32_t)((v - scan.page_v0) / scan.cell_dv);
+                    if (col >= scan.cells_per_row)
+                        continue;
+                    int32_t cell = row * scan.cells_per_row + col;
+                    if (cell != last_cell)
+                        scan.used_cells.push_back(cell);
+                    last_cell = cell;
+                }
+            }
+        }
+    }
+
+    // Scans the draw lists of all the windows rendered in the frame.
+    // Must be called once the windows of the frame are complete.
+    static void dynamic_font_scan_frame(DynamicFontScan &scan)
+    {
+        ImGuiContext *g = ImGui::GetCurrentContext();
+        if (g == nullptr)
+            return;
+        for (ImGuiWindow *window : g->Windows)
+            if (window->Active)
+                dynamic_font_scan_draw_list(scan, window->DrawList);
+        dynamic_font_scan_draw_list(scan, ImGui::GetBackgroundDrawList());
+        dynamic_font_scan_draw_list(scan, ImGui::GetForegroundDrawList());
+    }
+    """
+    cdef cppclass DynamicFontScan:
+        imgui.ImTextureID texture_id
+        float marker_v
+        float page_u0
+        float page_v0
+        float page_u1
+        float page_v1
+        float cell_du
+        float cell_dv
+        int32_t cells_per_row
+        vector[uint32_t] requested
+        vector[int32_t] used_cells
+    void dynamic_font_scan_frame(DynamicFontScan&)
+
+
+cdef int32_t _num_dynamic_fonts = 0 # Used to give each DynamicFont its own marker
+cdef uint32_t _FREE_CELL = 0xFFFFFFFF
+
+cdef class DynamicFont(baseFont):
+    """
+    A font which rasterizes its glyphs on demand.
+
+    Font requires all its glyphs to be packed in its
+    FontTexture before use, which is slow and memory
+    hungry for large character sets (CJK, symbols, emojis).
+    DynamicFont instead starts with an empty page in its
+    texture. The glyphs missing from the page are recorded
+    during rendering, rasterized in a background thread,
+    and appended to the page. When the page is full, the
+    glyphs that have not been displayed for the longest
+    time are evicted.
+
+    Until they are loaded (usually a frame or two after
+    they are first displayed), missing glyphs are rendered
+    as a blank space.
+
+    Parameters
+    ----------
+    context : Context
+    path : str
+        Path to the font file (ttf, otf, etc).
+    size : float = 17.
+        Pixel size at which the glyphs are rasterized.
+    page_size : int = 1024
+        Width and height of the page in which glyphs are
+        stored. The number of glyphs that can be displayed
+        simultaneously is about (page_size / (1.25 * size))**2.
+    hinter : str = "light"
+        See FontRenderer.render_glyph_set.
+    allow_color : bool = False
+        Allow color glyphs (emojis). The texture is
+        then RGBA instead of alpha only.
+    preload : str or iterable of int = None
+        Characters to load during initialization.
+
+    Attributes:
+    - texture: Texture containing the page.
+    - size: Size of the font.
+    - scale: Scale of the font.
+    - no_scaling: Boolean indicating if scaling should be disabled for the font.
+    - capacity: Maximum number of glyphs in the page.
+    - num_loaded: Number of glyphs currently in the page.
+    """
+    def __cinit__(self, context, *args, **kwargs):
+        self.can_have_sibling = False
+        self._atlas = <void*>(new imgui.ImFontAtlas())
+        self._font = NULL
+        self._texture = Texture(context)
+        self._scale = 1.
+        self._dpi_scaling = True
+        self._last_push_frame = -1
+        self._loading = False
+
+    def __init__(self, context,
+                 str path,
+                 float size=17.,
+                 int32_t page_size=1024,
+                 str hinter="light",
+                 bint allow_color=False,
+                 preload=None,
+                 **kwargs):
+        global _num_dynamic_fonts
+        super().__init__(context, **kwargs)
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        if not(os.path.exists(path)):
+            raise ValueError(f"File {path} does not exist")
+        if size <= 0.:
+            raise ValueError(f"Invalid size {size}")
+        if page_size < 64 or page_size > 16384:
+            raise ValueError(f"Invalid page size {page_size}")
+        with open(path, 'rb') as fp:
+            self._data = fp.read()
+        self._path = path
+        # For the glyphs and fonts the bundled FreeType
+        # does not support (see rasterize_glyphs_python)
+        self._face = freetype.Face(path)
+        self._pixel_size = int(round(size))
+        self._load_flags = get_freetype_load_flags(hinter, allow_color)
+        self._render_mode = get_freetype_render_mode(hinter)
+        self._color = allow_color
+
+        # Retrieve the metrics and the characters of the font
+        cdef vector[uint32_t] codepoints
+        cdef float ascender = 0.
+        cdef float descender = 0.
+        cdef int32_t error = font_face_info(<const unsigned char*><const char*>self._data,
+                                            len(self._data),
+                                            self._pixel_size,
+                                            &ascender,
+                                            &descender,
+                                            codepoints)
+        if error != 0:
+            # For instance a WOFF font
+            try:
+                self._face.set_pixel_sizes(0, self._pixel_size)
+            except freetype.FT_Exception:
+                raise ValueError(f"Failed to load {path} (FreeType error {error})")
+            ascender = self._face.size.ascender / 64.
+            descender = self._face.size.descender / 64.
+            codepoints.clear()
+            for (c, _) in self._face.get_chars():
+                codepoints.push_back(c)
+        self._origin_y = <int32_t>ceilf(ascender)
+        cdef int32_t height = max(1, self._origin_y + <int32_t>ceilf(-descender))
+        # Some glyphs exceed the line height. Cells have
+        # a margin for them, and a padding row and column.
+        self._cell_size = height + height // 4 + 1
+        if self._cell_size > page_size // 2:
+            raise ValueError(f"page_size is too small for a font of size {size}")
+        self._placeholder_advance = <float>round(size / 2.)
+        self._marker_v = -100000. - <float>_num_dynamic_fonts
+        _num_dynamic_fonts += 1
+
+        # The page is reserved in an atlas which also
+        # contains the data ImGui needs (lines, white pixel)
+        cdef imgui.ImFontAtlas *atlas = <imgui.ImFontAtlas*>self._atlas
+        atlas.TexDesiredWidth = page_size
+        atlas.Flags |= imgui.ImFontAtlasFlags_NoPowerOfTwoHeight
+        cdef imgui.ImFontConfig config = imgui.ImFontConfig()
+        config.SizePixels = height
+        config.OversampleH = 1
+        config.OversampleV = 1
+        # Imgui currently requires a font to build the atlas.
+        # Its glyphs are replaced below.
+        cdef imgui.ImFont *font = atlas.AddFontDefault(&config)
+        cdef int32_t page_index = \
+            atlas.AddCustomRectRegular(page_size - 2 * atlas.TexGlyphPadding, page_size)
+        if not(atlas.Build()):
+            raise RuntimeError("Failed to build target texture data")
+        cdef imgui.ImFontAtlasCustomRect *rect = atlas.GetCustomRectByIndex(page_index)
+        self._page_x = rect.X
+        self._page_y = rect.Y
+        self._page_width = rect.Width
+        self._page_height = rect.Height
+        self._cells_per_row = self._page_width // self._cell_size
+        cdef int32_t num_cells = self._cells_per_row * (self._page_height // self._cell_size)
+        self._cell_codepoint.resize(num_cells)
+        self._cell_last_used.resize(num_cells)
+        cdef int32_t i
+        for i in range(num_cells):
+            self._cell_codepoint[i] = _FREE_CELL
+            self._cell_last_used[i] = -1
+
+        # Upload the texture
+        cdef unsigned char *data = NULL
+        cdef int width, tex_height, bpp
+        if allow_color:
+            atlas.GetTexDataAsRGBA32(&data, &width, &tex_height, &bpp)
         else:
-            self._face.set_pixel_sizes(0, int(round(target_size)))
+            atlas.GetTexDataAsAlpha8(&data, &width, &tex_height, &bpp)
+        cdef cython.view.array data_array = cython.view.array(shape=(tex_height, width, bpp), itemsize=1, format='B', mode='c', allocate_buffer=False)
+        data_array.data = <char*>data
+        if allow_color:
+            self._texture._filtering_mode = 0 # rgba bilinear
+        else:
+            self._texture._filtering_mode = 2 # 111A bilinear
+        self._texture.set_value(np.asarray(data_array, dtype=np.uint8))
+        assert(self._texture.allocated_texture != NULL)
+        atlas.SetTexID(<imgui.ImTextureID>self._texture.allocated_texture)
+        self._texture_width = width
+        self._texture_height = tex_height
+        # Release temporary CPU memory. The input data is
+        # kept, as BuildLookupTable needs the font config.
+        atlas.ClearTexData()
+
+        # Replace the glyphs of the default font by
+        # placeholders for all the characters of the font
+        font.Glyphs.clear()
+        font.IndexLookup.clear()
+        font.IndexAdvanceX.clear()
+        font.FontSize = height
+        font.Ascent = ascender
+        font.Descent = descender
+        self._font = font
+        cdef uint32_t codepoint
+        for i in range(<int32_t>codepoints.size()):
+            codepoint = codepoints[i]
+            # Control characters are handled by ImGui
+            if codepoint < 32 or codepoint > 0x10FFFF or \
+               self._glyph_index.find(codepoint) != self._glyph_index.end():
+                continue
+            self._glyph_index[codepoint] = font.Glyphs.Size
+            font.AddGlyph(NULL, <imgui.ImWchar>codepoint,
+                          0., 0., 0., 0., 0., 0., 0., 0.,
+                          self._placeholder_advance)
+            self._set_placeholder(codepoint)
+        if self._glyph_index.empty():
+            raise ValueError(f"{path} has no characters")
+        font.BuildLookupTable()
+
+        # Space is never rendered, and thus never requested.
+        # The fallback and ellipsis characters are needed
+        # for most text.
+        cdef list initial = [ord(' '), ord('.'), font.FallbackChar, font.EllipsisChar]
+        if preload is not None:
+            initial += self._codepoints_of(preload)
+        m.unlock()
+        self._load_glyphs(initial)
 
-        load_flags = get_freetype_load_flags(hinter, allow_color)
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._load_callback = Callback(self._on_missing_glyphs)
+        self.context.viewport.register_end_frame_font(self)
 
-        # Track max dimensions while loading glyphs
-        max_bitmap_top = 0
-        max_bitmap_bot = 0
+    def __dealloc__(self):
+        # Before anything else, as end_frame might be running
+        if self.context is not None and self.context.viewport is not None:
+            self.context.viewport.unregister_end_frame_font(self)
+        cdef imgui.ImFontAtlas *atlas = <imgui.ImFontAtlas*>self._atlas
+        atlas.Clear()
+        del atlas
 
-        cdef const unsigned char* buffer_view
-        cdef unsigned char[:,::1] image_view
-        cdef unsigned char[:,:,::1] color_image_view
-        cdef int32_t rows, cols, pitch, i, j, idx
-        cdef uintptr_t buffer_ptr
-        
-        # First pass - collect all glyphs and find dimensions
-        glyphs_data = []  # Store temporary glyph data
-        for unicode_key, glyph_index in self._face.get_chars():
-            if (restrict_to is not None) and (unicode_key not in restrict_to):
+    def __del__(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+        super().__del__()
+
+    @property
+    def texture(self):
+        """Readonly attribute: Texture containing the glyphs"""
+        return self._texture
+
+    @property
+    def size(self):
+        """Readonly attribute: native height of characters"""
+        if self._font == NULL:
+            raise ValueError("Uninitialized font")
+        return (<imgui.ImFont*>self._font).FontSize
+
+    @property
+    def scale(self):
+        """Writable attribute: multiplicative factor to scale the font when used"""
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._scale
+
+    @scale.setter
+    def scale(self, float value):
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        if value <= 0.:
+            raise ValueError(f"Invalid scale {value}")
+        self._scale = value
+
+    @property
+    def no_scaling(self):
+        """
+        boolean. Defaults to False.
+        If set, disables the automated scaling to the dpi
+        scale value for this font.
+        The manual user-set scale is still applied.
+        """
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        return not(self._dpi_scaling)
+
+    @no_scaling.setter
+    def no_scaling(self, bint value):
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._dpi_scaling = not(value)
+
+    @property
+    def capacity(self):
+        """Readonly attribute: maximum number of glyphs in the page"""
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        return <int>self._cell_codepoint.size()
+
+    @property
+    def num_loaded(self):
+        """Readonly attribute: number of glyphs currently in the page"""
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        cdef int32_t i, count = 0
+        for i in range(<int32_t>self._cell_codepoint.size()):
+            if self._cell_codepoint[i] != _FREE_CELL:
+                count += 1
+        return count
+
+    def preload(self, characters):
+        """
+        Load the target characters now, rather than
+        the first frames they are displayed.
+
+        characters: str, or iterable of unicode codepoints.
+        """
+        self._executor.submit(self._load_glyphs,
+                              self._codepoints_of(characters)).result()
+
+    @staticmethod
+    def _codepoints_of(characters):
+        if isinstance(characters, str):
+            return [ord(c) for c in characters]
+        return [int(c) for c in characters]
+
+    def _on_missing_glyphs(self, sender, target):
+        """Called when missing glyphs were rendered"""
+        self._executor.submit(self._load_requested_glyphs)
+
+    def _load_requested_glyphs(self):
+        """Load the missing glyphs until none is left"""
+        cdef unique_lock[DCGMutex] m
+        cdef list codepoints
+        try:
+            while True:
+                lock_gil_friendly(m, self.mutex)
+                codepoints = [c for c in self._requested]
+                self._requested.clear()
+                if len(codepoints) == 0:
+                    self._loading = False
+                    return
+                m.unlock()
+                self._load_glyphs(codepoints)
+        except Exception:
+            lock_gil_friendly(m, self.mutex)
+            self._loading = False
+            raise
+
+    def _load_glyphs(self, codepoints):
+        """Rasterize the target glyphs and append them to the page"""
+        cdef unique_lock[DCGMutex] m
+        cdef imgui.ImFont *font = <imgui.ImFont*>self._font
+        cdef vector[GlyphRasterJob] jobs
+        jobs.resize(1)
+        cdef uint32_t codepoint
+        lock_gil_friendly(m, self.mutex)
+        for c in sorted(set(codepoints)):
+            if c < 0 or c > 0x10FFFF:
                 continue
-                
-            # Render at target scale
-            self._face.load_glyph(glyph_index, flags=load_flags)
-            glyph : freetype.GlyphSlot = self._face.glyph
-            
-            # Apply appropriate rendering mode
-            if hinter == "monochrome":
-                glyph.render(freetype.FT_RENDER_MODES["FT_RENDER_MODE_MONO"])
-            elif hinter == "light":
-                glyph.render(freetype.FT_RENDER_MODES["FT_RENDER_MODE_LIGHT"])
-            else:
-                glyph.render(freetype.FT_RENDER_MODES["FT_RENDER_MODE_NORMAL"])
-
-            bitmap : freetype.Bitmap = glyph.bitmap
-            metric : freetype.FT_Glyph_Metrics = glyph.metrics
-            rows = bitmap.rows
-            cols = bitmap.width
-            pitch = bitmap.pitch
-
-            # Calculate advance (positioning relative to the next glyph)
-
-            # lsb is the subpixel offset of our origin compared to the previous advance
-            # rsb is the subpixel offset of the next origin compared to our origin
-            # horiadvance is the horizontal displacement between
-            # our origin and the next one
-            # Currently the backend does not support rounding the advance when rendering
-            # the font (which would enable best support for lsb and rsb), thus we pre-round.
-            advance = (glyph._FT_GlyphSlot.contents.lsb_delta - 
-                      glyph._FT_GlyphSlot.contents.rsb_delta + 
-                      metric.horiAdvance) / 64.
-            advance = round(advance)
-            
-            bitmap_top = glyph.bitmap_top
-            bitmap_left = glyph.bitmap_left
-
-            # Create image array based on bitmap mode
-            if rows == 0 or cols == 0:
-                # Handle empty bitmap (space character for instance)
-                image = np.zeros([1, 1, 1], dtype=np.uint8)
-                bitmap_top = 0
-                bitmap_left = 0
-            elif bitmap.pixel_mode == freetype.FT_PIXEL_MODE_MONO:
-                #image = 255*np.unpackbits(np.array(bitmap.buffer, dtype=np.uint8), 
-                #                        count=bitmap.rows * 8*bitmap.pitch).reshape([bitmap.rows, 8*bitmap.pitch])
-                #image = image[:, :bitmap.width, np.newaxis]
-                buffer_ptr = <uintptr_t>ctypes.addressof(bitmap._FT_Bitmap.buffer.contents)
-                buffer_view = <unsigned char*>buffer_ptr
-                image = np.empty((rows, cols, 1), dtype=np.uint8)
-                image_view = image[:,:,0]
-        
-                # Unpack bits
-                for i in range(rows):
-                    for j in range(cols):
-                        image_view[i,j] = 255 if (buffer_view[i * pitch + (j >> 3)] & (1 << (7 - (j & 7)))) else 0
-            elif bitmap.pixel_mode == freetype.FT_PIXEL_MODE_GRAY:
-                #image = np.array(bitmap.buffer, dtype=np.uint8).reshape([bitmap.rows, bitmap.pitch])
-                #image = image[:, :bitmap.width, np.newaxis]
-                buffer_ptr = <uintptr_t>ctypes.addressof(bitmap._FT_Bitmap.buffer.contents)
-                buffer_view = <unsigned char*>buffer_ptr
-                image = np.empty((rows, cols, 1), dtype=np.uint8)
-                image_view = image[:,:,0]
-        
-                for i in range(rows):
-                    for j in range(cols):
-                        image_view[i,j] = buffer_view[i * pitch + j]
-            elif bitmap.pixel_mode == freetype.FT_PIXEL_MODE_BGRA:
-                #image = np.array(bitmap.buffer, dtype=np.uint8).reshape([bitmap.rows, bitmap.pitch//4, 4])
-                #image = image[:, :bitmap.width, :]
-                #image[:, :, [0, 2]] = image[:, :, [2, 0]]  # swap B and R
-                buffer_ptr = <uintptr_t>ctypes.addressof(bitmap._FT_Bitmap.buffer.contents)
-                buffer_view = <unsigned char*>buffer_ptr
-                image = np.empty((rows, cols, 4), dtype=np.uint8)
-                color_image_view = image
-                # Copy and swap R/B channels directly
-                for i in range(rows):
-                    for j in range(cols):
-                        idx = i * pitch + j * 4
-                        color_image_view[i,j,0] = buffer_view[idx + 2]  # R
-                        color_image_view[i,j,1] = buffer_view[idx + 1]  # G
-                        color_image_view[i,j,2] = buffer_view[idx]      # B
-                        color_image_view[i,j,3] = buffer_view[idx + 3]  # A
+            codepoint = c
+            # Skip characters absent from the font, or already loaded
+            if self._glyph_index.find(codepoint) == self._glyph_index.end() or \
+               self._glyph_cell.find(codepoint) != self._glyph_cell.end():
+                continue
+            jobs[0].codepoints.push_back(codepoint)
+        m.unlock()
+        if jobs[0].codepoints.empty():
+            return
+
+        jobs[0].font_data = <const unsigned char*><const char*>self._data
+        jobs[0].font_data_size = len(self._data)
+        jobs[0].pixel_size = self._pixel_size
+        jobs[0].load_flags = self._load_flags
+        jobs[0].render_mode = self._render_mode
+        jobs[0].all_codepoints = False
+        with nogil:
+            font_rasterize_jobs(jobs)
+        cdef list glyphs
+        try:
+            glyphs = glyphs_from_job(jobs[0], self._face)
+        except ValueError as e:
+            raise ValueError(f"Failed to render the glyphs of {self._path} ({e})")
+
+        # Prepare the content of the cells
+        cdef int32_t num_glyphs = len(glyphs)
+        cdef int32_t num_chans = 4 if self._color else 1
+        cdef int32_t cell_size = self._cell_size
+        cdef vector[int32_t] glyph_cells # -1: empty, -2: not placed
+        glyph_cells.resize(num_glyphs)
+        cdef list images = []
+        cdef int32_t i, rows, cols
+        for i in range(num_glyphs):
+            image = glyphs[i][1]
+            glyph_cells[i] = -2
+            if image.shape[0] == 1 and image.shape[1] == 1 and image.shape[2] == 1 and \
+               image[0, 0, 0] == 0:
+                glyph_cells[i] = -1 # space, etc
+                continue
+            rows = min(image.shape[0], cell_size - 1)
+            cols = min(image.shape[1], cell_size - 1)
+            image = image[:rows, :cols, :]
+            cell_image = np.zeros((cell_size, cell_size, num_chans), dtype=np.uint8)
+            if image.shape[2] == num_chans:
+                cell_image[:rows, :cols, :] = image
+            elif num_chans == 1:
+                cell_image[:rows, :cols, 0] = image[:, :, 3]
             else:
-                continue  # Skip unsupported bitmap modes
+                cell_image[:, :, :3] = 255
+                cell_image[:rows, :cols, 3] = image[:, :, 0]
+            images.append((i, cell_image))
 
-            # Update max dimensions
-            max_bitmap_top = max(max_bitmap_top, bitmap_top)
-            max_bitmap_bot = max(max_bitmap_bot, image.shape[0] - bitmap_top)
-            
-            # Store glyph data for second pass
-            glyphs_data.append((unicode_key, image, bitmap_top, bitmap_left, advance))
+        # Find cells for the new glyphs
+        lock_gil_friendly(m, self.mutex)
+        cdef int32_t frame = self.context.viewport.frame_count
+        cdef int32_t num_cells = <int32_t>self._cell_codepoint.size()
+        cdef int32_t cell
+        cdef list available = []
+        for cell in range(num_cells):
+            if self._cell_codepoint[cell] == _FREE_CELL:
+                available.append(cell)
+        cdef list candidates
+        if len(available) < len(images):
+            # Evict the glyphs unused for the longest time,
+            # except those displayed in the last frames.
+            candidates = sorted([(self._cell_last_used[cell], cell) \
+                                 for cell in range(num_cells) \
+                                 if self._cell_codepoint[cell] != _FREE_CELL and \
+                                    self._cell_last_used[cell] < frame - 1])
+            for (_, cell) in candidates[:len(images) - len(available)]:
+                self._evict_cell(cell)
+                available.append(cell)
+            font.BuildLookupTable()
+        # If the page is full, the remaining glyphs
+        # are requested again if they are displayed.
+        cdef list regions = []
+        for (j, (i, cell_image)) in enumerate(images[:len(available)]):
+            cell = available[j]
+            glyph_cells[i] = cell
+            self._cell_codepoint[cell] = glyphs[i][0]
+            self._cell_last_used[cell] = frame
+            regions.append((self._page_x + (cell % self._cells_per_row) * cell_size,
+                            self._page_y + (cell // self._cells_per_row) * cell_size,
+                            cell_image))
+        m.unlock()
 
-        # Calculate final dimensions
-        height = max_bitmap_top + max_bitmap_bot + 1
-        target_origin_y = max_bitmap_top
+        # Upload without blocking rendering
+        if len(regions) > 0:
+            self._texture.set_value_regions(regions)
 
-        # Create GlyphSet with calculated dimensions
-        glyph_set = GlyphSet(height, target_origin_y)
+        # Replace the placeholders
+        lock_gil_friendly(m, self.mutex)
+        cdef imgui.ImFontGlyph *target
+        cdef int32_t x, y
+        cdef set rendered = set()
+        for i in range(num_glyphs):
+            (codepoint, image, top, left, advance) = glyphs[i]
+            rendered.add(codepoint)
+            cell = glyph_cells[i]
+            if cell == -2:
+                continue
+            target = &font.Glyphs.Data[self._glyph_index[codepoint]]
+            self._glyph_cell[codepoint] = cell
+            target.AdvanceX = advance
+            if cell == -1:
+                target.Visible = 0
+                continue
+            rows = min(image.shape[0], cell_size - 1)
+            cols = min(image.shape[1], cell_size - 1)
+            x = self._page_x + (cell % self._cells_per_row) * cell_size
+            y = self._page_y + (cell // self._cells_per_row) * cell_size
+            target.X0 = left
+            target.Y0 = self._origin_y - top
+            target.X1 = target.X0 + cols
+            target.Y1 = target.Y0 + rows
+            target.U0 = <float>x / <float>self._texture_width
+            target.V0 = <float>y / <float>self._texture_height
+            target.U1 = <float>(x + cols) / <float>self._texture_width
+            target.V1 = <float>(y + rows) / <float>self._texture_height
+            target.Colored = image.shape[2] == 4
+            target.Visible = 1
+        # Do not retry the glyphs neither path could render
+        for i in range(<int32_t>jobs[0].codepoints.size()):
+            codepoint = jobs[0].codepoints[i]
+            if codepoint not in rendered:
+                self._glyph_cell[codepoint] = -1
+                font.Glyphs.Data[self._glyph_index[codepoint]].Visible = 0
+        font.BuildLookupTable()
+
+    cdef void _set_placeholder(self, uint32_t codepoint) noexcept nogil:
+        """
+        Placeholders are invisible quads (zero width) with
+        uv coordinates that identify the missing glyph.
+        """
+        cdef imgui.ImFont *font = <imgui.ImFont*>self._font
+        cdef imgui.ImFontGlyph *glyph = &font.Glyphs.Data[self._glyph_index[codepoint]]
+        glyph.X0 = 0.
+        glyph.Y0 = 0.
+        glyph.X1 = 0.
+        glyph.Y1 = font.FontSize
+        glyph.U0 = -(<float>codepoint + 1.)
+        glyph.U1 = glyph.U0
+        glyph.V0 = self._marker_v
+        glyph.V1 = self._marker_v
+        glyph.AdvanceX = self._placeholder_advance
+        glyph.Colored = 0
+        glyph.Visible = 1
+
+    cdef void _evict_cell(self, int32_t cell) noexcept nogil:
+        cdef uint32_t codepoint = self._cell_codepoint[cell]
+        self._cell_codepoint[cell] = _FREE_CELL
+        self._cell_last_used[cell] = -1
+        self._glyph_cell.erase(codepoint)
+        self._set_placeholder(codepoint)
+
+    cdef void _scan_frame(self) noexcept nogil:
+        """
+        Record the missing glyphs and the cells in use
+        in the draw lists of the frame.
+        """
+        cdef DynamicFontScan scan
+        cdef float texture_width = <float>self._texture_width
+        cdef float texture_height = <float>self._texture_height
+        scan.texture_id = <imgui.ImTextureID>self._texture.allocated_texture
+        scan.marker_v = self._marker_v
+        scan.page_u0 = <float>self._page_x / texture_width
+        scan.page_v0 = <float>self._page_y / texture_height
+        scan.page_u1 = <float>(self._page_x + self._page_width) / texture_width
+        scan.page_v1 = <float>(self._page_y + self._page_height) / texture_height
+        scan.cell_du = <float>self._cell_size / texture_width
+        scan.cell_dv = <float>self._cell_size / texture_height
+        scan.cells_per_row = self._cells_per_row
+        dynamic_font_scan_frame(scan)
+
+        cdef int32_t frame = self.context.viewport.frame_count
+        cdef int32_t i, cell
+        cdef uint32_t codepoint
+        for i in range(<int32_t>scan.used_cells.size()):
+            cell = scan.used_cells[i]
+            if cell >= 0 and cell < <int32_t>self._cell_last_used.size():
+                self._cell_last_used[cell] = frame
+        for i in range(<int32_t>scan.requested.size()):
+            codepoint = scan.requested[i]
+            if self._glyph_index.find(codepoint) != self._glyph_index.end() and \
+               self._glyph_cell.find(codepoint) == self._glyph_cell.end():
+                self._requested.insert(codepoint)
+        if not(self._requested.empty()) and not(self._loading):
+            self._loading = True
+            self.context.queue_callback_noarg(self._load_callback, self, self)
+
+    cdef void end_frame(self) noexcept nogil:
+        # The scan is done once all the draw lists of the
+        # frame are complete, and only if the font was used.
+        cdef unique_lock[DCGMutex] m = unique_lock[DCGMutex](self.mutex)
+        if self._last_push_frame != self.context.viewport.frame_count:
+            return
+        self._scan_frame()
 
-        # Second pass - add glyphs with correct positioning
-        for unicode_key, image, bitmap_top, bitmap_left, advance in glyphs_data:
-            dy = target_origin_y - bitmap_top  # Convert to top-down coordinate system
-            glyph_set.add_glyph(unicode_key, image, dy, bitmap_left, advance)
+    cdef void push(self) noexcept nogil:
+        if self._font == NULL:
+            return
+        self.mutex.lock()
+        cdef imgui.ImFont *font = <imgui.ImFont*>self._font
+        self._scales_backup.push_back(font.Scale)
+        font.Scale = \
+            (self.context.viewport.global_scale if self._dpi_scaling else 1.) * self._scale
+        imgui.PushFont(font)
+        self._last_push_frame = self.context.viewport.frame_count
 
-        return glyph_set
+    cdef void pop(self) noexcept nogil:
+        if self._font == NULL:
+            return
+        cdef imgui.ImFont *font = <imgui.ImFont*>self._font
+        font.Scale = self._scales_backup.back()
+        self._scales_backup.pop_back()
+        imgui.PopFont()
+        self.mutex.unlock()
 
 A_int = ord('A')
 Z_int = ord('Z')
@@ -1427,10 +2632,15 @@ def make_extended_latin_font(size: int,
             return key - A_int + A_bitalic
         return key - a_int + a_bitalic
 
-    main = FontRenderer(main_font_path).render_glyph_set(target_size=size, restrict_to=main_restrict, **kwargs)
-    bold = FontRenderer(main_font_path).render_glyph_set(target_size=size, restrict_to=restricted_latin, **kwargs)
-    bold_italic = FontRenderer(bold_italic_path).render_glyph_set(target_size=size, restrict_to=restricted_latin, **kwargs)
-    italic = FontRenderer(italic_font_path).render_glyph_set(target_size=size, restrict_to=restricted_latin, **kwargs)
+    # The four fonts are rendered in parallel
+    (main, bold, bold_italic, italic) = render_glyph_sets(
+        [FontRenderer(main_font_path),
+         FontRenderer(main_font_path),
+         FontRenderer(bold_italic_path),
+         FontRenderer(italic_font_path)],
+        target_size=size,
+        restrict_to=[main_restrict, restricted_latin, restricted_latin, restricted_latin],
+        **kwargs)
 
     bold.remap(restricted_latin,
                [make_bold_map(c) for c in restricted_latin])
@@ -21,7 +21,7 @@ from dearcygui.wrapper cimport imgui
 from libc.stdint cimport int32_t
 from libcpp.cmath cimport floor
 
-from .core cimport uiItem, Callback, lock_gil_friendly
+from .core cimport uiItem, Callback, lock_gil_friendly, draw_child
 from .imgui_types cimport *
 from .c_types cimport *
 from .types cimport *
@@ -140,7 +140,7 @@ cdef class Layout(uiItem):
 
     @cython.final
     cdef void draw_child(self, uiItem child) noexcept nogil:
-        child.draw()
+        draw_child(child, NULL)
         if child.state.cur.rect_size.x != child.state.prev.rect_size.x or \
            child.state.cur.rect_size.y != child.state.prev.rect_size.y:
             child.context.viewport.redraw_needed = True
@@ -850,7 +850,7 @@ cdef class WindowLayout(uiItem):
     @cython.final
     cdef void draw_child(self, uiItem child) noexcept nogil:
         child.pos_update_requested = True
-        child.draw()
+        draw_child(child, NULL)
         if child.state.cur.rect_size.x != child.state.prev.rect_size.x or \
            child.state.cur.rect_size.y != child.state.prev.rect_size.y or \
            child.state.cur.pos_to_viewport.x != child.state.prev.pos_to_viewport.x or \
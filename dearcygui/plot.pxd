@@ -3,7 +3,7 @@ from .core cimport baseItem, baseFont, itemState, \
 from .types cimport *
 from .c_types cimport DCGString, DCGVector
 
-from libc.stdint cimport int32_t
+from libc.stdint cimport int32_t, int64_t, uint32_t
 
 cimport numpy as cnp
 
@@ -82,19 +82,47 @@ cdef class plotElementWithLegend(plotElement):
     cdef void draw(self) noexcept nogil
     cdef void draw_element(self) noexcept nogil
 
-cdef class plotElementXY(plotElementWithLegend):
+cdef class plotElementStreamed(plotElementWithLegend):
+    # Ring buffer (see stream_capacity)
+    cdef int32_t _stream_capacity # 0 when not streaming
+    cdef int32_t _stream_size
+    cdef int32_t _stream_offset # index of the oldest sample
+    cdef tuple stream_columns(self)
+    cdef void set_stream_columns(self, tuple columns)
+    cdef void stream_extend(self, tuple samples)
+    cdef void stop_streaming(self)
+
+cdef class plotElementXY(plotElementStreamed):
     cdef cnp.ndarray _X
     cdef cnp.ndarray _Y
+    # Level of detail (see PlotLine.lod)
+    cdef bint _lod
+    cdef DCGVector[DCGVector[int32_t]] _lod_pyramid # per level: (argmin, argmax) of Y per block
+    cdef int32_t _lod_valid_size # number of samples covered by the pyramid
+    cdef bint _lod_monotonic # X is sorted on the samples covered
+    cdef void* _lod_X_data # arrays the pyramid was built for
+    cdef void* _lod_Y_data
+    cdef int32_t _lod_cache_start # range and width of the last decimation
+    cdef int32_t _lod_cache_end
+    cdef int32_t _lod_cache_width
+    cdef double _lod_cache_x_min
+    cdef double _lod_cache_x_max
+    cdef DCGVector[double] _lod_X
+    cdef DCGVector[double] _lod_Y
     cdef void check_arrays(self) noexcept nogil
+    cdef void invalidate_lod(self, cnp.ndarray previous, cnp.ndarray array) noexcept
+    cdef bint update_lod(self, int32_t size) noexcept nogil
+    cdef int32_t num_samples(self, int32_t* offset) noexcept nogil
 
 cdef class PlotLine(plotElementXY):
     cdef void draw_element(self) noexcept nogil
 
-cdef class plotElementXYY(plotElementWithLegend):
+cdef class plotElementXYY(plotElementStreamed):
     cdef cnp.ndarray _X
     cdef cnp.ndarray _Y1
     cdef cnp.ndarray _Y2
     cdef void check_arrays(self) noexcept nogil
+    cdef int32_t num_samples(self, int32_t* offset) noexcept nogil
 
 cdef class PlotShadedLine(plotElementXYY):
     cdef void draw_element(self) noexcept nogil
@@ -171,6 +199,22 @@ cdef class PlotHistogram(plotElementX):
     cdef double _range_min
     cdef double _range_max
     cdef bint _has_range
+    # Cached binning
+    cdef bint _hist_valid
+    cdef void* _hist_data # data the counts were computed for
+    cdef int32_t _hist_size
+    cdef int32_t _hist_num_bins
+    cdef double _hist_min
+    cdef double _hist_max
+    cdef double _hist_width
+    cdef int64_t _hist_counted # samples inside the range
+    cdef int64_t _hist_below # samples below the range
+    cdef DCGVector[double] _hist_counts
+    cdef DCGVector[double] _hist_centers
+    cdef DCGVector[double] _hist_values
+    cdef cnp.ndarray _hist_buffer # storage of X for append()
+    cdef void count_samples(self, void*, int32_t, Py_ssize_t, int32_t, int32_t) noexcept nogil
+    cdef void update_histogram(self) noexcept nogil
     cdef void draw_element(self) noexcept nogil
 
 cdef class PlotHistogram2D(plotElementXY):
@@ -182,6 +226,26 @@ cdef class PlotHistogram2D(plotElementXY):
     cdef double _range_max_y
     cdef bint _has_range_x
     cdef bint _has_range_y
+    # Cached binning
+    cdef bint _hist_valid
+    cdef void* _hist_data_x # data the counts were computed for
+    cdef void* _hist_data_y
+    cdef int32_t _hist_size
+    cdef int32_t _hist_x_num_bins
+    cdef int32_t _hist_y_num_bins
+    cdef double _hist_min_x
+    cdef double _hist_max_x
+    cdef double _hist_min_y
+    cdef double _hist_max_y
+    cdef double _hist_width
+    cdef double _hist_height
+    cdef int64_t _hist_counted
+    cdef DCGVector[double] _hist_counts # top row first
+    cdef DCGVector[double] _hist_values
+    cdef cnp.ndarray _hist_buffer_x # storage of X and Y for append()
+    cdef cnp.ndarray _hist_buffer_y
+    cdef void count_samples(self, void*, void*, int32_t, Py_ssize_t, int32_t, int32_t) noexcept nogil
+    cdef void update_histogram(self) noexcept nogil
     cdef void draw_element(self) noexcept nogil
 
 cdef class PlotHeatmap(plotElementWithLegend):
@@ -194,4 +258,37 @@ cdef class PlotHeatmap(plotElementWithLegend):
     cdef DCGString _label_format
     cdef double[2] _bounds_min
     cdef double[2] _bounds_max
-    cdef void draw_element(self) noexcept nogil
\ No newline at end of file
+    cdef void draw_element(self) noexcept nogil
+
+cdef class PlotCandleStick(plotElementWithLegend):
+    cdef cnp.ndarray _dates
+    cdef cnp.ndarray _opens
+    cdef cnp.ndarray _closes
+    cdef cnp.ndarray _lows
+    cdef cnp.ndarray _highs
+    cdef uint32_t _bull_color
+    cdef uint32_t _bear_color
+    cdef double _weight
+    cdef bint _tooltip
+    cdef DCGString _date_format
+    cdef int32_t _hovered_index
+    # Computed when the data changes
+    cdef bint _layout_valid
+    cdef int32_t _size
+    cdef double _half_width # in plot units
+    cdef double _min_date
+    cdef double _max_date
+    cdef double _min_low
+    cdef double _max_high
+    # Candles merged per pixel column (x, open, close, low, high),
+    # x being in pixels relative to the plot position
+    cdef DCGVector[double] _merged
+    cdef int32_t _merged_start
+    cdef int32_t _merged_end
+    cdef int32_t _merged_width
+    cdef double _merged_xmin
+    cdef double _merged_xmax
+    cdef float _merged_xmid # detects changes of the axis scale
+    cdef void update_layout(self) noexcept nogil
+    cdef void update_merged(self, int32_t, int32_t, int32_t, double, double) noexcept nogil
+    cdef void draw_element(self) noexcept nogil
@@ -17,23 +17,26 @@
 from libcpp cimport bool
 
 from dearcygui.wrapper cimport imgui, implot
-from libc.stdint cimport int32_t
-from libc.math cimport INFINITY
+from libc.stdint cimport int32_t, int64_t, uint32_t
+from libc.string cimport memcpy
+from libc.time cimport time_t, tm, strftime
+from libc.math cimport INFINITY, ceil, floor, sqrt, log2, cbrt, round
 from libcpp.vector cimport vector
 from cpython cimport PyObject
 
 from .core cimport baseHandler, baseItem, uiItem, AxisTag, \
     lock_gil_friendly, clear_obj_vector, append_obj_vector, \
-    draw_drawing_children, \
+    draw_drawing_children, draw_drawing_children_culled, \
     draw_ui_children, baseFont, plotElement, \
     update_current_mouse_states, \
-    draw_plot_element_children, itemState
+    draw_plot_element_children, draw_child, itemState
 from .imgui_types cimport *
 from .c_types cimport *
 from .types cimport *
 from .types import KeyMod
 
 
+from .core import _culling_property, _culling_margin_property
 import numpy as np
 cimport numpy as cnp
 cnp.import_array()
@@ -59,11 +62,21 @@ cdef extern from * nogil:
         ImPlotItem* item = ImPlot::GetItem(label_id);
         return item != nullptr && !item->Show;
     }
+    // Thread safe localtime
+    struct tm* LocalTime(const time_t* time, struct tm* result)
+    {
+    #ifdef _WIN32
+        return localtime_s(result, time) == 0 ? result : nullptr;
+    #else
+        return localtime_r(time, result);
+    #endif
+    }
     """
     implot.ImPlotAxisFlags GetAxisConfig(int)
     implot.ImPlotLocation GetLegendConfig(implot.ImPlotLegendFlags&)
     implot.ImPlotFlags GetPlotConfig()
     bint IsItemHidden(const char*)
+    tm* LocalTime(const time_t*, tm*)
 
 cdef class AxesResizeHandler(baseHandler):
     """
@@ -1930,10 +1943,10 @@ cdef class plotElementWithLegend(plotElement):
             self._enabled_dirty = False
         else:
             self._enabled = IsItemHidden(self._imgui_label.c_str())
+        self.state.cur.hovered = False
         self.draw_element()
 
         self.state.cur.rendered = True
-        self.state.cur.hovered = False
         cdef Vec2 pos_w, pos_p
         if self._legend:
             # Popup that gets opened with a click on the entry
@@ -1953,7 +1966,8 @@ cdef class plotElementWithLegend(plotElement):
                         self.context.viewport.window_pos = pos_w
                         self.context.viewport.parent_pos = pos_p
                     implot.EndLegendPopup()
-            self.state.cur.hovered = implot.IsLegendEntryHovered(self._imgui_label.c_str())
+            if implot.IsLegendEntryHovered(self._imgui_label.c_str()):
+                self.state.cur.hovered = True
 
 
         # pop theme, font
@@ -1970,10 +1984,167 @@ cdef class plotElementWithLegend(plotElement):
     cdef void draw_element(self) noexcept nogil:
         return
 
-cdef class plotElementXY(plotElementWithLegend):
+cdef enum:
+    # Number of samples of the finest level of the LOD pyramids
+    LOD_BLOCK_SIZE = 64
+
+cdef inline double read_sample(void* data, int32_t type_num,
+                               Py_ssize_t stride, int32_t i) noexcept nogil:
+    cdef char* p = <char*>data + i * stride
+    if type_num == cnp.NPY_INT:
+        return (<int*>p)[0]
+    elif type_num == cnp.NPY_FLOAT:
+        return (<float*>p)[0]
+    return (<double*>p)[0]
+
+cdef inline int32_t first_sample_at_least(void* data, int32_t type_num,
+                                          Py_ssize_t stride, int32_t lo,
+                                          int32_t hi, double value) noexcept nogil:
+    """Index of the first sample >= value in the sorted range [lo, hi)"""
+    cdef int32_t mid
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if read_sample(data, type_num, stride, mid) < value:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+cdef object ring_buffer_copy(cnp.ndarray array, int32_t offset, int32_t size):
+    """Copy of the samples of a ring buffer, oldest first"""
+    if offset == 0:
+        return array[:size].copy()
+    return np.concatenate((array[offset:size], array[:offset]))
+
+cdef inline void ring_buffer_write(double* dst, const double* src,
+                                   int32_t capacity, int32_t pos,
+                                   int32_t n) noexcept nogil:
+    """Writes n (<= capacity) samples starting at pos, wrapping around"""
+    cdef int32_t first = min(n, capacity - pos)
+    memcpy(dst + pos, src, first * sizeof(double))
+    if first < n:
+        memcpy(dst, src + first, (n - first) * sizeof(double))
+
+cdef class plotElementStreamed(plotElementWithLegend):
+    """
+    Base class for plot elements whose data arrays can
+    be filled as a ring buffer (see stream_capacity).
+
+    Subclasses return their data arrays with
+    stream_columns() and replace them with
+    set_stream_columns().
+    """
+    def __cinit__(self):
+        self._stream_capacity = 0
+        self._stream_size = 0
+        self._stream_offset = 0
+
+    @property
+    def stream_capacity(self):
+        """
+        Capacity of the ring buffer filled by append()
+        and extend(). 0 (default) means no streaming.
+
+        Setting a positive value preallocates the data
+        arrays with this capacity. Once the buffer is full,
+        new samples replace the oldest ones, without any
+        copy or reallocation, and the ring buffer is
+        rendered directly.
+
+        Enabling streaming starts from an empty buffer,
+        while changing the capacity of an existing
+        buffer keeps the most recent samples. Assigning
+        any of the data arrays stops streaming.
+        """
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._stream_capacity
+
+    @stream_capacity.setter
+    def stream_capacity(self, int32_t value):
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        if value < 0:
+            raise ValueError("stream_capacity must be positive")
+        if value == self._stream_capacity:
+            return
+        if value == 0:
+            self.stop_streaming()
+            return
+        # _stream_size is 0 when not streaming
+        cdef int32_t size = min(value, self._stream_size)
+        cdef list columns = []
+        cdef cnp.ndarray column
+        for previous in self.stream_columns():
+            column = np.zeros(shape=(value,), dtype=np.float64)
+            if size > 0:
+                column[:size] = ring_buffer_copy(previous, self._stream_offset, self._stream_size)[-size:]
+            columns.append(column)
+        self._stream_capacity = value
+        self._stream_size = size
+        self._stream_offset = 0
+        self.set_stream_columns(tuple(columns))
+
+    cdef tuple stream_columns(self):
+        return ()
+
+    cdef void set_stream_columns(self, tuple columns):
+        return
+
+    cdef void stream_extend(self, tuple samples):
+        """
+        Writes the samples of each column in the ring
+        buffer. If there are more samples than the
+        capacity, only the last ones are kept.
+        """
+        cdef cnp.ndarray array
+        cdef list arrays = [np.ascontiguousarray(s, dtype=np.float64).reshape([-1]) for s in samples]
+        cdef int32_t n = arrays[0].shape[0]
+        for array in arrays:
+            if array.shape[0] != n:
+                raise ValueError("all the sample arrays must have the same length")
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        cdef int32_t capacity = self._stream_capacity
+        if capacity == 0:
+            raise ValueError("stream_capacity must be set to append samples")
+        cdef int32_t skip = max(n - capacity, 0)
+        n -= skip
+        cdef int32_t pos = (self._stream_offset + self._stream_size) % capacity
+        for (array, column) in zip(arrays, self.stream_columns()):
+            ring_buffer_write(<double*>cnp.PyArray_DATA(column),
+                              <const double*>cnp.PyArray_DATA(array) + skip,
+                              capacity, pos, n)
+        if self._stream_size + n <= capacity:
+            self._stream_size += n
+        else:
+            # The oldest sample is the one after the last written
+            self._stream_offset = (pos + n) % capacity
+            self._stream_size = capacity
+
+    cdef void stop_streaming(self):
+        """Replaces the ring buffer by arrays of its samples"""
+        if self._stream_capacity == 0:
+            return
+        cdef tuple columns = tuple([ring_buffer_copy(column, self._stream_offset, self._stream_size)
+                                    for column in self.stream_columns()])
+        self._stream_capacity = 0
+        self._stream_size = 0
+        self._stream_offset = 0
+        self.set_stream_columns(columns)
+
+cdef class plotElementXY(plotElementStreamed):
     def __cinit__(self):
         self._X = np.zeros(shape=(1,), dtype=np.float64)
         self._Y = np.zeros(shape=(1,), dtype=np.float64)
+        self._lod = False
+        self._lod_valid_size = 0
+        self._lod_monotonic = True
+        self._lod_X_data = NULL
+        self._lod_Y_data = NULL
+        self._lod_cache_start = -1
+        self._lod_cache_end = -1
+        self._lod_cache_width = -1
 
     @property
     def X(self):
@@ -1983,15 +2154,21 @@ cdef class plotElementXY(plotElementWithLegend):
         directly for its internal backing (no copy).
         Supported types for no copy are np.int32,
         np.float32, np.float64.
+
+        When streaming (see stream_capacity), returns
+        a copy of the samples, oldest first.
         """
         cdef unique_lock[DCGMutex] m
         lock_gil_friendly(m, self.mutex)
+        if self._stream_capacity > 0:
+            return ring_buffer_copy(self._X, self._stream_offset, self._stream_size)
         return self._X
 
     @X.setter
     def X(self, value):
         cdef unique_lock[DCGMutex] m
         lock_gil_friendly(m, self.mutex)
+        self.stop_streaming()
         cdef cnp.ndarray array = np.asarray(value).reshape([-1])
         # We don't support array of pointers. Must be data,
         # with eventually a non-standard stride
@@ -2000,20 +2177,25 @@ cdef class plotElementXY(plotElementWithLegend):
            (cnp.PyArray_TYPE(array) == cnp.NPY_INT or \
             cnp.PyArray_TYPE(array) == cnp.NPY_FLOAT or \
             cnp.PyArray_TYPE(array) == cnp.NPY_DOUBLE):
+            self.invalidate_lod(self._X, array)
             self._X = array
         else:
             self._X = np.ascontiguousarray(array, dtype=np.float64)
+            self.invalidate_lod(None, self._X)
 
     @property
     def Y(self):
         cdef unique_lock[DCGMutex] m
         lock_gil_friendly(m, self.mutex)
+        if self._stream_capacity > 0:
+            return ring_buffer_copy(self._Y, self._stream_offset, self._stream_size)
         return self._Y
 
     @Y.setter
     def Y(self, value):
         cdef unique_lock[DCGMutex] m
         lock_gil_friendly(m, self.mutex)
+        self.stop_streaming()
         cdef cnp.ndarray array = np.asarray(value).reshape([-1])
         # We don't support array of pointers. Must be data,
         # with eventually a non-standard stride
@@ -2022,9 +2204,84 @@ cdef class plotElementXY(plotElementWithLegend):
            (cnp.PyArray_TYPE(array) == cnp.NPY_INT or \
             cnp.PyArray_TYPE(array) == cnp.NPY_FLOAT or \
             cnp.PyArray_TYPE(array) == cnp.NPY_DOUBLE):
+            self.invalidate_lod(self._Y, array)
             self._Y = array
         else:
             self._Y = np.ascontiguousarray(array, dtype=np.float64)
+            self.invalidate_lod(None, self._Y)
+
+    def append(self, double x, double y):
+        """
+        Appends a sample to the ring buffer
+        (see stream_capacity).
+        """
+        self.stream_extend((x, y))
+
+    def extend(self, xs, ys):
+        """
+        Appends several samples to the ring buffer
+        (see stream_capacity). If there are more samples
+        than the capacity, only the last ones are kept.
+        """
+        self.stream_extend((xs, ys))
+
+    cdef tuple stream_columns(self):
+        return (self._X, self._Y)
+
+    cdef void set_stream_columns(self, tuple columns):
+        (self._X, self._Y) = columns
+        self.invalidate_lod(None, self._X)
+
+    @property
+    def lod(self):
+        """
+        Level of detail rendering.
+
+        When set, only about four samples per pixel column
+        of the visible range are rendered (first, min, max and
+        last samples of the column), which gives the same
+        visual for a fraction of the cost when the data
+        has many more samples than pixels.
+
+        X must be sorted in increasing order. Else the
+        full data is rendered.
+
+        A min/max pyramid of the data is built the first time
+        it is rendered, using about 1/16 of the data memory.
+        When X and Y are replaced by longer views of the same
+        memory (for instance growing views of preallocated
+        arrays), only the new samples are processed.
+
+        Used by PlotLine, PlotStairs and PlotScatter,
+        ignored by the other plot elements.
+        """
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._lod
+
+    @lod.setter
+    def lod(self, bint value):
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._lod = value
+        if not(value):
+            # Release the memory
+            self._lod_pyramid.clear()
+            self._lod_X.clear()
+            self._lod_Y.clear()
+            self._lod_valid_size = 0
+            self._lod_cache_start = -1
+
+    cdef int32_t num_samples(self, int32_t* offset) noexcept nogil:
+        """
+        Number of samples to render, and in offset the index
+        of the first one (ImPlot wraps around the count).
+        """
+        if self._stream_capacity > 0:
+            offset[0] = self._stream_offset
+            return self._stream_size
+        offset[0] = 0
+        return min(self._X.shape[0], self._Y.shape[0])
 
     cdef void check_arrays(self) noexcept nogil:
         # X and Y must be same type and same stride
@@ -2037,6 +2294,246 @@ cdef class plotElementXY(plotElementWithLegend):
                 self._X = np.ascontiguousarray(self._X, dtype=np.float64)
                 self._Y = np.ascontiguousarray(self._Y, dtype=np.float64)
 
+    cdef void invalidate_lod(self, cnp.ndarray previous, cnp.ndarray array) noexcept:
+        """
+        Called when X or Y is replaced. If the new array
+        extends the previous one (same memory, same layout,
+        longer), only the new samples will be processed.
+        Else the pyramid is rebuilt.
+        """
+        self._lod_cache_start = -1
+        if previous is not None and \
+           cnp.PyArray_DATA(previous) == cnp.PyArray_DATA(array) and \
+           cnp.PyArray_TYPE(previous) == cnp.PyArray_TYPE(array) and \
+           cnp.PyArray_STRIDE(previous, 0) == cnp.PyArray_STRIDE(array, 0) and \
+           cnp.PyArray_DIM(array, 0) > cnp.PyArray_DIM(previous, 0):
+            return
+        self._lod_valid_size = 0
+
+    cdef bint update_lod(self, int32_t size) noexcept nogil:
+        """
+        Fill _lod_X and _lod_Y with the decimated samples
+        visible in the plot (M4 decimation: first, min, max
+        and last samples of each pixel column).
+
+        The min/max pyramid is completed for the samples
+        not processed yet.
+
+        Returns False if the full data must be rendered
+        instead (X not sorted, few samples, streaming).
+        """
+        if self._stream_capacity > 0:
+            return False
+        cdef void* x_data = cnp.PyArray_DATA(self._X)
+        cdef void* y_data = cnp.PyArray_DATA(self._Y)
+        cdef int32_t type_num = cnp.PyArray_TYPE(self._X)
+        cdef Py_ssize_t stride = cnp.PyArray_STRIDE(self._X, 0)
+        cdef int32_t i, j, k, b, num_blocks, block_size, start, end
+        cdef int32_t first_block, child_min, child_max
+        cdef double v, prev
+
+        # Update the pyramid
+        if x_data != self._lod_X_data or y_data != self._lod_Y_data or \
+           size < self._lod_valid_size:
+            # Arrays were converted (check_arrays) or shrinked
+            self._lod_valid_size = 0
+        self._lod_X_data = x_data
+        self._lod_Y_data = y_data
+        if self._lod_valid_size == 0:
+            self._lod_pyramid.clear()
+            self._lod_monotonic = True
+            self._lod_cache_start = -1
+        if self._lod_valid_size < size:
+            self._lod_cache_start = -1
+            # Check X is sorted on the new samples
+            i = max(1, self._lod_valid_size)
+            prev = read_sample(x_data, type_num, stride, i-1)
+            while self._lod_monotonic and i < size:
+                v = read_sample(x_data, type_num, stride, i)
+                if not(v >= prev): # also catches NaN
+                    self._lod_monotonic = False
+                prev = v
+                i += 1
+            # Blocks of the finest level
+            block_size = LOD_BLOCK_SIZE
+            k = 0
+            while True:
+                num_blocks = (size + block_size - 1) // block_size
+                if k >= <int32_t>self._lod_pyramid.size():
+                    self._lod_pyramid.push_back(DCGVector[int32_t]())
+                # The last block might have been partial
+                first_block = self._lod_valid_size // block_size
+                self._lod_pyramid[k].resize(2 * num_blocks)
+                for b in range(first_block, num_blocks):
+                    if k == 0:
+                        start = b * block_size
+                        end = min(start + block_size, size)
+                        child_min = start
+                        child_max = start
+                        for i in range(start + 1, end):
+                            v = read_sample(y_data, type_num, stride, i)
+                            if v < read_sample(y_data, type_num, stride, child_min):
+                                child_min = i
+                            if v > read_sample(y_data, type_num, stride, child_max):
+                                child_max = i
+                    else:
+                        # Merge the two blocks of the finer level
+                        child_min = self._lod_pyramid[k-1][4*b]
+                        child_max = self._lod_pyramid[k-1][4*b+1]
+                        if 2*b+1 < <int32_t>(self._lod_pyramid[k-1].size() // 2):
+                            i = self._lod_pyramid[k-1][4*b+2]
+                            if read_sample(y_data, type_num, stride, i) < \
+                               read_sample(y_data, type_num, stride, child_min):
+                                child_min = i
+                            i = self._lod_pyramid[k-1][4*b+3]
+                            if read_sample(y_data, type_num, stride, i) > \
+                               read_sample(y_data, type_num, stride, child_max):
+                                child_max = i
+                    self._lod_pyramid[k][2*b] = child_min
+                    self._lod_pyramid[k][2*b+1] = child_max
+                if num_blocks <= 1:
+                    break
+                block_size *= 2
+                k += 1
+            self._lod_pyramid.resize(k+1)
+            self._lod_valid_size = size
+
+        if not(self._lod_monotonic):
+            return False
+
+        # Visible range of samples
+        cdef int32_t width = <int32_t>implot.GetPlotSize().x
+        if width < 1:
+            width = 1
+        cdef implot.ImPlotRect rect
+        cdef bint plot_fit = self.context.viewport.plot_fit
+        cdef int32_t lo, hi, mid
+        start = 0
+        end = size
+        rect.X.Min = 0.
+        rect.X.Max = 0.
+        if not(plot_fit):
+            rect = implot.GetPlotLimits(self._axes[0], self._axes[1])
+            # first sample >= X.Min
+            lo = first_sample_at_least(x_data, type_num, stride,
+                                       0, size, rect.X.Min)
+            # Keep one sample outside to connect to the edge
+            start = max(0, lo - 1)
+            # first sample > X.Max
+            hi = size
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if read_sample(x_data, type_num, stride, mid) <= rect.X.Max:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            end = min(size, lo + 1)
+        elif size > 0:
+            rect.X.Min = read_sample(x_data, type_num, stride, 0)
+            rect.X.Max = read_sample(x_data, type_num, stride, size - 1)
+
+        # The columns depend on the exact limits
+        # (not only on the visible samples)
+        if start == self._lod_cache_start and end == self._lod_cache_end and \
+           width == self._lod_cache_width and \
+           rect.X.Min == self._lod_cache_x_min and \
+           rect.X.Max == self._lod_cache_x_max:
+            return True
+        self._lod_cache_start = start
+        self._lod_cache_end = end
+        self._lod_cache_width = width
+        self._lod_cache_x_min = rect.X.Min
+        self._lod_cache_x_max = rect.X.Max
+        self._lod_X.clear()
+        self._lod_Y.clear()
+
+        if end - start <= 4 * width:
+            # Not enough samples to decimate
+            for i in range(start, end):
+                self._lod_X.push_back(read_sample(x_data, type_num, stride, i))
+                self._lod_Y.push_back(read_sample(y_data, type_num, stride, i))
+            return True
+
+        # X coordinates of the edges of the pixel columns.
+        # The axis may be non-linear (log, etc) or inverted.
+        cdef DCGVector[double] edges
+        cdef imgui.ImVec2 plot_pos
+        cdef int32_t column, column_start, column_end, imin, imax, level
+        edges.resize(width + 1)
+        if plot_fit:
+            # Limits are not known yet. Approximate with a linear axis.
+            for column in range(width + 1):
+                edges[column] = rect.X.Min + \
+                    (rect.X.Max - rect.X.Min) * (<double>column / <double>width)
+        else:
+            plot_pos = implot.GetPlotPos()
+            for column in range(width + 1):
+                edges[column] = implot.PixelsToPlot(plot_pos.x + <float>column,
+                                                    plot_pos.y,
+                                                    self._axes[0],
+                                                    self._axes[1]).x
+            if edges[width] < edges[0]:
+                for column in range((width + 1) // 2):
+                    v = edges[column]
+                    edges[column] = edges[width - column]
+                    edges[width - column] = v
+
+        cdef int32_t[4] indices
+        column_end = start
+        for column in range(width):
+            column_start = column_end
+            # The first and last columns also take the
+            # samples outside the plot, to connect to the edges
+            if column == width - 1:
+                column_end = end
+            else:
+                column_end = first_sample_at_least(x_data, type_num, stride,
+                                                   column_start, end,
+                                                   edges[column + 1])
+            if column_end <= column_start:
+                continue
+            imin = column_start
+            imax = column_start
+            i = column_start
+            # Use the largest blocks aligned and contained in the column
+            while i < column_end:
+                if i % LOD_BLOCK_SIZE == 0 and column_end - i >= LOD_BLOCK_SIZE:
+                    level = 0
+                    block_size = LOD_BLOCK_SIZE
+                    while level + 1 < <int32_t>self._lod_pyramid.size() and \
+                          i % (2 * block_size) == 0 and \
+                          column_end - i >= 2 * block_size:
+                        level += 1
+                        block_size *= 2
+                    b = i // block_size
+                    j = self._lod_pyramid[level][2*b]
+                    if read_sample(y_data, type_num, stride, j) < \
+                       read_sample(y_data, type_num, stride, imin):
+                        imin = j
+                    j = self._lod_pyramid[level][2*b+1]
+                    if read_sample(y_data, type_num, stride, j) > \
+                       read_sample(y_data, type_num, stride, imax):
+                        imax = j
+                    i += block_size
+                else:
+                    v = read_sample(y_data, type_num, stride, i)
+                    if v < read_sample(y_data, type_num, stride, imin):
+                        imin = i
+                    if v > read_sample(y_data, type_num, stride, imax):
+                        imax = i
+                    i += 1
+            # Emit first, min, max, last in sample order
+            indices[0] = column_start
+            indices[1] = min(imin, imax)
+            indices[2] = max(imin, imax)
+            indices[3] = column_end - 1
+            for j in range(4):
+                if j > 0 and indices[j] == indices[j-1]:
+                    continue
+                self._lod_X.push_back(read_sample(x_data, type_num, stride, indices[j]))
+                self._lod_Y.push_back(read_sample(y_data, type_num, stride, indices[j]))
+        return True
+
 cdef class PlotLine(plotElementXY):
     @property
     def segments(self):
@@ -2127,17 +2624,30 @@ cdef class PlotLine(plotElementXY):
 
     cdef void draw_element(self) noexcept nogil:
         self.check_arrays()
-        cdef int32_t size = min(self._X.shape[0], self._Y.shape[0])
+        cdef int32_t offset
+        cdef int32_t size = self.num_samples(&offset)
         if size == 0:
             return
 
+        if self._lod and \
+           (self._flags & (implot.ImPlotLineFlags_Loop | implot.ImPlotLineFlags_Segments)) == 0 and \
+           self.update_lod(size):
+            implot.PlotLine[double](self._imgui_label.c_str(),
+                                 self._lod_X.data(),
+                                 self._lod_Y.data(),
+                                 <int32_t>self._lod_X.size(),
+                                 self._flags,
+                                 0,
+                                 sizeof(double))
+            return
+
         if cnp.PyArray_TYPE(self._X) == cnp.NPY_INT:
             implot.PlotLine[int](self._imgui_label.c_str(),
                                  <const int*>cnp.PyArray_DATA(self._X),
                                  <const int*>cnp.PyArray_DATA(self._Y),
                                  size,
                                  self._flags,
-                                 0,
+                                 offset,
                                  cnp.PyArray_STRIDE(self._X, 0))
         elif cnp.PyArray_TYPE(self._X) == cnp.NPY_FLOAT:
             implot.PlotLine[float](self._imgui_label.c_str(),
@@ -2145,7 +2655,7 @@ cdef class PlotLine(plotElementXY):
                                    <const float*>cnp.PyArray_DATA(self._Y),
                                    size,
                                    self._flags,
-                                   0,
+                                   offset,
                                    cnp.PyArray_STRIDE(self._X, 0))
         else:
             implot.PlotLine[double](self._imgui_label.c_str(),
@@ -2153,10 +2663,10 @@ cdef class PlotLine(plotElementXY):
                                     <const double*>cnp.PyArray_DATA(self._Y),
                                     size,
                                     self._flags,
-                                    0,
+                                    offset,
                                     cnp.PyArray_STRIDE(self._X, 0))
 
-cdef class plotElementXYY(plotElementWithLegend):
+cdef class plotElementXYY(plotElementStreamed):
     def __cinit__(self):
         self._X = np.zeros(shape=(1,), dtype=np.float64)
         self._Y1 = np.zeros(shape=(1,), dtype=np.float64)
@@ -2170,15 +2680,21 @@ cdef class plotElementXYY(plotElementWithLegend):
         directly for its internal backing (no copy).
         Supported types for no copy are np.int32,
         np.float32, np.float64.
+
+        When streaming (see stream_capacity), returns
+        a copy of the samples, oldest first.
         """
         cdef unique_lock[DCGMutex] m
         lock_gil_friendly(m, self.mutex)
+        if self._stream_capacity > 0:
+            return ring_buffer_copy(self._X, self._stream_offset, self._stream_size)
         return self._X
 
     @X.setter
     def X(self, value):
         cdef unique_lock[DCGMutex] m
         lock_gil_friendly(m, self.mutex)
+        self.stop_streaming()
         cdef cnp.ndarray array = np.asarray(value).reshape([-1])
         # We don't support array of pointers. Must be data,
         # with eventually a non-standard stride
@@ -2195,12 +2711,15 @@ cdef class plotElementXYY(plotElementWithLegend):
     def Y1(self):
         cdef unique_lock[DCGMutex] m
         lock_gil_friendly(m, self.mutex)
+        if self._stream_capacity > 0:
+            return ring_buffer_copy(self._Y1, self._stream_offset, self._stream_size)
         return self._Y1
 
     @Y1.setter
     def Y1(self, value):
         cdef unique_lock[DCGMutex] m
         lock_gil_friendly(m, self.mutex)
+        self.stop_streaming()
         cdef cnp.ndarray array = np.asarray(value).reshape([-1])
         # We don't support array of pointers. Must be data,
         # with eventually a non-standard stride
@@ -2217,12 +2736,15 @@ cdef class plotElementXYY(plotElementWithLegend):
     def Y2(self):
         cdef unique_lock[DCGMutex] m
         lock_gil_friendly(m, self.mutex)
+        if self._stream_capacity > 0:
+            return ring_buffer_copy(self._Y2, self._stream_offset, self._stream_size)
         return self._Y2
 
     @Y2.setter
     def Y2(self, value):
         cdef unique_lock[DCGMutex] m
         lock_gil_friendly(m, self.mutex)
+        self.stop_streaming()
         cdef cnp.ndarray array = np.asarray(value).reshape([-1])
         # We don't support array of pointers. Must be data,
         # with eventually a non-standard stride
@@ -2235,6 +2757,38 @@ cdef class plotElementXYY(plotElementWithLegend):
         else:
             self._Y2 = np.ascontiguousarray(array, dtype=np.float64)
 
+    def append(self, double x, double y1, double y2):
+        """
+        Appends a sample to the ring buffer
+        (see stream_capacity).
+        """
+        self.stream_extend((x, y1, y2))
+
+    def extend(self, xs, y1s, y2s):
+        """
+        Appends several samples to the ring buffer
+        (see stream_capacity). If there are more samples
+        than the capacity, only the last ones are kept.
+        """
+        self.stream_extend((xs, y1s, y2s))
+
+    cdef tuple stream_columns(self):
+        return (self._X, self._Y1, self._Y2)
+
+    cdef void set_stream_columns(self, tuple columns):
+        (self._X, self._Y1, self._Y2) = columns
+
+    cdef int32_t num_samples(self, int32_t* offset) noexcept nogil:
+        """
+        Number of samples to render, and in offset the index
+        of the first one (ImPlot wraps around the count).
+        """
+        if self._stream_capacity > 0:
+            offset[0] = self._stream_offset
+            return self._stream_size
+        offset[0] = 0
+        return min(min(self._X.shape[0], self._Y1.shape[0]), self._Y2.shape[0])
+
     cdef void check_arrays(self) noexcept nogil:
         # X, Y1 and Y2 must be same type and same stride
         if cnp.PyArray_TYPE(self._X) != cnp.PyArray_TYPE(self._Y1) or \
@@ -2253,7 +2807,8 @@ cdef class plotElementXYY(plotElementWithLegend):
 cdef class PlotShadedLine(plotElementXYY):
     cdef void draw_element(self) noexcept nogil:
         self.check_arrays()
-        cdef int32_t size = min(min(self._X.shape[0], self._Y1.shape[0]), self._Y2.shape[0])
+        cdef int32_t offset
+        cdef int32_t size = self.num_samples(&offset)
         if size == 0:
             return
 
@@ -2264,7 +2819,7 @@ cdef class PlotShadedLine(plotElementXYY):
                                    <const int*>cnp.PyArray_DATA(self._Y2),
                                    size,
                                    self._flags,
-                                   0,
+                                   offset,
                                    cnp.PyArray_STRIDE(self._X, 0))
         elif cnp.PyArray_TYPE(self._X) == cnp.NPY_FLOAT:
             implot.PlotShaded[float](self._imgui_label.c_str(),
@@ -2273,7 +2828,7 @@ cdef class PlotShadedLine(plotElementXYY):
                                      <const float*>cnp.PyArray_DATA(self._Y2),
                                      size,
                                      self._flags,
-                                     0,
+                                     offset,
                                      cnp.PyArray_STRIDE(self._X, 0))
         else:
             implot.PlotShaded[double](self._imgui_label.c_str(),
@@ -2282,7 +2837,7 @@ cdef class PlotShadedLine(plotElementXYY):
                                       <const double*>cnp.PyArray_DATA(self._Y2),
                                       size,
                                       self._flags,
-                                      0,
+                                      offset,
                                       cnp.PyArray_STRIDE(self._X, 0))
 
 cdef class PlotStems(plotElementXY):
@@ -2305,7 +2860,8 @@ cdef class PlotStems(plotElementXY):
 
     cdef void draw_element(self) noexcept nogil:
         self.check_arrays()
-        cdef int32_t size = min(self._X.shape[0], self._Y.shape[0])
+        cdef int32_t offset
+        cdef int32_t size = self.num_samples(&offset)
         if size == 0:
             return
 
@@ -2316,7 +2872,7 @@ cdef class PlotStems(plotElementXY):
                                  size,
                                  0.,
                                  self._flags,
-                                 0,
+                                 offset,
                                  cnp.PyArray_STRIDE(self._X, 0))
         elif cnp.PyArray_TYPE(self._X) == cnp.NPY_FLOAT:
             implot.PlotStems[float](self._imgui_label.c_str(),
@@ -2325,7 +2881,7 @@ cdef class PlotStems(plotElementXY):
                                    size,
                                    0.,
                                    self._flags,
-                                   0,
+                                   offset,
                                    cnp.PyArray_STRIDE(self._X, 0))
         else:
             implot.PlotStems[double](self._imgui_label.c_str(),
@@ -2334,7 +2890,7 @@ cdef class PlotStems(plotElementXY):
                                     size,
                                     0.,
                                     self._flags,
-                                    0,
+                                    offset,
                                     cnp.PyArray_STRIDE(self._X, 0))
 
 cdef class PlotBars(plotElementXY):
@@ -2375,7 +2931,8 @@ cdef class PlotBars(plotElementXY):
 
     cdef void draw_element(self) noexcept nogil:
         self.check_arrays()
-        cdef int32_t size = min(self._X.shape[0], self._Y.shape[0])
+        cdef int32_t offset
+        cdef int32_t size = self.num_samples(&offset)
         if size == 0:
             return
 
@@ -2386,7 +2943,7 @@ cdef class PlotBars(plotElementXY):
                                  size,
                                  self._weight,
                                  self._flags,
-                                 0,
+                                 offset,
                                  cnp.PyArray_STRIDE(self._X, 0))
         elif cnp.PyArray_TYPE(self._X) == cnp.NPY_FLOAT:
             implot.PlotBars[float](self._imgui_label.c_str(),
@@ -2395,7 +2952,7 @@ cdef class PlotBars(plotElementXY):
                                    size,
                                    self._weight,
                                    self._flags,
-                                   0,
+                                   offset,
                                    cnp.PyArray_STRIDE(self._X, 0))
         else:
             implot.PlotBars[double](self._imgui_label.c_str(),
@@ -2404,7 +2961,7 @@ cdef class PlotBars(plotElementXY):
                                     size,
                                     self._weight,
                                     self._flags,
-                                    0,
+                                    offset,
                                     cnp.PyArray_STRIDE(self._X, 0))
 
 cdef class PlotStairs(plotElementXY):
@@ -2448,17 +3005,29 @@ cdef class PlotStairs(plotElementXY):
 
     cdef void draw_element(self) noexcept nogil:
         self.check_arrays()
-        cdef int32_t size = min(self._X.shape[0], self._Y.shape[0])
+        cdef int32_t offset
+        cdef int32_t size = self.num_samples(&offset)
         if size == 0:
             return
 
+        if self._lod and \
+           self.update_lod(size):
+            implot.PlotStairs[double](self._imgui_label.c_str(),
+                                 self._lod_X.data(),
+                                 self._lod_Y.data(),
+                                 <int32_t>self._lod_X.size(),
+                                 self._flags,
+                                 0,
+                                 sizeof(double))
+            return
+
         if cnp.PyArray_TYPE(self._X) == cnp.NPY_INT:
             implot.PlotStairs[int](self._imgui_label.c_str(),
                                  <const int*>cnp.PyArray_DATA(self._X),
                                  <const int*>cnp.PyArray_DATA(self._Y),
                                  size,
                                  self._flags,
-                                 0,
+                                 offset,
                                  cnp.PyArray_STRIDE(self._X, 0))
         elif cnp.PyArray_TYPE(self._X) == cnp.NPY_FLOAT:
             implot.PlotStairs[float](self._imgui_label.c_str(),
@@ -2466,7 +3035,7 @@ cdef class PlotStairs(plotElementXY):
                                    <const float*>cnp.PyArray_DATA(self._Y),
                                    size,
                                    self._flags,
-                                   0,
+                                   offset,
                                    cnp.PyArray_STRIDE(self._X, 0))
         else:
             implot.PlotStairs[double](self._imgui_label.c_str(),
@@ -2474,7 +3043,7 @@ cdef class PlotStairs(plotElementXY):
                                     <const double*>cnp.PyArray_DATA(self._Y),
                                     size,
                                     self._flags,
-                                    0,
+                                    offset,
                                     cnp.PyArray_STRIDE(self._X, 0))
 
 cdef class plotElementX(plotElementWithLegend):
@@ -2584,17 +3153,29 @@ cdef class PlotScatter(plotElementXY):
 
     cdef void draw_element(self) noexcept nogil:
         self.check_arrays()
-        cdef int32_t size = min(self._X.shape[0], self._Y.shape[0])
+        cdef int32_t offset
+        cdef int32_t size = self.num_samples(&offset)
         if size == 0:
             return
 
+        if self._lod and \
+           self.update_lod(size):
+            implot.PlotScatter[double](self._imgui_label.c_str(),
+                                 self._lod_X.data(),
+                                 self._lod_Y.data(),
+                                 <int32_t>self._lod_X.size(),
+                                 self._flags,
+                                 0,
+                                 sizeof(double))
+            return
+
         if cnp.PyArray_TYPE(self._X) == cnp.NPY_INT:
             implot.PlotScatter[int](self._imgui_label.c_str(),
                                  <const int*>cnp.PyArray_DATA(self._X),
                                  <const int*>cnp.PyArray_DATA(self._Y),
                                  size,
                                  self._flags,
-                                 0,
+                                 offset,
                                  cnp.PyArray_STRIDE(self._X, 0))
         elif cnp.PyArray_TYPE(self._X) == cnp.NPY_FLOAT:
             implot.PlotScatter[float](self._imgui_label.c_str(),
@@ -2602,7 +3183,7 @@ cdef class PlotScatter(plotElementXY):
                                    <const float*>cnp.PyArray_DATA(self._Y),
                                    size,
                                    self._flags,
-                                   0,
+                                   offset,
                                    cnp.PyArray_STRIDE(self._X, 0))
         else:
             implot.PlotScatter[double](self._imgui_label.c_str(),
@@ -2610,7 +3191,7 @@ cdef class PlotScatter(plotElementXY):
                                     <const double*>cnp.PyArray_DATA(self._Y),
                                     size,
                                     self._flags,
-                                    0,
+                                    offset,
                                     cnp.PyArray_STRIDE(self._X, 0))
 
 '''
@@ -2828,6 +3409,9 @@ cdef class DrawInPlot(plotElementWithLegend):
         lock_gil_friendly(m, self.mutex)
         self._ignore_fit = value
 
+    culling = _culling_property
+    culling_margin = _culling_margin_property
+
     cdef void draw(self) noexcept nogil:
 
         # Check the axes are enabled
@@ -2874,7 +3458,11 @@ cdef class DrawInPlot(plotElementWithLegend):
         self.context.viewport.parent_pos = ImVec2Vec2(implot.GetPlotPos())
 
         if render:
-            draw_drawing_children(self, implot.GetPlotDrawList())
+            # The children must all be seen to fit the plot
+            if self._culling_children and not(self.context.viewport.plot_fit):
+                draw_drawing_children_culled(self, implot.GetPlotDrawList())
+            else:
+                draw_drawing_children(self, implot.GetPlotDrawList())
 
             if self._legend:
                 implot.EndItem()
@@ -3232,7 +3820,7 @@ cdef class Subplots(uiItem):
                     # for now only plots set can_have_plot_element_child
                     if not((<uiItem>child).can_have_plot_element_child):
                         continue
-                    (<uiItem>child).draw()
+                    draw_child(<baseItem>child, NULL)
                     child = <PyObject *>(<baseItem>child).next_sibling
 
             self.context.viewport.parent_pos = pos_p
@@ -3650,7 +4238,8 @@ cdef class PlotDigital(plotElementXY):
 
     cdef void draw_element(self) noexcept nogil:
         self.check_arrays()
-        cdef int32_t size = min(self._X.shape[0], self._Y.shape[0])
+        cdef int32_t offset
+        cdef int32_t size = self.num_samples(&offset)
         if size == 0:
             return
 
@@ -3660,7 +4249,7 @@ cdef class PlotDigital(plotElementXY):
                                    <const int*>cnp.PyArray_DATA(self._Y),
                                    size,
                                    self._flags,
-                                   0,
+                                   offset,
                                    cnp.PyArray_STRIDE(self._X, 0))
         elif cnp.PyArray_TYPE(self._X) == cnp.NPY_FLOAT:
             implot.PlotDigital[float](self._imgui_label.c_str(),
@@ -3668,7 +4257,7 @@ cdef class PlotDigital(plotElementXY):
                                      <const float*>cnp.PyArray_DATA(self._Y),
                                      size,
                                      self._flags,
-                                     0,
+                                     offset,
                                      cnp.PyArray_STRIDE(self._X, 0))
         else:
             implot.PlotDigital[double](self._imgui_label.c_str(),
@@ -3676,7 +4265,7 @@ cdef class PlotDigital(plotElementXY):
                                       <const double*>cnp.PyArray_DATA(self._Y),
                                       size,
                                       self._flags,
-                                      0,
+                                      offset,
                                       cnp.PyArray_STRIDE(self._X, 0))
 
 
@@ -3689,6 +4278,16 @@ cdef class PlotErrorBars(plotElementXY):
         self._pos = np.zeros(shape=(1,), dtype=np.float64)
         self._neg = None  # Optional negative errors
 
+    @property
+    def stream_capacity(self):
+        """Streaming is not supported by error bars"""
+        return 0
+
+    @stream_capacity.setter
+    def stream_capacity(self, int32_t value):
+        if value != 0:
+            raise TypeError("PlotErrorBars does not support streaming")
+
     @property
     def positives(self):
         """Positive error values array.
@@ -3919,9 +4518,71 @@ cdef class PlotAnnotation(plotElement):
                           format_str,
                           self._text.c_str())
 
+cdef void histogram_layout(void* data, int32_t type_num, Py_ssize_t stride,
+                           int32_t size, int32_t bins, bint has_range,
+                           double range_min, double range_max,
+                           int32_t* num_bins, double* bin_min,
+                           double* bin_max, double* bin_width) noexcept nogil:
+    """
+    Computes the bins the same way ImPlot's histograms do:
+    the range defaults to the extent of the data, and negative
+    bins select an automatic rule (sqrt, Sturges, Rice, Scott).
+    """
+    cdef int32_t i
+    cdef double v
+    if not(has_range) or (range_min == 0. and range_max == 0.):
+        range_min = INFINITY
+        range_max = -INFINITY
+        for i in range(size):
+            v = read_sample(data, type_num, stride, i)
+            if v < range_min:
+                range_min = v
+            if v > range_max:
+                range_max = v
+    if not(range_max > range_min):
+        # Degenerate (or empty) range
+        if range_min == INFINITY:
+            range_min = 0.
+            range_max = 0.
+        range_min -= 0.5
+        range_max += 0.5
+    cdef double extent = range_max - range_min
+    cdef double mean = 0., variance = 0., width
+    cdef int32_t n = bins
+    if bins == -1:
+        n = <int32_t>ceil(sqrt(<double>size))
+    elif bins == -2:
+        n = <int32_t>ceil(1. + log2(<double>size))
+    elif bins == -3:
+        n = <int32_t>ceil(2. * cbrt(<double>size))
+    elif bins == -4:
+        for i in range(size):
+            mean += read_sample(data, type_num, stride, i)
+        mean /= <double>max(size, 1)
+        for i in range(size):
+            v = read_sample(data, type_num, stride, i) - mean
+            variance += v * v
+        variance /= <double>max(size - 1, 1)
+        width = 3.49 * sqrt(variance) / cbrt(<double>max(size, 1))
+        n = <int32_t>round(extent / width) if width > 0. else 1
+    num_bins[0] = max(n, 1)
+    bin_min[0] = range_min
+    bin_max[0] = range_max
+    bin_width[0] = extent / <double>num_bins[0]
+
+cdef inline int32_t histogram_bin(double v, double bin_min,
+                                  double bin_width, int32_t num_bins) noexcept nogil:
+    cdef int32_t b = <int32_t>((v - bin_min) / bin_width)
+    return min(max(b, 0), num_bins - 1)
+
 cdef class PlotHistogram(plotElementX):
     """
     Plots a histogram from X,Y data points. Several binning options are available.
+
+    The bin counts are cached, and only recomputed when X,
+    the bins or the range change. Use append() to add
+    samples to a live histogram: with a fixed number of
+    bins and a fixed range, only the new samples are binned.
     """
     def __cinit__(self):
         self._bins = -1  # Default to sqrt
@@ -3929,6 +4590,32 @@ cdef class PlotHistogram(plotElementX):
         self._range_min = 0.0
         self._range_max = 0.0
         self._has_range = False
+        self._hist_valid = False
+        self._hist_data = NULL
+        self._hist_size = 0
+        self._hist_num_bins = 0
+
+    @property
+    def X(self):
+        """Values on the X axis.
+
+        By default, will try to use the passed array
+        directly for its internal backing (no copy).
+        Supported types for no copy are np.int32,
+        np.float32, np.float64.
+
+        The bins are cached: if the content of the
+        array is modified in place, X must be set
+        again for the histogram to be updated.
+        """
+        return plotElementX.X.__get__(self)
+
+    @X.setter
+    def X(self, value):
+        plotElementX.X.__set__(self, value)
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._hist_valid = False
 
     @property
     def bins(self):
@@ -3950,6 +4637,7 @@ cdef class PlotHistogram(plotElementX):
         if value < -4:
             raise ValueError("Invalid bins value")
         self._bins = value
+        self._hist_valid = False
 
     @property
     def bar_scale(self):
@@ -3978,6 +4666,7 @@ cdef class PlotHistogram(plotElementX):
     def range(self, value):
         cdef unique_lock[DCGMutex] m
         lock_gil_friendly(m, self.mutex)
+        self._hist_valid = False
         if value is None:
             self._has_range = False
             return
@@ -4047,51 +4736,145 @@ cdef class PlotHistogram(plotElementX):
         if value:
             self._flags |= implot.ImPlotHistogramFlags_NoOutliers
 
+    def append(self, values):
+        """
+        Appends samples to X.
+
+        If bins is a positive count and range is set, the
+        cached counts are updated with the new samples only.
+        Else the data is binned again at the next frame.
+
+        X is then backed by an internal float64 buffer
+        which grows geometrically.
+        """
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        cdef cnp.ndarray new_values = \
+            np.ascontiguousarray(values, dtype=np.float64).reshape([-1])
+        cdef int32_t n = new_values.shape[0]
+        if n == 0:
+            return
+        cdef int32_t size = self._X.shape[0]
+        cdef bint incremental = self._hist_valid and \
+            self._hist_data == cnp.PyArray_DATA(self._X) and \
+            self._hist_size == size and \
+            self._bins > 0 and self._has_range and \
+            not(self._range_min == 0. and self._range_max == 0.)
+        if self._hist_buffer is not None and \
+           cnp.PyArray_DATA(self._hist_buffer) != cnp.PyArray_DATA(self._X):
+            # X was replaced since the last append
+            self._hist_buffer = None
+        cdef cnp.ndarray buffer = self._hist_buffer
+        if buffer is None or buffer.shape[0] < size + n:
+            buffer = np.empty(max(2 * (size + n), 1024), dtype=np.float64)
+            buffer[:size] = self._X
+            self._hist_buffer = buffer
+        buffer[size:size+n] = new_values
+        self._X = buffer[:size+n]
+        if not(incremental):
+            self._hist_valid = False
+            return
+        self.count_samples(cnp.PyArray_DATA(new_values), cnp.NPY_DOUBLE,
+                           sizeof(double), 0, n)
+        self._hist_data = cnp.PyArray_DATA(self._X)
+        self._hist_size = size + n
+
+    cdef void count_samples(self, void* data, int32_t type_num,
+                            Py_ssize_t stride, int32_t start,
+                            int32_t end) noexcept nogil:
+        cdef double* counts = self._hist_counts.data()
+        cdef int32_t i
+        cdef double v
+        for i in range(start, end):
+            v = read_sample(data, type_num, stride, i)
+            if v >= self._hist_min and v <= self._hist_max:
+                counts[histogram_bin(v, self._hist_min,
+                                     self._hist_width,
+                                     self._hist_num_bins)] += 1.
+                self._hist_counted += 1
+            elif v < self._hist_min:
+                self._hist_below += 1
+
+    cdef void update_histogram(self) noexcept nogil:
+        """Recomputes the cached counts if the data changed"""
+        cdef int32_t size = self._X.shape[0]
+        cdef void* data = cnp.PyArray_DATA(self._X)
+        if self._hist_valid and self._hist_data == data and \
+           self._hist_size == size:
+            return
+        cdef int32_t type_num = cnp.PyArray_TYPE(self._X)
+        cdef Py_ssize_t stride = cnp.PyArray_STRIDE(self._X, 0)
+        histogram_layout(data, type_num, stride, size, self._bins,
+                         self._has_range, self._range_min, self._range_max,
+                         &self._hist_num_bins, &self._hist_min,
+                         &self._hist_max, &self._hist_width)
+        self._hist_counts.resize(self._hist_num_bins)
+        cdef int32_t b
+        for b in range(self._hist_num_bins):
+            self._hist_counts[b] = 0.
+        self._hist_counted = 0
+        self._hist_below = 0
+        self.count_samples(data, type_num, stride, 0, size)
+        self._hist_data = data
+        self._hist_size = size
+        self._hist_valid = True
+
     cdef void draw_element(self) noexcept nogil:
         self.check_arrays()
         cdef int32_t size = self._X.shape[0]
         if size == 0:
             return
 
-        # Set up range if specified
-        cdef implot.ImPlotRange hist_range
-        if self._has_range:
-            hist_range.Min = self._range_min 
-            hist_range.Max = self._range_max
-        else:
-            # (0, 0) means unspecified
-            hist_range.Min = 0
-            hist_range.Max = 0
+        self.update_histogram()
+
+        # Only the cached counts are read every frame
+        cdef int32_t num_bins = self._hist_num_bins
+        self._hist_centers.resize(num_bins)
+        self._hist_values.resize(num_bins)
+        cdef bint cumulative = (self._flags & implot.ImPlotHistogramFlags_Cumulative) != 0
+        cdef bint density = (self._flags & implot.ImPlotHistogramFlags_Density) != 0
+        cdef bint outliers = (self._flags & implot.ImPlotHistogramFlags_NoOutliers) == 0
+        cdef double total = <double>size if outliers else <double>self._hist_counted
+        cdef double scale = 1.
+        if density and total > 0.:
+            scale = 1. / total if cumulative else 1. / (total * self._hist_width)
+        cdef double running = <double>self._hist_below if (cumulative and outliers) else 0.
+        cdef int32_t b
+        for b in range(num_bins):
+            self._hist_centers[b] = self._hist_min + (b + 0.5) * self._hist_width
+            if cumulative:
+                running += self._hist_counts[b]
+                self._hist_values[b] = running * scale
+            else:
+                self._hist_values[b] = self._hist_counts[b] * scale
 
-        if cnp.PyArray_TYPE(self._X) == cnp.NPY_INT:
-            implot.PlotHistogram[int](self._imgui_label.c_str(), 
-                                     <const int*>cnp.PyArray_DATA(self._X),
-                                     size,
-                                     self._bins,
-                                     self._bar_scale,
-                                     hist_range,
-                                     self._flags)
-        elif cnp.PyArray_TYPE(self._X) == cnp.NPY_FLOAT:
-            implot.PlotHistogram[float](self._imgui_label.c_str(),
-                                       <const float*>cnp.PyArray_DATA(self._X), 
-                                       size,
-                                       self._bins,
-                                       self._bar_scale,
-                                       hist_range,
-                                       self._flags)
+        if (self._flags & implot.ImPlotHistogramFlags_Horizontal) != 0:
+            implot.PlotBars[double](self._imgui_label.c_str(),
+                                    self._hist_values.data(),
+                                    self._hist_centers.data(),
+                                    num_bins,
+                                    self._bar_scale * self._hist_width,
+                                    implot.ImPlotBarsFlags_Horizontal,
+                                    0,
+                                    sizeof(double))
         else:
-            implot.PlotHistogram[double](self._imgui_label.c_str(),
-                                        <const double*>cnp.PyArray_DATA(self._X),
-                                        size,
-                                        self._bins,
-                                        self._bar_scale, 
-                                        hist_range,
-                                        self._flags)
+            implot.PlotBars[double](self._imgui_label.c_str(),
+                                    self._hist_centers.data(),
+                                    self._hist_values.data(),
+                                    num_bins,
+                                    self._bar_scale * self._hist_width,
+                                    0,
+                                    0,
+                                    sizeof(double))
 
 cdef class PlotHistogram2D(plotElementXY):
     """
     Plots a 2D histogram as a heatmap from X,Y coordinate pairs.
     Several binning options are available.
+
+    As for PlotHistogram, the bin counts are cached, and
+    append() bins only the new samples when the number of
+    bins and the ranges are fixed.
     """
     def __cinit__(self):
         self._x_bins = -1  # Default to sqrt
@@ -4102,6 +4885,56 @@ cdef class PlotHistogram2D(plotElementXY):
         self._range_max_y = 0.0
         self._has_range_x = False
         self._has_range_y = False
+        self._hist_valid = False
+        self._hist_data_x = NULL
+        self._hist_data_y = NULL
+        self._hist_size = 0
+        self._hist_x_num_bins = 0
+        self._hist_y_num_bins = 0
+
+    @property
+    def X(self):
+        """Values on the X axis.
+
+        By default, will try to use the passed array
+        directly for its internal backing (no copy).
+        Supported types for no copy are np.int32,
+        np.float32, np.float64.
+
+        The bins are cached: if the content of the
+        array is modified in place, X must be set
+        again for the histogram to be updated.
+        """
+        return plotElementXY.X.__get__(self)
+
+    @X.setter
+    def X(self, value):
+        plotElementXY.X.__set__(self, value)
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._hist_valid = False
+
+    @property
+    def Y(self):
+        """Values on the Y axis. See X."""
+        return plotElementXY.Y.__get__(self)
+
+    @Y.setter
+    def Y(self, value):
+        plotElementXY.Y.__set__(self, value)
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._hist_valid = False
+
+    @property
+    def stream_capacity(self):
+        """Not supported: append() grows X and Y instead"""
+        return 0
+
+    @stream_capacity.setter
+    def stream_capacity(self, int32_t value):
+        if value != 0:
+            raise TypeError("PlotHistogram2D does not support streaming, use append()")
 
     @property
     def x_bins(self):
@@ -4123,6 +4956,7 @@ cdef class PlotHistogram2D(plotElementXY):
         if value < -4:
             raise ValueError("Invalid x_bins value")
         self._x_bins = value
+        self._hist_valid = False
 
     @property
     def y_bins(self):
@@ -4144,6 +4978,7 @@ cdef class PlotHistogram2D(plotElementXY):
         if value < -4:
             raise ValueError("Invalid y_bins value")
         self._y_bins = value
+        self._hist_valid = False
 
     @property
     def range_x(self):
@@ -4159,6 +4994,7 @@ cdef class PlotHistogram2D(plotElementXY):
     def range_x(self, value):
         cdef unique_lock[DCGMutex] m
         lock_gil_friendly(m, self.mutex)
+        self._hist_valid = False
         if value is None:
             self._has_range_x = False
             return
@@ -4182,6 +5018,7 @@ cdef class PlotHistogram2D(plotElementXY):
     def range_y(self, value):
         cdef unique_lock[DCGMutex] m
         lock_gil_friendly(m, self.mutex)
+        self._hist_valid = False
         if value is None:
             self._has_range_y = False
             return
@@ -4221,61 +5058,156 @@ cdef class PlotHistogram2D(plotElementXY):
         if value:
             self._flags |= implot.ImPlotHistogramFlags_NoOutliers
 
+    def append(self, x, y):
+        """
+        Appends (x, y) samples to X and Y.
+
+        If x_bins and y_bins are positive counts and both
+        ranges are set, the cached counts are updated with
+        the new samples only. Else the data is binned again
+        at the next frame.
+
+        X and Y are then backed by internal float64 buffers
+        which grow geometrically.
+        """
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        cdef cnp.ndarray new_x = \
+            np.ascontiguousarray(x, dtype=np.float64).reshape([-1])
+        cdef cnp.ndarray new_y = \
+            np.ascontiguousarray(y, dtype=np.float64).reshape([-1])
+        if new_x.shape[0] != new_y.shape[0]:
+            raise ValueError("x and y must have the same length")
+        cdef int32_t n = new_x.shape[0]
+        if n == 0:
+            return
+        cdef int32_t size = min(self._X.shape[0], self._Y.shape[0])
+        cdef bint incremental = self._hist_valid and \
+            self._hist_data_x == cnp.PyArray_DATA(self._X) and \
+            self._hist_data_y == cnp.PyArray_DATA(self._Y) and \
+            self._hist_size == size and \
+            self._x_bins > 0 and self._y_bins > 0 and \
+            self._has_range_x and self._has_range_y and \
+            not(self._range_min_x == 0. and self._range_max_x == 0.) and \
+            not(self._range_min_y == 0. and self._range_max_y == 0.)
+        if self._hist_buffer_x is not None and \
+           (cnp.PyArray_DATA(self._hist_buffer_x) != cnp.PyArray_DATA(self._X) or \
+            cnp.PyArray_DATA(self._hist_buffer_y) != cnp.PyArray_DATA(self._Y)):
+            # X or Y was replaced since the last append
+            self._hist_buffer_x = None
+            self._hist_buffer_y = None
+        cdef cnp.ndarray buffer_x = self._hist_buffer_x
+        cdef cnp.ndarray buffer_y = self._hist_buffer_y
+        if buffer_x is None or buffer_x.shape[0] < size + n:
+            buffer_x = np.empty(max(2 * (size + n), 1024), dtype=np.float64)
+            buffer_y = np.empty(max(2 * (size + n), 1024), dtype=np.float64)
+            buffer_x[:size] = self._X[:size]
+            buffer_y[:size] = self._Y[:size]
+            self._hist_buffer_x = buffer_x
+            self._hist_buffer_y = buffer_y
+        buffer_x[size:size+n] = new_x
+        buffer_y[size:size+n] = new_y
+        self._X = buffer_x[:size+n]
+        self._Y = buffer_y[:size+n]
+        self._lod_valid_size = 0
+        if not(incremental):
+            self._hist_valid = False
+            return
+        self.count_samples(cnp.PyArray_DATA(new_x), cnp.PyArray_DATA(new_y),
+                           cnp.NPY_DOUBLE, sizeof(double), 0, n)
+        self._hist_data_x = cnp.PyArray_DATA(self._X)
+        self._hist_data_y = cnp.PyArray_DATA(self._Y)
+        self._hist_size = size + n
+
+    def extend(self, xs, ys):
+        """Same as append()"""
+        self.append(xs, ys)
+
+    cdef void count_samples(self, void* data_x, void* data_y,
+                            int32_t type_num, Py_ssize_t stride,
+                            int32_t start, int32_t end) noexcept nogil:
+        cdef double* counts = self._hist_counts.data()
+        cdef int32_t i, xb, yb
+        cdef double x, y
+        for i in range(start, end):
+            x = read_sample(data_x, type_num, stride, i)
+            y = read_sample(data_y, type_num, stride, i)
+            if x < self._hist_min_x or x > self._hist_max_x or \
+               y < self._hist_min_y or y > self._hist_max_y:
+                continue
+            xb = histogram_bin(x, self._hist_min_x, self._hist_width,
+                               self._hist_x_num_bins)
+            # The heatmap draws the first row at the top
+            yb = self._hist_y_num_bins - 1 - \
+                histogram_bin(y, self._hist_min_y, self._hist_height,
+                              self._hist_y_num_bins)
+            counts[yb * self._hist_x_num_bins + xb] += 1.
+            self._hist_counted += 1
+
+    cdef void update_histogram(self) noexcept nogil:
+        """Recomputes the cached counts if the data changed"""
+        cdef int32_t size = min(self._X.shape[0], self._Y.shape[0])
+        cdef void* data_x = cnp.PyArray_DATA(self._X)
+        cdef void* data_y = cnp.PyArray_DATA(self._Y)
+        if self._hist_valid and self._hist_data_x == data_x and \
+           self._hist_data_y == data_y and self._hist_size == size:
+            return
+        # check_arrays ensures X and Y share type and stride
+        cdef int32_t type_num = cnp.PyArray_TYPE(self._X)
+        cdef Py_ssize_t stride = cnp.PyArray_STRIDE(self._X, 0)
+        histogram_layout(data_x, type_num, stride, size, self._x_bins,
+                         self._has_range_x, self._range_min_x, self._range_max_x,
+                         &self._hist_x_num_bins, &self._hist_min_x,
+                         &self._hist_max_x, &self._hist_width)
+        histogram_layout(data_y, type_num, stride, size, self._y_bins,
+                         self._has_range_y, self._range_min_y, self._range_max_y,
+                         &self._hist_y_num_bins, &self._hist_min_y,
+                         &self._hist_max_y, &self._hist_height)
+        cdef int32_t num_cells = self._hist_x_num_bins * self._hist_y_num_bins
+        self._hist_counts.resize(num_cells)
+        cdef int32_t b
+        for b in range(num_cells):
+            self._hist_counts[b] = 0.
+        self._hist_counted = 0
+        self.count_samples(data_x, data_y, type_num, stride, 0, size)
+        self._hist_data_x = data_x
+        self._hist_data_y = data_y
+        self._hist_size = size
+        self._hist_valid = True
+
     cdef void draw_element(self) noexcept nogil:
         self.check_arrays()
         cdef int32_t size = min(self._X.shape[0], self._Y.shape[0])
         if size == 0:
             return
 
-        # Set up ranges independently
-        cdef implot.ImPlotRange hist_range_x, hist_range_y
-        if self._has_range_x:
-            hist_range_x.Min = self._range_min_x
-            hist_range_x.Max = self._range_max_x
-        else:
-            # (0, 0) means unspecified
-            hist_range_x.Min = 0
-            hist_range_x.Max = 0
-            
-        if self._has_range_y:
-            hist_range_y.Min = self._range_min_y
-            hist_range_y.Max = self._range_max_y
-        else:
-            # (0, 0) means unspecified
-            hist_range_y.Min = 0
-            hist_range_y.Max = 0
-            
-        cdef implot.ImPlotRect hist_rect
-        hist_rect.X = hist_range_x
-        hist_rect.Y = hist_range_y
-
-        if cnp.PyArray_TYPE(self._X) == cnp.NPY_INT:
-            implot.PlotHistogram2D[int](self._imgui_label.c_str(),
-                                        <const int*>cnp.PyArray_DATA(self._X),
-                                        <const int*>cnp.PyArray_DATA(self._Y),
-                                        size,
-                                        self._x_bins,
-                                        self._y_bins,
-                                        hist_rect,
-                                        self._flags)
-        elif cnp.PyArray_TYPE(self._X) == cnp.NPY_FLOAT:
-            implot.PlotHistogram2D[float](self._imgui_label.c_str(),
-                                          <const float*>cnp.PyArray_DATA(self._X),
-                                          <const float*>cnp.PyArray_DATA(self._Y),
-                                          size,
-                                          self._x_bins,
-                                          self._y_bins,
-                                          hist_rect,
-                                          self._flags)
-        else:
-            implot.PlotHistogram2D[double](self._imgui_label.c_str(),
-                                           <const double*>cnp.PyArray_DATA(self._X),
-                                           <const double*>cnp.PyArray_DATA(self._Y),
-                                           size,
-                                           self._x_bins,
-                                           self._y_bins,
-                                           hist_rect,
-                                           self._flags)
+        self.update_histogram()
+
+        # Only the cached counts are read every frame
+        cdef int32_t num_cells = self._hist_x_num_bins * self._hist_y_num_bins
+        self._hist_values.resize(num_cells)
+        cdef bint density = (self._flags & implot.ImPlotHistogramFlags_Density) != 0
+        cdef bint outliers = (self._flags & implot.ImPlotHistogramFlags_NoOutliers) == 0
+        cdef double total = <double>size if outliers else <double>self._hist_counted
+        cdef double scale = 1.
+        if density and total > 0.:
+            scale = 1. / (total * self._hist_width * self._hist_height)
+        cdef double max_value = 0.
+        cdef int32_t b
+        for b in range(num_cells):
+            self._hist_values[b] = self._hist_counts[b] * scale
+            max_value = max(max_value, self._hist_values[b])
+
+        implot.PlotHeatmap[double](self._imgui_label.c_str(),
+                                   self._hist_values.data(),
+                                   self._hist_y_num_bins,
+                                   self._hist_x_num_bins,
+                                   0.,
+                                   max_value,
+                                   <const char*>NULL,
+                                   implot.ImPlotPoint(self._hist_min_x, self._hist_min_y),
+                                   implot.ImPlotPoint(self._hist_max_x, self._hist_max_y),
+                                   0)
 
 cdef class PlotHeatmap(plotElementWithLegend):
     """
@@ -4465,3 +5397,404 @@ cdef class PlotHeatmap(plotElementWithLegend):
                                        implot.ImPlotPoint(self._bounds_min[0], self._bounds_min[1]),
                                        implot.ImPlotPoint(self._bounds_max[0], self._bounds_max[1]),
                                        self._flags)
+
+
+cdef int32_t first_not_below(const double* data, int32_t size, double value) noexcept nogil:
+    """Index of the first element >= value in a sorted array"""
+    cdef int32_t lo = 0, hi = size, mid
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if data[mid] < value:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+cdef class PlotCandleStick(plotElementWithLegend):
+    """
+    Plots a candlestick (OHLC) series.
+
+    Contrary to utils.PlotCandleStick, which creates
+    several drawing items per candle, the candles are
+    drawn directly from the arrays:
+    - Only the candles in the visible X range are
+        processed (dates must be sorted).
+    - When candles are less than a pixel wide, the
+        candles of each pixel column are merged into a
+        single one (first open, last close, min low,
+        max high).
+    - Hovering is tested analytically. hovered_index
+        gives the index of the hovered candle.
+
+    Attributes:
+    - dates, opens, closes, lows, highs: data arrays
+    - bull_color, bear_color: colors of the candles
+    - weight: half width of the candles relative to the
+        spacing between dates
+    - tooltip: show a tooltip with the values on hover
+    - date_format: strftime format of the date in the tooltip
+    """
+    def __cinit__(self):
+        self._dates = np.zeros(shape=(0,), dtype=np.float64)
+        self._opens = np.zeros(shape=(0,), dtype=np.float64)
+        self._closes = np.zeros(shape=(0,), dtype=np.float64)
+        self._lows = np.zeros(shape=(0,), dtype=np.float64)
+        self._highs = np.zeros(shape=(0,), dtype=np.float64)
+        self._bull_color = parse_color((0, 255, 113, 255))
+        self._bear_color = parse_color((218, 13, 79, 255))
+        self._weight = 0.25
+        self._tooltip = True
+        self._date_format = string_from_bytes(b"%Y-%m-%d %H:%M:%S")
+        self._hovered_index = -1
+        self._layout_valid = False
+        self._merged_start = -1
+
+    @property
+    def dates(self):
+        """X coordinates of the candles, sorted in increasing order"""
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._dates
+
+    @dates.setter
+    def dates(self, value):
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._dates = np.ascontiguousarray(value, dtype=np.float64).reshape([-1])
+        self._layout_valid = False
+
+    @property
+    def opens(self):
+        """Open values"""
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._opens
+
+    @opens.setter
+    def opens(self, value):
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._opens = np.ascontiguousarray(value, dtype=np.float64).reshape([-1])
+        self._layout_valid = False
+
+    @property
+    def closes(self):
+        """Close values"""
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._closes
+
+    @closes.setter
+    def closes(self, value):
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._closes = np.ascontiguousarray(value, dtype=np.float64).reshape([-1])
+        self._layout_valid = False
+
+    @property
+    def lows(self):
+        """Low values"""
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._lows
+
+    @lows.setter
+    def lows(self, value):
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._lows = np.ascontiguousarray(value, dtype=np.float64).reshape([-1])
+        self._layout_valid = False
+
+    @property
+    def highs(self):
+        """High values"""
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._highs
+
+    @highs.setter
+    def highs(self, value):
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._highs = np.ascontiguousarray(value, dtype=np.float64).reshape([-1])
+        self._layout_valid = False
+
+    @property
+    def bull_color(self):
+        """Color of the candles whose close is not lower than the open"""
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        cdef float[4] color
+        unparse_color(color, self._bull_color)
+        return list(color)
+
+    @bull_color.setter
+    def bull_color(self, value):
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._bull_color = parse_color(value)
+
+    @property
+    def bear_color(self):
+        """Color of the candles whose close is lower than the open"""
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        cdef float[4] color
+        unparse_color(color, self._bear_color)
+        return list(color)
+
+    @bear_color.setter
+    def bear_color(self, value):
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._bear_color = parse_color(value)
+
+    @property
+    def weight(self):
+        """
+        Half width of the candles, relative to the
+        smallest spacing between two dates. Default is 0.25
+        """
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._weight
+
+    @weight.setter
+    def weight(self, double value):
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        if value <= 0.:
+            raise ValueError("weight must be positive")
+        self._weight = value
+        self._layout_valid = False
+
+    @property
+    def tooltip(self):
+        """Show a tooltip with the values of the hovered candle"""
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._tooltip
+
+    @tooltip.setter
+    def tooltip(self, bint value):
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._tooltip = value
+
+    @property
+    def date_format(self):
+        """
+        strftime format used to display the dates
+        (in seconds since epoch, local time) in the tooltip.
+        If empty, the dates are displayed as numbers.
+        """
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        return string_to_str(self._date_format)
+
+    @date_format.setter
+    def date_format(self, str value):
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._date_format = string_from_str(value)
+
+    @property
+    def hovered_index(self):
+        """
+        Readonly attribute: index of the candle under the
+        mouse during the last frame, -1 if none.
+        """
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._hovered_index
+
+    cdef void update_layout(self) noexcept nogil:
+        """Computes the candle width and the data extent"""
+        cdef int32_t size = min(min(min(self._dates.shape[0], self._opens.shape[0]),
+                                    min(self._closes.shape[0], self._lows.shape[0])),
+                                self._highs.shape[0])
+        cdef const double* dates = <const double*>cnp.PyArray_DATA(self._dates)
+        cdef const double* lows = <const double*>cnp.PyArray_DATA(self._lows)
+        cdef const double* highs = <const double*>cnp.PyArray_DATA(self._highs)
+        cdef double spacing = INFINITY
+        cdef int32_t i
+        self._min_low = INFINITY
+        self._max_high = -INFINITY
+        for i in range(size):
+            if i > 0 and dates[i] - dates[i-1] > 0.:
+                spacing = min(spacing, dates[i] - dates[i-1])
+            self._min_low = min(self._min_low, lows[i])
+            self._max_high = max(self._max_high, highs[i])
+        if spacing == INFINITY:
+            spacing = 1.
+        self._size = size
+        self._half_width = spacing * self._weight
+        if size > 0:
+            self._min_date = dates[0]
+            self._max_date = dates[size-1]
+        self._merged_start = -1
+        self._layout_valid = True
+
+    cdef void update_merged(self, int32_t start, int32_t end, int32_t width,
+                            double xmin, double xmax) noexcept nogil:
+        """
+        Merges the candles of [start, end) falling in the
+        same pixel column. The columns are computed through
+        the axis transform, thus are correct on log and time
+        axes. Cached as long as the visible X range, the axis
+        scale and the plot width are unchanged.
+        """
+        cdef float plot_x = implot.GetPlotPos().x
+        cdef float xmid = implot.PlotToPixels(0.5 * (xmin + xmax), 0., -1, -1).x - plot_x
+        if start == self._merged_start and end == self._merged_end and \
+           width == self._merged_width and xmin == self._merged_xmin and \
+           xmax == self._merged_xmax and xmid == self._merged_xmid:
+            return
+        self._merged_start = start
+        self._merged_end = end
+        self._merged_width = width
+        self._merged_xmin = xmin
+        self._merged_xmax = xmax
+        self._merged_xmid = xmid
+        self._merged.clear()
+        cdef const double* dates = <const double*>cnp.PyArray_DATA(self._dates)
+        cdef const double* opens = <const double*>cnp.PyArray_DATA(self._opens)
+        cdef const double* closes = <const double*>cnp.PyArray_DATA(self._closes)
+        cdef const double* lows = <const double*>cnp.PyArray_DATA(self._lows)
+        cdef const double* highs = <const double*>cnp.PyArray_DATA(self._highs)
+        cdef int64_t column, prev_column = -1
+        cdef int32_t i, n
+        for i in range(start, end):
+            column = <int64_t>floor(implot.PlotToPixels(dates[i], 0., -1, -1).x - plot_x)
+            n = self._merged.size()
+            if i > start and column == prev_column:
+                self._merged[n-3] = closes[i]
+                self._merged[n-2] = min(self._merged[n-2], lows[i])
+                self._merged[n-1] = max(self._merged[n-1], highs[i])
+                continue
+            prev_column = column
+            # The merged candle is centered on its column
+            self._merged.push_back(<double>column + 0.5)
+            self._merged.push_back(opens[i])
+            self._merged.push_back(closes[i])
+            self._merged.push_back(lows[i])
+            self._merged.push_back(highs[i])
+
+    cdef void draw_element(self) noexcept nogil:
+        self._hovered_index = -1
+        if not(self._layout_valid):
+            self.update_layout()
+        cdef int32_t size = self._size
+        if size == 0:
+            return
+
+        # Legend entry with the bull color
+        implot.SetNextLineStyle(imgui.ColorConvertU32ToFloat4(self._bull_color))
+        if not(implot.BeginItem(self._imgui_label.c_str(), self._flags,
+                                implot.ImPlotCol_Line)):
+            return
+
+        if implot.FitThisFrame() and \
+           (self._flags & implot.ImPlotItemFlags_NoFit) == 0:
+            implot.FitPointX(self._min_date - self._half_width)
+            implot.FitPointX(self._max_date + self._half_width)
+            implot.FitPointY(self._min_low)
+            implot.FitPointY(self._max_high)
+
+        cdef const double* dates = <const double*>cnp.PyArray_DATA(self._dates)
+        cdef const double* opens = <const double*>cnp.PyArray_DATA(self._opens)
+        cdef const double* closes = <const double*>cnp.PyArray_DATA(self._closes)
+        cdef const double* lows = <const double*>cnp.PyArray_DATA(self._lows)
+        cdef const double* highs = <const double*>cnp.PyArray_DATA(self._highs)
+        cdef imgui.ImDrawList* draw_list = implot.GetPlotDrawList()
+        cdef implot.ImPlotRect rect = implot.GetPlotLimits(self._axes[0], self._axes[1])
+        cdef int32_t width = max(1, <int32_t>implot.GetPlotSize().x)
+
+        # Visible candles
+        cdef int32_t start = first_not_below(dates, size, rect.X.Min - self._half_width)
+        cdef int32_t end = first_not_below(dates, size, rect.X.Max + self._half_width)
+        while end < size and dates[end] <= rect.X.Max + self._half_width:
+            end += 1
+
+        cdef double candle_pixels = \
+            2. * self._half_width * <double>width / (rect.X.Max - rect.X.Min)
+        cdef imgui.ImVec2 p_low, p_high, p_open, p_close
+        cdef uint32_t color
+        cdef int32_t i, n
+        cdef double open_v, close_v
+        cdef float x, plot_x
+        cdef const double* merged
+        if candle_pixels >= 1.:
+            for i in range(start, end):
+                color = self._bear_color if opens[i] > closes[i] else self._bull_color
+                p_low = implot.PlotToPixels(dates[i], lows[i], -1, -1)
+                p_high = implot.PlotToPixels(dates[i], highs[i], -1, -1)
+                p_open = implot.PlotToPixels(dates[i] - self._half_width,
+                                             max(opens[i], closes[i]), -1, -1)
+                p_close = implot.PlotToPixels(dates[i] + self._half_width,
+                                              min(opens[i], closes[i]), -1, -1)
+                draw_list.AddLine(p_low, p_high, color, 1.)
+                draw_list.AddRectFilled(p_open, p_close, color, 0., 0)
+        elif start < end:
+            self.update_merged(start, end, width, rect.X.Min, rect.X.Max)
+            merged = self._merged.data()
+            n = <int32_t>self._merged.size() // 5
+            plot_x = implot.GetPlotPos().x
+            for i in range(n):
+                x = plot_x + merged[5*i]
+                open_v = merged[5*i+1]
+                close_v = merged[5*i+2]
+                color = self._bear_color if open_v > close_v else self._bull_color
+                # Only the Y coordinates are transformed
+                p_low = implot.PlotToPixels(rect.X.Min, merged[5*i+3], -1, -1)
+                p_high = implot.PlotToPixels(rect.X.Min, merged[5*i+4], -1, -1)
+                p_open = implot.PlotToPixels(rect.X.Min, max(open_v, close_v), -1, -1)
+                p_close = implot.PlotToPixels(rect.X.Min, min(open_v, close_v), -1, -1)
+                p_low.x = x
+                p_high.x = x
+                p_open.x = x - 0.5
+                p_close.x = x + 0.5
+                draw_list.AddLine(p_low, p_high, color, 1.)
+                draw_list.AddRectFilled(p_open, p_close, color, 0., 0)
+
+        # Hit test against the candle nearest to the mouse
+        cdef implot.ImPlotPoint mouse
+        cdef imgui.ImVec2 mouse_pos
+        cdef float half_width_pixels = max(2., 0.5 * candle_pixels)
+        if implot.IsPlotHovered():
+            mouse = implot.GetPlotMousePos(self._axes[0], self._axes[1])
+            i = first_not_below(dates, size, mouse.x)
+            if i == size or (i > 0 and mouse.x - dates[i-1] < dates[i] - mouse.x):
+                i -= 1
+            mouse_pos = imgui.GetMousePos()
+            p_low = implot.PlotToPixels(dates[i], lows[i], -1, -1)
+            p_high = implot.PlotToPixels(dates[i], highs[i], -1, -1)
+            if abs(mouse_pos.x - p_low.x) <= half_width_pixels and \
+               mouse_pos.y >= min(p_low.y, p_high.y) - 2. and \
+               mouse_pos.y <= max(p_low.y, p_high.y) + 2.:
+                self._hovered_index = i
+                self.state.cur.hovered = True
+
+        implot.EndItem()
+
+        cdef char[128] date_text
+        cdef time_t date_time
+        cdef tm date_tm_storage
+        cdef tm* date_tm
+        if self._tooltip and self._hovered_index >= 0:
+            i = self._hovered_index
+            imgui.BeginTooltip()
+            date_tm = NULL
+            if not(self._date_format.empty()):
+                date_time = <time_t>dates[i]
+                date_tm = LocalTime(&date_time, &date_tm_storage)
+            if date_tm != NULL and \
+               strftime(date_text, 128, self._date_format.c_str(), date_tm) > 0:
+                imgui.Text("Date: %s", date_text)
+            else:
+                imgui.Text("Date: %g", dates[i])
+            imgui.Text("Open: %g", opens[i])
+            imgui.Text("Close: %g", closes[i])
+            imgui.Text("Low: %g", lows[i])
+            imgui.Text("High: %g", highs[i])
+            imgui.EndTooltip()
@@ -34,6 +34,8 @@ cdef struct TableIterState:
     map[pair[int32_t, int32_t], TableElementData].iterator end
     # Whether iteration has started
     bint started
+    # Table row when iterating a single row, else -1
+    int32_t row
 
 cdef class TableElement:
     """
@@ -98,6 +100,29 @@ cdef class baseTable(uiItem):
     # Do not use these fields as they may be implemented
     # with a different map implementation than your compiler.
     cdef map[pair[int32_t, int32_t], TableElementData] *_items
+    # Columnar mode: cells are formatted from columns
+    # of data for the rendered rows only.
+    cdef bint _columnar
+    cdef object _columns # list of arrays or sequences
+    cdef object _column_formats # list or None
+    cdef DCGVector[void*] _column_ptrs # data of numeric columns
+    cdef DCGVector[int32_t] _column_lengths
+    cdef DCGVector[int32_t] _column_kinds
+    cdef DCGVector[DCGString] _column_printf # empty if python formatting
+    cdef int32_t _columns_num_rows
+    # Row permutation: displayed row -> storage row (element
+    # mode) or data row (columnar mode). Empty for identity.
+    # Sorting, inserting and removing rows only edit it.
+    cdef DCGVector[int32_t] _row_order
+    cdef int32_t _next_row_id # next unused storage row
+    cdef DCGVector[int32_t] _iter_row_inverse # storage row -> table row
+    # Text of the cells of the rows likely to be rendered
+    cdef bint _cells_valid
+    cdef DCGVector[int32_t] _cells_rows # sorted
+    cdef DCGVector[DCGString] _cells # _cells_rows.size() * num cols
+    cdef DCGString _cell_fallback
+    cdef int32_t _cells_last_min
+    cdef int32_t _cells_last_max
 
     # public API
     cdef void clear_items(self) # assumes mutex is held
@@ -111,8 +136,25 @@ cdef class baseTable(uiItem):
     cdef TableElement _get_single_item(self, int32_t row, int32_t col)
     cdef void _swap_items(self, int32_t row1, int32_t col1, int32_t row2, int32_t col2) noexcept nogil
     cdef void _update_row_col_counts(self) noexcept nogil
+    # Row permutation helpers
+    cdef int32_t _storage_row(self, int32_t row) noexcept nogil
+    cdef int32_t _alloc_storage_row(self, int32_t row) noexcept nogil
+    cdef pair[int32_t, int32_t] _item_key(self, int32_t row, int32_t col) noexcept nogil
+    cdef void _ensure_row_order(self) noexcept nogil
+    cdef void _build_row_inverse(self, DCGVector[int32_t]& inverse) noexcept nogil
+    cdef void _normalize_rows(self) noexcept nogil
+    # Columnar mode helpers
+    cdef void _update_column_formats(self)
+    cdef void _sort_rows_columnar(self, int32_t ref_col, bint ascending)
+    cdef int32_t _data_row(self, int32_t row) noexcept nogil
+    cdef void _format_cell(self, int32_t data_row, int32_t col, DCGString& dst) noexcept nogil
+    cdef str _format_cell_python(self, int32_t data_row, int32_t col)
+    cdef void _format_missing_cells(self, DCGVector[int32_t]& rows, DCGVector[int32_t]& missing, DCGVector[DCGString]& cells) noexcept
+    cdef void _prepare_cells(self, int32_t num_rows, int32_t num_rows_frozen) noexcept nogil
+    cdef const char* _get_cell_text(self, int32_t row, int32_t col) noexcept nogil
     # Protected iterator helpers for derived classes
     cdef void _items_iter_prepare(self) noexcept nogil
+    cdef void _items_iter_prepare_row(self, int32_t row) noexcept nogil
     cdef bint _items_iter_next(self, int32_t* row, int32_t* col, TableElementData** element) noexcept nogil
     cdef void _items_iter_finish(self) noexcept nogil
     cdef size_t _get_num_items(self) noexcept nogil
@@ -194,10 +236,12 @@ cdef class Table(baseTable):
     cdef map[int32_t, PyObject*] *_row_configs # TableRowConfig
     cdef float _inner_width
     cdef bint _header
+    cdef bint _row_clipping
     cdef uint32_t _flags # imgui.ImGuiTableFlags
 
     cdef TableColConfig get_col_config(self, int32_t col_idx)
     cdef void set_col_config(self, int32_t col_idx, TableColConfig config)
     cdef TableRowConfig get_row_config(self, int32_t row_idx)
     cdef void set_row_config(self, int32_t row_idx, TableRowConfig config)
+    cdef void draw_row(self, int32_t row, int32_t num_cols) noexcept nogil
     cdef bint draw_item(self) noexcept nogil
\ No newline at end of file
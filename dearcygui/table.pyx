@@ -18,14 +18,17 @@ from dearcygui.wrapper cimport imgui
 from libc.stdlib cimport malloc, free
 from libcpp.map cimport map, pair
 from libcpp.vector cimport vector
-from libc.stdint cimport uint32_t, int32_t
+from libc.stdint cimport uint32_t, int32_t, int64_t
+from libc.stdio cimport snprintf
+from libc.string cimport memcpy
+from libc.math cimport INFINITY
 
 cimport cython
 from cython.operator cimport dereference, preincrement
 
 from .core cimport baseItem, baseHandler, uiItem, \
     lock_gil_friendly, clear_obj_vector, append_obj_vector, \
-    update_current_mouse_states, itemState
+    update_current_mouse_states, draw_child, itemState
 from .c_types cimport *
 from .imgui_types cimport unparse_color, parse_color, Vec2ImVec2, \
     ImVec2Vec2
@@ -34,12 +37,100 @@ from .widget cimport Tooltip
 
 from cpython.ref cimport PyObject, Py_INCREF, Py_DECREF
 
+cdef extern from "Python.h":
+    const char* PyUnicode_AsUTF8AndSize(object, Py_ssize_t*) except NULL
+
 from .types import TableFlag
 
 import numpy as np
 cimport numpy as cnp
 cnp.import_array()
 
+import re
+
+cdef extern from * nogil:
+    """
+    #include <algorithm>
+    #include <cstring>
+
+    struct TableStringKey {
+        const char *data;
+        size_t size;
+    };
+
+    // Stable argsort of keys into indices (initialized by the caller)
+    static void table_argsort_numeric(int32_t *indices, const double *keys,
+                                      int32_t n, bool ascending)
+    {
+        if (ascending)
+            std::stable_sort(indices, indices + n,
+                [keys](int32_t a, int32_t b) { return keys[a] < keys[b]; });
+        else
+            std::stable_sort(indices, indices + n,
+                [keys](int32_t a, int32_t b) { return keys[a] > keys[b]; });
+    }
+
+    static inline bool table_string_less(const TableStringKey &a, const TableStringKey &b)
+    {
+        // Byte order of utf-8 is the code point order, as for python str
+        int c = memcmp(a.data, b.data, std::min(a.size, b.size));
+        return c < 0 || (c == 0 && a.size < b.size);
+    }
+
+    static void table_argsort_strings(int32_t *indices, const TableStringKey *keys,
+                                      int32_t n, bool ascending)
+    {
+        if (ascending)
+            std::stable_sort(indices, indices + n,
+                [keys](int32_t a, int32_t b) { return table_string_less(keys[a], keys[b]); });
+        else
+            std::stable_sort(indices, indices + n,
+                [keys](int32_t a, int32_t b) { return table_string_less(keys[b], keys[a]); });
+    }
+    """
+    ctypedef struct TableStringKey:
+        const char* data
+        size_t size
+    void table_argsort_numeric(int32_t*, const double*, int32_t, bint)
+    void table_argsort_strings(int32_t*, const TableStringKey*, int32_t, bint)
+
+cdef enum column_kind:
+    float_values = 0
+    int_values = 1
+    object_values = 2
+
+# printf format with a single conversion
+_printf_format = re.compile(r"^(?:[^%]|%%)*%([-+ #0]*[0-9]*(?:\.[0-9]+)?)(hh|h|ll|l|j|z|t|L)?([diouxXeEfFgGaA])(?:[^%]|%%)*$")
+
+cdef bytes native_column_format(fmt, int32_t kind):
+    """
+    printf format to use to format natively the values
+    of a column, or b"" if Python must format them.
+    """
+    if kind == column_kind.object_values:
+        return b""
+    if fmt is None:
+        return b"%g" if kind == column_kind.float_values else b"%lld"
+    if not(isinstance(fmt, str)):
+        return b""
+    match = _printf_format.match(fmt)
+    if match is None:
+        return b""
+    (flags, _, conversion) = match.groups()
+    if conversion in "eEfFgGaA":
+        if kind != column_kind.float_values:
+            return b""
+        length = ""
+    else:
+        if kind != column_kind.int_values:
+            return b""
+        length = "ll"
+    (start, end) = match.span(1)
+    (_, end) = match.span(3)
+    # Rebuild the format with the length matching the value type
+    fmt = fmt[:start] + flags + length + conversion + fmt[end:]
+    return fmt.encode(encoding='utf-8')
+
 
 cdef class TableElement:
     """
@@ -246,8 +337,7 @@ cdef class TableRowView:
 
     def __delitem__(self, int32_t col_idx):
         """Delete item at specified column."""
-        cdef pair[int32_t, int32_t] key = pair[int32_t, int32_t](self.row_idx, col_idx)
-        self.table._delete_item(key)
+        self.table._delete_item(self.table._item_key(self.row_idx, col_idx))
 
     @staticmethod
     cdef create(baseTable table, int32_t row_idx):
@@ -309,8 +399,7 @@ cdef class TableColView:
 
     def __delitem__(self, int32_t row_idx):
         """Delete item at specified row."""
-        cdef pair[int32_t, int32_t] key = pair[int32_t, int32_t](row_idx, self.col_idx)
-        self.table._delete_item(key)
+        self.table._delete_item(self.table._item_key(row_idx, self.col_idx))
 
     @staticmethod
     cdef create(baseTable table, int32_t col_idx):
@@ -344,6 +433,12 @@ cdef class baseTable(uiItem):
         self.can_have_widget_child = True
         self._items = new map[pair[int32_t, int32_t], TableElementData]()
         self._iter_state = NULL  # Initialize iterator state to NULL
+        self._next_row_id = 0
+        self._columnar = False
+        self._columns_num_rows = 0
+        self._cells_valid = False
+        self._cells_last_min = 0
+        self._cells_last_max = -1
 
     def __dealloc__(self):
         self.clear_items()
@@ -531,6 +626,8 @@ cdef class baseTable(uiItem):
             if key_element.second.ordering_value != NULL:
                 Py_DECREF(<object>key_element.second.ordering_value)
         self._items.clear()
+        self._row_order.clear()
+        self._next_row_id = 0
         self._num_rows = 0
         self._num_cols = 0
         self._dirty_num_rows_cols = False
@@ -540,11 +637,14 @@ cdef class baseTable(uiItem):
         
         Does now clear row and column configurations.
         These are cleared only when the Table is released.
+        Unbinds the columns in columnar mode.
         """
         cdef unique_lock[DCGMutex] m
         lock_gil_friendly(m, self.mutex)
         self.clear_items()
         self.children = []
+        if self._columnar:
+            self.columns = None
 
     cpdef void delete_item(self):
         cdef unique_lock[DCGMutex] m
@@ -579,8 +679,8 @@ cdef class baseTable(uiItem):
         Get item at specific target
         """
         cdef unique_lock[DCGMutex] m
-        cdef pair[int32_t, int32_t] map_key = pair[int32_t, int32_t](row, col)
         lock_gil_friendly(m, self.mutex)
+        cdef pair[int32_t, int32_t] map_key = self._item_key(row, col)
         cdef map[pair[int32_t, int32_t], TableElementData].iterator it
         it = self._items.find(map_key)
         if it == self._items.end():
@@ -604,6 +704,8 @@ cdef class baseTable(uiItem):
         Set items at specific target
         """
         cdef unique_lock[DCGMutex] m
+        if row < 0:
+            raise IndexError("Row index out of range")
         if isinstance(value, dict):
             value = TableElement(**value)
         cdef TableElementData element
@@ -639,7 +741,8 @@ cdef class baseTable(uiItem):
         # We lock only after in case the value was child
         # of a parent to prevent deadlock.
         lock_gil_friendly(m, self.mutex)
-        cdef pair[int32_t, int32_t] map_key = pair[int32_t, int32_t](row, col)
+        cdef pair[int32_t, int32_t] map_key = \
+            pair[int32_t, int32_t](self._alloc_storage_row(row), col)
         # delete previous element if any
         self._dirty_num_rows_cols |= not(self._delete_item(map_key))
         dereference(self._items)[map_key] = element
@@ -671,8 +774,7 @@ cdef class baseTable(uiItem):
             raise ValueError("value must be a list of length 2")
         cdef int32_t row, col
         (row, col) = key
-        cdef pair[int32_t, int32_t] map_key = pair[int32_t, int32_t](row, col)
-        self._delete_item(map_key)
+        self._delete_item(self._item_key(row, col))
 
     def __iter__(self):
         """
@@ -681,8 +783,19 @@ cdef class baseTable(uiItem):
         cdef unique_lock[DCGMutex] m
         lock_gil_friendly(m, self.mutex)
         cdef pair[pair[int32_t, int32_t], TableElementData] key_element
-        for key_element in dereference(self._items):
-            yield key_element.first
+        cdef map[pair[int32_t, int32_t], TableElementData].iterator it, end
+        cdef int32_t row
+        if self._row_order.empty() or self._columnar:
+            for key_element in dereference(self._items):
+                yield key_element.first
+            return
+        # Storage rows are permuted
+        for row in range(<int32_t>self._row_order.size()):
+            it = self._items.lower_bound(pair[int32_t, int32_t](self._row_order[row], 0))
+            end = self._items.lower_bound(pair[int32_t, int32_t](self._row_order[row] + 1, 0))
+            while it != end:
+                yield (row, dereference(it).first.second)
+                preincrement(it)
 
     def __len__(self):
         """
@@ -702,7 +815,7 @@ cdef class baseTable(uiItem):
             raise ValueError("key must be a list of length 2")
         cdef int32_t row, col
         (row, col) = key
-        cdef pair[int32_t, int32_t] map_key = pair[int32_t, int32_t](row, col)
+        cdef pair[int32_t, int32_t] map_key = self._item_key(row, col)
         cdef map[pair[int32_t, int32_t], TableElementData].iterator it
         it = self._items.find(map_key)
         return it != self._items.end()
@@ -714,8 +827,19 @@ cdef class baseTable(uiItem):
         cdef unique_lock[DCGMutex] m
         lock_gil_friendly(m, self.mutex)
         cdef pair[pair[int32_t, int32_t], TableElementData] key_element
-        for key_element in dereference(self._items):
-            yield key_element.first
+        cdef map[pair[int32_t, int32_t], TableElementData].iterator it, end
+        cdef int32_t row
+        if self._row_order.empty() or self._columnar:
+            for key_element in dereference(self._items):
+                yield key_element.first
+            return
+        # Storage rows are permuted
+        for row in range(<int32_t>self._row_order.size()):
+            it = self._items.lower_bound(pair[int32_t, int32_t](self._row_order[row], 0))
+            end = self._items.lower_bound(pair[int32_t, int32_t](self._row_order[row] + 1, 0))
+            while it != end:
+                yield (row, dereference(it).first.second)
+                preincrement(it)
 
     def values(self):
         """
@@ -724,9 +848,20 @@ cdef class baseTable(uiItem):
         cdef unique_lock[DCGMutex] m
         lock_gil_friendly(m, self.mutex)
         cdef pair[pair[int32_t, int32_t], TableElementData] key_element
-        for key_element in dereference(self._items):
-            element_config = TableElement.from_element(key_element.second)
-            yield element_config
+        cdef map[pair[int32_t, int32_t], TableElementData].iterator it, end
+        cdef int32_t row
+        if self._row_order.empty() or self._columnar:
+            for key_element in dereference(self._items):
+                element_config = TableElement.from_element(key_element.second)
+                yield element_config
+            return
+        # Same order as keys()
+        for row in range(<int32_t>self._row_order.size()):
+            it = self._items.lower_bound(pair[int32_t, int32_t](self._row_order[row], 0))
+            end = self._items.lower_bound(pair[int32_t, int32_t](self._row_order[row] + 1, 0))
+            while it != end:
+                yield TableElement.from_element(dereference(it).second)
+                preincrement(it)
 
     def get(self, key, default=None):
         """
@@ -738,7 +873,7 @@ cdef class baseTable(uiItem):
             raise ValueError("key must be a list of length 2")
         cdef int32_t row, col
         (row, col) = key
-        cdef pair[int32_t, int32_t] map_key = pair[int32_t, int32_t](row, col)
+        cdef pair[int32_t, int32_t] map_key = self._item_key(row, col)
         cdef map[pair[int32_t, int32_t], TableElementData].iterator it
         it = self._items.find(map_key)
         if it != self._items.end():
@@ -764,6 +899,7 @@ cdef class baseTable(uiItem):
             dereference(self._items)[key1] = dereference(it2).second
             self._items.erase(it2)
             self._dirty_num_rows_cols |= \
+                not(self._row_order.empty()) or \
                 row2 == self._num_rows - 1 or \
                 col2 == self._num_cols - 1 or \
                 row1 == self._num_rows - 1 or \
@@ -773,6 +909,7 @@ cdef class baseTable(uiItem):
             dereference(self._items)[key2] = dereference(it1).second
             self._items.erase(it1)
             self._dirty_num_rows_cols |= \
+                not(self._row_order.empty()) or \
                 row2 == self._num_rows - 1 or \
                 col2 == self._num_cols - 1 or \
                 row1 == self._num_rows - 1 or \
@@ -788,6 +925,9 @@ cdef class baseTable(uiItem):
 
         Assumes the mutex is held.
         """
+        # The items may move to rows without storage yet
+        row1 = self._alloc_storage_row(row1)
+        row2 = self._alloc_storage_row(row2)
         cdef pair[int32_t, int32_t] key1 = pair[int32_t, int32_t](row1, col1)
         cdef pair[int32_t, int32_t] key2 = pair[int32_t, int32_t](row2, col2)
         cdef map[pair[int32_t, int32_t], TableElementData].iterator it1, it2
@@ -815,21 +955,35 @@ cdef class baseTable(uiItem):
         cdef int32_t row1, col1, row2, col2
         (row1, col1) = key1
         (row2, col2) = key2
+        if row1 < 0 or row2 < 0:
+            raise IndexError("Row index out of range")
         self._swap_items(row1, col1, row2, col2)
         # _dirty_num_rows_cols managed by _swap_items
 
     cpdef void swap_rows(self, int32_t row1, int32_t row2):
         """
         Swaps the rows at the two indices.
+
+        Only the row order is modified, thus the cost
+        does not depend on the number of items.
         """
         cdef unique_lock[DCGMutex] m
         lock_gil_friendly(m, self.mutex)
-        self._update_row_col_counts()
-        cdef int32_t i
-        for i in range(self._num_cols):
-            # TODO: can be optimized to avoid the find()
-            self._swap_items(row1, i, row2, i)
-        # _dirty_num_rows_cols managed by _swap_items
+        if row1 < 0 or row2 < 0:
+            raise IndexError("Row index out of range")
+        if row1 == row2:
+            return
+        self._ensure_row_order()
+        if self._columnar:
+            if max(row1, row2) >= <int32_t>self._row_order.size():
+                raise IndexError("Row index out of range")
+            self._cells_valid = False
+        else:
+            self._alloc_storage_row(max(row1, row2))
+        cdef int32_t tmp = self._row_order[row1]
+        self._row_order[row1] = self._row_order[row2]
+        self._row_order[row2] = tmp
+        self._dirty_num_rows_cols = True
 
     cpdef void swap_cols(self, int32_t col1, int32_t col2):
         """
@@ -847,16 +1001,37 @@ cdef class baseTable(uiItem):
     def remove_row(self, int32_t row):
         """
         Removes the row at the given index.
+
+        The next rows are shifted by editing the row
+        order only, not the items.
         """
         cdef unique_lock[DCGMutex] m
         lock_gil_friendly(m, self.mutex)
+        if self._columnar:
+            raise ValueError("Rows cannot be removed in columnar mode")
+        if row < 0:
+            raise IndexError("Row index out of range")
         self._update_row_col_counts()
+        if row >= self._num_rows:
+            return
+        self._ensure_row_order()
+        cdef int32_t storage_row = self._row_order[row]
+        cdef map[pair[int32_t, int32_t], TableElementData].iterator it
+        # Delete the items of the row
+        while True:
+            it = self._items.lower_bound(pair[int32_t, int32_t](storage_row, 0))
+            if it == self._items.end() or dereference(it).first.first != storage_row:
+                break
+            self._delete_item(dereference(it).first)
+        # Shift the next rows
         cdef int32_t i
-        for i in range(self._num_cols):
-            self._delete_item(pair[int32_t, int32_t](row, i))
-        # Shift all rows
-        for i in range(row + 1, self._num_rows):
-            self.swap_rows(i, i - 1)
+        for i in range(row, <int32_t>self._row_order.size() - 1):
+            self._row_order[i] = self._row_order[i + 1]
+        self._row_order.pop_back()
+        # Storage rows are not reused. Renumber them if
+        # many were removed.
+        if self._next_row_id > 2 * <int32_t>self._row_order.size() + 1024:
+            self._normalize_rows()
         self._dirty_num_rows_cols = True
 
     def insert_row(self, int32_t row, items = None):
@@ -865,11 +1040,21 @@ cdef class baseTable(uiItem):
         """
         cdef unique_lock[DCGMutex] m
         lock_gil_friendly(m, self.mutex)
+        if self._columnar:
+            raise ValueError("Rows cannot be inserted in columnar mode")
+        if row < 0:
+            raise IndexError("Row index out of range")
         self._update_row_col_counts()
         cdef int32_t i
-        # Shift all rows
-        for i in range(self._num_rows - 1, row-1, -1):
-            self.swap_rows(i, i + 1)
+        if row < self._num_rows:
+            # Shift the next rows by inserting a new
+            # storage row in the row order.
+            self._ensure_row_order()
+            self._row_order.push_back(0)
+            for i in range(<int32_t>self._row_order.size() - 1, row, -1):
+                self._row_order[i] = self._row_order[i - 1]
+            self._row_order[row] = self._next_row_id
+            self._next_row_id += 1
         self._dirty_num_rows_cols = True
         if items is not None:
             if not hasattr(items, '__len__'):
@@ -890,7 +1075,7 @@ cdef class baseTable(uiItem):
         for i in range(len(items)):
             self._set_single_item(row, i, items[i])
         for i in range(len(items), self._num_cols):
-            self._delete_item(pair[int32_t, int32_t](row, i))
+            self._delete_item(self._item_key(row, i))
         self._dirty_num_rows_cols = True
 
     def append_row(self, items):
@@ -916,7 +1101,7 @@ cdef class baseTable(uiItem):
         self._update_row_col_counts()
         cdef int32_t i
         for i in range(self._num_rows):
-            self._delete_item(pair[int32_t, int32_t](i, col))
+            self._delete_item(self._item_key(i, col))
         # Shift all columns
         for i in range(col + 1, self._num_cols):
             self.swap_cols(i, i - 1)
@@ -953,7 +1138,7 @@ cdef class baseTable(uiItem):
         for i in range(len(items)):
             self._set_single_item(i, col, items[i])
         for i in range(len(items), self._num_rows):
-            self._delete_item(pair[int32_t, int32_t](i, col))
+            self._delete_item(self._item_key(i, col))
         self._dirty_num_rows_cols = True
 
     def append_col(self, items):
@@ -972,22 +1157,108 @@ cdef class baseTable(uiItem):
 
     cdef void _update_row_col_counts(self) noexcept nogil:
         """Update row and column counts if needed."""
+        if self._columnar:
+            self._num_rows = self._columns_num_rows
+            self._num_cols = <int32_t>self._column_kinds.size()
+            self._dirty_num_rows_cols = False
+            return
         if not self._dirty_num_rows_cols:
             return
 
         cdef pair[pair[int32_t, int32_t], TableElementData] key_element
         cdef int32_t max_row = -1
         cdef int32_t max_col = -1
+        cdef DCGVector[int32_t] inverse
         
         # Find max row/col indices
-        for key_element in dereference(self._items):
-            max_row = max(max_row, key_element.first.first)
-            max_col = max(max_col, key_element.first.second) 
+        if self._row_order.empty():
+            for key_element in dereference(self._items):
+                max_row = max(max_row, key_element.first.first)
+                max_col = max(max_col, key_element.first.second) 
+        else:
+            self._build_row_inverse(inverse)
+            for key_element in dereference(self._items):
+                max_row = max(max_row, inverse[key_element.first.first])
+                max_col = max(max_col, key_element.first.second)
 
         self._num_rows = (max_row + 1) if max_row >= 0 else 0
         self._num_cols = (max_col + 1) if max_col >= 0 else 0
         self._dirty_num_rows_cols = False
 
+    cdef int32_t _storage_row(self, int32_t row) noexcept nogil:
+        """
+        Row of the items map for a row of the table,
+        -1 if the row has no storage.
+        """
+        if self._row_order.empty() or self._columnar:
+            return row
+        if row < 0 or row >= <int32_t>self._row_order.size():
+            return -1
+        return self._row_order[row]
+
+    cdef int32_t _alloc_storage_row(self, int32_t row) noexcept nogil:
+        """
+        Same as _storage_row, but assigns new storage
+        rows to the rows without storage.
+        row must be positive.
+        """
+        if self._row_order.empty() or self._columnar:
+            return row
+        while <int32_t>self._row_order.size() <= row:
+            self._row_order.push_back(self._next_row_id)
+            self._next_row_id += 1
+        return self._row_order[row]
+
+    cdef pair[int32_t, int32_t] _item_key(self, int32_t row, int32_t col) noexcept nogil:
+        """Key in the items map of a cell. Never found if the row has no storage"""
+        return pair[int32_t, int32_t](self._storage_row(row), col)
+
+    cdef void _ensure_row_order(self) noexcept nogil:
+        """
+        Fill the row order with the identity if it
+        is empty, in order to permute it.
+        """
+        if not(self._row_order.empty()):
+            return
+        self._update_row_col_counts()
+        cdef int32_t i
+        self._row_order.reserve(self._num_rows)
+        for i in range(self._num_rows):
+            self._row_order.push_back(i)
+        if not(self._columnar):
+            self._next_row_id = self._num_rows
+
+    cdef void _build_row_inverse(self, DCGVector[int32_t]& inverse) noexcept nogil:
+        """Storage row -> table row (-1 if unused)"""
+        cdef int32_t i
+        inverse.clear()
+        inverse.resize(self._next_row_id)
+        for i in range(self._next_row_id):
+            inverse[i] = -1
+        for i in range(<int32_t>self._row_order.size()):
+            inverse[self._row_order[i]] = i
+
+    cdef void _normalize_rows(self) noexcept nogil:
+        """
+        Renumber the items such that the storage rows
+        match the table rows, and clear the row order.
+        """
+        if self._row_order.empty() or self._columnar:
+            return
+        cdef DCGVector[int32_t] inverse
+        self._build_row_inverse(inverse)
+        cdef map[pair[int32_t, int32_t], TableElementData] items
+        cdef pair[pair[int32_t, int32_t], TableElementData] key_element
+        cdef pair[int32_t, int32_t] key
+        for key_element in dereference(self._items):
+            # All the items are in rows of the order
+            key.first = inverse[key_element.first.first]
+            key.second = key_element.first.second
+            items[key] = key_element.second
+        self._items.swap(items)
+        self._row_order.clear()
+        self._next_row_id = 0
+
     def row(self, int32_t idx):
         """Get a view of the specified row."""
         cdef unique_lock[DCGMutex] m
@@ -1062,6 +1333,11 @@ cdef class baseTable(uiItem):
         - The content string (if it is a string)
         - The content before its conversion into string
         - If content is an uiItem, it defaults to the UUID (item creation order)
+
+        Rows without value in ref_col are placed last.
+        Only the row order is modified, not the items. When all
+        values are numbers, or all are strings, they are compared
+        without calling Python.
         """
         cdef unique_lock[DCGMutex] m
         lock_gil_friendly(m, self.mutex)
@@ -1071,45 +1347,119 @@ cdef class baseTable(uiItem):
         if num_rows <= 1:
             return
 
-        # Put in a list all the values to sort
-        keys = []
+        if self._columnar:
+            self._sort_rows_columnar(ref_col, ascending)
+            return
+
+        # The rows are reordered by permuting the row order.
+        # The keys are compared natively when they are all
+        # numbers or all strings.
+        self._ensure_row_order()
+        num_rows = <int32_t>self._row_order.size()
+        cdef DCGVector[int32_t] present # rows with a key
+        cdef DCGVector[int32_t] absent # rows without a key
+        cdef DCGVector[double] numeric_keys
+        cdef DCGVector[TableStringKey] string_keys
+        cdef double numeric_key
+        cdef TableStringKey string_key
+        cdef Py_ssize_t string_size
+        cdef bint all_numeric = True
+        cdef bint all_strings = True
+        cdef map[pair[int32_t, int32_t], TableElementData].iterator it
         cdef int32_t i
+        keys = []
         for i in range(num_rows):
-            element = self._get_single_item(i, ref_col)
-            if element is None:
-                keys.append(0)
-            keys.append(element.ordering_value)
+            it = self._items.find(pair[int32_t, int32_t](self._row_order[i], ref_col))
+            if it == self._items.end():
+                absent.push_back(i)
+                continue
+            if dereference(it).second.ordering_value != NULL:
+                key = <object>dereference(it).second.ordering_value
+            elif dereference(it).second.ui_item != NULL:
+                key = (<uiItem>dereference(it).second.ui_item).uuid
+            else:
+                absent.push_back(i)
+                continue
+            present.push_back(i)
+            keys.append(key)
+            if all_numeric:
+                if isinstance(key, (int, float)):
+                    try:
+                        numeric_key = <double>key
+                        if numeric_key != numeric_key:
+                            numeric_key = INFINITY # NaN are sorted last
+                        numeric_keys.push_back(numeric_key)
+                    except OverflowError:
+                        all_numeric = False
+                else:
+                    all_numeric = False
+            if all_strings:
+                if isinstance(key, str):
+                    try:
+                        string_key.data = PyUnicode_AsUTF8AndSize(key, &string_size)
+                        string_key.size = <size_t>string_size
+                        string_keys.push_back(string_key)
+                    except UnicodeError:
+                        all_strings = False
+                else:
+                    all_strings = False
+
+        cdef int32_t num_keys = <int32_t>present.size()
+        cdef DCGVector[int32_t] indices
+        indices.resize(num_keys)
+        for i in range(num_keys):
+            indices[i] = i
+        if all_numeric:
+            with nogil:
+                table_argsort_numeric(indices.data(), numeric_keys.data(),
+                                      num_keys, ascending)
+        elif all_strings:
+            # the keys keep the utf-8 buffers alive
+            with nogil:
+                table_argsort_strings(indices.data(), string_keys.data(),
+                                      num_keys, ascending)
+        else:
+            order = sorted(range(num_keys), key=keys.__getitem__,
+                           reverse=not(ascending))
+            for i in range(num_keys):
+                indices[i] = order[i]
+
+        # Rows without keys are kept last
+        cdef DCGVector[int32_t] row_order
+        row_order.reserve(num_rows)
+        for i in range(num_keys):
+            row_order.push_back(self._row_order[present[indices[i]]])
+        for i in range(<int32_t>absent.size()):
+            row_order.push_back(self._row_order[absent[i]])
+        self._row_order = row_order
+        self._dirty_num_rows_cols = True
 
-        # Determine order
-        key_array = np.array(keys, dtype=object)
-        order = np.argsort(key_array, stable=True)
+    cdef void _sort_rows_columnar(self, int32_t ref_col, bint ascending):
+        """Reorder the displayed rows by the values of a column"""
+        if ref_col < 0 or ref_col >= len(self._columns):
+            raise IndexError(f"Column {ref_col} out of range")
+        column = self._columns[ref_col]
+        cdef int32_t num_rows = self._columns_num_rows
+        # Current order, such that successive sorts compose
+        order = np.arange(num_rows, dtype=np.int32)
+        cdef int32_t[::1] order_view = order
+        cdef int32_t num_ordered = min(<int32_t>self._row_order.size(), num_rows)
+        if num_ordered > 0:
+            memcpy(&order_view[0], self._row_order.data(), num_ordered * sizeof(int32_t))
+        if not(isinstance(column, np.ndarray)):
+            column = np.asarray(column, dtype=object).reshape([-1])
+        # Rows past the end of the column stay last
+        valid = order < len(column)
+        sorted_order = order[valid]
+        sorted_order = sorted_order[np.argsort(column[sorted_order], kind='stable')]
         if not(ascending):
-            order = order[::-1]
-
-        cdef map[pair[int32_t, int32_t], TableElementData] items_copy = dereference(self._items)
-        cdef pair[pair[int32_t, int32_t], TableElementData] element_key
-        self._items.clear()
-
-        # We do not need to play with refcounts because each item
-        # is kept a single time. Similarly, row/col count doesn't
-        # change, so we don't need to update them.
-
-        # Create inverse permutation
-        cdef vector[int32_t] inverse_order
-        inverse_order.resize(len(order))
-        for i in range(len(order)):
-            inverse_order[order[i]] = i
-
-        # apply the invert order
-        cdef int32_t src_row
-        cdef int32_t target_row
-        cdef pair[int32_t, int32_t] target_key
-        for element_key in items_copy:
-            src_row = element_key.first.first
-            target_row = inverse_order[src_row]
-            target_key.first = target_row
-            target_key.second = element_key.first.second
-            dereference(self._items)[target_key] = element_key.second
+            sorted_order = sorted_order[::-1]
+        order = np.ascontiguousarray(np.concatenate([sorted_order, order[~valid]]), dtype=np.int32)
+        order_view = order
+        self._row_order.resize(num_rows)
+        if num_rows > 0:
+            memcpy(self._row_order.data(), &order_view[0], num_rows * sizeof(int32_t))
+        self._cells_valid = False
 
     def sort_cols(self, int32_t ref_row, bint ascending=True):
         """Sort the columns using the value in ref_row as index.
@@ -1142,7 +1492,7 @@ cdef class baseTable(uiItem):
 
         # Determine order
         key_array = np.array(keys, dtype=object)
-        order = np.argsort(key_array, stable=True)
+        order = np.argsort(key_array, kind='stable')
         if not(ascending):
             order = order[::-1]
 
@@ -1168,16 +1518,340 @@ cdef class baseTable(uiItem):
             target_key.second = target_col
             dereference(self._items)[target_key] = element_key.second
 
+    @property
+    def columns(self):
+        """
+        Column data the table is bound to, or None.
+
+        Setting a list of columns switches the table to
+        columnar mode: the text of the cell (row, col) is
+        formatted from columns[col][row] only when the row
+        is rendered, rather than stored for every cell.
+        This makes very large tables cheap to display and
+        to update, as a new dataset is displayed with a
+        single assignment.
+
+        Each column can be a 1D numpy array or any sequence
+        (for instance a list of strings). A 2D array is split
+        into its columns. Numeric arrays are converted to
+        float64 or int64 arrays (without copy if they already
+        are), and thus if they are modified in place, assign
+        the columns again to refresh the displayed text.
+
+        In columnar mode, the number of rows and columns
+        is given by the columns, and the elements set by
+        indexing the table are not displayed. Sorting
+        reorders the displayed rows, not the data.
+        Setting columns to None returns to the element mode.
+        """
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        if not(self._columnar):
+            return None
+        return list(self._columns)
+
+    @columns.setter
+    def columns(self, value):
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        columns = []
+        kinds = []
+        if value is not None:
+            if isinstance(value, np.ndarray) and value.ndim == 2:
+                value = [value[:, i] for i in range(value.shape[1])]
+            for column in value:
+                if isinstance(column, np.ndarray) and column.dtype.kind in 'fiub':
+                    if column.dtype.kind == 'f':
+                        column = np.ascontiguousarray(column, dtype=np.float64).reshape([-1])
+                        kinds.append(column_kind.float_values)
+                    else:
+                        column = np.ascontiguousarray(column, dtype=np.int64).reshape([-1])
+                        kinds.append(column_kind.int_values)
+                elif hasattr(column, '__getitem__') and hasattr(column, '__len__'):
+                    kinds.append(column_kind.object_values)
+                else:
+                    raise TypeError("Columns must be arrays or sequences")
+                columns.append(column)
+
+        if not(self._columnar):
+            # The row order is used for the columns
+            self._normalize_rows()
+        self._column_ptrs.clear()
+        self._column_lengths.clear()
+        self._column_kinds.clear()
+        self._row_order.clear()
+        self._cells_valid = False
+        self._dirty_num_rows_cols = True
+        if value is None:
+            self._columnar = False
+            self._columns = None
+            self._columns_num_rows = 0
+            self._update_column_formats()
+            return
+        cdef int32_t num_rows = 0
+        cdef cnp.ndarray array
+        for (column, kind) in zip(columns, kinds):
+            self._column_kinds.push_back(kind)
+            self._column_lengths.push_back(<int32_t>len(column))
+            if kind == column_kind.object_values:
+                self._column_ptrs.push_back(NULL)
+            else:
+                # kept alive by self._columns
+                array = column
+                self._column_ptrs.push_back(cnp.PyArray_DATA(array))
+            num_rows = max(num_rows, <int32_t>len(column))
+        self._columns = columns
+        self._columns_num_rows = num_rows
+        self._columnar = True
+        self._update_column_formats()
+
+    @property
+    def formats(self):
+        """
+        Formatters of the columns, used in columnar mode.
+
+        A list with one entry per column (missing entries
+        use the default). Each entry can be:
+        - None: the default. '%g' for floats, '%d' for
+            integers and str() for other values.
+        - A printf style format string ('%.3f', '%5d %%').
+            For numeric columns it is applied without
+            calling Python.
+        - A format string for str.format ('{:,.2f}')
+        - A callable taking the value and returning a string.
+
+        If formatting fails, str() of the value is displayed.
+        """
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        if self._column_formats is None:
+            return None
+        return list(self._column_formats)
+
+    @formats.setter
+    def formats(self, value):
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        formats = None
+        if value is not None:
+            formats = list(value)
+            for fmt in formats:
+                if fmt is not None and not(isinstance(fmt, str)) and not(callable(fmt)):
+                    raise TypeError("formats must be None, strings or callables")
+        self._column_formats = formats
+        self._update_column_formats()
+        self._cells_valid = False
+
+    cdef void _update_column_formats(self):
+        """
+        Compute the printf formats usable natively for
+        the columns, or an empty string when formatting
+        needs Python. Assumes the mutex is held.
+        """
+        self._column_printf.clear()
+        cdef int32_t col
+        for col in range(<int32_t>self._column_kinds.size()):
+            fmt = None
+            if self._column_formats is not None and col < len(self._column_formats):
+                fmt = self._column_formats[col]
+            self._column_printf.push_back(
+                string_from_bytes(native_column_format(fmt, self._column_kinds[col])))
+
+    cdef int32_t _data_row(self, int32_t row) noexcept nogil:
+        """Row of the column data displayed at row"""
+        if row < <int32_t>self._row_order.size():
+            return self._row_order[row]
+        return row
+
+    cdef void _format_cell(self, int32_t data_row, int32_t col, DCGString& dst) noexcept nogil:
+        """
+        Write in dst the text of the cell at data_row
+        of the column. Takes the gil only if needed.
+        """
+        cdef char[128] buffer
+        if data_row >= self._column_lengths[col]:
+            dst.clear()
+            return
+        if self._column_printf[col].empty():
+            with gil:
+                dst = string_from_str(self._format_cell_python(data_row, col))
+            return
+        if self._column_kinds[col] == column_kind.float_values:
+            snprintf(buffer, 128, self._column_printf[col].c_str(),
+                     (<double*>self._column_ptrs[col])[data_row])
+        else:
+            snprintf(buffer, 128, self._column_printf[col].c_str(),
+                     <long long>(<int64_t*>self._column_ptrs[col])[data_row])
+        dst = DCGString(buffer)
+
+    cdef str _format_cell_python(self, int32_t data_row, int32_t col):
+        fmt = None
+        if self._column_formats is not None and col < len(self._column_formats):
+            fmt = self._column_formats[col]
+        try:
+            value = self._columns[col][data_row]
+        except Exception:
+            # For instance a sequence modified in place
+            return ""
+        try:
+            if fmt is None:
+                return str(value)
+            if callable(fmt):
+                return str(fmt(value))
+            if '{' in fmt:
+                return fmt.format(value)
+            return fmt % value
+        except Exception:
+            return str(value)
+
+    cdef void _format_missing_cells(self,
+                                    DCGVector[int32_t]& rows,
+                                    DCGVector[int32_t]& missing,
+                                    DCGVector[DCGString]& cells) noexcept:
+        cdef int32_t num_cols = <int32_t>self._column_kinds.size()
+        cdef int32_t i, col
+        for i in range(<int32_t>rows.size()):
+            if not(missing[i]):
+                continue
+            for col in range(num_cols):
+                self._format_cell(self._data_row(rows[i]), col, cells[i * num_cols + col])
+
+    cdef void _prepare_cells(self, int32_t num_rows, int32_t num_rows_frozen) noexcept nogil:
+        """
+        Format the text of the rows likely to be rendered
+        this frame: the frozen rows, and the rows rendered
+        the previous frame with a margin on each side for
+        scrolling. The texts already formatted are reused.
+        """
+        cdef int32_t num_cols = <int32_t>self._column_kinds.size()
+        cdef int32_t i, j, col
+        cdef int32_t start, end, margin
+        if self._cells_last_max >= self._cells_last_min:
+            margin = max(16, self._cells_last_max - self._cells_last_min + 1)
+            start = self._cells_last_min - margin
+            end = self._cells_last_max + 1 + margin
+        else:
+            start = num_rows_frozen
+            end = num_rows_frozen + 64
+        start = max(start, num_rows_frozen)
+        end = min(end, num_rows)
+        # Reset the rendered rows tracking for this frame
+        self._cells_last_min = num_rows
+        self._cells_last_max = -1
+
+        cdef DCGVector[int32_t] rows
+        for i in range(min(num_rows_frozen, num_rows)):
+            rows.push_back(i)
+        for i in range(start, end):
+            rows.push_back(i)
+        if self._cells_valid and rows == self._cells_rows:
+            return
+
+        # Reuse the texts of the rows already formatted
+        # (both lists are sorted)
+        cdef DCGVector[DCGString] cells
+        cdef DCGVector[int32_t] missing
+        cdef bint any_missing = False
+        cells.resize(rows.size() * num_cols)
+        missing.resize(rows.size())
+        j = 0
+        for i in range(<int32_t>rows.size()):
+            if self._cells_valid:
+                while j < <int32_t>self._cells_rows.size() and \
+                      self._cells_rows[j] < rows[i]:
+                    j += 1
+                if j < <int32_t>self._cells_rows.size() and \
+                   self._cells_rows[j] == rows[i]:
+                    for col in range(num_cols):
+                        cells[i * num_cols + col] = self._cells[j * num_cols + col]
+                    missing[i] = False
+                    continue
+            missing[i] = True
+            any_missing = True
+
+        cdef bint needs_python = False
+        for col in range(num_cols):
+            if self._column_printf[col].empty():
+                needs_python = True
+        if any_missing:
+            if needs_python:
+                # Take the gil only once for all the cells
+                with gil:
+                    self._format_missing_cells(rows, missing, cells)
+            else:
+                for i in range(<int32_t>rows.size()):
+                    if not(missing[i]):
+                        continue
+                    for col in range(num_cols):
+                        self._format_cell(self._data_row(rows[i]), col, cells[i * num_cols + col])
+
+        self._cells_rows = rows
+        self._cells = cells
+        self._cells_valid = True
+
+    cdef const char* _get_cell_text(self, int32_t row, int32_t col) noexcept nogil:
+        """
+        Text of a cell in columnar mode, formatting it if it
+        was not prepared. Valid until the next call.
+        """
+        if row >= self._num_rows_frozen:
+            self._cells_last_min = min(self._cells_last_min, row)
+            self._cells_last_max = max(self._cells_last_max, row)
+        cdef int32_t num_cols = <int32_t>self._column_kinds.size()
+        # Binary search in the prepared rows
+        cdef int32_t lo = 0
+        cdef int32_t hi = <int32_t>self._cells_rows.size()
+        cdef int32_t mid
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._cells_rows[mid] < row:
+                lo = mid + 1
+            else:
+                hi = mid
+        if self._cells_valid and lo < <int32_t>self._cells_rows.size() and \
+           self._cells_rows[lo] == row:
+            return self._cells[lo * num_cols + col].c_str()
+        # Not prepared (for instance fast scrolling)
+        self._format_cell(self._data_row(row), col, self._cell_fallback)
+        return self._cell_fallback.c_str()
+
     cdef void _items_iter_prepare(self) noexcept nogil:
         """Start iterating over items."""
         if self._iter_state == NULL:
             self._iter_state = <TableIterState*>malloc(sizeof(TableIterState))
         self._iter_state.started = False
+        self._iter_state.row = -1
         self._iter_state.it = self._items.begin()
         self._iter_state.end = self._items.end()
+        # The items are stored by storage row
+        if self._row_order.empty() or self._columnar:
+            self._iter_row_inverse.clear()
+        else:
+            self._build_row_inverse(self._iter_row_inverse)
+
+    cdef void _items_iter_prepare_row(self, int32_t row) noexcept nogil:
+        """
+        Start iterating over the items of a single row.
+        The items are sorted by row, then column, thus
+        the row is found without walking the previous ones.
+        """
+        if self._iter_state == NULL:
+            self._iter_state = <TableIterState*>malloc(sizeof(TableIterState))
+        self._iter_state.started = False
+        self._iter_state.row = row
+        row = self._storage_row(row)
+        if row < 0:
+            self._iter_state.it = self._items.end()
+            self._iter_state.end = self._items.end()
+            return
+        self._iter_state.it = self._items.lower_bound(pair[int32_t, int32_t](row, 0))
+        self._iter_state.end = self._items.lower_bound(pair[int32_t, int32_t](row + 1, 0))
 
     cdef bint _items_iter_next(self, int32_t* row, int32_t* col, TableElementData** element) noexcept nogil:
-        """Get next item in iteration. Returns False when done."""
+        """
+        Get next item in iteration. Returns False when done.
+        row is the row of the table, not the storage row.
+        """
         if self._iter_state.started:
             preincrement(self._iter_state.it)
         self._iter_state.started = True
@@ -1186,6 +1860,10 @@ cdef class baseTable(uiItem):
             return False
             
         row[0] = dereference(self._iter_state.it).first.first
+        if self._iter_state.row >= 0:
+            row[0] = self._iter_state.row
+        elif not(self._iter_row_inverse.empty()):
+            row[0] = self._iter_row_inverse[row[0]]
         col[0] = dereference(self._iter_state.it).first.second
         element[0] = &dereference(self._iter_state.it).second
         return True
@@ -1200,7 +1878,7 @@ cdef class baseTable(uiItem):
 
     cdef bint _items_contains(self, int32_t row, int32_t col) noexcept nogil:
         """Check if an item exists at the given position."""
-        cdef pair[int32_t, int32_t] key = pair[int32_t, int32_t](row, col)
+        cdef pair[int32_t, int32_t] key = self._item_key(row, col)
         return self._items.find(key) != self._items.end()
 
 cdef class TableColConfig(baseItem):
@@ -1892,6 +2570,7 @@ cdef class Table(baseTable):
         self._row_configs = new map[int32_t, PyObject*]()
         self._inner_width = 0.
         self._flags = imgui.ImGuiTableFlags_None
+        self._row_clipping = False
 
     def __dealloc(self):
         cdef pair[int32_t, PyObject*] key_value
@@ -2057,6 +2736,97 @@ cdef class Table(baseTable):
         lock_gil_friendly(m, self.mutex)
         self._header = value
 
+    @property
+    def row_clipping(self):
+        """
+        boolean. Defaults to False.
+        Only submit the rows that are visible.
+
+        The frame cost then depends on the number of
+        visible rows rather than on the size of the table.
+        The height of the skipped rows is deduced from the
+        height of the first row, thus disable it if the
+        rows have very different heights.
+        Items in the skipped rows are not rendered, and
+        thus do not run their handlers. It is thus meant
+        for large tables whose items do not rely on
+        handlers.
+        Tables bound to columns (see columns) are always
+        clipped, as they have no items.
+        """
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        return self._row_clipping
+
+    @row_clipping.setter
+    def row_clipping(self, bint value):
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, self.mutex)
+        self._row_clipping = value
+
+    cdef void draw_row(self, int32_t row, int32_t num_cols) noexcept nogil:
+        """
+        Submit a (not hidden) row and its cells.
+        Assumes the row configurations are locked.
+        """
+        cdef map[int32_t , PyObject*].iterator it_row
+        cdef TableElementData *element
+        cdef int32_t element_row, col
+
+        it_row = self._row_configs.find(row)
+        if it_row == self._row_configs.end():
+            imgui.TableNextRow(0, 0.)
+        else:
+            imgui.TableNextRow(0, (<TableRowConfig>dereference(it_row).second).min_height)
+            imgui.TableSetBgColor(imgui.ImGuiTableBgTarget_RowBg1,
+                (<TableRowConfig>dereference(it_row).second).bg_color, -1)
+
+        if self._columnar:
+            for col in range(min(num_cols, <int32_t>self._column_kinds.size())):
+                imgui.TableSetColumnIndex(col)
+                imgui.TextUnformatted(self._get_cell_text(row, col))
+            return
+
+        self._items_iter_prepare_row(row)
+        while self._items_iter_next(&element_row, &col, &element):
+            if col >= num_cols:
+                # sorted by column
+                break
+
+            imgui.TableSetColumnIndex(col)
+
+            if element.bg_color != 0:
+                imgui.TableSetBgColor(imgui.ImGuiTableBgTarget_CellBg, element.bg_color, -1)
+
+            # Draw element content
+            if element.ui_item is not NULL:
+                # We lock because we check the parent field.
+                # Probably not needed though, as the parent
+                # must be locked to be edited.
+                (<uiItem>element.ui_item).mutex.lock()
+                if (<uiItem>element.ui_item).parent is self:
+                    # Each cell is like a Child Window
+                    self.context.viewport.parent_pos = ImVec2Vec2(imgui.GetCursorScreenPos())
+                    self.context.viewport.window_pos = self.context.viewport.parent_pos
+                    self.context.viewport.parent_size = ImVec2Vec2(imgui.GetContentRegionAvail())
+                    draw_child(<baseItem>element.ui_item, NULL)
+                (<uiItem>element.ui_item).mutex.unlock()
+            elif not element.str_item.empty():
+                imgui.TextUnformatted(element.str_item.c_str())
+
+            # Optional tooltip
+            if element.tooltip_ui_item is not NULL:
+                (<uiItem>element.tooltip_ui_item).mutex.lock()
+                if (<uiItem>element.tooltip_ui_item).parent is self:
+                    draw_child(<baseItem>element.tooltip_ui_item, NULL)
+                (<uiItem>element.tooltip_ui_item).mutex.unlock()
+            elif not element.str_tooltip.empty():
+                if imgui.IsItemHovered(0):
+                    if imgui.BeginTooltip():
+                        imgui.TextUnformatted(element.str_tooltip.c_str())
+                        imgui.EndTooltip()
+        self._items_iter_finish()
+
     cdef bint draw_item(self) noexcept nogil:
         cdef Vec2 requested_size = self.scaled_requested_size()
         cdef imgui.ImGuiTableSortSpecs *sort_specs
@@ -2079,19 +2849,16 @@ cdef class Table(baseTable):
         if num_cols_frozen >= actual_num_cols:
             num_cols_frozen = actual_num_cols
 
-        cdef pair[pair[int32_t, int32_t], TableElementData] key_element
-        cdef pair[int32_t, int32_t] key
-        cdef TableElementData *element
-        cdef int32_t row, col
-        cdef int32_t prev_row = -1
         cdef int32_t prev_col = -1
         cdef int32_t j
         cdef Vec2 pos_p_backup, pos_w_backup, parent_size_backup
         cdef pair[int32_t , PyObject*] col_data
         cdef pair[int32_t , PyObject*] row_data
-        cdef map[int32_t , PyObject*].iterator it_row
-
-        cdef bint row_hidden = False
+        cdef imgui.ImGuiListClipper clipper
+        # Rows that are displayed, if some are hidden
+        cdef DCGVector[int32_t] displayed_rows
+        cdef bint has_hidden_rows = False
+        cdef int32_t num_displayed_rows
 
         # Corruption issue for empty tables
         if actual_num_rows == 0 or actual_num_cols == 0:
@@ -2121,6 +2888,8 @@ cdef class Table(baseTable):
             if row_data.first >= actual_num_rows:
                 break
             (<TableRowConfig>row_data.second).mutex.lock()
+            if not((<TableRowConfig>row_data.second).show):
+                has_hidden_rows = True
 
         if imgui.BeginTable(self._imgui_label.c_str(),
                             actual_num_cols,
@@ -2147,78 +2916,45 @@ cdef class Table(baseTable):
             pos_w_backup = self.context.viewport.window_pos
             parent_size_backup = self.context.viewport.parent_size
 
-            # Prepare iteration
-            self._items_iter_prepare()
-
-            while self._items_iter_next(&row, &col, &element):
-                if row >= actual_num_rows or col >= actual_num_cols:
-                    continue
-
-                if row != prev_row:
-                    for j in range(prev_row, row):
-                        row_hidden = False
-                        it_row = self._row_configs.find(j+1) # +1 here, but not for below (empty rows)
-                        if it_row == self._row_configs.end():
-                            imgui.TableNextRow(0, 0.)
-                            continue
-                        if not((<TableRowConfig>dereference(it_row).second).show):
-                            row_hidden = True
-                            continue
-                        imgui.TableNextRow(0, (<TableRowConfig>dereference(it_row).second).min_height)
-                        imgui.TableSetBgColor(imgui.ImGuiTableBgTarget_RowBg1,
-                            (<TableRowConfig>dereference(it_row).second).bg_color, -1)
-                    prev_row = row
-
-                if row_hidden:
-                    continue
-
-                imgui.TableSetColumnIndex(col)
+            # Index the displayed rows only if needed
+            num_displayed_rows = actual_num_rows
+            if has_hidden_rows:
+                j = 0
+                for row_data in dereference(self._row_configs):
+                    if row_data.first >= actual_num_rows:
+                        break
+                    if (<TableRowConfig>row_data.second).show:
+                        continue
+                    # rows before the hidden one
+                    while j < row_data.first:
+                        displayed_rows.push_back(j)
+                        j += 1
+                    j = row_data.first + 1
+                while j < actual_num_rows:
+                    displayed_rows.push_back(j)
+                    j += 1
+                num_displayed_rows = <int32_t>displayed_rows.size()
+
+            if self._columnar:
+                self._prepare_cells(actual_num_rows, num_rows_frozen)
+
+            # Columnar tables have no items, thus no handlers
+            # that would need the skipped rows to be rendered.
+            if self._row_clipping or self._columnar:
+                clipper.Begin(num_displayed_rows, -1.)
+                # Frozen rows are always visible
+                if num_rows_frozen > 0:
+                    clipper.IncludeItemsByIndex(0, min(num_rows_frozen, num_displayed_rows))
+                while clipper.Step():
+                    for j in range(clipper.DisplayStart, clipper.DisplayEnd):
+                        self.draw_row(displayed_rows[j] if has_hidden_rows else j,
+                                      actual_num_cols)
+                clipper.End()
+            else:
+                for j in range(num_displayed_rows):
+                    self.draw_row(displayed_rows[j] if has_hidden_rows else j,
+                                  actual_num_cols)
 
-                if element.bg_color != 0:
-                    imgui.TableSetBgColor(imgui.ImGuiTableBgTarget_CellBg, element.bg_color, -1)
-
-                # Draw element content
-                if element.ui_item is not NULL:
-                    # We lock because we check the parent field.
-                    # Probably not needed though, as the parent
-                    # must be locked to be edited.
-                    (<uiItem>element.ui_item).mutex.lock()
-                    if (<uiItem>element.ui_item).parent is self:
-                        # Each cell is like a Child Window
-                        self.context.viewport.parent_pos = ImVec2Vec2(imgui.GetCursorScreenPos())
-                        self.context.viewport.window_pos = self.context.viewport.parent_pos
-                        self.context.viewport.parent_size = ImVec2Vec2(imgui.GetContentRegionAvail())
-                        (<uiItem>element.ui_item).draw()
-                    (<uiItem>element.ui_item).mutex.unlock()
-                elif not element.str_item.empty():
-                    imgui.TextUnformatted(element.str_item.c_str())
-
-                # Optional tooltip
-                if element.tooltip_ui_item is not NULL:
-                    (<uiItem>element.tooltip_ui_item).mutex.lock()
-                    if (<uiItem>element.tooltip_ui_item).parent is self:
-                        (<uiItem>element.tooltip_ui_item).draw()
-                    (<uiItem>element.tooltip_ui_item).mutex.unlock()
-                elif not element.str_tooltip.empty():
-                    if imgui.IsItemHovered(0):
-                        if imgui.BeginTooltip():
-                            imgui.TextUnformatted(element.str_tooltip.c_str())
-                            imgui.EndTooltip()
-
-            # Clean up iteration
-            self._items_iter_finish()
-
-            # Submit empty rows if any
-            for j in range(prev_row+1, actual_num_rows):
-                it_row = self._row_configs.find(j)
-                if it_row == self._row_configs.end():
-                    imgui.TableNextRow(0, 0.)
-                    continue
-                if not((<TableRowConfig>dereference(it_row).second).show):
-                    continue
-                imgui.TableNextRow(0, (<TableRowConfig>dereference(it_row).second).min_height)
-                imgui.TableSetBgColor(imgui.ImGuiTableBgTarget_RowBg1,
-                    (<TableRowConfig>dereference(it_row).second).bg_color, -1)
             # Update column states
             for col_data in dereference(self._col_configs):
                 if col_data.first >= actual_num_cols:
@@ -3,11 +3,16 @@ from .core cimport *
 from .types cimport *
 from .c_types cimport DCGVector
 
-from libc.stdint cimport uint32_t, int32_t
+from libc.stdint cimport uint32_t, int32_t, int64_t
 
 cdef class baseThemeColor(baseTheme):
     cdef list _names
     cdef unordered_map[int32_t, uint32_t] _index_to_value
+    # Flat list of the actions to push
+    cdef DCGVector[theme_action] _compiled
+    cdef int32_t[6] _compiled_counts
+    cdef int64_t _compiled_generation
+    cdef void _update_compiled(self) noexcept nogil
     cdef object __common_getter(self, int32_t)
     cdef void __common_setter(self, int32_t, object)
 
@@ -43,6 +48,11 @@ cdef class baseThemeStyle(baseTheme):
     cdef float _dpi
     cdef bint _dpi_scaling
     cdef bint _round_after_scale
+    # Flat list of the actions to push
+    cdef DCGVector[theme_action] _compiled
+    cdef int32_t[6] _compiled_counts
+    cdef int64_t _compiled_generation
+    cdef void _update_compiled(self) noexcept nogil
     cdef object __common_getter(self, int32_t, theme_value_types)
     cdef void __common_setter(self, int32_t, theme_value_types, bint, bint, py_value)
     cdef void __compute_for_dpi(self) noexcept nogil
@@ -60,6 +70,13 @@ cdef class ThemeStyleImNodes(baseThemeStyle):
     pass
 
 cdef class ThemeList(baseTheme):
+    # Actions of all the children, grouped by stack
+    cdef DCGVector[theme_action] _compiled
+    cdef int32_t[6] _compiled_counts
+    cdef int64_t _compiled_generation
+    cdef float _compiled_dpi
+    cdef bint _compilable
+    cdef bint _update_compiled(self) noexcept nogil
     cdef void push(self) noexcept nogil
     cdef void push_to_list(self, DCGVector[theme_action]&) noexcept nogil
     cdef void pop(self) noexcept nogil
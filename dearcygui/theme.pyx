@@ -14,7 +14,7 @@
 #cython: auto_pickle=False
 #distutils: language=c++
 
-from libc.stdint cimport int32_t, uint32_t
+from libc.stdint cimport int32_t, uint32_t, int64_t
 from libcpp.cmath cimport round
 from libcpp.unordered_map cimport unordered_map, pair
 from libcpp.string cimport string
@@ -27,6 +27,8 @@ from .c_types cimport *
 from .types cimport *
 from cpython cimport PyObject_GenericSetAttr
 
+import weakref
+
 cdef inline void imgui_PushStyleVar2(int i, float[2] val) noexcept nogil:
     imgui.PushStyleVar(<imgui.ImGuiStyleVar>i, imgui.ImVec2(val[0], val[1]))
 
@@ -67,6 +69,101 @@ cdef inline void pop_theme_children(baseItem item) noexcept nogil:
         (<baseTheme>child).pop()
         child = <PyObject *>(<baseItem>child).prev_sibling
 
+# Compiled themes are flat lists of actions, grouped
+# by the stack they are pushed to, in this order:
+# imgui colors, imgui styles, implot colors, implot
+# styles, imnodes colors, imnodes styles.
+cdef inline int32_t theme_action_stack(theme_action& action) noexcept nogil:
+    return 2 * <int32_t>action.backend + <int32_t>action.type
+
+cdef void sort_theme_actions(DCGVector[theme_action]& actions,
+                             int32_t* counts) noexcept nogil:
+    """
+    Group the actions by stack, keeping their order
+    inside a stack, and write the size of each group
+    in counts.
+    """
+    cdef int32_t i, stack
+    cdef int32_t[6] starts
+    for i in range(6):
+        counts[i] = 0
+    for i in range(<int32_t>actions.size()):
+        counts[theme_action_stack(actions[i])] += 1
+    starts[0] = 0
+    for i in range(1, 6):
+        starts[i] = starts[i-1] + counts[i-1]
+    cdef DCGVector[theme_action] grouped
+    grouped.resize(actions.size())
+    for i in range(<int32_t>actions.size()):
+        stack = theme_action_stack(actions[i])
+        grouped[starts[stack]] = actions[i]
+        starts[stack] += 1
+    actions = grouped
+
+cdef void push_theme_actions(DCGVector[theme_action]& actions,
+                             const int32_t* counts) noexcept nogil:
+    """Push actions grouped with sort_theme_actions"""
+    cdef theme_action* action = actions.data()
+    cdef theme_action* end = action + counts[0]
+    while action != end:
+        imgui.PushStyleColor(<imgui.ImGuiCol>action.theme_index, <imgui.ImU32>action.value.value_u32)
+        action += 1
+    end = action + counts[1]
+    while action != end:
+        if action.value_type == theme_value_types.t_float:
+            imgui.PushStyleVar(action.theme_index, action.value.value_float)
+        elif action.float2_mask == theme_value_float2_mask.t_left:
+            imgui.PushStyleVarX(action.theme_index, action.value.value_float2[0])
+        elif action.float2_mask == theme_value_float2_mask.t_right:
+            imgui.PushStyleVarY(action.theme_index, action.value.value_float2[1])
+        else:
+            imgui_PushStyleVar2(action.theme_index, action.value.value_float2)
+        action += 1
+    end = action + counts[2]
+    while action != end:
+        implot.PushStyleColor(<implot.ImPlotCol>action.theme_index, <imgui.ImU32>action.value.value_u32)
+        action += 1
+    end = action + counts[3]
+    while action != end:
+        if action.value_type == theme_value_types.t_float:
+            implot.PushStyleVar(action.theme_index, action.value.value_float)
+        elif action.value_type == theme_value_types.t_int:
+            implot.PushStyleVar(action.theme_index, action.value.value_int)
+        elif action.float2_mask == theme_value_float2_mask.t_left:
+            implot.PushStyleVarX(action.theme_index, action.value.value_float2[0])
+        elif action.float2_mask == theme_value_float2_mask.t_right:
+            implot.PushStyleVarY(action.theme_index, action.value.value_float2[1])
+        else:
+            implot_PushStyleVar2(action.theme_index, action.value.value_float2)
+        action += 1
+    end = action + counts[4]
+    while action != end:
+        imnodes.PushColorStyle(<imnodes.ImNodesCol>action.theme_index, action.value.value_u32)
+        action += 1
+    end = action + counts[5]
+    while action != end:
+        if action.value_type == theme_value_types.t_float:
+            imnodes.PushStyleVar(action.theme_index, action.value.value_float)
+        else:
+            imnodes_PushStyleVar2(action.theme_index, action.value.value_float2)
+        action += 1
+
+cdef void pop_theme_actions(const int32_t* counts) noexcept nogil:
+    """Pop what push_theme_actions pushed"""
+    cdef int32_t i
+    if counts[0] > 0:
+        imgui.PopStyleColor(counts[0])
+    if counts[1] > 0:
+        imgui.PopStyleVar(counts[1])
+    if counts[2] > 0:
+        implot.PopStyleColor(counts[2])
+    if counts[3] > 0:
+        implot.PopStyleVar(counts[3])
+    for i in range(counts[4]):
+        imnodes.PopColorStyle()
+    if counts[5] > 0:
+        imnodes.PopStyleVar(counts[5])
+
 cdef class baseThemeColor(baseTheme):
     """
     Base class for theme colors that provides common color-related functionality.
@@ -134,14 +231,92 @@ cdef class baseThemeColor(baseTheme):
         cdef uint32_t value = dereference(element_content).second
         return value
 
+    def __cinit__(self):
+        self._compiled_generation = -1
+
+    cdef void _update_compiled(self) noexcept nogil:
+        """
+        Rebuild the flat list of actions if a theme
+        changed. Assumes the mutex is held.
+        """
+        cdef int64_t generation = self.context._theme_generation.load()
+        if generation == self._compiled_generation:
+            return
+        self._compiled.clear()
+        self.push_to_list(self._compiled)
+        sort_theme_actions(self._compiled, self._compiled_counts)
+        self._compiled_generation = generation
+
     cdef void __common_setter(self, int32_t index, value):
         cdef unique_lock[DCGMutex] m
         lock_gil_friendly(m, self.mutex)
         if value is None:
             self._index_to_value.erase(index)
+            self._mark_changed()
             return
         cdef imgui.ImU32 color = parse_color(value)
         self._index_to_value[index] = <uint32_t> color
+        self._mark_changed()
+
+# Names of the values, in the order of their index
+_imgui_color_names = [
+    "Text",
+    "TextDisabled", 
+    "WindowBg",
+    "ChildBg",
+    "PopupBg",
+    "Border",
+    "BorderShadow",
+    "FrameBg",
+    "FrameBgHovered",
+    "FrameBgActive",
+    "TitleBg",
+    "TitleBgActive", 
+    "TitleBgCollapsed",
+    "MenuBarBg",
+    "ScrollbarBg",
+    "ScrollbarGrab",
+    "ScrollbarGrabHovered",
+    "ScrollbarGrabActive",
+    "CheckMark",
+    "SliderGrab",
+    "SliderGrabActive",
+    "Button",
+    "ButtonHovered",
+    "ButtonActive",
+    "Header",
+    "HeaderHovered",
+    "HeaderActive",
+    "Separator",
+    "SeparatorHovered",
+    "SeparatorActive",
+    "ResizeGrip",
+    "ResizeGripHovered",
+    "ResizeGripActive",
+    "TabHovered",
+    "Tab",
+    "TabSelected",  
+    "TabSelectedOverline",
+    "TabDimmed",
+    "TabDimmedSelected",
+    "TabDimmedSelectedOverline",
+    "PlotLines",
+    "PlotLinesHovered",
+    "PlotHistogram",
+    "PlotHistogramHovered",
+    "TableHeaderBg",
+    "TableBorderStrong",
+    "TableBorderLight", 
+    "TableRowBg",
+    "TableRowBgAlt",
+    "TextLink",
+    "TextSelectedBg",
+    "DragDropTarget",
+    "NavCursor",
+    "NavWindowingHighlight",
+    "NavWindowingDimBg",
+    "ModalWindowDimBg"
+]
 
 cdef class ThemeColorImGui(baseThemeColor):
     """
@@ -216,64 +391,7 @@ cdef class ThemeColorImGui(baseThemeColor):
     """
 
     def __cinit__(self):
-        self._names = [
-            "Text",
-            "TextDisabled", 
-            "WindowBg",
-            "ChildBg",
-            "PopupBg",
-            "Border",
-            "BorderShadow",
-            "FrameBg",
-            "FrameBgHovered",
-            "FrameBgActive",
-            "TitleBg",
-            "TitleBgActive", 
-            "TitleBgCollapsed",
-            "MenuBarBg",
-            "ScrollbarBg",
-            "ScrollbarGrab",
-            "ScrollbarGrabHovered",
-            "ScrollbarGrabActive",
-            "CheckMark",
-            "SliderGrab",
-            "SliderGrabActive",
-            "Button",
-            "ButtonHovered",
-            "ButtonActive",
-            "Header",
-            "HeaderHovered",
-            "HeaderActive",
-            "Separator",
-            "SeparatorHovered",
-            "SeparatorActive",
-            "ResizeGrip",
-            "ResizeGripHovered",
-            "ResizeGripActive",
-            "TabHovered",
-            "Tab",
-            "TabSelected",  
-            "TabSelectedOverline",
-            "TabDimmed",
-            "TabDimmedSelected",
-            "TabDimmedSelectedOverline",
-            "PlotLines",
-            "PlotLinesHovered",
-            "PlotHistogram",
-            "PlotHistogramHovered",
-            "TableHeaderBg",
-            "TableBorderStrong",
-            "TableBorderLight", 
-            "TableRowBg",
-            "TableRowBgAlt",
-            "TextLink",
-            "TextSelectedBg",
-            "DragDropTarget",
-            "NavCursor",
-            "NavWindowingHighlight",
-            "NavWindowingDimBg",
-            "ModalWindowDimBg"
-        ]
+        self._names = _imgui_color_names
 
     @property 
     def Text(self):
@@ -958,11 +1076,9 @@ cdef class ThemeColorImGui(baseThemeColor):
         if not(self._enabled):
             self._last_push_size.push_back(0)
             return
-        cdef pair[int32_t, uint32_t] element_content
-        for element_content in self._index_to_value:
-            # Note: imgui seems to convert U32 for this. Maybe use float4
-            imgui.PushStyleColor(<imgui.ImGuiCol>element_content.first, <imgui.ImU32>element_content.second)
-        self._last_push_size.push_back(<int>self._index_to_value.size())
+        self._update_compiled()
+        push_theme_actions(self._compiled, self._compiled_counts)
+        self._last_push_size.push_back(<int>self._compiled.size())
 
     cdef void push_to_list(self, DCGVector[theme_action]& v) noexcept nogil:
         cdef unique_lock[DCGMutex] m = unique_lock[DCGMutex](self.mutex)
@@ -989,6 +1105,31 @@ cdef class ThemeColorImGui(baseThemeColor):
         self.mutex.unlock()
 
 
+# Names of the values, in the order of their index
+_implot_color_names = [
+    "Line",
+    "Fill",
+    "MarkerOutline",
+    "MarkerFill",
+    "ErrorBar",
+    "FrameBg",
+    "PlotBg",
+    "PlotBorder",
+    "LegendBg",
+    "LegendBorder",
+    "LegendText",
+    "TitleText",
+    "InlayText",
+    "AxisText",
+    "AxisGrid",
+    "AxisTick",
+    "AxisBg",
+    "AxisBgHovered",
+    "AxisBgActive",
+    "Selection",
+    "Crosshairs"
+]
+
 cdef class ThemeColorImPlot(baseThemeColor):
     """
     Theme color parameters that affect how ImPlot renders plots.
@@ -1025,29 +1166,7 @@ cdef class ThemeColorImPlot(baseThemeColor):
         Crosshairs: Crosshairs color. Auto - derived from PlotBorder color
     """
     def __cinit__(self):
-        self._names = [
-            "Line",
-            "Fill",
-            "MarkerOutline",
-            "MarkerFill",
-            "ErrorBar",
-            "FrameBg",
-            "PlotBg",
-            "PlotBorder",
-            "LegendBg",
-            "LegendBorder",
-            "LegendText",
-            "TitleText",
-            "InlayText",
-            "AxisText",
-            "AxisGrid",
-            "AxisTick",
-            "AxisBg",
-            "AxisBgHovered",
-            "AxisBgActive",
-            "Selection",
-            "Crosshairs"
-        ]
+        self._names = _implot_color_names
 
     @property
     def Line(self):
@@ -1313,11 +1432,9 @@ cdef class ThemeColorImPlot(baseThemeColor):
         if not(self._enabled):
             self._last_push_size.push_back(0)
             return
-        cdef pair[int32_t, uint32_t] element_content
-        for element_content in self._index_to_value:
-            # Note: imgui seems to convert U32 for this. Maybe use float4
-            implot.PushStyleColor(<implot.ImPlotCol>element_content.first, <imgui.ImU32>element_content.second)
-        self._last_push_size.push_back(<int>self._index_to_value.size())
+        self._update_compiled()
+        push_theme_actions(self._compiled, self._compiled_counts)
+        self._last_push_size.push_back(<int>self._compiled.size())
 
     cdef void push_to_list(self, DCGVector[theme_action]& v) noexcept nogil:
         cdef unique_lock[DCGMutex] m = unique_lock[DCGMutex](self.mutex)
@@ -1446,9 +1563,11 @@ cdef class ThemeColorImNodes(baseThemeColor):
         cdef int32_t color_index = dereference(element).second
         if value is None:
             self._index_to_value.erase(color_index)
+            self._mark_changed()
             return
         cdef imgui.ImU32 color = parse_color(value)
         self._index_to_value[color_index] = color
+        self._mark_changed()
 
     def __setitem__(self, key, value):
         cdef unique_lock[DCGMutex] m
@@ -1470,9 +1589,11 @@ cdef class ThemeColorImNodes(baseThemeColor):
             raise TypeError("%s is an invalid index type" % str(type(key)))
         if value is None:
             self._index_to_value.erase(color_index)
+            self._mark_changed()
             return
         cdef imgui.ImU32 color = parse_color(value)
         self._index_to_value[color_index] = color
+        self._mark_changed()
 
     def __iter__(self):
         cdef unique_lock[DCGMutex] m
@@ -1489,11 +1610,9 @@ cdef class ThemeColorImNodes(baseThemeColor):
         if not(self._enabled):
             self._last_push_size.push_back(0)
             return
-        cdef pair[int32_t, imgui.ImU32] element_content
-        for element_content in self._index_to_value:
-            # Note: imgui seems to convert U32 for this. Maybe use float4
-            imnodes.PushColorStyle(<imnodes.ImNodesCol>element_content.first, <imgui.ImU32>element_content.second)
-        self._last_push_size.push_back(<int>self._index_to_value.size())
+        self._update_compiled()
+        push_theme_actions(self._compiled, self._compiled_counts)
+        self._last_push_size.push_back(<int>self._compiled.size())
 
     cdef void push_to_list(self, DCGVector[theme_action]& v) noexcept nogil:
         cdef unique_lock[DCGMutex] m = unique_lock[DCGMutex](self.mutex)
@@ -1527,6 +1646,7 @@ cdef class baseThemeStyle(baseTheme):
         self._dpi = -1.
         self._backend = theme_backends.t_imgui
         self._dpi_scaling = True
+        self._compiled_generation = -1
 
     @property
     def no_scaling(self):
@@ -1544,6 +1664,8 @@ cdef class baseThemeStyle(baseTheme):
         cdef unique_lock[DCGMutex] m
         lock_gil_friendly(m, self.mutex)
         self._dpi_scaling = not(value)
+        self._dpi = -1 # regenerate the scaled dpi array
+        self._mark_changed()
 
     @property
     def no_rounding(self):
@@ -1563,6 +1685,8 @@ cdef class baseThemeStyle(baseTheme):
         cdef unique_lock[DCGMutex] m
         lock_gil_friendly(m, self.mutex)
         self._round_after_scale = not(value)
+        self._dpi = -1 # regenerate the scaled dpi array
+        self._mark_changed()
 
     def __getitem__(self, key):
         cdef unique_lock[DCGMutex] m
@@ -1643,6 +1767,7 @@ cdef class baseThemeStyle(baseTheme):
             # Delete the value
             self._index_to_value.erase(index)
             self._dpi = -1 # regenerate the scaled dpi array
+            self._mark_changed()
             return
         cdef theme_value_info value
         if type == theme_value_types.t_float:
@@ -1676,6 +1801,7 @@ cdef class baseThemeStyle(baseTheme):
         value.should_round = should_round
         self._index_to_value[index] = value
         self._dpi = -1 # regenerate the scaled dpi array
+        self._mark_changed()
 
     cdef void __compute_for_dpi(self) noexcept nogil:
         cdef float dpi = self.context.viewport.global_scale
@@ -1725,46 +1851,28 @@ cdef class baseThemeStyle(baseTheme):
                 action.float2_mask = theme_value_float2_mask.t_full # Not used
             v.push_back(action)
 
+    cdef void _update_compiled(self) noexcept nogil:
+        """
+        Rebuild the flat list of actions if a theme or
+        the dpi changed. Assumes the mutex is held.
+        """
+        cdef int64_t generation = self.context._theme_generation.load()
+        if generation == self._compiled_generation and \
+           self.context.viewport.global_scale == self._dpi:
+            return
+        self._compiled.clear()
+        self.push_to_list(self._compiled) # updates the dpi values
+        sort_theme_actions(self._compiled, self._compiled_counts)
+        self._compiled_generation = generation
+
     cdef void push(self) noexcept nogil:
         self.mutex.lock()
         if not(self._enabled):
             self._last_push_size.push_back(0)
             return
-        if self.context.viewport.global_scale != self._dpi:
-            self.__compute_for_dpi()
-        cdef pair[int32_t, theme_value_info] element_content
-        if self._backend == theme_backends.t_imgui:
-            for element_content in self._index_to_value_for_dpi:
-                if element_content.second.value_type == theme_value_types.t_float:
-                    imgui.PushStyleVar(element_content.first, element_content.second.value.value_float)
-                else: # t_float2
-                    if element_content.second.float2_mask == theme_value_float2_mask.t_left:
-                        imgui.PushStyleVarX(element_content.first, element_content.second.value.value_float2[0])
-                    elif element_content.second.float2_mask == theme_value_float2_mask.t_right:
-                        imgui.PushStyleVarY(element_content.first, element_content.second.value.value_float2[1])
-                    else:
-                        imgui_PushStyleVar2(element_content.first, element_content.second.value.value_float2)
-        elif self._backend == theme_backends.t_implot:
-            for element_content in self._index_to_value_for_dpi:
-                if element_content.second.value_type == theme_value_types.t_float:
-                    implot.PushStyleVar(element_content.first, element_content.second.value.value_float)
-                elif element_content.second.value_type == theme_value_types.t_int:
-                    implot.PushStyleVar(element_content.first, element_content.second.value.value_int)
-                else: # t_float2
-                    if element_content.second.float2_mask == theme_value_float2_mask.t_left:
-                        implot.PushStyleVarX(element_content.first, element_content.second.value.value_float2[0])
-                    elif element_content.second.float2_mask == theme_value_float2_mask.t_right:
-                        implot.PushStyleVarY(element_content.first, element_content.second.value.value_float2[1])
-                    else:
-                        implot_PushStyleVar2(element_content.first, element_content.second.value.value_float2)
-        elif self._backend == theme_backends.t_imnodes:
-            for element_content in self._index_to_value_for_dpi:
-                if element_content.second.value_type == theme_value_types.t_float:
-                    imnodes.PushStyleVar(element_content.first, element_content.second.value.value_float)
-                else:
-                    # TODO: Add VarX/Y when needed
-                    imnodes_PushStyleVar2(element_content.first, element_content.second.value.value_float2)
-        self._last_push_size.push_back(<int>self._index_to_value_for_dpi.size())
+        self._update_compiled()
+        push_theme_actions(self._compiled, self._compiled_counts)
+        self._last_push_size.push_back(<int>self._compiled.size())
 
     cdef void pop(self) noexcept nogil:
         cdef int32_t count = self._last_push_size.back()
@@ -1779,43 +1887,46 @@ cdef class baseThemeStyle(baseTheme):
         self.mutex.unlock()
 
 
+# Names of the values, in the order of their index
+_imgui_style_names = [
+    "Alpha",                    # float     Alpha
+    "DisabledAlpha",            # float     DisabledAlpha
+    "WindowPadding",            # ImVec2    WindowPadding
+    "WindowRounding",           # float     WindowRounding
+    "WindowBorderSize",         # float     WindowBorderSize
+    "WindowMinSize",            # ImVec2    WindowMinSize
+    "WindowTitleAlign",         # ImVec2    WindowTitleAlign
+    "ChildRounding",            # float     ChildRounding
+    "ChildBorderSize",          # float     ChildBorderSize
+    "PopupRounding",            # float     PopupRounding
+    "PopupBorderSize",          # float     PopupBorderSize
+    "FramePadding",             # ImVec2    FramePadding
+    "FrameRounding",            # float     FrameRounding
+    "FrameBorderSize",          # float     FrameBorderSize
+    "ItemSpacing",              # ImVec2    ItemSpacing
+    "ItemInnerSpacing",         # ImVec2    ItemInnerSpacing
+    "IndentSpacing",            # float     IndentSpacing
+    "CellPadding",              # ImVec2    CellPadding
+    "ScrollbarSize",            # float     ScrollbarSize
+    "ScrollbarRounding",        # float     ScrollbarRounding
+    "GrabMinSize",              # float     GrabMinSize
+    "GrabRounding",             # float     GrabRounding
+    "TabRounding",              # float     TabRounding
+    "TabBorderSize",            # float     TabBorderSize
+    "TabBarBorderSize",         # float     TabBarBorderSize
+    "TabBarOverlineSize",       # float     TabBarOverlineSize
+    "TableAngledHeadersAngle",  # float     TableAngledHeadersAngle
+    "TableAngledHeadersTextAlign",# ImVec2  TableAngledHeadersTextAlign
+    "ButtonTextAlign",          # ImVec2    ButtonTextAlign
+    "SelectableTextAlign",      # ImVec2    SelectableTextAlign
+    "SeparatorTextBorderSize",  # float     SeparatorTextBorderSize
+    "SeparatorTextAlign",       # ImVec2    SeparatorTextAlign
+    "SeparatorTextPadding",     # ImVec2    SeparatorTextPadding
+]
+
 cdef class ThemeStyleImGui(baseThemeStyle):
     def __cinit__(self):
-        self._names = [
-            "Alpha",                    # float     Alpha
-            "DisabledAlpha",            # float     DisabledAlpha
-            "WindowPadding",            # ImVec2    WindowPadding
-            "WindowRounding",           # float     WindowRounding
-            "WindowBorderSize",         # float     WindowBorderSize
-            "WindowMinSize",            # ImVec2    WindowMinSize
-            "WindowTitleAlign",         # ImVec2    WindowTitleAlign
-            "ChildRounding",            # float     ChildRounding
-            "ChildBorderSize",          # float     ChildBorderSize
-            "PopupRounding",            # float     PopupRounding
-            "PopupBorderSize",          # float     PopupBorderSize
-            "FramePadding",             # ImVec2    FramePadding
-            "FrameRounding",            # float     FrameRounding
-            "FrameBorderSize",          # float     FrameBorderSize
-            "ItemSpacing",              # ImVec2    ItemSpacing
-            "ItemInnerSpacing",         # ImVec2    ItemInnerSpacing
-            "IndentSpacing",            # float     IndentSpacing
-            "CellPadding",              # ImVec2    CellPadding
-            "ScrollbarSize",            # float     ScrollbarSize
-            "ScrollbarRounding",        # float     ScrollbarRounding
-            "GrabMinSize",              # float     GrabMinSize
-            "GrabRounding",             # float     GrabRounding
-            "TabRounding",              # float     TabRounding
-            "TabBorderSize",            # float     TabBorderSize
-            "TabBarBorderSize",         # float     TabBarBorderSize
-            "TabBarOverlineSize",       # float     TabBarOverlineSize
-            "TableAngledHeadersAngle",  # float     TableAngledHeadersAngle
-            "TableAngledHeadersTextAlign",# ImVec2  TableAngledHeadersTextAlign
-            "ButtonTextAlign",          # ImVec2    ButtonTextAlign
-            "SelectableTextAlign",      # ImVec2    SelectableTextAlign
-            "SeparatorTextBorderSize",  # float     SeparatorTextBorderSize
-            "SeparatorTextAlign",       # ImVec2    SeparatorTextAlign
-            "SeparatorTextPadding",     # ImVec2    SeparatorTextPadding
-        ]
+        self._names = _imgui_style_names
         self._backend = theme_backends.t_imgui
 
     @property
@@ -2323,37 +2434,40 @@ cdef class ThemeStyleImGui(baseThemeStyle):
             raise KeyError(f"Style {style_name} not found")
 
 
+# Names of the values, in the order of their index
+_implot_style_names = [
+    "LineWeight",         # float,  plot item line weight in pixels
+    "Marker",             # int,    marker specification
+    "MarkerSize",         # float,  marker size in pixels (roughly the marker's "radius")
+    "MarkerWeight",       # float,  plot outline weight of markers in pixels
+    "FillAlpha",          # float,  alpha modifier applied to all plot item fills
+    "ErrorBarSize",       # float,  error bar whisker width in pixels
+    "ErrorBarWeight",     # float,  error bar whisker weight in pixels
+    "DigitalBitHeight",   # float,  digital channels bit height (at 1) in pixels
+    "DigitalBitGap",      # float,  digital channels bit padding gap in pixels
+    "PlotBorderSize",     # float,  thickness of border around plot area
+    "MinorAlpha",         # float,  alpha multiplier applied to minor axis grid lines
+    "MajorTickLen",       # ImVec2, major tick lengths for X and Y axes
+    "MinorTickLen",       # ImVec2, minor tick lengths for X and Y axes
+    "MajorTickSize",      # ImVec2, line thickness of major ticks
+    "MinorTickSize",      # ImVec2, line thickness of minor ticks
+    "MajorGridSize",      # ImVec2, line thickness of major grid lines
+    "MinorGridSize",      # ImVec2, line thickness of minor grid lines
+    "PlotPadding",        # ImVec2, padding between widget frame and plot area, labels, or outside legends (i.e. main padding)
+    "LabelPadding",       # ImVec2, padding between axes labels, tick labels, and plot edge
+    "LegendPadding",      # ImVec2, legend padding from plot edges
+    "LegendInnerPadding", # ImVec2, legend inner padding from legend edges
+    "LegendSpacing",      # ImVec2, spacing between legend entries
+    "MousePosPadding",    # ImVec2, padding between plot edge and interior info text
+    "AnnotationPadding",  # ImVec2, text padding around annotation labels
+    "FitPadding",         # ImVec2, additional fit padding as a percentage of the fit extents (e.g. ImVec2(0.1f,0.1f) adds 10% to the fit extents of X and Y)
+    "PlotDefaultSize",    # ImVec2, default size used when ImVec2(0,0) is passed to BeginPlot
+    "PlotMinSize",        # ImVec2, minimum size plot frame can be when shrunk
+]
+
 cdef class ThemeStyleImPlot(baseThemeStyle):
     def __cinit__(self):
-        self._names = [
-            "LineWeight",         # float,  plot item line weight in pixels
-            "Marker",             # int,    marker specification
-            "MarkerSize",         # float,  marker size in pixels (roughly the marker's "radius")
-            "MarkerWeight",       # float,  plot outline weight of markers in pixels
-            "FillAlpha",          # float,  alpha modifier applied to all plot item fills
-            "ErrorBarSize",       # float,  error bar whisker width in pixels
-            "ErrorBarWeight",     # float,  error bar whisker weight in pixels
-            "DigitalBitHeight",   # float,  digital channels bit height (at 1) in pixels
-            "DigitalBitGap",      # float,  digital channels bit padding gap in pixels
-            "PlotBorderSize",     # float,  thickness of border around plot area
-            "MinorAlpha",         # float,  alpha multiplier applied to minor axis grid lines
-            "MajorTickLen",       # ImVec2, major tick lengths for X and Y axes
-            "MinorTickLen",       # ImVec2, minor tick lengths for X and Y axes
-            "MajorTickSize",      # ImVec2, line thickness of major ticks
-            "MinorTickSize",      # ImVec2, line thickness of minor ticks
-            "MajorGridSize",      # ImVec2, line thickness of major grid lines
-            "MinorGridSize",      # ImVec2, line thickness of minor grid lines
-            "PlotPadding",        # ImVec2, padding between widget frame and plot area, labels, or outside legends (i.e. main padding)
-            "LabelPadding",       # ImVec2, padding between axes labels, tick labels, and plot edge
-            "LegendPadding",      # ImVec2, legend padding from plot edges
-            "LegendInnerPadding", # ImVec2, legend inner padding from legend edges
-            "LegendSpacing",      # ImVec2, spacing between legend entries
-            "MousePosPadding",    # ImVec2, padding between plot edge and interior info text
-            "AnnotationPadding",  # ImVec2, text padding around annotation labels
-            "FitPadding",         # ImVec2, additional fit padding as a percentage of the fit extents (e.g. ImVec2(0.1f,0.1f) adds 10% to the fit extents of X and Y)
-            "PlotDefaultSize",    # ImVec2, default size used when ImVec2(0,0) is passed to BeginPlot
-            "PlotMinSize",        # ImVec2, minimum size plot frame can be when shrunk
-        ]
+        self._names = _implot_style_names
         self._backend = theme_backends.t_implot
 
     @property
@@ -3018,18 +3132,92 @@ cdef class ThemeList(baseTheme):
     """
     def __cinit__(self):
         self.can_have_theme_child = True
+        self._compiled_generation = -1
+        self._compiled_dpi = -1.
+        self._compilable = False
+
+    cdef bint _update_compiled(self) noexcept nogil:
+        """
+        Compile the actions of the children (and nested
+        theme lists) into a single flat list, if a theme
+        or the dpi changed.
+
+        Returns False if a child depends on the rendering
+        state (ThemeListWithCondition, ThemeStopCondition),
+        in which case the children must be pushed one by one.
+        Assumes the mutex is held.
+        """
+        cdef int64_t generation = self.context._theme_generation.load()
+        cdef float dpi = self.context.viewport.global_scale
+        if generation == self._compiled_generation and \
+           dpi == self._compiled_dpi:
+            return self._compilable
+        self._compiled.clear()
+        self._compilable = True
+        cdef PyObject *child = NULL
+        cdef int32_t i
+        if self.last_theme_child is not None:
+            child = <PyObject*> self.last_theme_child
+            while (<baseItem>child).prev_sibling is not None:
+                child = <PyObject *>(<baseItem>child).prev_sibling
+        while child != NULL and (<baseItem>child) is not None:
+            if (<baseTheme>child)._is_conditional:
+                self._compilable = False
+                break
+            if (<baseItem>child).can_have_theme_child:
+                # Nested ThemeList
+                (<ThemeList>child).mutex.lock()
+                if (<ThemeList>child)._update_compiled():
+                    for i in range(<int32_t>(<ThemeList>child)._compiled.size()):
+                        self._compiled.push_back((<ThemeList>child)._compiled[i])
+                else:
+                    self._compilable = False
+                (<ThemeList>child).mutex.unlock()
+                if not(self._compilable):
+                    break
+            else:
+                (<baseTheme>child).push_to_list(self._compiled)
+            child = <PyObject *>(<baseItem>child).next_sibling
+        if self._compilable:
+            sort_theme_actions(self._compiled, self._compiled_counts)
+        else:
+            self._compiled.clear()
+        self._compiled_generation = generation
+        self._compiled_dpi = dpi
+        return self._compilable
 
     cdef void push(self) noexcept nogil:
         self.mutex.lock()
-        push_theme_children(self)
+        cdef int32_t i
+        if not(self._update_compiled()):
+            push_theme_children(self)
+            self._last_push_size.push_back(-1)
+            return
+        push_theme_actions(self._compiled, self._compiled_counts)
+        for i in range(6):
+            self._last_push_size.push_back(self._compiled_counts[i])
 
     cdef void pop(self) noexcept nogil:
-        pop_theme_children(self)
+        cdef int32_t[6] counts
+        cdef int32_t i
+        if self._last_push_size.back() < 0:
+            self._last_push_size.pop_back()
+            pop_theme_children(self)
+        else:
+            for i in range(5, -1, -1):
+                counts[i] = self._last_push_size.back()
+                self._last_push_size.pop_back()
+            pop_theme_actions(counts)
         self.mutex.unlock()
     
     cdef void push_to_list(self, DCGVector[theme_action]& v) noexcept nogil:
         cdef unique_lock[DCGMutex] m = unique_lock[DCGMutex](self.mutex)
-        push_to_list_children(self, v)
+        cdef int32_t i
+        if self._update_compiled():
+            for i in range(<int32_t>self._compiled.size()):
+                v.push_back(self._compiled[i])
+        else:
+            push_to_list_children(self, v)
 
 
 cdef class ThemeListWithCondition(baseTheme):
@@ -3052,6 +3240,7 @@ cdef class ThemeListWithCondition(baseTheme):
     """
     def __cinit__(self):
         self.can_have_theme_child = True
+        self._is_conditional = True
         self._activation_condition_enabled = ThemeEnablers.ANY
         self._activation_condition_category = ThemeCategories.t_any
 
@@ -3183,6 +3372,9 @@ cdef class ThemeStopCondition(baseTheme):
 
     Does not work inside a ThemeListWithCondition
     """
+    def __cinit__(self):
+        self._is_conditional = True
+
     cdef void push(self) noexcept nogil:
         self.mutex.lock()
         self._start_pending_theme_actions_backup.push_back(self.context.viewport.start_pending_theme_actions)
@@ -3195,110 +3387,289 @@ cdef class ThemeStopCondition(baseTheme):
     cdef void push_to_list(self, DCGVector[theme_action]& v) noexcept nogil:
         return
 
-'''
-cdef object extract_theme_value(baseTheme theme, str name, type target_class):
-    """
-    Helper function that takes a baseTheme and walks recursively to retrieve the value
-    attached to the target name/class if this baseTheme is pushed. Returns None if the
-    target name/class is not present at all.
-    """
-    cdef unique_lock[DCGMutex] m
-    lock_gil_friendly(m, theme.mutex)
-    if isinstance(theme, ThemeListWithCondition):
-        return None # handled in another function
-    if isinstance(theme, target_class):
-        try:
-            return getattr(theme, name)
-        except AttributeError:
-            pass
-    cdef PyObject *child
-    if theme.can_have_theme_child and theme.last_theme_child is not None:
-        child = <PyObject*> theme.last_theme_child
-        while (<baseItem>child) is not None:
-            value = extract_theme_value(<baseTheme>child, name, target_class)
-            if value is not None:
-                return value
-            child = <PyObject *>(<baseItem>child).prev_sibling
-    return None
-
-
-# UNFINISHED
-cdef object apply_theme_conditions(string name, DCGVector[theme_action] &current_theme_conditions, baseItem item, type target_class):
+
+cdef inline int64_t theme_action_key(const theme_action& action) noexcept nogil:
+    return (<int64_t>action.backend << 40) | \
+           (<int64_t>action.type << 32) | \
+           <int64_t><uint32_t>action.theme_index
+
+cdef inline bint theme_action_matches(const theme_action& action,
+                                      ThemeEnablers enabled,
+                                      ThemeCategories category) noexcept nogil:
+    """Same test as Viewport.push_pending_theme_actions_on_subset"""
+    if action.activation_condition_enabled != ThemeEnablers.ANY and \
+       enabled != ThemeEnablers.ANY and \
+       action.activation_condition_enabled != enabled:
+        return False
+    if action.activation_condition_category != category and \
+       action.activation_condition_category != ThemeCategories.t_any:
+        return False
+    return True
+
+
+cdef class _ThemeState:
     """
-    Helper function that applies the theme conditions to the item and returns the value if conditions are met.
+    Theme state seen by an item and its children during
+    rendering: the values pushed by the item and its parents,
+    and the pending conditional actions.
     """
-    cdef theme_action action
-    cdef theme_backends backend
-    cdef theme_types type
-    if not(isinstance(item, uiItem)):
-        return None
-    if target_class is ThemeColorImGui or target_class is ThemeStyleImGui:
-        backend = theme_backends.t_imgui
-    elif target_class is ThemeColorImPlot or target_class is ThemeStyleImPlot:
-        backend = theme_backends.t_implot
-    else:
-        raise TypeError("target_class must be a valid subclass of baseTheme")
-    if target_class is ThemeColorImGui or target_class is ThemeColorImPlot:
-        type = theme_types.t_color
-    elif target_class is ThemeStyleImGui or target_class is ThemeStyleImPlot:
-        type = theme_types.t_style
-    item_enabled = getattr(item, "enabled", True)
-    cdef int32_t theme_index = target_class.get_internal_index(name)
-    for action in current_theme_conditions:
-        if action.backend != backend:
-            continue
-        if action.type != type:
-            continue
-        if action.activation_condition_category != ThemeCategories.t_any and \
-           action.activation_condition_category != item._theme_condition_category:
-            continue
-        if action.activation_condition_enabled != ThemeEnablers.ANY and \
-           action.activation_condition_enabled != item._theme_condition_enabled:
-            continue
-        if type == theme_types.t_color:
-            if action.theme_index == theme_index:
-                return action.value.value_u32
-        elif type == theme_types.t_style:
-            if action.theme_index == theme_index:
-                if action.value_type == theme_value_types.t_int:
-                    return action.value.value_int
-                elif action.value_type == theme_value_types.t_float:
-                    return action.value.value_float
-                elif action.value_type == theme_value_types.t_float2:
-                    if action.float2_mask == theme_value_float2_mask.t_left:
-                        return (action.value.value_float2[0], None)
-                    elif action.float2_mask == theme_value_float2_mask.t_right:
-                        return (None, action.value.value_float2[1])
-                    else:
-                        return action.value.value_float2
-                elif action.value_type == theme_value_types.t_u32:
-                    return action.value.value_u32
-    return None
+    cdef int64_t generation
+    cdef float dpi
+    # (item uuid, theme uuid, enabled condition) from the root
+    cdef DCGVector[int64_t] chain
+    cdef unordered_map[int64_t, theme_action] values
+    cdef DCGVector[theme_action] pending
+    cdef int32_t start_pending
+
+    cdef void apply(self, const theme_action& action) noexcept nogil:
+        """Equivalent of pushing the action on the imgui stacks"""
+        cdef int64_t key = theme_action_key(action)
+        cdef unordered_map[int64_t, theme_action].iterator it
+        if action.value_type != theme_value_types.t_float2 or \
+           action.float2_mask == theme_value_float2_mask.t_full:
+            self.values[key] = action
+            return
+        # PushStyleVarX/PushStyleVarY only replace one component
+        it = self.values.find(key)
+        if it == self.values.end() or \
+           dereference(it).second.value_type != theme_value_types.t_float2:
+            self.values[key] = action
+            return
+        if action.float2_mask == theme_value_float2_mask.t_left:
+            dereference(it).second.value.value_float2[0] = action.value.value_float2[0]
+            if dereference(it).second.float2_mask == theme_value_float2_mask.t_right:
+                dereference(it).second.float2_mask = theme_value_float2_mask.t_full
+        else:
+            dereference(it).second.value.value_float2[1] = action.value.value_float2[1]
+            if dereference(it).second.float2_mask == theme_value_float2_mask.t_left:
+                dereference(it).second.float2_mask = theme_value_float2_mask.t_full
 
+    cdef void apply_pending(self, int32_t start, int32_t end,
+                            ThemeEnablers enabled,
+                            ThemeCategories category) noexcept nogil:
+        cdef int32_t i
+        for i in range(start, end):
+            if theme_action_matches(self.pending[i], enabled, category):
+                self.apply(self.pending[i])
+
+    cdef void apply_theme(self, baseTheme theme,
+                          ThemeEnablers enabled,
+                          ThemeCategories category):
+        """Equivalent of theme.push() for an item with these conditions"""
+        cdef unique_lock[DCGMutex] m
+        lock_gil_friendly(m, theme.mutex)
+        cdef DCGVector[theme_action] actions
+        cdef PyObject *child
+        cdef int32_t i, prev_size
+        if isinstance(theme, ThemeStopCondition):
+            if theme._enabled:
+                self.start_pending = <int32_t>self.pending.size()
+            return
+        if isinstance(theme, ThemeListWithCondition):
+            if not(theme._enabled):
+                return
+            prev_size = <int32_t>self.pending.size()
+            theme.push_to_list(self.pending)
+            self.apply_pending(prev_size, <int32_t>self.pending.size(),
+                               enabled, category)
+            return
+        if isinstance(theme, ThemeList):
+            if not((<ThemeList>theme)._update_compiled()):
+                child = <PyObject*> theme.last_theme_child
+                while (<baseItem>child).prev_sibling is not None:
+                    child = <PyObject *>(<baseItem>child).prev_sibling
+                while (<baseItem>child) is not None:
+                    self.apply_theme(<baseTheme>child, enabled, category)
+                    child = <PyObject *>(<baseItem>child).next_sibling
+                return
+            for i in range(<int32_t>(<ThemeList>theme)._compiled.size()):
+                self.apply((<ThemeList>theme)._compiled[i])
+            return
+        theme.push_to_list(actions)
+        for i in range(<int32_t>actions.size()):
+            self.apply(actions[i])
 
-cdef void update_theme_conditions(baseTheme theme, DCGVector[theme_action] &current_theme_conditions):
+    cdef object get_value(self, int64_t key):
+        cdef unordered_map[int64_t, theme_action].iterator it = self.values.find(key)
+        if it == self.values.end():
+            return None
+        cdef theme_action action = dereference(it).second
+        if action.value_type == theme_value_types.t_int:
+            return action.value.value_int
+        elif action.value_type == theme_value_types.t_float:
+            return action.value.value_float
+        elif action.value_type == theme_value_types.t_float2:
+            if action.float2_mask == theme_value_float2_mask.t_left:
+                return (action.value.value_float2[0], None)
+            elif action.float2_mask == theme_value_float2_mask.t_right:
+                return (None, action.value.value_float2[1])
+            return (action.value.value_float2[0], action.value.value_float2[1])
+        return action.value.value_u32
+
+
+# item -> _ThemeState
+_theme_states = weakref.WeakKeyDictionary()
+# name table -> {name: index}
+_theme_indices = dict()
+
+# Default styles scaled by the global scale in Viewport.render_frame,
+# and whether the scaled value is rounded.
+_imgui_scaled_style_defaults = {
+    "WindowPadding": True,
+    "WindowMinSize": True,
+    "FramePadding": True,
+    "ItemSpacing": True,
+    "ItemInnerSpacing": True,
+    "CellPadding": True,
+    "IndentSpacing": True,
+    "ScrollbarSize": True,
+    "ScrollbarRounding": True,
+    "GrabMinSize": True,
+    "TabRounding": True,
+    "TabBarOverlineSize": True,
+    "SeparatorTextPadding": True
+}
+
+_implot_scaled_style_defaults = {
+    "LineWeight": False,
+    "MarkerSize": False,
+    "MarkerWeight": False,
+    "ErrorBarSize": True,
+    "ErrorBarWeight": False,
+    "DigitalBitHeight": True,
+    "DigitalBitGap": True,
+    "MajorTickLen": False,
+    "MinorTickLen": False,
+    "MajorTickSize": False,
+    "MinorTickSize": False,
+    "MajorGridSize": False,
+    "MinorGridSize": False,
+    "PlotPadding": True,
+    "LabelPadding": True,
+    "LegendPadding": True,
+    "LegendInnerPadding": True,
+    "LegendSpacing": True,
+    "MousePosPadding": True,
+    "AnnotationPadding": True,
+    "PlotDefaultSize": True,
+    "PlotMinSize": True
+}
+
+cdef object scale_style_default(dict scaled_defaults, str name, value, float dpi):
+    """Default style value as set for the global scale dpi"""
+    should_round = scaled_defaults.get(name, None)
+    if should_round is None:
+        return value
+    if isinstance(value, tuple):
+        if should_round:
+            return (round(<double>value[0] * dpi), round(<double>value[1] * dpi))
+        return (value[0] * dpi, value[1] * dpi)
+    if should_round:
+        return round(<double>value * dpi)
+    return value * dpi
+
+cdef _ThemeState resolve_theme_state(baseItem item):
     """
-    Helper function that updates the list of theme conditions based on the current theme.
+    Returns the theme state of the item, reusing the states
+    cached for the item and its parents if neither their theme,
+    their position in the tree nor any theme changed since.
     """
-    if theme is None:
-        return current_theme_conditions
-    if isinstance(theme, ThemeStopCondition):
-        current_theme_conditions.clear()
-    if isinstance(theme, ThemeListWithCondition):
-        theme.push_to_list(current_theme_conditions)
-    if theme.can_have_theme_child and theme.last_theme_child is not None:
-        cdef PyObject *child = <PyObject*> theme.last_theme_child
-        # Go back to the first child
-        while (<baseItem>child).prev_sibling is not None:
-            child = <PyObject *>(<baseItem>child).prev_sibling
-        while (<baseItem>child) is not None:
-            update_theme_conditions(<baseTheme>child, current_theme_conditions)
-            child = <PyObject *>(<baseItem>child).next_sibling
-    return current_theme_conditions
-
+    cdef Context context = item.context
+    cdef int64_t generation = context._theme_generation.load()
+    cdef float dpi = context.viewport.global_scale
+    cdef unique_lock[DCGMutex] m
+    cdef list chain = []
+    cdef list themes = []
+    cdef DCGVector[int64_t] key
+    cdef DCGVector[int32_t] conditions
+    cdef baseItem element = item
+    cdef baseItem parent
+    cdef baseTheme theme
+    cdef ThemeEnablers enabled
+    cdef ThemeCategories category
+    cdef int32_t i, j, depth
+    # Retrieve the parents, from the item to the root
+    while element is not None:
+        lock_gil_friendly(m, element.mutex)
+        theme = None
+        # Conditions passed to push_pending_theme_actions by draw()
+        enabled = ThemeEnablers.ANY
+        category = ThemeCategories.t_any
+        if isinstance(element, uiItem):
+            theme = (<uiItem>element)._theme
+            enabled = (<uiItem>element)._theme_condition_enabled
+            category = (<uiItem>element)._theme_condition_category
+        elif isinstance(element, plotElement):
+            theme = (<plotElement>element)._theme
+            category = ThemeCategories.t_plot
+        elif isinstance(element, Viewport):
+            theme = (<Viewport>element)._theme
+            category = ThemeCategories.t_window
+        chain.append(element)
+        themes.append(theme)
+        key.push_back(element.uuid)
+        key.push_back(theme.uuid if theme is not None else -1)
+        key.push_back(<int64_t>enabled)
+        conditions.push_back(<int32_t>enabled)
+        conditions.push_back(<int32_t>category)
+        parent = element.parent
+        m.unlock()
+        element = parent
+    depth = len(chain)
+    # Key of the chain, starting from the root
+    cdef DCGVector[int64_t] root_key
+    for i in range(depth-1, -1, -1):
+        for j in range(3):
+            root_key.push_back(key[3*i+j])
+
+    # Find the deepest parent with a valid state
+    cdef _ThemeState state = None
+    cdef _ThemeState parent_state = None
+    cdef bint valid
+    cdef int32_t first = depth
+    for i in range(depth):
+        # i-th element starting from the item
+        state = _theme_states.get(chain[i], None)
+        if state is None or state.generation != generation or \
+           state.dpi != dpi or <int32_t>state.chain.size() != 3*(depth-i):
+            continue
+        valid = True
+        for j in range(3*(depth-i)):
+            if state.chain[j] != root_key[j]:
+                valid = False
+                break
+        if valid:
+            if i == 0:
+                return state
+            parent_state = state
+            first = i
+            break
+
+    # Apply the themes down to the item
+    for i in range(first-1, -1, -1):
+        state = _ThemeState.__new__(_ThemeState)
+        state.generation = generation
+        state.dpi = dpi
+        for j in range(3*(depth-i)):
+            state.chain.push_back(root_key[j])
+        if parent_state is not None:
+            state.values = parent_state.values
+            state.pending = parent_state.pending
+            state.start_pending = parent_state.start_pending
+        enabled = <ThemeEnablers>conditions[2*i]
+        category = <ThemeCategories>conditions[2*i+1]
+        # Mimic draw(): pending actions of the parents,
+        # then the item theme
+        if isinstance(chain[i], (uiItem, plotElement, Viewport)):
+            state.apply_pending(state.start_pending,
+                                <int32_t>state.pending.size(),
+                                enabled, category)
+        if themes[i] is not None:
+            state.apply_theme(<baseTheme>themes[i], enabled, category)
+        _theme_states[chain[i]] = state
+        parent_state = state
+    return state
 
-More work needed to support theme conditions,
-but also apply scaling
 def resolve_theme(baseItem item, str name, type target_class) -> object:
     """
     Function that given a baseItem, a style/color name, and a target style or color class,
@@ -3306,48 +3677,65 @@ def resolve_theme(baseItem item, str name, type target_class) -> object:
     returns the default value.
 
     It can be used outside rendering to determines the style value
-    that would be applied to an item during rendering.
-
-    Note: currently does not work with ThemeListWithCondition
+    that would be applied to an item during rendering. The themes
+    bound to the item and its parents are applied as during rendering,
+    including ThemeListWithCondition and ThemeStopCondition.
+    Style values, whether themed or default, are returned scaled by
+    the global scale. Colors are returned as (r, g, b, a) tuples of
+    floats in the [0, 1] range, as get_default.
+
+    The result of the theme resolution is cached for the item and
+    its parents, until a theme is modified, or the item is moved.
+    Thus querying many values, or many items of a same parent, is cheap.
     """
-    if not issubclass(target_class, baseTheme):
-        raise TypeError("target_class must be a subclass of baseTheme")
-    parent_tree = [item]
-    item_parent = item.parent
-    while item_parent is not None:
-        parent_tree.append(item_parent)
-        item_parent = item_parent.parent
-    parent_tree = parent_tree[::-1]
-    # TODO: for each item in parent_tree, build the list
-    # of applicable ThemeListWithCondition. If a ThemeStopCondition
-    # is found, reset the list for the next item
-    # Starting from the top-most parent, iteratively apply
-    # the theme lists with conditions, (stop if a ThemeStopCondition
-    # is found), and then apply the theme list without conditions
-    # Deduce the final value for the target name
-    cdef DCGVector[theme_action] current_theme_conditions = DCGVector[theme_action]()
-    current_target_value = None
-    for item in parent_tree:
-        theme = item.theme
-        # Apply theme conditions that should apply for the item
-        #value = apply_theme_conditions(name, current_theme_conditions, item, target_class)
-        #if value is not None:
-        #        current_target_value = value
-        # Apply the theme value
-        if theme is not None:
-            value = extract_theme_value(theme, name, target_class)
-            if value is not None:
-                current_target_value = value
-            # Append conditions, reset when a ThemeStopCondition is met
-            update_theme_conditions(theme, current_theme_conditions)
-    try:
-        if current_target_value is None:
-            return target_class.get_default(name)
-    except KeyError:
+    cdef int32_t backend
+    cdef int32_t theme_type
+    cdef list names
+    cdef dict scaled_defaults = None
+    if issubclass(target_class, ThemeColorImGui):
+        (backend, theme_type) = (theme_backends.t_imgui, theme_types.t_color)
+        names = _imgui_color_names
+    elif issubclass(target_class, ThemeColorImPlot):
+        (backend, theme_type) = (theme_backends.t_implot, theme_types.t_color)
+        names = _implot_color_names
+    elif issubclass(target_class, ThemeStyleImGui):
+        (backend, theme_type) = (theme_backends.t_imgui, theme_types.t_style)
+        names = _imgui_style_names
+        scaled_defaults = _imgui_scaled_style_defaults
+    elif issubclass(target_class, ThemeStyleImPlot):
+        (backend, theme_type) = (theme_backends.t_implot, theme_types.t_style)
+        names = _implot_style_names
+        scaled_defaults = _implot_scaled_style_defaults
+    else:
+        raise TypeError("target_class must be a theme color or style class")
+    indices = _theme_indices.get(id(names), None)
+    if indices is None:
+        indices = {n: i for (i, n) in enumerate(names)}
+        _theme_indices[id(names)] = indices
+    index = indices.get(name, None)
+    if index is None:
         raise KeyError(f"Style {name} not found")
-    # catch if the class doesn't have a get_default
-    except AttributeError:
-        raise TypeError(f"{target_class} does not have a get_default method")
-    return current_target_value
 
-'''
\ No newline at end of file
+    cdef theme_action action
+    action.backend = <theme_backends>backend
+    action.type = <theme_types>theme_type
+    action.theme_index = <int32_t>index
+    cdef _ThemeState state = resolve_theme_state(item)
+    value = state.get_value(theme_action_key(action))
+    cdef float[4] color
+    if theme_type == theme_types.t_color:
+        if value is None:
+            return target_class.get_default(name)
+        unparse_color(color, <uint32_t>value)
+        return tuple(color)
+    if value is not None and \
+       not(isinstance(value, tuple) and (value[0] is None or value[1] is None)):
+        return value
+    default = scale_style_default(scaled_defaults, name,
+                                  target_class.get_default(name),
+                                  state.dpi)
+    if value is None:
+        return default
+    # Only one of the components is set
+    return (default[0] if value[0] is None else value[0],
+            default[1] if value[1] is None else value[1])
@@ -9,6 +9,10 @@ class PlotCandleStick(dcg.DrawInPlot):
     See the source code for how to make
     a custom version with more interactions.
 
+    This version creates several items per candle.
+    For large series, prefer the native
+    dcg.PlotCandleStick.
+
     Args:
         dates (np.ndarray): x-axis values
         opens (np.ndarray): open values
@@ -26,7 +26,7 @@ from libc.math cimport INFINITY
 
 from .core cimport baseHandler, drawingItem, uiItem, \
     lock_gil_friendly, read_point, clear_obj_vector, append_obj_vector, \
-    draw_drawing_children, draw_menubar_children, \
+    draw_drawing_children, draw_drawing_children_culled, draw_menubar_children, \
     draw_ui_children, button_area, \
     draw_tab_children, Callback, \
     Context, read_vec4, read_point, \
@@ -36,6 +36,7 @@ from .imgui_types cimport unparse_color, parse_color, Vec2ImVec2, \
     Vec4ImVec4, ImVec2Vec2, ImVec4Vec4, ButtonDirection
 from .types cimport *
 
+from .core import _culling_property, _culling_margin_property
 import numpy as np
 cimport numpy as cnp
 cnp.import_array()
@@ -625,6 +626,9 @@ cdef class DrawInWindow(uiItem):
         lock_gil_friendly(m, self.mutex)
         self.button = value
 
+    culling = _culling_property
+    culling_margin = _culling_margin_property
+
     @property
     def frame(self):
         """
@@ -812,7 +816,10 @@ cdef class DrawInWindow(uiItem):
                                         starty + clip_height),
                            True)
 
-        draw_drawing_children(self, drawlist)
+        if self._culling_children:
+            draw_drawing_children_culled(self, drawlist)
+        else:
+            draw_drawing_children(self, drawlist)
 
         imgui.PopClipRect()
 
@@ -1061,6 +1068,16 @@ cdef class Button(uiItem):
         return activated
 
 
+cdef inline void include_selected_item(imgui.ImGuiListClipper* clipper,
+                                       DCGVector[DCGString]& items,
+                                       DCGString& value) noexcept nogil:
+    """Make the clipper submit the item equal to value"""
+    cdef int32_t i
+    for i in range(<int>items.size()):
+        if items[i] == value:
+            clipper.IncludeItemByIndex(i)
+            return
+
 cdef class Combo(uiItem):
     def __cinit__(self):
         self._theme_condition_category = ThemeCategories.t_combo
@@ -1239,22 +1256,31 @@ cdef class Combo(uiItem):
         cdef bool selected_backup
         # we push an ID because we didn't append ###uuid to the items
         
+        cdef imgui.ImGuiListClipper clipper
         # TODO: there are nice ImGuiSelectableFlags to add in the future
         if open:
             imgui.PushID(self.uuid)
             if self._enabled:
-                for i in range(<int>self._items.size()):
-                    selected = self._items[i] == current_value
-                    selected_backup = selected
-                    pressed |= imgui.Selectable(self._items[i].c_str(),
-                                                &selected,
-                                                imgui.ImGuiSelectableFlags_None,
-                                                Vec2ImVec2(self.scaled_requested_size()))
-                    if selected:
-                        imgui.SetItemDefaultFocus()
-                    if selected and selected != selected_backup:
-                        changed = True
-                        SharedStr.set(<SharedStr>self._value, self._items[i])
+                # Only the visible items are submitted
+                clipper.Begin(<int>self._items.size(), -1.)
+                if imgui.IsWindowAppearing():
+                    # The selected item must be submitted for
+                    # SetItemDefaultFocus to scroll to it
+                    include_selected_item(&clipper, self._items, current_value)
+                while clipper.Step():
+                    for i in range(clipper.DisplayStart, clipper.DisplayEnd):
+                        selected = self._items[i] == current_value
+                        selected_backup = selected
+                        pressed |= imgui.Selectable(self._items[i].c_str(),
+                                                    &selected,
+                                                    imgui.ImGuiSelectableFlags_None,
+                                                    Vec2ImVec2(self.scaled_requested_size()))
+                        if selected:
+                            imgui.SetItemDefaultFocus()
+                        if selected and selected != selected_backup:
+                            changed = True
+                            SharedStr.set(<SharedStr>self._value, self._items[i])
+                clipper.End()
             else:
                 # TODO: test
                 selected = True
@@ -1833,8 +1859,8 @@ cdef class ListBox(uiItem):
         cdef bool selected_backup
         # we push an ID because we didn't append ###uuid to the items
         
+        cdef imgui.ImGuiListClipper clipper
         # TODO: there are nice ImGuiSelectableFlags to add in the future
-        # TODO: use clipper
         if visible:
             # ListBox is simply a ChildWindow wrapped in a group
             self.state.cur.hovered = imgui.IsWindowHovered(imgui.ImGuiHoveredFlags_None)
@@ -1843,20 +1869,26 @@ cdef class ListBox(uiItem):
             update_current_mouse_states(self.state)
             imgui.PushID(self.uuid)
             if self._enabled:
-                for i in range(<int>self._items.size()):
-                    imgui.PushID(i)
-                    selected = self._items[i] == current_value
-                    selected_backup = selected
-                    pressed |= imgui.Selectable(self._items[i].c_str(),
-                                                &selected,
-                                                imgui.ImGuiSelectableFlags_None,
-                                                Vec2ImVec2(self.scaled_requested_size()))
-                    if selected:
-                        imgui.SetItemDefaultFocus()
-                    if selected and selected != selected_backup:
-                        changed = True
-                        SharedStr.set(<SharedStr>self._value, self._items[i])
-                    imgui.PopID()
+                # Only the visible items are submitted
+                clipper.Begin(<int>self._items.size(), -1.)
+                if imgui.IsWindowAppearing():
+                    include_selected_item(&clipper, self._items, current_value)
+                while clipper.Step():
+                    for i in range(clipper.DisplayStart, clipper.DisplayEnd):
+                        imgui.PushID(i)
+                        selected = self._items[i] == current_value
+                        selected_backup = selected
+                        pressed |= imgui.Selectable(self._items[i].c_str(),
+                                                    &selected,
+                                                    imgui.ImGuiSelectableFlags_None,
+                                                    Vec2ImVec2(self.scaled_requested_size()))
+                        if selected:
+                            imgui.SetItemDefaultFocus()
+                        if selected and selected != selected_backup:
+                            changed = True
+                            SharedStr.set(<SharedStr>self._value, self._items[i])
+                        imgui.PopID()
+                clipper.End()
             else:
                 # TODO: test
                 selected = True
@@ -3499,11 +3531,16 @@ cdef class Image(uiItem):
         if size.y == 0.:
             size.y = self._texture.height * (self.context.viewport.global_scale if self._dpi_scaling else 1.)
 
+        # Restrict to the region of the texture (AtlasTexture)
+        cdef float[2] uv_offset = self._texture._uv_offset
+        cdef float[2] uv_scale = self._texture._uv_scale
         imgui.PushID(self.uuid)
         imgui.Image(<imgui.ImTextureID>self._texture.allocated_texture,
                     Vec2ImVec2(size),
-                    imgui.ImVec2(self._uv[0], self._uv[1]),
-                    imgui.ImVec2(self._uv[2], self._uv[3]),
+                    imgui.ImVec2(uv_offset[0] + uv_scale[0] * self._uv[0],
+                                 uv_offset[1] + uv_scale[1] * self._uv[1]),
+                    imgui.ImVec2(uv_offset[0] + uv_scale[0] * self._uv[2],
+                                 uv_offset[1] + uv_scale[1] * self._uv[3]),
                     imgui.ColorConvertU32ToFloat4(self._color_multiplier),
                     imgui.ColorConvertU32ToFloat4(self._border_color))
         imgui.PopID()
@@ -3593,6 +3630,9 @@ cdef class ImageButton(uiItem):
         if size.y == 0.:
             size.y = self._texture.height * (self.context.viewport.global_scale if self._dpi_scaling else 1.)
 
+        # Restrict to the region of the texture (AtlasTexture)
+        cdef float[2] uv_offset = self._texture._uv_offset
+        cdef float[2] uv_scale = self._texture._uv_scale
         imgui.PushID(self.uuid)
         if self._frame_padding >= 0:
             imgui.PushStyleVar(imgui.ImGuiStyleVar_FramePadding,
@@ -3602,8 +3642,10 @@ cdef class ImageButton(uiItem):
         activated = imgui.ImageButton(self._imgui_label.c_str(),
                                       <imgui.ImTextureID>self._texture.allocated_texture,
                                       Vec2ImVec2(size),
-                                      imgui.ImVec2(self._uv[0], self._uv[1]),
-                                      imgui.ImVec2(self._uv[2], self._uv[3]),
+                                      imgui.ImVec2(uv_offset[0] + uv_scale[0] * self._uv[0],
+                                                   uv_offset[1] + uv_scale[1] * self._uv[1]),
+                                      imgui.ImVec2(uv_offset[0] + uv_scale[0] * self._uv[2],
+                                                   uv_offset[1] + uv_scale[1] * self._uv[3]),
                                       imgui.ColorConvertU32ToFloat4(self._background_color),
                                       imgui.ColorConvertU32ToFloat4(self._color_multiplier))
         if self._frame_padding >= 0:
@@ -353,8 +353,7 @@ def setup_package():
         packages=['dearcygui', 'dearcygui.docs', 'dearcygui.utils', 'dearcygui.backends', 'dearcygui.wrapper'],
         install_requires=[
           'numpy',
-          'freetype-py',
-          'scipy'
+          'freetype-py'
         ],
         ext_modules = cythonize(extensions, compiler_directives={'language_level' : "3"}, nthreads=4),
         extras_require={